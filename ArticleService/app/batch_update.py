@@ -6,14 +6,18 @@ Redis 캐시 데이터를 주기적으로 데이터베이스에 반영합니다.
 """
 import asyncio
 import logging
+import os
 import signal
 import sys
+import time
 from datetime import datetime
-from typing import Optional
-from sqlalchemy import update
-from database.core import AsyncSessionLocal
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, update
 from database.posts import Posts
-from libs.redis import get_all_cached_stats, UPDATE_INTERVAL, sync_post_stats, close_redis_connection, force_flush_backlogs
+from database.sharding import shard_session, split_writable
+from libs.redis import UPDATE_INTERVAL, close_redis_connection, force_flush_backlogs, get_cached_stats_for_posts
+from libs.redis import pop_dirty_unique_viewers, restore_dirty_unique_viewers
+from libs.redis import pop_dirty_counters, restore_dirty_counters, get_dirty_counter_stats
 
 # 로깅 설정
 logging.basicConfig(
@@ -22,86 +26,313 @@ logging.basicConfig(
 )
 logger = logging.getLogger("batch_update")
 
+# 배치 간격 조절 범위 (초)
+BATCH_UPDATE_MIN_INTERVAL = int(os.getenv("BATCH_UPDATE_MIN_INTERVAL", 1))
+BATCH_UPDATE_MAX_INTERVAL = int(os.getenv("BATCH_UPDATE_MAX_INTERVAL", UPDATE_INTERVAL))
+# 반영 대기 게시글이 이 수에 도달할 즈음 반영 (도달하면 간격이 남아 있어도 바로 반영)
+BATCH_UPDATE_TARGET_DIRTY = int(os.getenv("BATCH_UPDATE_TARGET_DIRTY", 2000))
+# 한 번에 꺼내어 UPDATE 하는 게시글 수
+BATCH_UPDATE_CHUNK = int(os.getenv("BATCH_UPDATE_CHUNK", 1000))
+# 다음 반영까지 최소한 직전 반영 소요 시간의 이 배수만큼 쉼 (DB가 느려지면 자동으로 간격이 늘어남)
+BATCH_UPDATE_DURATION_FACTOR = float(os.getenv("BATCH_UPDATE_DURATION_FACTOR", 4))
+# 청크당 UPDATE 지연(ms)이 이 값을 넘으면 DB가 바쁜 것으로 보고 간격을 비례해 늘림
+BATCH_UPDATE_SLOW_DB_MS = float(os.getenv("BATCH_UPDATE_SLOW_DB_MS", 200))
+
 # 배치 업데이트 작업 상태
 _running = False
 _batch_task: Optional[asyncio.Task] = None
 _last_update_time = None
+# 반영이 겹치지 않도록 (주기 실행과 관리자 요청)
+_flush_lock = asyncio.Lock()
+# 즉시 반영 요청 시 대기 중인 루프를 깨움
+_wakeup: Optional[asyncio.Event] = None
+
+_flush_stats = {
+    "flushes": 0,
+    "rows": 0,
+    "errors": 0,
+    "last_flush_at": None,
+    "last_duration_sec": 0.0,
+    "last_rows": 0,
+    "last_trigger": None,
+    # 청크당 UPDATE 지연 지수 이동 평균 (ms)
+    "db_latency_ms": 0.0,
+    # 반영 대기 게시글이 늘어나는 속도 (초당 게시글 수, 지수 이동 평균)
+    "dirty_rate": 0.0,
+    "next_interval_sec": float(BATCH_UPDATE_MAX_INTERVAL),
+}
+
+# UPDATE 문 (executemany), 값이 있는 컬럼만 SET
+_posts = Posts.__table__
+_UPDATE_BOTH = (
+    update(_posts)
+    .where(_posts.c.id == bindparam("post_id"))
+    .values(views=bindparam("v"), hearts=bindparam("h"))
+)
+_UPDATE_VIEWS = update(_posts).where(_posts.c.id == bindparam("post_id")).values(views=bindparam("v"))
+_UPDATE_HEARTS = update(_posts).where(_posts.c.id == bindparam("post_id")).values(hearts=bindparam("h"))
+
 
-async def update_db_from_cache():
+def _ewma(previous: float, value: float, alpha: float = 0.3) -> float:
+    return value if not previous else previous + alpha * (value - previous)
+
+
+async def update_db_from_cache(trigger: str = "interval") -> Dict[str, object]:
     """
     Redis 캐시의 데이터를 데이터베이스에 반영하는 배치 작업
+
+    마지막 반영 이후 조회수/좋아요 수가 바뀐 게시글(dirty 집합)만 오래된 것부터 청크 단위로 꺼내
+    캐시 값을 MGET 하고 executemany UPDATE로 반영합니다. 실패한 청크는 dirty 집합으로 되돌립니다.
+
+    Returns:
+        반영 결과 요약 (trigger, rows, chunks, duration_sec, 반영 전 staleness_sec)
     """
+    async with _flush_lock:
+        return await _flush(trigger)
+
+async def _flush(trigger: str) -> Dict[str, object]:
     global _last_update_time
-    
+
+    start = time.monotonic()
+    summary = {"trigger": trigger, "rows": 0, "chunks": 0, "failed_chunks": 0, "duration_sec": 0.0, "staleness_sec": None}
+
     try:
-        start_time = datetime.now()
-        logger.info(f"배치 업데이트 시작: {start_time}")
-        
+        logger.info(f"배치 업데이트 시작: {datetime.now()} ({trigger})")
+
         # 백로그 처리 먼저 수행
         await force_flush_backlogs()
-        
-        # 캐시된 모든 통계 가져오기
-        views_dict, hearts_dict = await get_all_cached_stats()
-        
-        if not views_dict and not hearts_dict:
-            logger.info("캐시된 데이터가 없습니다.")
-            return
-        
-        update_count = 0    
-        async with AsyncSessionLocal() as session:
-            # 조회수 업데이트
-            for post_id, views in views_dict.items():
-                try:
-                    await session.execute(
-                        update(Posts)
-                        .where(Posts.id == int(post_id))
-                        .values(views=views)
-                    )
-                    update_count += 1
-                except Exception as e:
-                    logger.error(f"게시글 {post_id} 조회수 업데이트 실패: {str(e)}")
-            
-            # 좋아요 수 업데이트
-            for post_id, hearts in hearts_dict.items():
-                try:
-                    await session.execute(
-                        update(Posts)
-                        .where(Posts.id == int(post_id))
-                        .values(hearts=hearts)
-                    )
-                    update_count += 1
-                except Exception as e:
-                    logger.error(f"게시글 {post_id} 좋아요 수 업데이트 실패: {str(e)}")
-            
-            # 변경사항 커밋
-            await session.commit()
-            
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            logger.info(f"배치 업데이트 완료: {update_count}개 항목 업데이트, 소요 시간: {duration:.2f}초")
-            _last_update_time = end_time
-            
+
+        # 순 방문자 수는 조회된 게시글만 따로 반영
+        await update_unique_viewers()
+
+        _, oldest = await get_dirty_counter_stats()
+        if oldest is not None:
+            summary["staleness_sec"] = round(max(0.0, time.time() - oldest), 3)
+
+        while True:
+            items = await pop_dirty_counters(BATCH_UPDATE_CHUNK)
+            if not items:
+                break
+
+            summary["chunks"] += 1
+            rows = await _update_chunk(items)
+            if rows is None:
+                summary["failed_chunks"] += 1
+                # 실패한 청크는 다음 반영에서 다시 시도
+                break
+            summary["rows"] += rows
+
+            if len(items) < BATCH_UPDATE_CHUNK:
+                break
+
     except Exception as e:
+        _flush_stats["errors"] += 1
         logger.error(f"배치 업데이트 중 오류 발생: {str(e)}")
 
+    duration = time.monotonic() - start
+    summary["duration_sec"] = round(duration, 4)
+    _flush_stats["flushes"] += 1
+    _flush_stats["rows"] += summary["rows"]
+    _flush_stats["last_flush_at"] = time.time()
+    _flush_stats["last_duration_sec"] = summary["duration_sec"]
+    _flush_stats["last_rows"] = summary["rows"]
+    _flush_stats["last_trigger"] = trigger
+    _last_update_time = datetime.now()
+
+    if summary["rows"]:
+        logger.info(f"배치 업데이트 완료: {summary['rows']}개 게시글 업데이트, 소요 시간: {duration:.2f}초")
+    return summary
+
+async def _update_chunk(items: List[Tuple[int, float]]) -> Optional[int]:
+    """
+    꺼낸 게시글들의 캐시 값을 DB에 반영합니다. 실패하면 dirty 집합으로 되돌리고 None을 반환합니다.
+    """
+    post_ids = [post_id for post_id, _ in items]
+    try:
+        stats = await get_cached_stats_for_posts(post_ids)
+        if not stats:
+            raise ConnectionError("캐시된 통계를 조회하지 못했습니다.")
+
+        both, views_only, hearts_only = [], [], []
+        for post_id, (views, hearts) in stats.items():
+            if views is not None and hearts is not None:
+                both.append({"post_id": post_id, "v": views, "h": hearts})
+            elif views is not None:
+                views_only.append({"post_id": post_id, "v": views})
+            elif hearts is not None:
+                hearts_only.append({"post_id": post_id, "h": hearts})
+
+        # 샤드별로 나눠 동시에 반영, 다른 샤드로 옮기는 중인 게시글은 다음 반영으로 미룸
+        groups, frozen = split_writable(stats.keys())
+        started = time.monotonic()
+        results = await asyncio.gather(*(
+            _update_shard(shard, set(post_ids), both, views_only, hearts_only)
+            for shard, post_ids in groups.items()
+        ), return_exceptions=True)
+        latency_ms = (time.monotonic() - started) * 1000
+        _flush_stats["db_latency_ms"] = round(_ewma(_flush_stats["db_latency_ms"], latency_ms), 3)
+
+        retry = set(frozen)
+        # 연결하지 못한 Redis 노드의 게시글은 값을 읽지 못했으므로 다음 반영으로 미룸
+        retry.update(item[0] for item in items if item[0] not in stats)
+        for (shard, post_ids), result in zip(groups.items(), results):
+            if isinstance(result, Exception):
+                _flush_stats["errors"] += 1
+                logger.error(f"샤드 {shard}의 게시글 {len(post_ids)}개 통계 업데이트 실패: {str(result)}")
+                retry.update(post_ids)
+        if retry:
+            await restore_dirty_counters([item for item in items if item[0] in retry])
+        if len(retry) == len(items):
+            return None
+        return len(items) - len(retry)
+
+    except Exception as e:
+        _flush_stats["errors"] += 1
+        logger.error(f"게시글 {len(items)}개 통계 업데이트 실패: {str(e)}")
+        await restore_dirty_counters(items)
+        return None
+
+async def _update_shard(shard: int, post_ids: set, *param_lists: List[dict]):
+    async with shard_session(shard) as session:
+        for stmt, params in zip((_UPDATE_BOTH, _UPDATE_VIEWS, _UPDATE_HEARTS), param_lists):
+            params = [param for param in params if param["post_id"] in post_ids]
+            if params:
+                await session.execute(stmt, params)
+        await session.commit()
+
+def next_interval(dirty_rate: float, last_duration: float, db_latency_ms: float) -> float:
+    """
+    다음 반영까지 기다릴 시간 (초)
+
+    - 반영 대기 게시글이 BATCH_UPDATE_TARGET_DIRTY에 도달할 것으로 예상되는 시간
+    - 직전 반영 소요 시간의 BATCH_UPDATE_DURATION_FACTOR배 이상 (반영이 DB 부하를 독점하지 않도록)
+    - DB 지연이 BATCH_UPDATE_SLOW_DB_MS를 넘으면 그 비율만큼 늘림
+    을 [BATCH_UPDATE_MIN_INTERVAL, BATCH_UPDATE_MAX_INTERVAL] 범위로 제한합니다.
+    """
+    interval = BATCH_UPDATE_TARGET_DIRTY / dirty_rate if dirty_rate > 0 else BATCH_UPDATE_MAX_INTERVAL
+    interval = max(interval, last_duration * BATCH_UPDATE_DURATION_FACTOR)
+    if db_latency_ms > BATCH_UPDATE_SLOW_DB_MS:
+        interval *= db_latency_ms / BATCH_UPDATE_SLOW_DB_MS
+    return min(max(interval, BATCH_UPDATE_MIN_INTERVAL), BATCH_UPDATE_MAX_INTERVAL)
+
+async def _wait_next_flush() -> str:
+    """
+    다음 반영 시점까지 1초 간격으로 대기합니다.
+    반영 대기 게시글이 목표 수에 도달하거나 즉시 반영 요청이 오면 일찍 깨어납니다.
+
+    Returns:
+        반영 사유 (interval | dirty | stop)
+    """
+    interval = next_interval(_flush_stats["dirty_rate"], _flush_stats["last_duration_sec"], _flush_stats["db_latency_ms"])
+    _flush_stats["next_interval_sec"] = round(interval, 3)
+
+    waited_from = time.monotonic()
+    deadline = waited_from + interval
+    while _running:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return "interval"
+        try:
+            await asyncio.wait_for(_wakeup.wait(), min(1.0, remaining))
+            # 관리자 요청으로 이미 반영되었으므로 처음부터 다시 대기
+            _wakeup.clear()
+            waited_from = time.monotonic()
+            deadline = waited_from + interval
+            continue
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            dirty, _ = await get_dirty_counter_stats()
+        except Exception:
+            continue
+        elapsed = time.monotonic() - waited_from
+        if elapsed >= 1:
+            _flush_stats["dirty_rate"] = round(_ewma(_flush_stats["dirty_rate"], dirty / elapsed), 3)
+        if dirty >= BATCH_UPDATE_TARGET_DIRTY and elapsed >= BATCH_UPDATE_MIN_INTERVAL:
+            return "dirty"
+    return "stop"
+
+async def flush_now() -> Dict[str, object]:
+    """
+    즉시 반영하고 결과를 반환합니다. (관리자 요청)
+    주기 실행 중이면 그 반영이 끝난 뒤 이어서 반영하므로, 호출 시점까지 Redis에 들어간 변경과
+    이 워커의 메모리에 있던 증가분은 모두 DB에 들어갑니다. (다른 워커의 메모리 증가분은 제외)
+    """
+    summary = await update_db_from_cache("manual")
+    if _wakeup is not None:
+        _wakeup.set()
+    return summary
+
+async def get_batch_update_stats() -> Dict[str, object]:
+    """
+    배치 반영 상태와 DB staleness (가장 오래 반영되지 않은 변경의 경과 시간, 초)
+    """
+    try:
+        dirty, oldest = await get_dirty_counter_stats()
+    except Exception as e:
+        logger.warning(f"반영 대기 게시글 조회 실패: {str(e)}")
+        dirty, oldest = None, None
+
+    return {
+        **_flush_stats,
+        "dirty_posts": dirty,
+        "db_staleness_sec": round(max(0.0, time.time() - oldest), 3) if oldest is not None else 0.0,
+        "min_interval_sec": BATCH_UPDATE_MIN_INTERVAL,
+        "max_interval_sec": BATCH_UPDATE_MAX_INTERVAL,
+        "target_dirty": BATCH_UPDATE_TARGET_DIRTY,
+        "running": _running,
+    }
+
+async def update_unique_viewers():
+    """
+    조회된 게시글의 순 방문자 수(HLL 추정값)를 DB에 반영합니다.
+    HLL 키가 만료되어 다시 작게 세는 경우가 있으므로 DB 값보다 클 때만 갱신합니다.
+    """
+    counts = await pop_dirty_unique_viewers()
+    if not counts:
+        return
+
+    stmt = (
+        update(Posts.__table__)
+        .where(Posts.__table__.c.id == bindparam("post_id"))
+        .where(Posts.__table__.c.unique_viewers < bindparam("count"))
+        .values(unique_viewers=bindparam("count"))
+    )
+
+    async def _update(shard: int, post_ids: List[int]):
+        async with shard_session(shard) as session:
+            await session.execute(stmt, [{"post_id": post_id, "count": counts[post_id]} for post_id in post_ids])
+            await session.commit()
+
+    groups, retry = split_writable(counts)
+    results = await asyncio.gather(*(_update(shard, post_ids) for shard, post_ids in groups.items()), return_exceptions=True)
+    for (shard, post_ids), result in zip(groups.items(), results):
+        if isinstance(result, Exception):
+            logger.error(f"샤드 {shard}의 순 방문자 수 업데이트 실패: {str(result)}")
+            retry.extend(post_ids)
+
+    if len(retry) < len(counts):
+        logger.info(f"순 방문자 수 업데이트: {len(counts) - len(retry)}개 게시글")
+    if retry:
+        # 다음 배치에서 다시 반영
+        await restore_dirty_unique_viewers(retry)
+
 async def run_batch_update_loop():
     """
-    주기적으로 배치 업데이트를 실행하는 무한 루프
+    배치 업데이트를 반복 실행하는 무한 루프 (간격은 next_interval로 매번 다시 계산)
     """
-    global _running
+    global _running, _wakeup
     
     _running = True
-    logger.info(f"배치 업데이트 서비스 시작 (간격: {UPDATE_INTERVAL}초)")
+    _wakeup = asyncio.Event()
+    logger.info(f"배치 업데이트 서비스 시작 (간격: {BATCH_UPDATE_MIN_INTERVAL}~{BATCH_UPDATE_MAX_INTERVAL}초)")
     
     try:
+        trigger = "interval"
         while _running:
-            await update_db_from_cache()
-            
-            # 다음 실행까지 대기 (1초 간격으로 중단 가능한 슬립)
-            for _ in range(UPDATE_INTERVAL):
-                if not _running:
-                    break
-                await asyncio.sleep(1)
+            await update_db_from_cache(trigger)
+            trigger = await _wait_next_flush()
     except asyncio.CancelledError:
         logger.info("배치 업데이트 태스크가 취소되었습니다.")
     finally:
@@ -109,7 +340,7 @@ async def run_batch_update_loop():
         # 마지막 업데이트 실행
         try:
             logger.info("애플리케이션 종료 전 최종 업데이트 실행")
-            await update_db_from_cache()
+            await update_db_from_cache("shutdown")
             await close_redis_connection()
         except Exception as e:
             logger.error(f"최종 업데이트 실패: {str(e)}")
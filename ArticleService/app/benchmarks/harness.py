@@ -0,0 +1,145 @@
+"""
+벤치마크 실행/비교 도구
+
+비동기 함수를 반복 실행하여 지연 시간 분포를 측정하고,
+결과를 JSON으로 저장하거나 기준(baseline) 결과와 비교합니다.
+
+사용법 (두 결과 파일 비교):
+    python -m benchmarks.harness benchmarks/baseline.json results.json --threshold 20
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+def _percentile(sorted_samples: List[float], ratio: float) -> float:
+    index = min(len(sorted_samples) - 1, max(0, int(round(len(sorted_samples) * ratio)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples: List[float], cpu_seconds: Optional[float] = None) -> Dict[str, float]:
+    """
+    초 단위 측정값 목록을 마이크로초 단위 통계로 요약합니다.
+    cpu_seconds를 주면 반복당 프로세스 CPU 시간(cpu_us)도 포함합니다.
+    """
+    samples = sorted(samples)
+    total = sum(samples)
+    cpu = {"cpu_us": round(cpu_seconds / len(samples) * 1e6, 2)} if cpu_seconds is not None else {}
+    return {
+        "iterations": len(samples),
+        "ops_per_sec": round(len(samples) / total, 1) if total > 0 else None,
+        "mean_us": round(statistics.fmean(samples) * 1e6, 2),
+        "p50_us": round(_percentile(samples, 0.50) * 1e6, 2),
+        "p95_us": round(_percentile(samples, 0.95) * 1e6, 2),
+        "p99_us": round(_percentile(samples, 0.99) * 1e6, 2),
+        "max_us": round(samples[-1] * 1e6, 2),
+        **cpu,
+    }
+
+
+async def measure(
+    op: Callable[[int], Awaitable[object]],
+    iterations: int,
+    warmup: int,
+    before_each: Optional[Callable[[int], Awaitable[object]]] = None,
+) -> Dict[str, float]:
+    """
+    op(i)를 warmup회 실행한 뒤 iterations회 실행하며 한 번씩 시간을 잽니다.
+    before_each(i)는 측정 시간에 포함되지 않는 준비 작업입니다.
+    """
+    for i in range(warmup):
+        if before_each is not None:
+            await before_each(i)
+        await op(i)
+
+    samples = []
+    cpu_seconds = 0.0
+    for i in range(iterations):
+        if before_each is not None:
+            await before_each(warmup + i)
+        # 프로세스 전체 CPU 시간 (aiosqlite 스레드 등 다른 스레드 포함)
+        cpu_started_at = time.process_time()
+        started_at = time.perf_counter()
+        await op(warmup + i)
+        samples.append(time.perf_counter() - started_at)
+        cpu_seconds += time.process_time() - cpu_started_at
+
+    return summarize(samples, cpu_seconds)
+
+
+def build_report(results: Dict[str, Dict[str, float]], meta: Dict[str, object]) -> Dict[str, object]:
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **meta,
+        },
+        "results": results,
+    }
+
+
+def write_report(report: Dict[str, object], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def load_report(path: str) -> Dict[str, object]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_reports(baseline: Dict[str, object], current: Dict[str, object], threshold: float) -> List[Dict[str, object]]:
+    """
+    벤치마크별 p50 지연 시간 변화율(%)을 계산합니다.
+    threshold(%)보다 느려진 항목은 regression=True로 표시합니다.
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, result in current.get("results", {}).items():
+        base = base_results.get(name)
+        if base is None:
+            rows.append({"name": name, "baseline_p50_us": None, "current_p50_us": result["p50_us"],
+                         "change_pct": None, "regression": False})
+            continue
+
+        change = (result["p50_us"] - base["p50_us"]) / base["p50_us"] * 100 if base["p50_us"] else 0.0
+        rows.append({
+            "name": name,
+            "baseline_p50_us": base["p50_us"],
+            "current_p50_us": result["p50_us"],
+            "change_pct": round(change, 1),
+            "regression": change > threshold,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, object]]):
+    print(f"{'benchmark':<40} {'baseline p50(us)':>17} {'current p50(us)':>16} {'change':>9}")
+    for row in rows:
+        baseline = "-" if row["baseline_p50_us"] is None else f"{row['baseline_p50_us']:.2f}"
+        change = "new" if row["change_pct"] is None else f"{row['change_pct']:+.1f}%"
+        marker = "  <- regression" if row["regression"] else ""
+        print(f"{row['name']:<40} {baseline:>17} {row['current_p50_us']:>16.2f} {change:>9}{marker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 JSON 비교")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=20.0, help="regression 판정 기준 (p50 증가율 %%)")
+    args = parser.parse_args()
+
+    rows = compare_reports(load_report(args.baseline), load_report(args.current), args.threshold)
+    print_comparison(rows)
+    sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
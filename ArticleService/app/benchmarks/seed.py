@@ -0,0 +1,211 @@
+"""
+부하 테스트용 대량 데이터 시더
+
+게시글/댓글 수백만 건을 청크 단위 executemany로 빠르게 채웁니다.
+여러 청크를 서로 다른 커넥션에서 동시에 넣으며, 청크마다 트랜잭션을 따로 커밋합니다.
+사용자는 AuthService의 `python -m benchmarks.seed_users`로 생성합니다.
+
+게시글 ID는 기존 최대 ID 다음부터 직접 지정하므로, 출력된 post_id_min / post_id_max를
+k6 시나리오(loadtests/zipf_hot_posts_test.js)의 POST_ID_MIN / POST_ID_MAX로 사용하면 됩니다.
+
+샤딩을 쓰면(DB_SHARD_URLS) 게시글 id 구간을 공용 시퀀스에서 통째로 예약하여 다른 워커가 같은 id를 할당하지 않게 하고,
+그 구간을 새 게시글을 받는 샤드 수만큼 나눠 구간 맵(shard_ranges)에 담당 샤드를 기록한 뒤 각 샤드에 넣습니다.
+(id가 연속이므로 k6 시나리오를 그대로 사용, 실행 중인 워커는 SHARD_MAP_REFRESH_INTERVAL 안에 새 구간을 읽음)
+댓글 id는 청크마다 allocate_ids로 게시글 샤드에 맞춰 할당합니다.
+
+사용법:
+    python -m benchmarks.seed --posts 1000000 --comments 3 --users 10000
+    DATABASE_URL=sqlite+aiosqlite:///seed.db python -m benchmarks.seed --posts 10000 --create-tables
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+from typing import List, Tuple
+from sqlalchemy import func, insert, select
+from database.core import async_engine
+from database.posts import Posts
+from database.comments import Comments
+from database.migrations import run_migrations
+from database.sharding import (
+    RANGE_ACTIVE, SHARD_COUNT, SHARD_NEW_POST_SHARDS, SHARDING_ENABLED, allocate_ids, get_engine, reserve_id_range,
+    shard_ranges, start_sharding, stop_sharding,
+)
+
+_WORDS = (
+    "서버 캐시 조회수 좋아요 게시글 댓글 배치 지연 처리량 부하 테스트 요청 응답 "
+    "redis mysql grpc fastapi latency throughput cursor index shard stream"
+).split()
+
+
+def _text(rng: random.Random, approx_bytes: int) -> str:
+    words = []
+    size = 0
+    while size < approx_bytes:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        size += len(word.encode("utf-8")) + 1
+    return " ".join(words)
+
+
+def _post_rows(start_id: int, count: int, users: int, content_bytes: int, seed: int) -> list:
+    rng = random.Random(seed + start_id)
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": post_id,
+            "title": _text(rng, 40)[:100],
+            "content": _text(rng, content_bytes),
+            "user_id": rng.randint(1, users),
+            "last_modified": now,
+            "is_modified": False,
+            "views": 0,
+            "hearts": 0,
+        }
+        for post_id in range(start_id, start_id + count)
+    ]
+
+
+def _comment_rows(start_id: int, count: int, users: int, comments: int, seed: int) -> list:
+    # 게시글당 0 ~ 2*comments개 (평균 comments개)
+    rng = random.Random(seed * 31 + start_id)
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "content": _text(rng, 60),
+            "post_id": str(post_id),
+            "user_id": rng.randint(1, users),
+            "last_modified": now,
+            "is_modified": False,
+        }
+        for post_id in range(start_id, start_id + count)
+        for _ in range(rng.randint(0, comments * 2))
+    ]
+
+
+async def _insert_chunk(semaphore: asyncio.Semaphore, table, shard: int, build_rows) -> int:
+    async with semaphore:
+        # 행 생성도 세마포어 안에서 해야 동시에 메모리에 올라가는 청크 수가 제한됨
+        rows = build_rows()
+        if rows:
+            if table is Comments.__table__:
+                # 샤딩을 쓰면 게시글 샤드로 인코딩된 댓글 id (아니면 None, 자동 증가)
+                ids = await allocate_ids("comments", shard, len(rows))
+                for row, row_id in zip(rows, ids or ()):
+                    row["id"] = row_id
+            async with get_engine(shard).begin() as conn:
+                await conn.execute(insert(table), rows)
+        return len(rows)
+
+
+async def _insert_all(label: str, table, chunks: List[Tuple[int, object]], concurrency: int) -> int:
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.ensure_future(_insert_chunk(semaphore, table, shard, build)) for shard, build in chunks]
+
+    inserted = 0
+    started_at = time.perf_counter()
+    for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+        inserted += await task
+        if done % 20 == 0 or done == len(tasks):
+            elapsed = time.perf_counter() - started_at
+            print(f"[{label}] {done}/{len(tasks)} chunks, {inserted} rows, {inserted / elapsed:.0f} rows/s", flush=True)
+    return inserted
+
+
+async def _reserve_sharded_range(count: int, chunk_size: int) -> Tuple[int, List[Tuple[int, int, int]]]:
+    """
+    게시글 id 구간을 예약하고 새 게시글을 받는 샤드 수만큼 청크 경계에서 나눠 구간 맵에 기록합니다.
+
+    Returns:
+        (첫 id, [(시작 id, 끝 id, 샤드)])
+    """
+    first_id, end_id = await reserve_id_range("posts", count)
+    chunks = -(-count // chunk_size)
+    shards = SHARD_NEW_POST_SHARDS[:chunks]
+    pieces = []
+    for index, shard in enumerate(shards):
+        start = first_id + chunks * index // len(shards) * chunk_size
+        end = min(first_id + chunks * (index + 1) // len(shards) * chunk_size, end_id)
+        pieces.append((start, end, shard))
+
+    # 행을 넣기 전에 기록해야 워커가 맵을 다시 읽은 뒤 바로 올바른 샤드에서 찾음
+    now = datetime.now(timezone.utc)
+    async with async_engine.begin() as conn:
+        await conn.execute(insert(shard_ranges), [
+            {"start_id": start, "end_id": end, "shard": shard, "prev_shard": None, "state": RANGE_ACTIVE, "updated_at": now}
+            for start, end, shard in pieces
+        ])
+    return first_id, pieces
+
+
+async def seed(args) -> dict:
+    if args.create_tables:
+        for shard in range(SHARD_COUNT):
+            await run_migrations(get_engine(shard))
+
+    pieces = []
+    if SHARDING_ENABLED:
+        # 레거시 구간을 먼저 기록해야 함 (샤딩을 처음 켠 DB)
+        await start_sharding()
+        first_id, pieces = await _reserve_sharded_range(args.posts, args.chunk_size)
+    else:
+        async with async_engine.connect() as conn:
+            first_id = ((await conn.execute(select(func.max(Posts.id)))).scalar() or 0) + 1
+
+    chunk_starts = range(first_id, first_id + args.posts, args.chunk_size)
+
+    def chunk_count(start: int) -> int:
+        return min(args.chunk_size, first_id + args.posts - start)
+
+    def chunk_shard(start: int) -> int:
+        return next((shard for lo, hi, shard in pieces if lo <= start < hi), 0)
+
+    started_at = time.perf_counter()
+    posts = await _insert_all("posts", Posts.__table__, [
+        (chunk_shard(start), lambda start=start: _post_rows(start, chunk_count(start), args.users, args.content_bytes, args.seed))
+        for start in chunk_starts
+    ], args.concurrency)
+
+    comments = 0
+    if args.comments:
+        comments = await _insert_all("comments", Comments.__table__, [
+            (chunk_shard(start), lambda start=start: _comment_rows(start, chunk_count(start), args.users, args.comments, args.seed))
+            for start in chunk_starts
+        ], args.concurrency)
+    elapsed = time.perf_counter() - started_at
+
+    if SHARDING_ENABLED:
+        await stop_sharding()
+    await async_engine.dispose()
+
+    return {
+        "post_id_min": first_id,
+        "post_id_max": first_id + args.posts - 1,
+        "posts": posts,
+        "comments": comments,
+        "shard_ranges": [{"start_id": lo, "end_id": hi, "shard": shard} for lo, hi, shard in pieces] or None,
+        "elapsed_sec": round(elapsed, 1),
+        "rows_per_sec": round((posts + comments) / elapsed) if elapsed > 0 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게시글/댓글 대량 시드")
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--comments", type=int, default=3, help="게시글당 평균 댓글 수")
+    parser.add_argument("--users", type=int, default=10_000, help="작성자 ID 범위 (1 ~ users)")
+    parser.add_argument("--content-bytes", type=int, default=500, help="본문 길이 (대략적인 바이트 수)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="executemany 한 번에 넣을 행 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 사용할 커넥션 수")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (같은 값이면 같은 데이터)")
+    parser.add_argument("--create-tables", action="store_true", help="시드 전에 마이그레이션 실행")
+    args = parser.parse_args()
+
+    result = asyncio.run(seed(args))
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
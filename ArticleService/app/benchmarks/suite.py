@@ -0,0 +1,431 @@
+"""
+ArticleService 마이크로벤치마크
+
+docker-compose 없이 로컬에서 Redis 카운터, 백로그 처리, 배치 업데이트,
+피드/상세 핸들러의 지연 시간을 측정합니다.
+
+기본값으로 SQLite(aiosqlite) 임시 파일과 인메모리 fakeredis를 사용하며,
+DATABASE_URL / REDIS_URL을 지정하면 실제 MySQL / redis-server로 측정할 수 있습니다.
+각 벤치마크 전에 Redis DB를 비우므로(FLUSHDB) 외부 백엔드는 전용 DB를 사용하고
+--allow-external 옵션을 함께 지정해야 합니다.
+
+사용법:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 20
+    python -m benchmarks.suite --filter redis. --iterations 5000
+    REDIS_URL=redis://localhost:6379/15 python -m benchmarks.suite --allow-external
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# 앱 모듈을 import 하기 전에 DB/Redis 백엔드를 정해야 함
+_TEMP_DIR = tempfile.mkdtemp(prefix="article-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_TEMP_DIR}/bench.db")
+os.environ.setdefault("REDIS_URL", "fakeredis://")
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import joinedload
+from starlette.requests import Request
+from database.core import async_engine, AsyncSessionLocal, SQLALCHEMY_DATABASE_URL
+from database.posts import Posts
+from database.comments import Comments
+from database.migrations import run_migrations
+from database import statements
+from libs.redis import (
+    get_all_node_clients,
+    close_redis_connection,
+    increment_views,
+    increment_hearts,
+    decrement_hearts,
+    get_all_cached_stats,
+    sync_post_stats,
+)
+from libs.redis import views as redis_views, hearts as redis_hearts
+from libs.redis.client import REDIS_URL, DIRTY_COUNTERS_KEY
+from libs.redis.nodes import group_by_node, run_on_nodes
+from batch_update import update_db_from_cache
+from libs.group_commit import GroupCommitWriter
+from routes.posts import get as feed_route, detail_get as detail_route
+from rpc.auth.services import getuser
+from benchmarks.harness import measure, build_report, write_report, load_report, compare_reports, print_comparison
+
+# 핸들러를 직접 호출할 때 넘기는 요청 (gzip을 받는 클라이언트)
+GZIP_REQUEST = Request({"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip")]})
+
+# 벤치마크 이름 -> (setup 함수, 최대 반복 횟수)
+BENCHMARKS = {}
+
+
+def benchmark(name: str, max_iterations: int = None):
+    """
+    setup(ctx)는 준비 작업을 한 뒤 op 또는 (op, before_each)를 반환합니다.
+    비용이 큰 벤치마크는 max_iterations로 반복 횟수를 제한합니다.
+    """
+    def decorator(setup):
+        BENCHMARKS[name] = (setup, max_iterations)
+        return setup
+    return decorator
+
+
+class Context:
+    def __init__(self, post_ids, user_ids, cached_keys):
+        self.post_ids = post_ids
+        self.user_ids = user_ids
+        self.cached_keys = cached_keys
+
+    def post_id(self, i: int) -> int:
+        return self.post_ids[i % len(self.post_ids)]
+
+
+async def _reset_redis():
+    for redis_client in await get_all_node_clients():
+        await redis_client.flushdb()
+    redis_views._views_backlog.clear()
+    redis_hearts._hearts_backlog.clear()
+
+
+async def _cache_stats(ctx: Context):
+    """
+    배치 업데이트/통계 조회 대상이 되도록 cached_keys개 게시글의 통계를 Redis에 올려둡니다.
+    """
+    index = {post_id: i for i, post_id in enumerate(ctx.post_ids[:ctx.cached_keys])}
+
+    async def _set(redis_client, post_ids):
+        pipeline = redis_client.pipeline()
+        for post_id in post_ids:
+            pipeline.set(f"views:{post_id}", index[post_id] + 1)
+            pipeline.set(f"hearts:{post_id}", index[post_id] % 50)
+        await pipeline.execute()
+
+    await run_on_nodes(group_by_node(index), _set)
+
+
+async def _mark_dirty(ctx: Context):
+    """
+    cached_keys개 게시글을 DB 반영 대상(dirty 집합)으로 표시합니다. (배치 반영이 집합을 비우므로 반복마다 호출)
+    """
+    now = time.time()
+
+    async def _zadd(redis_client, post_ids):
+        await redis_client.zadd(DIRTY_COUNTERS_KEY, {post_id: now for post_id in post_ids})
+
+    await run_on_nodes(group_by_node(ctx.post_ids[:ctx.cached_keys]), _zadd)
+
+
+@benchmark("redis.increment_views.hot_key")
+async def bench_increment_views_hot(ctx: Context):
+    post_id = ctx.post_ids[0]
+
+    async def op(i):
+        await increment_views(post_id)
+    return op
+
+
+@benchmark("redis.increment_views.spread")
+async def bench_increment_views_spread(ctx: Context):
+    async def op(i):
+        await increment_views(ctx.post_id(i))
+    return op
+
+
+@benchmark("redis.increment_hearts")
+async def bench_increment_hearts(ctx: Context):
+    async def op(i):
+        await increment_hearts(ctx.post_id(i))
+    return op
+
+
+@benchmark("redis.decrement_hearts")
+async def bench_decrement_hearts(ctx: Context):
+    # 0 아래로 내려가지 않도록 미리 충분히 올려둠
+    for post_id in ctx.post_ids:
+        await sync_post_stats(post_id, 0, 1_000_000)
+
+    async def op(i):
+        await decrement_hearts(ctx.post_id(i))
+    return op
+
+
+@benchmark("redis.flush_backlog", max_iterations=200)
+async def bench_flush_backlog(ctx: Context):
+    """
+    Redis 장애 중 쌓인 백로그(게시글 cached_keys개)를 한 번에 반영하는 비용
+    """
+    async def before_each(i):
+        for post_id in ctx.post_ids[:ctx.cached_keys]:
+            redis_views._views_backlog[post_id] += 1
+            redis_hearts._hearts_backlog[post_id] += 1
+
+    async def op(i):
+        await redis_views.force_flush_backlog()
+        await redis_hearts.force_flush_backlog()
+    return op, before_each
+
+
+@benchmark("redis.get_all_cached_stats", max_iterations=200)
+async def bench_get_all_cached_stats(ctx: Context):
+    await _cache_stats(ctx)
+
+    async def op(i):
+        await get_all_cached_stats()
+    return op
+
+
+@benchmark("batch.update_db_from_cache", max_iterations=50)
+async def bench_update_db_from_cache(ctx: Context):
+    await _cache_stats(ctx)
+
+    async def before_each(i):
+        await _mark_dirty(ctx)
+
+    async def op(i):
+        await update_db_from_cache()
+    return op, before_each
+
+
+# 동시에 들어온 게시글 작성 요청 INSERT_CONCURRENCY개 처리 (반복당 행 수 = INSERT_CONCURRENCY)
+INSERT_CONCURRENCY = 50
+
+
+def _new_post(i: int, j: int) -> dict:
+    return {
+        "title": f"insert bench {i}-{j}",
+        "content": "insert bench content",
+        "picture": None,
+        "user_id": j + 1,
+        "last_modified": datetime.now(timezone.utc),
+        "is_modified": False,
+        "views": 0,
+        "hearts": 0,
+        "unique_viewers": 0,
+    }
+
+
+@benchmark("insert.posts.session", max_iterations=50)
+async def bench_insert_session(ctx: Context):
+    # 요청마다 세션을 열고 한 행씩 커밋 (기존 경로)
+    async def insert_one(row):
+        async with AsyncSessionLocal() as session:
+            session.add(Posts(**row))
+            await session.commit()
+
+    async def op(i):
+        await asyncio.gather(*(insert_one(_new_post(i, j)) for j in range(INSERT_CONCURRENCY)))
+    return op
+
+
+@benchmark("insert.posts.group_commit", max_iterations=50)
+async def bench_insert_group_commit(ctx: Context):
+    writer = GroupCommitWriter("bench", Posts.__table__)
+
+    async def op(i):
+        await asyncio.gather(*(writer.insert(_new_post(i, j)) for j in range(INSERT_CONCURRENCY)))
+    return op
+
+
+# 자주 실행하는 조회: 요청마다 ORM 문을 만드는 경로(orm)와 미리 만든 Core 문(core) 비교
+@benchmark("query.feed_page.orm")
+async def bench_feed_page_orm(ctx: Context):
+    cursors = [post_id - 1 for post_id in ctx.post_ids[::10]]
+
+    async def op(i):
+        async with AsyncSessionLocal() as session:
+            query = select(Posts.id, Posts.title, Posts.user_id, Posts.last_modified).where(
+                Posts.id > cursors[i % len(cursors)]
+            ).order_by(Posts.id).limit(10)
+            [
+                {"id": row.id, "title": row.title, "user_id": row.user_id, "last_modified": row.last_modified}
+                for row in await session.execute(query)
+            ]
+    return op
+
+
+@benchmark("query.feed_page.core")
+async def bench_feed_page_core(ctx: Context):
+    cursors = [post_id - 1 for post_id in ctx.post_ids[::10]]
+
+    async def op(i):
+        async with async_engine.connect() as conn:
+            result = await conn.execute(statements.FEED_PAGE, {"cursor_id": cursors[i % len(cursors)], "limit": 10})
+            [dict(row._mapping) for row in result]
+    return op
+
+
+@benchmark("query.detail.orm")
+async def bench_detail_orm(ctx: Context):
+    async def op(i):
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Posts).options(joinedload(Posts.comments)).where(Posts.id == ctx.post_id(i))
+            )
+            post = result.scalars().first()
+            [{"id": comment.id, "content": comment.content} for comment in post.comments]
+    return op
+
+
+@benchmark("query.detail.core")
+async def bench_detail_core(ctx: Context):
+    async def op(i):
+        async with async_engine.connect() as conn:
+            params = {"post_id": ctx.post_id(i)}
+            (await conn.execute(statements.POST_DETAIL, params)).first()
+            [{"id": comment.id, "content": comment.content} for comment in await conn.execute(statements.COMMENTS_FOR_POST, params)]
+    return op
+
+
+@benchmark("query.post_exists.orm")
+async def bench_post_exists_orm(ctx: Context):
+    async def op(i):
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(Posts).where(Posts.id == ctx.post_id(i)))
+            result.scalars().first()
+    return op
+
+
+@benchmark("query.post_exists.core")
+async def bench_post_exists_core(ctx: Context):
+    async def op(i):
+        async with async_engine.connect() as conn:
+            (await conn.execute(statements.POST_HEARTS, {"post_id": ctx.post_id(i)})).first()
+    return op
+
+
+@benchmark("handler.feed")
+async def bench_feed(ctx: Context):
+    # 작성자 정보는 캐시에서 응답 (Auth RPC 비용 제외)
+    getuser._user_cache.set_many({
+        user_id: {"id": user_id, "username": f"user{user_id}", "handle_name": f"handle{user_id}"}
+        for user_id in ctx.user_ids
+    })
+    cursors = [post_id - 1 for post_id in ctx.post_ids[::10]]
+
+    async def op(i):
+        await feed_route.get_posts(request=GZIP_REQUEST, cursor_id=cursors[i % len(cursors)], limit=10, userid=1)
+    return op
+
+
+@benchmark("handler.detail")
+async def bench_detail(ctx: Context):
+    async def op(i):
+        await detail_route.get_posts(request=GZIP_REQUEST, post_id=ctx.post_id(i), userid=1)
+    return op
+
+
+@benchmark("handler.detail.hot_key")
+async def bench_detail_hot(ctx: Context):
+    # 한 게시글에 요청이 몰리는 경우 (핫 키 탐지 -> L1 캐시/조회수 로컬 합산)
+    post_id = ctx.post_ids[0]
+
+    async def op(i):
+        await detail_route.get_posts(request=GZIP_REQUEST, post_id=post_id, userid=1)
+    return op
+
+
+async def seed(posts: int, comments_per_post: int, users: int) -> list:
+    """
+    마이그레이션으로 테이블을 만들고 게시글/댓글을 채운 뒤 생성된 게시글 ID 목록을 반환합니다.
+    """
+    await run_migrations()
+
+    async with async_engine.begin() as conn:
+        max_id = (await conn.execute(select(func.max(Posts.id)))).scalar() or 0
+        await conn.execute(insert(Posts), [
+            {
+                "title": f"bench title {index}",
+                "content": "bench content " * 20,
+                "user_id": index % users + 1,
+                "views": 0,
+                "hearts": 0,
+                "is_modified": False,
+            }
+            for index in range(posts)
+        ])
+        post_ids = list((await conn.execute(
+            select(Posts.id).where(Posts.id > max_id).order_by(Posts.id)
+        )).scalars())
+
+        if comments_per_post:
+            await conn.execute(insert(Comments), [
+                {"content": f"bench comment {index}", "post_id": str(post_id), "user_id": index % users + 1, "is_modified": False}
+                for post_id in post_ids
+                for index in range(comments_per_post)
+            ])
+
+    return post_ids
+
+
+async def run(args) -> dict:
+    post_ids = await seed(args.posts, args.comments, args.users)
+    ctx = Context(post_ids, list(range(1, args.users + 1)), min(args.cached_keys, len(post_ids)))
+
+    results = {}
+    for name, (setup, max_iterations) in BENCHMARKS.items():
+        if args.filter and not any(name.startswith(prefix) for prefix in args.filter):
+            continue
+
+        await _reset_redis()
+        case = await setup(ctx)
+        op, before_each = case if isinstance(case, tuple) else (case, None)
+
+        iterations = min(args.iterations, max_iterations) if max_iterations else args.iterations
+        warmup = min(args.warmup, iterations)
+        results[name] = await measure(op, iterations, warmup, before_each)
+        print(f"{name:<40} p50={results[name]['p50_us']:>10.2f}us  p99={results[name]['p99_us']:>10.2f}us  "
+              f"cpu={results[name]['cpu_us']:>10.2f}us  {results[name]['ops_per_sec']:>10} ops/s", file=sys.stderr)
+
+    await close_redis_connection()
+    await async_engine.dispose()
+
+    return build_report(results, {
+        "database": async_engine.dialect.name,
+        "redis": REDIS_URL.split("://")[0],
+        "posts": args.posts,
+        "comments_per_post": args.comments,
+        "cached_keys": ctx.cached_keys,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ArticleService 마이크로벤치마크")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--posts", type=int, default=1000, help="시드 게시글 수")
+    parser.add_argument("--comments", type=int, default=5, help="게시글당 댓글 수")
+    parser.add_argument("--users", type=int, default=100, help="작성자 수")
+    parser.add_argument("--cached-keys", type=int, default=500, help="배치/통계 조회 대상 게시글 수")
+    parser.add_argument("--filter", action="append", help="이름이 이 접두사로 시작하는 벤치마크만 실행 (반복 지정 가능)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=20.0, help="regression 판정 기준 (p50 증가율 %%)")
+    parser.add_argument("--allow-external", action="store_true", help="실제 MySQL/Redis 사용 허용 (Redis DB를 FLUSHDB 함)")
+    args = parser.parse_args()
+
+    if not args.allow_external and not (SQLALCHEMY_DATABASE_URL.startswith("sqlite") and REDIS_URL.startswith("fakeredis://")):
+        parser.error("외부 DB/Redis를 사용하려면 --allow-external을 지정하세요. (Redis DB를 비웁니다)")
+
+    # 요청마다 남는 INFO 로그가 측정값을 왜곡하지 않도록 끔
+    logging.disable(logging.INFO)
+
+    report = asyncio.run(run(args))
+
+    if args.output:
+        write_report(report, args.output)
+
+    if args.baseline:
+        rows = compare_reports(load_report(args.baseline), report, args.threshold)
+        print_comparison(rows)
+        if any(row["regression"] for row in rows):
+            sys.exit(1)
+    elif not args.output:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
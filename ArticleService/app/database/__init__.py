@@ -1,5 +1,9 @@
+from sqlalchemy import BigInteger, Integer
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
+# SQLite는 INTEGER PRIMARY KEY만 자동 증가하므로 SQLite에서는 Integer로 생성
+BigIntegerPK = BigInteger().with_variant(Integer, "sqlite")
+
 __all__ = ['core', 'database', 'application', 'department']
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import BLOB, Column, Integer, String, DateTime, ForeignKey, Boolean, BigInteger
+from sqlalchemy import BLOB, Column, Index, Integer, String, Text, DateTime, ForeignKey, Boolean, BigInteger
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from sqlalchemy.ext.declarative import declarative_base
@@ -7,12 +7,20 @@ from database import Base
 
 class Comments(Base):
     __tablename__ = "comments"
+    # 스키마 변경은 database/migrations/versions에 새 버전으로 추가해야 DB에 반영됨
+    __table_args__ = (
+        # 게시글별 댓글 (상세 조회 JOIN, id 순 정렬)
+        Index("ix_comments_post_id_id", "post_id", "id"),
+        # 사용자별 댓글 (본인 댓글 삭제/조회)
+        Index("ix_comments_user_id_id", "user_id", "id"),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
-    content = Column(String, nullable=False) 
+    content = Column(Text, nullable=False)
     last_modified = Column(DateTime, nullable=True, onupdate=datetime.now(timezone.utc), default=datetime.now(timezone.utc))
     is_modified = Column(Boolean, nullable=False, default=False)
     
-    post_id = Column(String, ForeignKey('posts.id'), nullable=False)
+    # posts.id와 같은 타입이어야 JOIN 시 형변환 없이 인덱스를 사용
+    post_id = Column(BigInteger, ForeignKey('posts.id'), nullable=False)
     post = relationship('Posts', back_populates='comments')
 
     user_id = Column(BigInteger, nullable=False) 
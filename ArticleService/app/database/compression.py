@@ -0,0 +1,99 @@
+"""
+게시글 본문 압축 저장
+
+CompressedText 컬럼은 값 앞에 1바이트 인코딩 표시를 붙여 BLOB으로 저장합니다.
+- 0x00: 압축하지 않음 (CONTENT_COMPRESSION_MIN_BYTES보다 짧거나 압축해도 줄지 않는 본문)
+- 0x01: zlib
+- 0x02: zstd (zstandard 패키지가 있을 때)
+
+ORM/Core 어디서 읽고 쓰든 bind/result 처리에서 압축/해제하므로 호출하는 쪽은 str로 다룹니다.
+표시 바이트가 없는 값(BLOB으로 바꾸기 전의 행)은 압축하지 않은 UTF-8로 읽습니다.
+"""
+import os
+import zlib
+from typing import Optional, Union
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects import mysql
+from sqlalchemy.types import TypeDecorator
+
+try:
+    import zstandard
+except ImportError:  # zstandard가 없으면 zlib만 사용
+    zstandard = None
+
+# 이 크기(UTF-8 바이트) 이상인 본문만 압축
+CONTENT_COMPRESSION_MIN_BYTES = int(os.getenv("CONTENT_COMPRESSION_MIN_BYTES", 1024))
+# zstd | zlib | none (zstd를 지정했는데 패키지가 없으면 zlib)
+CONTENT_COMPRESSION = os.getenv("CONTENT_COMPRESSION", "zstd")
+CONTENT_COMPRESSION_LEVEL = int(os.getenv("CONTENT_COMPRESSION_LEVEL", 3))
+
+ENCODING_PLAIN = 0
+ENCODING_ZLIB = 1
+ENCODING_ZSTD = 2
+
+if CONTENT_COMPRESSION == "zstd" and zstandard is None:
+    CONTENT_COMPRESSION = "zlib"
+
+_zstd_compressor = zstandard.ZstdCompressor(level=CONTENT_COMPRESSION_LEVEL) if zstandard else None
+_zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def compress_content(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    if CONTENT_COMPRESSION == "none" or len(raw) < CONTENT_COMPRESSION_MIN_BYTES:
+        return bytes((ENCODING_PLAIN,)) + raw
+
+    if CONTENT_COMPRESSION == "zstd":
+        encoding, compressed = ENCODING_ZSTD, _zstd_compressor.compress(raw)
+    else:
+        encoding, compressed = ENCODING_ZLIB, zlib.compress(raw, CONTENT_COMPRESSION_LEVEL)
+
+    # 압축해도 줄지 않으면 그대로 저장
+    if len(compressed) >= len(raw):
+        return bytes((ENCODING_PLAIN,)) + raw
+    return bytes((encoding,)) + compressed
+
+
+def decompress_content(value: Union[bytes, str]) -> str:
+    if isinstance(value, str):
+        return value
+
+    value = bytes(value)
+    if not value:
+        return ""
+
+    encoding = value[0]
+    if encoding == ENCODING_PLAIN:
+        return value[1:].decode("utf-8")
+    if encoding == ENCODING_ZLIB:
+        return zlib.decompress(value[1:]).decode("utf-8")
+    if encoding == ENCODING_ZSTD:
+        if _zstd_decompressor is None:
+            raise RuntimeError("zstd로 압축된 본문을 읽으려면 zstandard 패키지가 필요합니다.")
+        return _zstd_decompressor.decompress(value[1:]).decode("utf-8")
+    # 표시 바이트가 없는 이전 행
+    return value.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """
+    str을 받아 압축 여부를 정해 BLOB으로 저장하고, 읽을 때 다시 str로 돌려주는 컬럼 타입
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "mysql":
+            # TEXT(64KB)보다 긴 본문도 저장할 수 있도록 MEDIUMBLOB(16MB)
+            return dialect.type_descriptor(mysql.MEDIUMBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return compress_content(value)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return decompress_content(value)
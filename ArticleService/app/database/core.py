@@ -1,26 +1,65 @@
 import os
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from dotenv import load_dotenv
+# 모델들이 등록되는 Base와 같은 객체를 사용해야 create_all이 테이블을 생성함
+from database import Base
+from shared.tracing import instrument_sqlalchemy
+from database.slow_queries import instrument_slow_queries
 
 load_dotenv()
 
-MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD')
+# DATABASE_URL을 지정하면 해당 DB를 사용 (예: 벤치마크용 sqlite+aiosqlite:///bench.db)
+DATABASE_URL = os.environ.get('DATABASE_URL')
 
-if not MYSQL_PASSWORD:
-    raise ValueError("mysql password 환경변수를 찾을 수 없습니다.")
+# 샤드별 DB URL (쉼표 구분, 첫 번째가 0번 샤드), 지정하면 DATABASE_URL 대신 사용 (database/sharding.py)
+DB_SHARD_URLS = [url.strip() for url in os.getenv("DB_SHARD_URLS", "").split(",") if url.strip()]
 
-SQLALCHEMY_DATABASE_URL = f"mysql+aiomysql://root:123456@db:3306/rpcarticle-db-1"
+if DB_SHARD_URLS:
+    SQLALCHEMY_DATABASE_URL = DB_SHARD_URLS[0]
+elif DATABASE_URL:
+    SQLALCHEMY_DATABASE_URL = DATABASE_URL
+else:
+    MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD')
 
-async_engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
+    if not MYSQL_PASSWORD:
+        raise ValueError("mysql password 환경변수를 찾을 수 없습니다.")
+
+    SQLALCHEMY_DATABASE_URL = f"mysql+aiomysql://root:123456@db:3306/rpcarticle-db-1"
+
+# 커넥션 풀 크기 (워커 프로세스마다, 샤드마다 따로 생성됨)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 3600))
+
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+
+
+def create_db_engine(url: str) -> AsyncEngine:
+    if url.startswith("sqlite"):
+        # SQLite는 파일 잠금 단위로 동작하므로 풀 크기 설정을 사용하지 않음
+        engine = create_async_engine(url)
+    else:
+        engine = create_async_engine(
+            url,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+
+    # TRACING_ENABLED=1이면 SQL 문마다 span 기록
+    instrument_sqlalchemy(engine)
+    # SLOW_QUERY_THRESHOLD_MS 이상 걸린 문 기록 (/api/admin/slow_queries)
+    instrument_slow_queries(engine)
+    return engine
+
+
+# 샤딩을 쓰면 0번 샤드 (샤드 맵과 id 시퀀스가 있는 DB)
+async_engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 
 AsyncSessionLocal = sessionmaker(
     bind=async_engine,
     expire_on_commit=False,
-    class_=AsyncSession,
-    poolclass=30
+    class_=AsyncSession
 )  
-
-Base = declarative_base()
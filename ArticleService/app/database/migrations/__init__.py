@@ -0,0 +1,156 @@
+"""
+버전 기반 스키마 마이그레이션 모듈
+
+database/migrations/versions/vNNNN_<설명>.py 파일 하나가 마이그레이션 하나이며,
+각 파일은 VERSION(정수)과 upgrade(conn) 함수(동기 Connection을 받음)를 정의합니다.
+적용된 버전은 article_schema_migrations 테이블에 기록되고, 아직 적용되지 않은 버전만 순서대로 실행합니다.
+
+여러 워커가 동시에 시작해도 한 번만 실행되도록 MySQL에서는 GET_LOCK으로 직렬화합니다.
+(MySQL의 DDL은 암묵적으로 커밋되므로 각 upgrade는 다시 실행해도 안전하게 작성해야 합니다.)
+"""
+import importlib
+import logging
+import os
+import pkgutil
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, String, Table, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from database.core import async_engine
+
+logger = logging.getLogger("migrations")
+
+MIGRATION_TABLE = "article_schema_migrations"
+# 다른 워커가 마이그레이션 중일 때 기다리는 최대 시간 (초)
+MIGRATION_LOCK_TIMEOUT = int(os.getenv("MIGRATION_LOCK_TIMEOUT", 60))
+
+_metadata = MetaData()
+_migration_table = Table(
+    MIGRATION_TABLE,
+    _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+    Column("duration_ms", Float, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def load_migrations() -> List[Migration]:
+    """
+    versions 패키지의 마이그레이션을 버전 순으로 반환합니다.
+
+    Raises:
+        RuntimeError: 버전이 중복되거나 1부터 연속되지 않을 때
+    """
+    from database.migrations import versions
+
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(Migration(module.VERSION, module_info.name, module.upgrade))
+
+    migrations.sort(key=lambda migration: migration.version)
+    expected = list(range(1, len(migrations) + 1))
+    if [migration.version for migration in migrations] != expected:
+        raise RuntimeError(f"마이그레이션 버전이 올바르지 않습니다: {[(m.version, m.name) for m in migrations]}")
+    return migrations
+
+
+def _applied_versions(conn: Connection) -> Dict[int, dict]:
+    _metadata.create_all(conn, checkfirst=True)
+    rows = conn.execute(select(_migration_table)).mappings()
+    return {row["version"]: dict(row) for row in rows}
+
+
+class _MigrationLock:
+    """
+    MySQL GET_LOCK으로 워커 간 마이그레이션을 직렬화합니다. (SQLite는 단일 프로세스 개발용이므로 생략)
+    락은 커넥션에 묶이므로 마이그레이션이 끝날 때까지 별도 커넥션을 잡고 있습니다.
+    """
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.conn = None
+
+    async def __aenter__(self):
+        if self.engine.dialect.name != "mysql":
+            return self
+
+        self.conn = await self.engine.connect()
+        acquired = (await self.conn.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": MIGRATION_TABLE, "timeout": MIGRATION_LOCK_TIMEOUT},
+        )).scalar()
+        if acquired != 1:
+            await self.conn.close()
+            raise TimeoutError(f"마이그레이션 락을 {MIGRATION_LOCK_TIMEOUT}초 안에 얻지 못했습니다.")
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.conn is not None:
+            try:
+                await self.conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_TABLE})
+            finally:
+                await self.conn.close()
+
+
+async def run_migrations(engine: AsyncEngine = async_engine, target: Optional[int] = None) -> List[str]:
+    """
+    적용되지 않은 마이그레이션을 target 버전(없으면 최신)까지 순서대로 실행합니다.
+
+    Returns:
+        이번에 적용한 마이그레이션 이름 목록
+    """
+    migrations = load_migrations()
+    applied_now = []
+
+    async with _MigrationLock(engine):
+        async with engine.begin() as conn:
+            applied = await conn.run_sync(_applied_versions)
+
+        for migration in migrations:
+            if migration.version in applied or (target is not None and migration.version > target):
+                continue
+
+            started_at = time.perf_counter()
+            logger.info(f"마이그레이션 적용 중: {migration.name}")
+            async with engine.begin() as conn:
+                await conn.run_sync(migration.upgrade)
+                duration_ms = round((time.perf_counter() - started_at) * 1000, 2)
+                await conn.execute(_migration_table.insert().values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.now(timezone.utc),
+                    duration_ms=duration_ms,
+                ))
+            logger.info(f"마이그레이션 적용 완료: {migration.name} ({duration_ms}ms)")
+            applied_now.append(migration.name)
+
+    if not applied_now:
+        logger.info("적용할 마이그레이션이 없습니다.")
+    return applied_now
+
+
+async def get_migration_status(engine: AsyncEngine = async_engine) -> List[dict]:
+    """
+    마이그레이션별 적용 여부와 적용 시각을 반환합니다.
+    """
+    async with engine.begin() as conn:
+        applied = await conn.run_sync(_applied_versions)
+
+    return [
+        {
+            "version": migration.version,
+            "name": migration.name,
+            "applied": migration.version in applied,
+            "applied_at": applied.get(migration.version, {}).get("applied_at"),
+        }
+        for migration in load_migrations()
+    ]
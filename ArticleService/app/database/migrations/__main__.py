@@ -0,0 +1,41 @@
+"""
+마이그레이션 CLI
+
+사용법:
+    python -m database.migrations            # 최신 버전까지 적용
+    python -m database.migrations --target 2 # 2번까지만 적용
+    python -m database.migrations --status   # 적용 여부 확인
+
+DB_SHARD_URLS를 지정하면 모든 샤드에 차례로 적용합니다.
+"""
+import argparse
+import asyncio
+import logging
+from database.core import async_engine
+from database.migrations import get_migration_status, run_migrations
+from database.sharding import SHARD_COUNT, shard_engines, stop_sharding
+
+
+async def main(args):
+    try:
+        for shard, engine in enumerate(shard_engines):
+            if SHARD_COUNT > 1:
+                print(f"== 샤드 {shard}")
+            if args.status:
+                for migration in await get_migration_status(engine):
+                    mark = "O" if migration["applied"] else " "
+                    print(f"[{mark}] {migration['name']}  {migration['applied_at'] or ''}")
+            else:
+                applied = await run_migrations(engine, target=args.target)
+                print(f"{len(applied)}개 적용: {', '.join(applied) or '-'}")
+    finally:
+        await stop_sharding()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ArticleService 스키마 마이그레이션")
+    parser.add_argument("--status", action="store_true", help="적용 여부만 출력")
+    parser.add_argument("--target", type=int, help="이 버전까지만 적용")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,6 @@
+"""
+스키마 버전 파일 (vNNNN_<설명>.py)
+
+이미 배포된 버전 파일은 수정하지 말고, 변경 사항은 항상 다음 번호의 새 파일로 추가합니다.
+모델(database/posts.py 등)을 import하지 말고 필요한 테이블/컬럼 정의를 파일 안에 고정해 둡니다.
+"""
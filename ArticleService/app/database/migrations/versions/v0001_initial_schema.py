@@ -0,0 +1,41 @@
+"""
+posts, comments 테이블 생성
+
+이전에 create_all로 만들어진 테이블이 있으면 건드리지 않고, 타입 수정은 v0002에서 처리합니다.
+"""
+from sqlalchemy import BLOB, BigInteger, Boolean, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+from database import BigIntegerPK
+
+VERSION = 1
+
+metadata = MetaData()
+
+Table(
+    "posts",
+    metadata,
+    Column("id", BigIntegerPK, primary_key=True, autoincrement=True),
+    Column("title", String(255), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("picture", BLOB, nullable=True),
+    Column("last_modified", DateTime, nullable=True),
+    Column("is_modified", Boolean, nullable=False),
+    Column("views", Integer, nullable=False),
+    Column("hearts", Integer, nullable=False),
+    Column("user_id", BigInteger, nullable=False),
+)
+
+Table(
+    "comments",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("content", Text, nullable=False),
+    Column("last_modified", DateTime, nullable=True),
+    Column("is_modified", Boolean, nullable=False),
+    Column("post_id", BigInteger, ForeignKey("posts.id"), nullable=False),
+    Column("user_id", BigInteger, nullable=False),
+)
+
+
+def upgrade(conn: Connection):
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,104 @@
+"""
+기존 테이블의 컬럼 타입 수정 (MySQL)
+
+- comments.post_id: 문자열 -> BIGINT (posts.id와 타입이 달라 JOIN 시 인덱스를 쓰지 못함)
+- posts.title: 길이 없는 문자열 -> VARCHAR(255)
+- posts.content, comments.content: TEXT
+
+SQLite는 ALTER COLUMN을 지원하지 않으므로 comments.post_id만 테이블을 다시 만들어 수정합니다.
+(문자열 affinity인 post_id는 정수 posts.id와 JOIN할 때 인덱스를 쓰지 못함, 나머지는 저장 방식이 같아 생략)
+"""
+import logging
+from sqlalchemy import BigInteger, String, Text, inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 2
+
+TITLE_MAX_LENGTH = 255
+
+logger = logging.getLogger("migrations")
+
+
+def _columns(conn: Connection, table: str) -> dict:
+    return {column["name"]: column for column in inspect(conn).get_columns(table)}
+
+
+def _fix_post_id(conn: Connection):
+    column = _columns(conn, "comments")["post_id"]
+    if isinstance(column["type"], BigInteger):
+        return
+
+    # 외래 키가 걸린 컬럼은 타입을 바꿀 수 없으므로 잠시 제거 후 다시 생성
+    for foreign_key in inspect(conn).get_foreign_keys("comments"):
+        if foreign_key["constrained_columns"] == ["post_id"]:
+            conn.execute(text(f"ALTER TABLE comments DROP FOREIGN KEY `{foreign_key['name']}`"))
+
+    invalid = conn.execute(text(
+        "SELECT COUNT(*) FROM comments WHERE post_id NOT REGEXP '^[0-9]+$'"
+    )).scalar()
+    if invalid:
+        raise RuntimeError(f"comments.post_id에 숫자가 아닌 값이 {invalid}건 있어 BIGINT로 바꿀 수 없습니다.")
+
+    conn.execute(text("ALTER TABLE comments MODIFY post_id BIGINT NOT NULL"))
+    conn.execute(text(
+        "ALTER TABLE comments ADD CONSTRAINT fk_comments_post_id FOREIGN KEY (post_id) REFERENCES posts (id)"
+    ))
+    logger.info("comments.post_id -> BIGINT")
+
+
+def _fix_title(conn: Connection):
+    column = _columns(conn, "posts")["title"]
+    if isinstance(column["type"], String) and column["type"].length == TITLE_MAX_LENGTH:
+        return
+
+    too_long = conn.execute(text(
+        f"SELECT COUNT(*) FROM posts WHERE CHAR_LENGTH(title) > {TITLE_MAX_LENGTH}"
+    )).scalar()
+    if too_long:
+        raise RuntimeError(f"제목이 {TITLE_MAX_LENGTH}자를 넘는 게시글이 {too_long}건 있습니다. 먼저 정리해야 합니다.")
+
+    conn.execute(text(f"ALTER TABLE posts MODIFY title VARCHAR({TITLE_MAX_LENGTH}) NOT NULL"))
+    logger.info(f"posts.title -> VARCHAR({TITLE_MAX_LENGTH})")
+
+
+def _fix_content(conn: Connection, table: str):
+    column = _columns(conn, table)["content"]
+    if isinstance(column["type"], Text):
+        return
+
+    conn.execute(text(f"ALTER TABLE {table} MODIFY content TEXT NOT NULL"))
+    logger.info(f"{table}.content -> TEXT")
+
+
+def _rebuild_sqlite_comments(conn: Connection):
+    column = _columns(conn, "comments")["post_id"]
+    if isinstance(column["type"], BigInteger):
+        return
+
+    conn.execute(text(
+        "CREATE TABLE comments_new ("
+        "id INTEGER NOT NULL PRIMARY KEY, "
+        "content TEXT NOT NULL, "
+        "last_modified DATETIME, "
+        "is_modified BOOLEAN NOT NULL, "
+        "post_id BIGINT NOT NULL REFERENCES posts (id), "
+        "user_id BIGINT NOT NULL)"
+    ))
+    conn.execute(text(
+        "INSERT INTO comments_new (id, content, last_modified, is_modified, post_id, user_id) "
+        "SELECT id, content, last_modified, is_modified, CAST(post_id AS INTEGER), user_id FROM comments"
+    ))
+    conn.execute(text("DROP TABLE comments"))
+    conn.execute(text("ALTER TABLE comments_new RENAME TO comments"))
+    logger.info("comments.post_id -> BIGINT (테이블 재생성)")
+
+
+def upgrade(conn: Connection):
+    if conn.dialect.name == "sqlite":
+        _rebuild_sqlite_comments(conn)
+        return
+
+    _fix_post_id(conn)
+    _fix_title(conn)
+    _fix_content(conn, "posts")
+    _fix_content(conn, "comments")
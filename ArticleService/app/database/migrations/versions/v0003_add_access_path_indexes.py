@@ -0,0 +1,38 @@
+"""
+조회 경로별 인덱스 추가
+
+- ix_posts_feed (id, user_id, last_modified, title): 피드 목록 커버링 인덱스
+- ix_posts_user_id_id (user_id, id): 작성자별 목록
+- ix_comments_post_id_id (post_id, id): 게시글 상세의 댓글 JOIN
+- ix_comments_user_id_id (user_id, id): 본인 댓글 삭제/조회
+
+이미 같은 이름의 인덱스가 있으면 건너뜁니다. (InnoDB는 온라인으로 인덱스를 생성)
+"""
+import logging
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 3
+
+INDEXES = {
+    "posts": {
+        "ix_posts_feed": ("id", "user_id", "last_modified", "title"),
+        "ix_posts_user_id_id": ("user_id", "id"),
+    },
+    "comments": {
+        "ix_comments_post_id_id": ("post_id", "id"),
+        "ix_comments_user_id_id": ("user_id", "id"),
+    },
+}
+
+logger = logging.getLogger("migrations")
+
+
+def upgrade(conn: Connection):
+    for table, indexes in INDEXES.items():
+        existing = {index["name"] for index in inspect(conn).get_indexes(table)}
+        for name, columns in indexes.items():
+            if name in existing:
+                continue
+            conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+            logger.info(f"인덱스 생성: {table}.{name}")
@@ -0,0 +1,22 @@
+"""
+posts.unique_viewers 컬럼 추가
+
+순 방문자 수(Redis HyperLogLog 추정값)를 배치 업데이트가 저장합니다.
+기존 게시글은 0으로 시작합니다. 이미 컬럼이 있으면 건너뜁니다.
+"""
+import logging
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 4
+
+logger = logging.getLogger("migrations")
+
+
+def upgrade(conn: Connection):
+    columns = {column["name"] for column in inspect(conn).get_columns("posts")}
+    if "unique_viewers" in columns:
+        return
+
+    conn.execute(text("ALTER TABLE posts ADD COLUMN unique_viewers INTEGER NOT NULL DEFAULT 0"))
+    logger.info("posts.unique_viewers 추가")
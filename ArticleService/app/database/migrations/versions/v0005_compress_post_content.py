@@ -0,0 +1,30 @@
+"""
+posts.content를 압축 저장용 BLOB으로 변경 (MySQL: TEXT -> MEDIUMBLOB)
+
+기존 행은 그대로 두며, 인코딩 표시 바이트가 없는 값은 압축하지 않은 본문으로 읽습니다.
+새로 쓰거나 수정한 본문부터 CONTENT_COMPRESSION_MIN_BYTES 이상이면 압축됩니다.
+(테이블을 다시 쓰는 ALTER이므로 큰 테이블은 점검 시간에 실행)
+
+SQLite는 컬럼 타입과 관계없이 BLOB 값을 그대로 저장하므로 변경하지 않습니다.
+"""
+import logging
+from sqlalchemy import BLOB, inspect, text
+from sqlalchemy.dialects.mysql import LONGBLOB, MEDIUMBLOB
+from sqlalchemy.engine import Connection
+
+VERSION = 5
+
+logger = logging.getLogger("migrations")
+
+
+def upgrade(conn: Connection):
+    if conn.dialect.name != "mysql":
+        return
+
+    column = {column["name"]: column for column in inspect(conn).get_columns("posts")}["content"]
+    if isinstance(column["type"], (BLOB, MEDIUMBLOB, LONGBLOB)):
+        return
+
+    # TEXT -> BLOB 변환은 저장된 UTF-8 바이트를 그대로 유지
+    conn.execute(text("ALTER TABLE posts MODIFY content MEDIUMBLOB NOT NULL"))
+    logger.info("posts.content -> MEDIUMBLOB")
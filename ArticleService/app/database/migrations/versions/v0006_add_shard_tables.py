@@ -0,0 +1,37 @@
+"""
+샤딩용 테이블 추가 (database/sharding.py)
+
+- shard_ranges: id 구간별 담당 샤드 (id 인코딩보다 우선, 레거시 id와 재샤딩으로 옮긴 구간)
+- shard_sequences: (테이블, 샤드)별 다음 id 시퀀스 값 (블록 단위로 예약)
+
+모든 샤드에 만들지만 0번 샤드의 것만 사용합니다. 이미 있으면 건너뜁니다.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+VERSION = 6
+
+metadata = MetaData()
+
+Table(
+    "shard_ranges",
+    metadata,
+    Column("start_id", BigInteger, primary_key=True, autoincrement=False),
+    Column("end_id", BigInteger, nullable=False),
+    Column("shard", Integer, nullable=False),
+    Column("prev_shard", Integer, nullable=True),
+    Column("state", String(16), nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "shard_sequences",
+    metadata,
+    Column("name", String(64), primary_key=True),
+    Column("shard", Integer, primary_key=True, autoincrement=False),
+    Column("next_value", BigInteger, nullable=False),
+)
+
+
+def upgrade(conn: Connection):
+    metadata.create_all(conn, checkfirst=True)
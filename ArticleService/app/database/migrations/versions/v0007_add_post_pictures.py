@@ -0,0 +1,54 @@
+"""
+게시글 사진 변형 저장 (libs/pictures.py)
+
+- post_pictures: 게시글별 크기별 변형 (thumb/medium/large ...)
+- posts.picture_version: 현재 사진 버전 (없으면 NULL)
+- ix_posts_feed에 picture_version 추가: 피드가 썸네일 URL을 만들 때도 커버링 인덱스만 읽도록
+
+이미 적용된 부분은 건너뜁니다. (인덱스 재생성은 InnoDB에서 온라인으로 실행)
+"""
+import logging
+from sqlalchemy import BigInteger, Column, DateTime, Integer, LargeBinary, MetaData, String, Table, inspect, text
+from sqlalchemy.dialects.mysql import MEDIUMBLOB
+from sqlalchemy.engine import Connection
+
+VERSION = 7
+
+FEED_INDEX_COLUMNS = ("id", "user_id", "last_modified", "title", "picture_version")
+
+logger = logging.getLogger("migrations")
+
+metadata = MetaData()
+
+Table(
+    "post_pictures",
+    metadata,
+    Column("post_id", BigInteger, primary_key=True, autoincrement=False),
+    Column("variant", String(16), primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("content_type", String(32), nullable=False),
+    Column("width", Integer, nullable=False),
+    Column("height", Integer, nullable=False),
+    Column("data", LargeBinary().with_variant(MEDIUMBLOB, "mysql"), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+
+
+def upgrade(conn: Connection):
+    metadata.create_all(conn, checkfirst=True)
+
+    columns = {column["name"] for column in inspect(conn).get_columns("posts")}
+    if "picture_version" not in columns:
+        conn.execute(text("ALTER TABLE posts ADD COLUMN picture_version INTEGER NULL"))
+        logger.info("posts.picture_version 추가")
+
+    indexes = {index["name"]: tuple(index["column_names"]) for index in inspect(conn).get_indexes("posts")}
+    if indexes.get("ix_posts_feed") == FEED_INDEX_COLUMNS:
+        return
+    if "ix_posts_feed" in indexes:
+        if conn.dialect.name == "mysql":
+            conn.execute(text("DROP INDEX ix_posts_feed ON posts"))
+        else:
+            conn.execute(text("DROP INDEX ix_posts_feed"))
+    conn.execute(text(f"CREATE INDEX ix_posts_feed ON posts ({', '.join(FEED_INDEX_COLUMNS)})"))
+    logger.info("인덱스 재생성: posts.ix_posts_feed (+ picture_version)")
@@ -0,0 +1,41 @@
+"""
+shard_sequences를 테이블별 시퀀스 하나로 합침 (database/sharding.py)
+
+(테이블, 샤드)별 시퀀스는 샤드마다 따로 증가하므로, 번갈아 만든 게시글의 id가 생성 순서와 어긋나
+id > cursor_id로 넘기는 피드에서 일부 게시글이 빠졌습니다. 이제 시퀀스는 테이블별로 하나(shard = 0)이며,
+합칠 때는 샤드별 값 중 가장 큰 값에서 이어갑니다. (이미 합쳐져 있으면 그대로)
+"""
+import logging
+from sqlalchemy import BigInteger, Column, Integer, MetaData, String, Table, delete, func, insert, select
+from sqlalchemy.engine import Connection
+
+VERSION = 8
+
+logger = logging.getLogger("migrations")
+
+metadata = MetaData()
+
+shard_sequences = Table(
+    "shard_sequences",
+    metadata,
+    Column("name", String(64), primary_key=True),
+    Column("shard", Integer, primary_key=True, autoincrement=False),
+    Column("next_value", BigInteger, nullable=False),
+)
+
+
+def upgrade(conn: Connection):
+    rows = conn.execute(
+        select(shard_sequences.c.name, func.count(), func.max(shard_sequences.c.next_value))
+        .group_by(shard_sequences.c.name)
+    ).all()
+    merged = [(name, next_value) for name, count, next_value in rows if count > 1]
+    if not merged:
+        return
+
+    conn.execute(delete(shard_sequences).where(shard_sequences.c.name.in_([name for name, _ in merged])))
+    conn.execute(insert(shard_sequences), [
+        {"name": name, "shard": 0, "next_value": next_value} for name, next_value in merged
+    ])
+    for name, next_value in merged:
+        logger.info(f"시퀀스 합침: {name} -> 다음 값 {next_value}")
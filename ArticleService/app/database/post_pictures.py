@@ -0,0 +1,26 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, LargeBinary, String
+from sqlalchemy.dialects.mysql import MEDIUMBLOB
+
+from database import Base
+
+# 변형 한 장의 최대 크기는 MEDIUMBLOB(16MB) 안이어야 함
+PictureData = LargeBinary().with_variant(MEDIUMBLOB, "mysql")
+
+
+class PostPictures(Base):
+    """
+    게시글 사진의 크기별 변형 (libs/pictures.py가 업로드된 원본에서 만들어 저장)
+
+    게시글과 같은 샤드에 저장하며, 게시글을 지울 때 함께 지웁니다. (posts.picture_version과 같은 version만 유효)
+    """
+    __tablename__ = "post_pictures"
+    # 스키마 변경은 database/migrations/versions에 새 버전으로 추가해야 DB에 반영됨
+    post_id = Column(BigInteger, primary_key=True, autoincrement=False)
+    # thumb / medium / large ... (PICTURE_VARIANTS)
+    variant = Column(String(16), primary_key=True)
+    version = Column(Integer, nullable=False)
+    content_type = Column(String(32), nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    data = Column(PictureData, nullable=False)
+    created_at = Column(DateTime, nullable=False)
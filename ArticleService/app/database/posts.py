@@ -1,20 +1,36 @@
-from sqlalchemy import BLOB, Column, Integer, String, DateTime, Boolean, BigInteger
+from sqlalchemy import BLOB, Column, Index, Integer, String, Text, DateTime, Boolean, BigInteger
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from sqlalchemy.ext.declarative import declarative_base
 
-from database import Base
+from database import Base, BigIntegerPK
+from database.compression import CompressedText
+
+# 제목 최대 길이 (API 검증에도 같은 값 사용)
+POST_TITLE_MAX_LENGTH = 255
 
 class Posts(Base):
     __tablename__ = "posts"
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
-    title = Column(String, nullable=False)  
-    content = Column(String, nullable=False)  
+    # 스키마 변경은 database/migrations/versions에 새 버전으로 추가해야 DB에 반영됨
+    __table_args__ = (
+        # 피드(id 커서 페이지네이션)가 본문/사진을 읽지 않도록 목록 컬럼만 담은 커버링 인덱스
+        Index("ix_posts_feed", "id", "user_id", "last_modified", "title", "picture_version"),
+        # 작성자별 목록 (user_id 필터 + id 정렬)
+        Index("ix_posts_user_id_id", "user_id", "id"),
+    )
+    id = Column(BigIntegerPK, primary_key=True, autoincrement=True)
+    title = Column(String(POST_TITLE_MAX_LENGTH), nullable=False)
+    # 긴 본문은 zstd/zlib로 압축하여 저장 (읽고 쓸 때는 str)
+    content = Column(CompressedText, nullable=False)
     picture = Column(BLOB, nullable=True)  
+    # 업로드한 사진의 버전 (크기별 변형은 post_pictures, 사진이 없으면 NULL, 사진 URL의 ?v=에 사용)
+    picture_version = Column(Integer, nullable=True)
     last_modified = Column(DateTime, nullable=True, onupdate=datetime.now(timezone.utc), default=datetime.now(timezone.utc))
     is_modified = Column(Boolean, nullable=False, default=False)
     views = Column(Integer, nullable=False, default=0)
     hearts = Column(Integer, nullable=False, default=0)
+    # 순 방문자 수 (Redis HyperLogLog 추정값을 배치 업데이트가 반영)
+    unique_viewers = Column(Integer, nullable=False, default=0, server_default="0")
 
     comments = relationship('Comments', back_populates='post')
     user_id = Column(BigInteger, nullable=False)
@@ -0,0 +1,189 @@
+"""
+주요 쿼리 실행 계획(EXPLAIN) 검사
+
+핫 경로 쿼리를 실제 코드와 같은 방식으로 만들어 EXPLAIN을 실행하고,
+기대한 인덱스를 사용하는지, 전체 스캔/filesort가 없는지 확인합니다.
+MySQL은 테이블이 작으면 인덱스 대신 전체 스캔을 고를 수 있으므로
+시드 데이터(benchmarks/seed.py)가 들어간 DB에서 실행해야 의미가 있습니다.
+
+사용법:
+    python -m database.query_checks   # 실패한 검사가 있으면 종료 코드 1
+"""
+import asyncio
+import sys
+from typing import Callable, Dict, List, NamedTuple, Sequence
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import joinedload
+from database.core import async_engine
+from database.comments import Comments
+from database.posts import Posts
+from database.post_pictures import PostPictures
+
+# EXPLAIN의 인덱스 이름 중 기본 키 (SQLite는 rowid 검색)
+PRIMARY = "PRIMARY"
+
+
+class QueryCheck(NamedTuple):
+    name: str
+    build: Callable[[], object]
+    # {테이블: 허용하는 인덱스 이름들}
+    expected: Dict[str, Sequence[str]]
+    # MySQL에서 테이블 데이터를 읽지 않고 인덱스만으로 처리해야 하는 테이블 ("Using index")
+    covering: Sequence[str] = ()
+
+
+QUERY_CHECKS: List[QueryCheck] = [
+    QueryCheck(
+        "posts.feed",  # GET /api/get_posts/{cursor_id}
+        lambda: select(Posts.id, Posts.title, Posts.user_id, Posts.last_modified, Posts.picture_version)
+        .where(Posts.id > 1000).order_by(Posts.id).limit(10),
+        {"posts": ("ix_posts_feed", PRIMARY)},
+        covering=("posts",),
+    ),
+    QueryCheck(
+        "posts.detail_with_comments",  # GET /api/posts/{post_id}
+        lambda: select(Posts).options(joinedload(Posts.comments)).where(Posts.id == 1),
+        {"posts": (PRIMARY,), "comments": ("ix_comments_post_id_id",)},
+    ),
+    QueryCheck(
+        "posts.by_user",  # gRPC ListPosts(user_id)
+        lambda: select(Posts).where(Posts.id > 0, Posts.user_id == 1).order_by(Posts.id).limit(100),
+        {"posts": ("ix_posts_user_id_id",)},
+    ),
+    QueryCheck(
+        "posts.stats_batch",  # gRPC GetStats / BatchGetPosts
+        lambda: select(Posts.id, Posts.views, Posts.hearts).where(Posts.id.in_([1, 2, 3])),
+        {"posts": (PRIMARY,)},
+    ),
+    QueryCheck(
+        "post_pictures.variant",  # GET /api/posts/{post_id}/picture/{variant}
+        lambda: select(PostPictures.version, PostPictures.content_type, PostPictures.data)
+        .where(PostPictures.post_id == 1, PostPictures.variant == "thumb"),
+        {"post_pictures": (PRIMARY,)},
+    ),
+    QueryCheck(
+        "comments.by_post",
+        lambda: select(Comments.id, Comments.content).where(Comments.post_id == 1).order_by(Comments.id),
+        {"comments": ("ix_comments_post_id_id",)},
+    ),
+    QueryCheck(
+        "comments.by_user",
+        lambda: select(Comments.id).where(Comments.user_id == 1).order_by(Comments.id).limit(100),
+        {"comments": ("ix_comments_user_id_id",)},
+        covering=("comments",),
+    ),
+    QueryCheck(
+        "comments.delete_own",  # POST /api/comment/delete/{comment_id}
+        lambda: delete(Comments).where(Comments.id == 1, Comments.user_id == 1),
+        {"comments": (PRIMARY, "ix_comments_user_id_id")},
+    ),
+]
+
+
+def _table_matches(explained: str, table: str) -> bool:
+    # joinedload 등으로 붙은 별칭(comments_1)도 같은 테이블로 취급
+    return explained == table or explained.startswith(f"{table}_")
+
+
+def _analyze_mysql(rows: List[dict], check: QueryCheck) -> List[str]:
+    problems = []
+    for row in rows:
+        extra = row.get("Extra") or ""
+        if "Using filesort" in extra:
+            problems.append(f"{row['table']}: filesort")
+        if "Using temporary" in extra:
+            problems.append(f"{row['table']}: 임시 테이블 사용")
+
+    for table, indexes in check.expected.items():
+        matched = [row for row in rows if _table_matches(row["table"] or "", table)]
+        if not matched:
+            problems.append(f"{table}: 실행 계획에 없음")
+            continue
+        for row in matched:
+            if row["type"] == "ALL":
+                problems.append(f"{table}: 전체 스캔")
+            elif row["key"] not in indexes:
+                problems.append(f"{table}: {row['key']} 사용 (기대: {', '.join(indexes)})")
+            if table in check.covering and "Using index" not in (row.get("Extra") or ""):
+                problems.append(f"{table}: 커버링 인덱스가 아님 ({row['key']})")
+    return problems
+
+
+def _sqlite_index(detail: str) -> str:
+    if "INTEGER PRIMARY KEY" in detail:
+        return PRIMARY
+    if " INDEX " in detail:
+        index = detail.split(" INDEX ", 1)[1].split(" ", 1)[0]
+        # 복합 기본 키(post_pictures 등)는 SQLite가 만든 sqlite_autoindex_<테이블>_N 인덱스로 표시됨
+        return PRIMARY if index.startswith("sqlite_autoindex_") else index
+    return ""
+
+
+def _analyze_sqlite(rows: List[dict], check: QueryCheck) -> List[str]:
+    details = [row["detail"] for row in rows]
+    problems = [detail for detail in details if "TEMP B-TREE" in detail]
+
+    for table, indexes in check.expected.items():
+        matched = [
+            detail for detail in details
+            if detail.startswith(("SCAN ", "SEARCH ")) and _table_matches(detail.split(" ")[1], table)
+        ]
+        if not matched:
+            problems.append(f"{table}: 실행 계획에 없음")
+            continue
+        for detail in matched:
+            index = _sqlite_index(detail)
+            if not index and detail.startswith("SCAN "):
+                problems.append(f"{table}: 전체 스캔")
+            elif index not in indexes:
+                problems.append(f"{table}: {index or '인덱스 없음'} 사용 (기대: {', '.join(indexes)})")
+    return problems
+
+
+async def explain(check: QueryCheck, engine: AsyncEngine = async_engine) -> dict:
+    """
+    검사 하나를 실행하여 실행 계획과 발견된 문제를 반환합니다.
+    """
+    dialect = engine.dialect
+    sql = str(check.build().compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if dialect.name == "sqlite" else "EXPLAIN "
+
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(prefix + sql)
+        rows = [dict(row) for row in result.mappings()]
+
+    if dialect.name == "sqlite":
+        problems = _analyze_sqlite(rows, check)
+    else:
+        problems = _analyze_mysql(rows, check)
+
+    return {"name": check.name, "ok": not problems, "problems": problems, "sql": sql, "plan": rows}
+
+
+async def run_query_checks(engine: AsyncEngine = async_engine) -> List[dict]:
+    return [await explain(check, engine) for check in QUERY_CHECKS]
+
+
+async def main() -> int:
+    try:
+        results = await run_query_checks()
+    finally:
+        await async_engine.dispose()
+
+    for result in results:
+        print(f"[{'OK' if result['ok'] else 'FAIL'}] {result['name']}")
+        for problem in result["problems"]:
+            print(f"    - {problem}")
+        if not result["ok"]:
+            print(f"    SQL: {' '.join(result['sql'].split())}")
+            for row in result["plan"]:
+                print(f"    {row}")
+
+    failed = sum(not result["ok"] for result in results)
+    print(f"{len(results) - failed}/{len(results)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
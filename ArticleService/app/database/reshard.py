@@ -0,0 +1,387 @@
+"""
+온라인 재샤딩 CLI
+
+게시글 id 구간 [start, end)의 게시글과 댓글을 다른 샤드로 옮깁니다.
+옮기는 동안 읽기는 계속되고, 쓰기는 마지막 맞추기 단계(moving)에서만 잠깐 막힙니다. (503 + Retry-After)
+
+1. copying: 구간을 맵에 기록합니다. 담당은 그대로이고 새 id 할당에서만 제외됩니다.
+   모든 워커가 맵을 다시 읽을 때까지(SHARD_MAP_REFRESH_INTERVAL의 2배) 기다립니다.
+2. 1차 복사: 이전 담당 샤드에서 대상 샤드로 청크 단위로 복사합니다. (쓰기는 계속 이전 샤드로)
+3. moving: 쓰기를 막고 모든 워커가 알 때까지 기다린 뒤, 1차 복사 이후 바뀐/추가된/삭제된 행만 다시 맞춥니다.
+4. active: 담당 샤드를 대상 샤드로 바꾸고, 모든 워커가 알 때까지 기다린 뒤 이전 샤드의 행을 지웁니다.
+
+조회수/좋아요 수는 Redis 값을 배치 업데이트가 담당 샤드에 반영하며, moving 동안의 반영은 다음 배치로 미뤄집니다.
+할당 중인 id와 겹치지 않도록 end는 아직 할당하지 않은 가장 작은 게시글 id 이하여야 합니다.
+
+사용법:
+    python -m database.reshard status
+    python -m database.reshard move --start 1 --end 50000 --to 1
+    python -m database.reshard move --start 1 --end 50000 --to 1 --dry-run   # 옮길 행 수만 출력
+    python -m database.reshard abort   # 중단된 이동을 되돌림 (대상 샤드에 복사된 행은 담당이 아니므로 무시됨)
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from database.core import async_engine
+from database.posts import Posts
+from database.comments import Comments
+from database.post_pictures import PostPictures
+from database.sharding import (
+    RANGE_ACTIVE, RANGE_COPYING, RANGE_MOVING, SHARD_COUNT, SHARD_ID_SLOTS, SHARD_MAP_REFRESH_INTERVAL,
+    ShardRange, get_engine, read_ranges, shard_map, shard_ranges, shard_sequences, stop_sharding,
+)
+
+logger = logging.getLogger("reshard")
+
+# 한 번에 비교/복사하는 게시글 수
+RESHARD_CHUNK_SIZE = int(os.getenv("RESHARD_CHUNK_SIZE", 500))
+# 사진 변형을 한 번에 읽어 복사하는 게시글 수 (BLOB이 크므로 청크보다 작게)
+RESHARD_PICTURE_BATCH = int(os.getenv("RESHARD_PICTURE_BATCH", 20))
+
+posts = Posts.__table__
+comments = Comments.__table__
+post_pictures = PostPictures.__table__
+
+# 바뀌었는지 비교하는 게시글 컬럼 (본문/사진은 수정 시 last_modified가 바뀌므로 제외, 사진 변형은 picture_version으로 비교)
+_POST_SIGNATURE = [posts.c.id, posts.c.title, posts.c.user_id, posts.c.last_modified, posts.c.is_modified,
+                   posts.c.views, posts.c.hearts, posts.c.unique_viewers, posts.c.picture_version]
+
+
+class ReshardError(Exception):
+    pass
+
+
+def _wait_seconds() -> float:
+    return SHARD_MAP_REFRESH_INTERVAL * 2 + 1
+
+
+async def _wait_for_workers(reason: str):
+    seconds = _wait_seconds()
+    logger.info(f"모든 워커가 맵을 다시 읽을 때까지 {seconds:.0f}초 대기 ({reason})")
+    await asyncio.sleep(seconds)
+
+
+async def _reload_map():
+    async with async_engine.connect() as conn:
+        shard_map.set_ranges(await read_ranges(conn))
+
+
+async def allocation_floor() -> Optional[int]:
+    """
+    아직 할당하지 않은 가장 작은 게시글 id, 할당한 적이 없으면 None
+    """
+    async with async_engine.connect() as conn:
+        next_value = (await conn.execute(
+            select(func.max(shard_sequences.c.next_value)).where(shard_sequences.c.name == "posts")
+        )).scalar()
+    return next_value * SHARD_ID_SLOTS if next_value is not None else None
+
+
+# ---------------------------------------------------------------------------
+# 구간 맵 변경 (0번 샤드)
+# ---------------------------------------------------------------------------
+
+async def begin_move(start: int, end: int, target: int) -> List[ShardRange]:
+    """
+    [start, end)를 copying 상태로 맵에 기록합니다. 겹치는 active 구간은 잘라서 남은 부분을 유지하고,
+    겹친 부분은 이전 담당 샤드(prev_shard)를 기억한 조각으로 나눕니다.
+
+    Returns:
+        기록한 조각 목록
+    """
+    now = datetime.now(timezone.utc)
+    async with async_engine.begin() as conn:
+        existing = await read_ranges(conn)
+        overlapping = [r for r in existing if r.start_id < end and start < r.end_id]
+        busy = [r for r in overlapping if r.state != RANGE_ACTIVE]
+        if busy:
+            raise ReshardError(f"이미 옮기는 중인 구간과 겹칩니다: {busy}")
+
+        remnants: List[ShardRange] = []
+        pieces: List[ShardRange] = []
+        cursor = start
+        for r in sorted(overlapping, key=lambda r: r.start_id):
+            if r.start_id < start:
+                remnants.append(r._replace(end_id=start))
+            if r.end_id > end:
+                remnants.append(r._replace(start_id=end))
+            piece_start, piece_end = max(start, r.start_id), min(end, r.end_id)
+            if cursor < piece_start:
+                # 맵에 없던 부분 (id 인코딩으로 담당)
+                pieces.append(ShardRange(cursor, piece_start, target, None, RANGE_COPYING))
+            pieces.append(ShardRange(piece_start, piece_end, target, r.shard, RANGE_COPYING))
+            cursor = piece_end
+        if cursor < end:
+            pieces.append(ShardRange(cursor, end, target, None, RANGE_COPYING))
+
+        if overlapping:
+            await conn.execute(delete(shard_ranges).where(shard_ranges.c.start_id.in_([r.start_id for r in overlapping])))
+        await conn.execute(insert(shard_ranges), [{**r._asdict(), "updated_at": now} for r in remnants + pieces])
+    return pieces
+
+
+async def set_state(pieces: List[ShardRange], state: str):
+    values = {"state": state, "updated_at": datetime.now(timezone.utc)}
+    if state == RANGE_ACTIVE:
+        values["prev_shard"] = None
+    async with async_engine.begin() as conn:
+        await conn.execute(
+            update(shard_ranges).where(shard_ranges.c.start_id.in_([r.start_id for r in pieces])).values(**values)
+        )
+
+
+async def abort_moves() -> int:
+    """
+    active가 아닌 조각을 이전 담당으로 되돌립니다. (이전 담당이 id 인코딩이면 조각을 지움)
+    """
+    now = datetime.now(timezone.utc)
+    async with async_engine.begin() as conn:
+        pieces = [r for r in await read_ranges(conn) if r.state != RANGE_ACTIVE]
+        for r in pieces:
+            row = shard_ranges.c.start_id == r.start_id
+            if r.prev_shard is None:
+                await conn.execute(delete(shard_ranges).where(row))
+            else:
+                await conn.execute(update(shard_ranges).where(row).values(
+                    shard=r.prev_shard, prev_shard=None, state=RANGE_ACTIVE, updated_at=now,
+                ))
+    return len(pieces)
+
+
+# ---------------------------------------------------------------------------
+# 복사 / 맞추기
+# ---------------------------------------------------------------------------
+
+def _naive(value):
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo is not None else value
+
+
+async def _post_signatures(conn, source: int, lo: int, hi: int) -> Dict[int, tuple]:
+    """
+    (lo, hi] 구간에서 이전 담당이 source인 게시글의 비교용 값
+    """
+    rows = await conn.execute(
+        select(*_POST_SIGNATURE).where(posts.c.id > lo, posts.c.id <= hi).order_by(posts.c.id)
+    )
+    return {row[0]: tuple(row) for row in rows if shard_map.owner(row[0]) == source}
+
+
+async def _comment_rows(conn, source: int, lo: int, hi: int) -> Dict[int, dict]:
+    rows = await conn.execute(select(comments).where(comments.c.post_id > lo, comments.c.post_id <= hi))
+    return {row["id"]: dict(row) for row in rows.mappings() if shard_map.owner(row["post_id"]) == source}
+
+
+async def _sync_chunk(source: int, target: int, lo: int, hi: int, since: Optional[datetime]) -> Dict[str, int]:
+    """
+    (lo, hi] 구간의 게시글/댓글을 source와 같게 target에 맞춥니다.
+    since가 있으면 그 이후 수정된 게시글은 비교값이 같아도 다시 복사합니다. (같은 초 안의 수정 대비)
+    """
+    async with get_engine(source).connect() as conn:
+        src_posts = await _post_signatures(conn, source, lo, hi)
+        src_comments = await _comment_rows(conn, source, lo, hi)
+    async with get_engine(target).connect() as conn:
+        dst_posts = await _post_signatures(conn, source, lo, hi)
+        dst_comments = await _comment_rows(conn, source, lo, hi)
+
+    copy_ids = [
+        post_id for post_id, signature in src_posts.items()
+        if dst_posts.get(post_id) != signature
+        or (since is not None and signature[3] is not None and _naive(signature[3]) >= since)
+    ]
+    extra_posts = [post_id for post_id in dst_posts if post_id not in src_posts]
+    new_comments = [row for comment_id, row in src_comments.items() if comment_id not in dst_comments]
+    changed_comments = [row for comment_id, row in src_comments.items()
+                        if comment_id in dst_comments and dst_comments[comment_id] != row]
+    extra_comments = [comment_id for comment_id in dst_comments if comment_id not in src_comments]
+
+    full_rows = []
+    if copy_ids:
+        async with get_engine(source).connect() as conn:
+            full_rows = [dict(row) for row in (await conn.execute(select(posts).where(posts.c.id.in_(copy_ids)))).mappings()]
+
+    async with get_engine(target).begin() as conn:
+        if extra_comments:
+            await conn.execute(delete(comments).where(comments.c.id.in_(extra_comments)))
+        if extra_posts:
+            await conn.execute(delete(comments).where(comments.c.post_id.in_(extra_posts)))
+            await conn.execute(delete(post_pictures).where(post_pictures.c.post_id.in_(extra_posts)))
+            await conn.execute(delete(posts).where(posts.c.id.in_(extra_posts)))
+
+        inserts = [row for row in full_rows if row["id"] not in dst_posts]
+        updates = [row for row in full_rows if row["id"] in dst_posts]
+        if inserts:
+            await conn.execute(insert(posts), inserts)
+        if updates:
+            await conn.execute(
+                update(posts).where(posts.c.id == bindparam("_id")).values(
+                    **{column.name: bindparam(f"_{column.name}") for column in posts.c if column.name != "id"}
+                ),
+                [{f"_{key}": value for key, value in row.items()} for row in updates],
+            )
+
+        # 복사한 게시글의 사진 변형은 통째로 교체
+        for i in range(0, len(copy_ids), RESHARD_PICTURE_BATCH):
+            batch = copy_ids[i:i + RESHARD_PICTURE_BATCH]
+            async with get_engine(source).connect() as src:
+                pictures = [dict(row) for row in (await src.execute(
+                    select(post_pictures).where(post_pictures.c.post_id.in_(batch))
+                )).mappings()]
+            await conn.execute(delete(post_pictures).where(post_pictures.c.post_id.in_(batch)))
+            if pictures:
+                await conn.execute(insert(post_pictures), pictures)
+
+        if new_comments:
+            await conn.execute(insert(comments), new_comments)
+        if changed_comments:
+            await conn.execute(
+                update(comments).where(comments.c.id == bindparam("_id")).values(
+                    **{column.name: bindparam(f"_{column.name}") for column in comments.c if column.name != "id"}
+                ),
+                [{f"_{key}": value for key, value in row.items()} for row in changed_comments],
+            )
+
+    return {
+        "posts_copied": len(full_rows),
+        "posts_deleted": len(extra_posts),
+        "comments_copied": len(new_comments) + len(changed_comments),
+        "comments_deleted": len(extra_comments),
+    }
+
+
+async def sync_range(start: int, end: int, target: int, since: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    [start, end)에서 target이 아닌 샤드가 담당하는 게시글/댓글을 target에 맞춥니다.
+    """
+    totals = {"posts_copied": 0, "posts_deleted": 0, "comments_copied": 0, "comments_deleted": 0}
+    for source in range(SHARD_COUNT):
+        if source == target:
+            continue
+        lo = start - 1
+        while lo < end - 1:
+            # source의 다음 청크 경계 (마지막 청크는 end까지 포함해 target에만 남은 행도 지움)
+            async with get_engine(source).connect() as conn:
+                ids = (await conn.execute(
+                    select(posts.c.id).where(posts.c.id > lo, posts.c.id < end).order_by(posts.c.id).limit(RESHARD_CHUNK_SIZE)
+                )).scalars().all()
+            hi = ids[-1] if len(ids) >= RESHARD_CHUNK_SIZE else end - 1
+
+            counts = await _sync_chunk(source, target, lo, hi, since)
+            for key, value in counts.items():
+                totals[key] += value
+            logger.info(f"샤드 {source} -> {target}: ({lo}, {hi}] {counts}")
+            lo = hi
+    return totals
+
+
+async def cleanup_sources(start: int, end: int, target: int) -> int:
+    """
+    target으로 옮긴 [start, end)의 게시글/댓글/사진을 다른 샤드에서 지웁니다.
+    """
+    deleted = 0
+    for source in range(SHARD_COUNT):
+        if source == target:
+            continue
+        while True:
+            async with get_engine(source).begin() as conn:
+                ids = (await conn.execute(
+                    select(posts.c.id).where(posts.c.id >= start, posts.c.id < end).limit(RESHARD_CHUNK_SIZE)
+                )).scalars().all()
+                if not ids:
+                    break
+                await conn.execute(delete(comments).where(comments.c.post_id.in_(ids)))
+                await conn.execute(delete(post_pictures).where(post_pictures.c.post_id.in_(ids)))
+                await conn.execute(delete(posts).where(posts.c.id.in_(ids)))
+            deleted += len(ids)
+    return deleted
+
+
+async def count_rows(start: int, end: int, target: int) -> Dict[int, int]:
+    await _reload_map()
+    counts = {}
+    for source in range(SHARD_COUNT):
+        if source == target:
+            continue
+        async with get_engine(source).connect() as conn:
+            ids = (await conn.execute(select(posts.c.id).where(posts.c.id >= start, posts.c.id < end))).scalars()
+            counts[source] = sum(1 for post_id in ids if shard_map.owner(post_id) == source)
+    return counts
+
+
+async def move(start: int, end: int, target: int):
+    if not 0 <= target < SHARD_COUNT:
+        raise ReshardError(f"없는 샤드입니다: {target} (샤드 {SHARD_COUNT}개)")
+    if start >= end:
+        raise ReshardError("start < end 여야 합니다.")
+    floor = await allocation_floor()
+    if floor is not None and end > floor:
+        raise ReshardError(f"end는 아직 할당하지 않은 id({floor}) 이하여야 합니다.")
+
+    started_at = time.monotonic()
+    pieces = await begin_move(start, end, target)
+    await _reload_map()
+    logger.info(f"[1/4] copying: {len(pieces)}개 조각 기록")
+    await _wait_for_workers("copying")
+
+    copy_started = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+    copied = await sync_range(start, end, target)
+    logger.info(f"[2/4] 1차 복사 완료: {copied}")
+
+    await set_state(pieces, RANGE_MOVING)
+    await _reload_map()
+    await _wait_for_workers("moving, 쓰기 중단")
+    frozen_at = time.monotonic()
+    delta = await sync_range(start, end, target, since=copy_started)
+    logger.info(f"[3/4] 변경분 맞추기 완료: {delta}")
+
+    await set_state(pieces, RANGE_ACTIVE)
+    await _reload_map()
+    logger.info(f"담당 샤드 변경 완료 (쓰기 중단 {time.monotonic() - frozen_at + _wait_seconds():.1f}초)")
+    await _wait_for_workers("active")
+    deleted = await cleanup_sources(start, end, target)
+    logger.info(f"[4/4] 이전 샤드 정리: 게시글 {deleted}개 삭제 (총 {time.monotonic() - started_at:.1f}초)")
+
+
+async def print_status():
+    await _reload_map()
+    print(f"샤드 {SHARD_COUNT}개, id 슬롯 {SHARD_ID_SLOTS}, 할당 하한 {await allocation_floor()}")
+    for r in shard_map.ranges:
+        prev = f" (이전: {r.prev_shard if r.prev_shard is not None else 'id 인코딩'})" if r.state != RANGE_ACTIVE else ""
+        print(f"[{r.start_id}, {r.end_id}) -> {r.shard} {r.state}{prev}")
+    async with async_engine.connect() as conn:
+        for row in await conn.execute(select(shard_sequences).order_by(shard_sequences.c.name, shard_sequences.c.shard)):
+            print(f"시퀀스 {row.name}[{row.shard}] 다음 값 {row.next_value}")
+
+
+async def main(args):
+    try:
+        if args.command == "status":
+            await print_status()
+        elif args.command == "abort":
+            print(f"{await abort_moves()}개 조각을 되돌렸습니다.")
+        elif args.dry_run:
+            for source, count in (await count_rows(args.start, args.end, args.to)).items():
+                print(f"샤드 {source} -> {args.to}: 게시글 {count}개")
+        else:
+            await move(args.start, args.end, args.to)
+    finally:
+        await stop_sharding()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게시글 id 구간을 다른 샤드로 옮김")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("status", help="구간 맵과 id 시퀀스 출력")
+    subparsers.add_parser("abort", help="진행 중(copying/moving)인 이동을 되돌림")
+    move_parser = subparsers.add_parser("move", help="[start, end) 구간을 --to 샤드로 옮김")
+    move_parser.add_argument("--start", type=int, required=True)
+    move_parser.add_argument("--end", type=int, required=True)
+    move_parser.add_argument("--to", type=int, required=True)
+    move_parser.add_argument("--dry-run", action="store_true", help="옮길 게시글 수만 출력")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,487 @@
+"""
+게시글/댓글 수평 샤딩
+
+DB_SHARD_URLS에 URL을 여러 개 지정하면 게시글과 그 댓글을 게시글 id 기준으로 여러 DB에 나눠 저장합니다.
+지정하지 않으면 샤드는 기존 DB 하나(0번)뿐이고 id도 기존처럼 자동 증가 값을 사용합니다.
+
+- id 인코딩: 새 게시글/댓글 id는 "시퀀스 * SHARD_ID_SLOTS + 샤드 번호"이므로 id만 보고 샤드를 알 수 있습니다.
+  시퀀스는 0번 샤드의 shard_sequences에 테이블별로 하나이며 모든 샤드가 함께 쓰므로, id는 생성 순서대로 커집니다.
+  워커 안에서 동시에 들어온 할당 요청은 시퀀스 UPDATE 한 번으로 함께 예약합니다. (미리 블록을 받아 두지 않으므로
+  다른 워커의 id보다 먼저 할당된 id가 나중 값이 되는 일은 예약 한 번의 왕복 시간 안으로 제한됨)
+  댓글은 항상 게시글과 같은 샤드에 저장하고, 댓글 id도 그 샤드로 인코딩합니다.
+- 구간 맵: 0번 샤드의 shard_ranges에 기록된 id 구간은 인코딩보다 우선합니다.
+  샤딩 이전의 게시글(레거시 구간, 0번 샤드)과 재샤딩으로 옮긴 구간이 여기에 있으며,
+  워커는 SHARD_MAP_REFRESH_INTERVAL마다 맵을 다시 읽습니다.
+- 구간 상태: active(shard가 담당) / copying(이전 담당 샤드가 계속 담당, 새 id 할당에서 제외) /
+  moving(이전 담당 샤드에서 읽기만 가능, 쓰기는 ShardRangeMoving -> 503). 재샤딩 절차는 database/reshard.py 참고
+- 새 게시글은 SHARD_NEW_POST_SHARDS(기본: 전체) 중 라운드 로빈으로 샤드를 정합니다.
+"""
+import asyncio
+import bisect
+import itertools
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
+from sqlalchemy import BigInteger, Column, DateTime, Integer, MetaData, String, Table, case, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database.core import DB_SHARD_URLS, AsyncSessionLocal, async_engine, create_db_engine
+from database.posts import Posts
+from database.comments import Comments
+
+logger = logging.getLogger("sharding")
+
+SHARDING_ENABLED = bool(DB_SHARD_URLS)
+# id에 인코딩할 수 있는 샤드 수 (나중에 샤드를 늘릴 여유, 운영 중 변경 불가)
+SHARD_ID_SLOTS = int(os.getenv("SHARD_ID_SLOTS", 16))
+# 구간 맵 다시 읽는 간격 (초), 재샤딩은 이 값의 2배씩 기다리며 단계를 넘김
+SHARD_MAP_REFRESH_INTERVAL = float(os.getenv("SHARD_MAP_REFRESH_INTERVAL", 5))
+# 옮기는 중인 구간에 쓰기를 요청하면 이 시간(초) 뒤에 다시 시도하도록 응답
+SHARD_MOVE_RETRY_AFTER = int(os.getenv("SHARD_MOVE_RETRY_AFTER", 5))
+
+RANGE_ACTIVE = "active"
+RANGE_COPYING = "copying"
+RANGE_MOVING = "moving"
+
+shard_engines: List[AsyncEngine] = [async_engine] + [create_db_engine(url) for url in DB_SHARD_URLS[1:]]
+SHARD_COUNT = len(shard_engines)
+
+if SHARD_COUNT > SHARD_ID_SLOTS:
+    raise ValueError(f"샤드 수({SHARD_COUNT})가 SHARD_ID_SLOTS({SHARD_ID_SLOTS})보다 많습니다.")
+
+# 새 게시글을 받을 샤드 (예: "1,2"이면 0번 샤드에는 더 이상 새 게시글을 넣지 않음)
+SHARD_NEW_POST_SHARDS = [
+    int(shard) for shard in os.getenv("SHARD_NEW_POST_SHARDS", "").split(",") if shard.strip()
+] or list(range(SHARD_COUNT))
+
+_session_makers = [AsyncSessionLocal] + [
+    sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession) for engine in shard_engines[1:]
+]
+
+_metadata = MetaData()
+shard_ranges = Table(
+    "shard_ranges",
+    _metadata,
+    Column("start_id", BigInteger, primary_key=True, autoincrement=False),
+    Column("end_id", BigInteger, nullable=False),
+    Column("shard", Integer, nullable=False),
+    Column("prev_shard", Integer, nullable=True),
+    Column("state", String(16), nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+# 테이블별 다음 시퀀스 값 (shard는 예전 샤드별 시퀀스에서 남은 키 컬럼, 지금은 항상 0)
+shard_sequences = Table(
+    "shard_sequences",
+    _metadata,
+    Column("name", String(64), primary_key=True),
+    Column("shard", Integer, primary_key=True, autoincrement=False),
+    Column("next_value", BigInteger, nullable=False),
+)
+
+# 시퀀스 이름 -> 처음 만들 때 기존 최대 id를 확인할 테이블
+_SEQUENCE_TABLES = {"posts": Posts.__table__, "comments": Comments.__table__}
+
+T = TypeVar("T")
+
+
+class ShardRangeMoving(Exception):
+    """
+    다른 샤드로 옮기는 중(moving)인 구간의 게시글에 쓰기를 요청함
+    """
+    def __init__(self, post_id: int):
+        super().__init__(f"게시글 {post_id}을(를) 다른 샤드로 옮기는 중입니다.")
+        self.post_id = post_id
+
+
+class ShardRange(NamedTuple):
+    start_id: int
+    end_id: int
+    shard: int
+    prev_shard: Optional[int]
+    state: str
+
+
+def home_shard(row_id: int) -> int:
+    """
+    id에 인코딩된 샤드 (없는 샤드를 가리키는 id는 0번)
+    """
+    if not SHARDING_ENABLED:
+        return 0
+    shard = row_id % SHARD_ID_SLOTS
+    return shard if shard < SHARD_COUNT else 0
+
+
+class ShardMap:
+    def __init__(self):
+        self.ranges: List[ShardRange] = []
+        self._starts: List[int] = []
+        self.loaded_at: Optional[float] = None
+
+    def set_ranges(self, ranges: Iterable[ShardRange]):
+        ranges = sorted(ranges, key=lambda r: r.start_id)
+        self.ranges = ranges
+        self._starts = [r.start_id for r in ranges]
+        self.loaded_at = time.time()
+
+    def find(self, row_id: int) -> Optional[ShardRange]:
+        index = bisect.bisect_right(self._starts, row_id) - 1
+        if index >= 0 and row_id < self.ranges[index].end_id:
+            return self.ranges[index]
+        return None
+
+    def owner(self, row_id: int) -> int:
+        found = self.find(row_id)
+        if found is None:
+            return home_shard(row_id)
+        if found.state == RANGE_ACTIVE:
+            return found.shard
+        # 옮기는 중에는 이전 담당 샤드가 계속 담당
+        return found.prev_shard if found.prev_shard is not None else home_shard(row_id)
+
+    def id_floor(self) -> int:
+        """
+        구간 맵이 덮는 가장 큰 id + 1 (새로 할당하는 id는 이 값 이상)
+        """
+        return max((r.end_id for r in self.ranges), default=0)
+
+
+shard_map = ShardMap()
+
+_refresh_task: Optional[asyncio.Task] = None
+_stats = {
+    "map_refreshes": 0, "map_refresh_errors": 0, "reservations": 0, "reserved_ids": 0, "discarded_ids": 0,
+    "moving_rejections": 0,
+}
+
+
+def get_engine(shard: int = 0) -> AsyncEngine:
+    return shard_engines[shard]
+
+
+def shard_session(shard: int = 0) -> AsyncSession:
+    return _session_makers[shard]()
+
+
+def shard_for_post(post_id: int) -> int:
+    """
+    게시글(과 그 댓글)을 담당하는 샤드
+    """
+    return shard_map.owner(post_id) if SHARDING_ENABLED else 0
+
+
+def writable_shard_for_post(post_id: int) -> int:
+    """
+    게시글에 쓰기 전에 담당 샤드를 구합니다.
+
+    Raises:
+        ShardRangeMoving: 게시글이 다른 샤드로 옮기는 중인 구간에 있음
+    """
+    if not SHARDING_ENABLED:
+        return 0
+    found = shard_map.find(post_id)
+    if found is not None and found.state == RANGE_MOVING:
+        _stats["moving_rejections"] += 1
+        raise ShardRangeMoving(post_id)
+    return shard_map.owner(post_id)
+
+
+def engine_for_post(post_id: int) -> AsyncEngine:
+    return shard_engines[shard_for_post(post_id)]
+
+
+def group_by_shard(post_ids: Iterable[int]) -> Dict[int, List[int]]:
+    groups: Dict[int, List[int]] = {}
+    for post_id in post_ids:
+        groups.setdefault(shard_for_post(post_id), []).append(post_id)
+    return groups
+
+
+def split_writable(post_ids: Iterable[int]) -> Tuple[Dict[int, List[int]], List[int]]:
+    """
+    게시글을 담당 샤드별로 나누고, 옮기는 중이라 지금 쓸 수 없는 게시글은 따로 반환합니다.
+    """
+    groups: Dict[int, List[int]] = {}
+    frozen: List[int] = []
+    for post_id in post_ids:
+        try:
+            shard = writable_shard_for_post(post_id)
+        except ShardRangeMoving:
+            frozen.append(post_id)
+            continue
+        groups.setdefault(shard, []).append(post_id)
+    return groups, frozen
+
+
+async def fan_out(fn: Callable[[int], Awaitable[T]]) -> List[T]:
+    """
+    모든 샤드에 fn(shard)를 동시에 실행합니다.
+    """
+    return list(await asyncio.gather(*(fn(shard) for shard in range(SHARD_COUNT))))
+
+
+async def merged_page(
+    fetch: Callable[[int, int, int], Awaitable[List[T]]],
+    cursor_id: int,
+    limit: int,
+    id_of: Callable[[T], int] = lambda row: row["id"],
+) -> List[T]:
+    """
+    모든 샤드에서 cursor_id 다음 행을 읽어 id 순으로 합친 한 페이지를 반환합니다.
+
+    fetch(shard, cursor_id, limit)는 id 오름차순으로 최대 limit개를 반환해야 합니다.
+    담당하지 않는 행(재샤딩 후 정리 전의 이전 샤드 행)은 버리고,
+    limit개를 꽉 채운 샤드는 뒤에 행이 더 있을 수 있으므로 그 샤드들의 마지막 id 중 가장 작은 값까지만 확정합니다.
+    """
+    if SHARD_COUNT == 1:
+        return await fetch(0, cursor_id, limit)
+
+    rows: List[T] = []
+    while len(rows) < limit:
+        pages = await fan_out(lambda shard: fetch(shard, cursor_id, limit))
+        boundary = min((id_of(page[-1]) for page in pages if len(page) >= limit), default=None)
+        merged = sorted(
+            (
+                row for shard, page in enumerate(pages) for row in page
+                if shard_map.owner(id_of(row)) == shard and (boundary is None or id_of(row) <= boundary)
+            ),
+            key=id_of,
+        )
+        rows.extend(merged[:limit - len(rows)])
+        if boundary is None:
+            break
+        cursor_id = boundary
+    return rows
+
+
+_round_robin = itertools.cycle(SHARD_NEW_POST_SHARDS)
+
+
+def choose_shard_for_new_post() -> int:
+    return next(_round_robin) if SHARDING_ENABLED else 0
+
+
+# ---------------------------------------------------------------------------
+# id 할당
+# ---------------------------------------------------------------------------
+
+async def _initial_sequence(conn, name: str) -> int:
+    """
+    시퀀스 행을 처음 만들 때의 시작 값: 샤딩 이전 최대 id 다음
+    """
+    table = _SEQUENCE_TABLES[name]
+    legacy_max = (await conn.execute(select(func.max(table.c.id)))).scalar()
+    return (legacy_max or 0) // SHARD_ID_SLOTS + 1
+
+
+async def _reserve_sequences(name: str, count: int) -> int:
+    """
+    테이블의 시퀀스에서 연속된 count개를 예약하고 첫 값을 반환합니다.
+    """
+    # 구간 맵이 덮는 id는 할당하지 않음
+    floor = -(-shard_map.id_floor() // SHARD_ID_SLOTS)
+    row = shard_sequences.c.name == name
+
+    for _ in range(3):
+        try:
+            async with async_engine.begin() as conn:
+                # UPDATE로 먼저 행 잠금을 잡은 뒤 읽음 (워커 간 같은 값 예약 방지)
+                result = await conn.execute(
+                    update(shard_sequences).where(row).values(
+                        next_value=case(
+                            (shard_sequences.c.next_value < floor, floor),
+                            else_=shard_sequences.c.next_value,
+                        ) + count
+                    )
+                )
+                if result.rowcount:
+                    end = (await conn.execute(select(shard_sequences.c.next_value).where(row))).scalar()
+                else:
+                    start = max(await _initial_sequence(conn, name), floor)
+                    end = start + count
+                    await conn.execute(insert(shard_sequences).values(name=name, shard=0, next_value=end))
+        except IntegrityError:
+            # 다른 워커가 먼저 행을 만듦
+            continue
+        _stats["reservations"] += 1
+        _stats["reserved_ids"] += count
+        return end - count
+
+    raise RuntimeError(f"{name} 시퀀스를 예약하지 못했습니다.")
+
+
+class _SequenceReserver:
+    """
+    시퀀스 하나의 예약 요청을 모아 _reserve_sequences 한 번으로 처리합니다.
+
+    예약하는 동안 들어온 요청은 다음 예약에 함께 모이므로, 작성이 몰려도 시퀀스 행을 잠그는 트랜잭션은
+    워커마다 한 번에 하나뿐입니다. 요청 순서대로 연속된 값을 나눠 줍니다.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        # [(개수, 첫 값을 받을 future)]
+        self._waiting: List[Tuple[int, asyncio.Future]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def reserve(self, count: int) -> int:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiting.append((count, future))
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return await future
+
+    async def _run(self):
+        while self._waiting:
+            batch, self._waiting = self._waiting, []
+            try:
+                start = await _reserve_sequences(self.name, sum(count for count, _ in batch))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            # 응답 전에 취소된 요청 몫은 빈 번호로 남음
+            for count, future in batch:
+                if not future.done():
+                    future.set_result(start)
+                start += count
+
+
+_reservers = {name: _SequenceReserver(name) for name in _SEQUENCE_TABLES}
+
+
+async def allocate_ids(name: str, shard: int, count: int = 1) -> Optional[List[int]]:
+    """
+    shard로 인코딩된 새 id를 count개 할당합니다. 샤딩을 쓰지 않으면 None (DB 자동 증가 사용)
+    시퀀스는 모든 샤드가 함께 쓰므로 id는 샤드와 관계없이 할당한 순서대로 커집니다. (id > cursor_id로 넘기는 피드)
+
+    Args:
+        name: 시퀀스 이름 (posts, comments)
+    """
+    if not SHARDING_ENABLED:
+        return None
+
+    ids: List[int] = []
+    while len(ids) < count:
+        needed = count - len(ids)
+        start = await _reservers[name].reserve(needed)
+        discarded = False
+        for sequence in range(start, start + needed):
+            row_id = sequence * SHARD_ID_SLOTS + shard
+            if name == "posts" and shard_map.find(row_id) is not None:
+                # 맵을 다시 읽기 전에 예약한 값이 재샤딩 구간에 들어감, 버리고 새로 예약
+                _stats["discarded_ids"] += 1
+                discarded = True
+                continue
+            ids.append(row_id)
+        if discarded:
+            await load_shard_map()
+    return ids
+
+
+async def allocate_id(name: str, shard: int) -> Optional[int]:
+    ids = await allocate_ids(name, shard)
+    return ids[0] if ids else None
+
+
+async def reserve_id_range(name: str, count: int) -> Tuple[int, int]:
+    """
+    어느 샤드에도 할당되지 않을 연속된 id 구간 [start, end)를 예약합니다. (end - start == count)
+    시퀀스 값 하나가 id SHARD_ID_SLOTS개를 덮으므로, 구간 맵에 담당 샤드를 기록하고 쓰는 대량 시드용입니다.
+    """
+    start = await _reserve_sequences(name, -(-count // SHARD_ID_SLOTS)) * SHARD_ID_SLOTS
+    return start, start + count
+
+
+# ---------------------------------------------------------------------------
+# 구간 맵
+# ---------------------------------------------------------------------------
+
+async def read_ranges(conn) -> List[ShardRange]:
+    rows = await conn.execute(select(
+        shard_ranges.c.start_id, shard_ranges.c.end_id, shard_ranges.c.shard,
+        shard_ranges.c.prev_shard, shard_ranges.c.state,
+    ))
+    return [ShardRange(*row) for row in rows]
+
+
+async def load_shard_map():
+    async with async_engine.connect() as conn:
+        shard_map.set_ranges(await read_ranges(conn))
+    _stats["map_refreshes"] += 1
+
+
+async def ensure_legacy_range():
+    """
+    샤딩을 처음 켰을 때 0번 샤드에 있던 게시글 id 전체를 0번 샤드 구간으로 기록합니다.
+    (id를 한 번도 할당하지 않았고 구간 맵이 비어 있을 때만)
+    """
+    try:
+        async with async_engine.begin() as conn:
+            if (await conn.execute(select(func.count()).select_from(shard_ranges))).scalar():
+                return
+            if (await conn.execute(select(func.count()).select_from(shard_sequences))).scalar():
+                return
+            max_id = (await conn.execute(select(func.max(Posts.__table__.c.id)))).scalar()
+            if not max_id:
+                return
+            await conn.execute(insert(shard_ranges).values(
+                start_id=1, end_id=max_id + 1, shard=0, prev_shard=None,
+                state=RANGE_ACTIVE, updated_at=datetime.now(timezone.utc),
+            ))
+        logger.info(f"레거시 게시글 구간 기록: [1, {max_id + 1}) -> 0번 샤드")
+    except IntegrityError:
+        # 다른 워커가 먼저 기록함
+        pass
+
+
+async def _refresh_loop():
+    while True:
+        await asyncio.sleep(SHARD_MAP_REFRESH_INTERVAL)
+        try:
+            await load_shard_map()
+        except Exception as e:
+            # 읽지 못하면 직전 맵을 계속 사용
+            _stats["map_refresh_errors"] += 1
+            logger.warning(f"샤드 맵 갱신 실패: {e!r}")
+
+
+async def start_sharding():
+    global _refresh_task
+
+    if not SHARDING_ENABLED:
+        return
+    await ensure_legacy_range()
+    await load_shard_map()
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.get_event_loop().create_task(_refresh_loop())
+    logger.info(f"샤딩 사용: 샤드 {SHARD_COUNT}개, 구간 {len(shard_map.ranges)}개")
+
+
+async def stop_sharding():
+    """
+    맵 갱신을 멈추고 0번을 제외한 샤드 엔진을 닫습니다. (0번은 database.core.async_engine)
+    """
+    if _refresh_task is not None and not _refresh_task.done():
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+    for engine in shard_engines[1:]:
+        await engine.dispose()
+
+
+def get_sharding_stats() -> Dict[str, object]:
+    return {
+        "enabled": SHARDING_ENABLED,
+        "shards": SHARD_COUNT,
+        "id_slots": SHARD_ID_SLOTS,
+        "new_post_shards": SHARD_NEW_POST_SHARDS,
+        "map_age_sec": round(time.time() - shard_map.loaded_at, 3) if shard_map.loaded_at else None,
+        "ranges": [r._asdict() for r in shard_map.ranges],
+        **_stats,
+    }
@@ -0,0 +1,75 @@
+"""
+느린 SQL 기록
+
+before/after_cursor_execute 이벤트로 문마다 실행 시간을 재고, SLOW_QUERY_THRESHOLD_MS 이상 걸린 문만
+최근 SLOW_QUERY_LOG_SIZE개를 워커 메모리에 보관합니다. (파라미터 값은 기록하지 않음)
+임계값은 관리자 API로 실행 중에 바꿀 수 있으며, 0 이하이면 기록하지 않습니다.
+"""
+import os
+import time
+from collections import deque
+from typing import Dict, List
+from sqlalchemy import event
+from shared.tracing import current_traceparent
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", 200))
+SLOW_QUERY_MAX_LENGTH = int(os.getenv("SLOW_QUERY_MAX_LENGTH", 2000))
+
+_settings = {"threshold_ms": SLOW_QUERY_THRESHOLD_MS}
+_slow_queries: deque = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+_slow_stats = {"queries": 0, "slow": 0}
+
+
+def instrument_slow_queries(engine):
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        _slow_stats["queries"] += 1
+
+        threshold = _settings["threshold_ms"]
+        if threshold <= 0 or elapsed_ms < threshold:
+            return
+
+        _slow_stats["slow"] += 1
+        _slow_queries.append({
+            "at": time.time(),
+            "duration_ms": round(elapsed_ms, 3),
+            "statement": statement[:SLOW_QUERY_MAX_LENGTH],
+            "executemany": len(parameters) if executemany else None,
+            "rowcount": cursor.rowcount,
+            # 트레이싱 중이면 같은 요청의 다른 구간을 찾을 수 있도록
+            "traceparent": current_traceparent(),
+        })
+
+
+def get_slow_queries(limit: int = SLOW_QUERY_LOG_SIZE) -> List[dict]:
+    """
+    최근 느린 문 (최신 순)
+    """
+    return list(reversed(_slow_queries))[:limit]
+
+
+def set_slow_query_threshold(threshold_ms: float):
+    _settings["threshold_ms"] = threshold_ms
+
+
+def clear_slow_queries():
+    _slow_queries.clear()
+
+
+def get_slow_query_stats() -> Dict[str, float]:
+    return {
+        "threshold_ms": _settings["threshold_ms"],
+        **_slow_stats,
+        "logged": len(_slow_queries),
+    }
@@ -0,0 +1,89 @@
+"""
+자주 실행하는 조회의 미리 만들어 둔 Core 문
+
+요청마다 select(Posts)... 를 새로 만들면 문 객체 생성과 캐시 키 계산을 매번 다시 하고,
+ORM 결과는 전체 컬럼을 읽어 Posts 객체로 만들고 세션 identity map에 등록합니다.
+여기 있는 문은 모듈 로드 시 한 번만 만들고 값은 bindparam으로 넘기므로
+캐시 키가 문 객체에 보관되어 컴파일 캐시를 바로 찾고, 필요한 컬럼만 가벼운 Row로 돌려받습니다.
+
+사용 예:
+    async with async_engine.connect() as conn:
+        row = (await conn.execute(POST_DETAIL, {"post_id": post_id})).first()
+"""
+from sqlalchemy import bindparam, delete, func, select, update
+from database.posts import Posts
+from database.comments import Comments
+from database.post_pictures import PostPictures
+
+posts = Posts.__table__
+comments = Comments.__table__
+post_pictures = PostPictures.__table__
+
+# 피드 한 페이지 (ix_posts_feed 커버링 인덱스)
+# params: cursor_id, limit
+FEED_PAGE = (
+    select(posts.c.id, posts.c.title, posts.c.user_id, posts.c.last_modified, posts.c.picture_version)
+    .where(posts.c.id > bindparam("cursor_id"))
+    .order_by(posts.c.id)
+    .limit(bindparam("limit"))
+)
+
+# 게시글 상세 (댓글은 COMMENTS_FOR_POST로 따로 조회하여 본문이 댓글 수만큼 반복되지 않도록 함)
+# params: post_id
+POST_DETAIL = select(
+    posts.c.id,
+    posts.c.title,
+    posts.c.content,
+    posts.c.picture,
+    posts.c.picture_version,
+    posts.c.last_modified,
+    posts.c.is_modified,
+    posts.c.views,
+    posts.c.hearts,
+    posts.c.unique_viewers,
+    posts.c.user_id,
+).where(posts.c.id == bindparam("post_id"))
+
+# params: post_id
+COMMENTS_FOR_POST = (
+    select(comments.c.id, comments.c.content)
+    .where(comments.c.post_id == bindparam("post_id"))
+    .order_by(comments.c.id)
+)
+
+# 존재 확인 + 좋아요 수 (좋아요 추가/취소)
+# params: post_id
+POST_HEARTS = select(posts.c.id, posts.c.hearts).where(posts.c.id == bindparam("post_id"))
+
+# 게시글 수정 (rowcount가 0이면 없는 게시글)
+# params: post_id + 바꿀 컬럼 (title, content, picture, last_modified, 넘긴 컬럼만 SET 절에 포함)
+UPDATE_POST = update(posts).where(posts.c.id == bindparam("post_id"))
+
+# 게시글 삭제 (댓글이 외래 키로 게시글을 참조하므로 댓글 먼저 삭제)
+# params: post_id
+DELETE_POST_COMMENTS = delete(comments).where(comments.c.post_id == bindparam("post_id"))
+DELETE_POST_PICTURES = delete(post_pictures).where(post_pictures.c.post_id == bindparam("post_id"))
+DELETE_POST = delete(posts).where(posts.c.id == bindparam("post_id"))
+
+# 새 사진으로 교체 (버전 증가, 예전 BLOB 컬럼은 비움, rowcount가 0이면 없는 게시글)
+# params: post_id, last_modified
+BUMP_PICTURE_VERSION = (
+    update(posts)
+    .where(posts.c.id == bindparam("post_id"))
+    .values(
+        picture_version=func.coalesce(posts.c.picture_version, 0) + 1,
+        picture=None,
+        last_modified=bindparam("last_modified"),
+    )
+)
+
+# params: post_id
+POST_PICTURE_VERSION = select(posts.c.picture_version).where(posts.c.id == bindparam("post_id"))
+
+# 사진 변형 하나 (기본 키)
+# params: post_id, variant
+POST_PICTURE = select(
+    post_pictures.c.version,
+    post_pictures.c.content_type,
+    post_pictures.c.data,
+).where(post_pictures.c.post_id == bindparam("post_id"), post_pictures.c.variant == bindparam("variant"))
@@ -1 +1,2 @@
-from .requireauth import RequireAuth
\ No newline at end of file
+from .requireauth import RequireAuth
+from .requireadmin import RequireAdmin
\ No newline at end of file
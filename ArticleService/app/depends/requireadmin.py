@@ -0,0 +1,19 @@
+from fastapi import Header
+from fastapi.exceptions import HTTPException
+from tools import admin_check_auth
+
+
+async def RequireAdmin(authorization: str = Header(...)):
+    try:
+        token_type = authorization.split(" ")[0]
+        token = authorization.split(" ")[1]
+
+        if token_type != "Bearer":
+            raise
+
+        userid = await admin_check_auth(token)
+        if not userid:
+            raise
+        return userid
+    except:
+        raise HTTPException(status_code=403, detail="FORBIDDEN")
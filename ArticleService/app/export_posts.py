@@ -0,0 +1,67 @@
+"""
+게시글 내보내기 CLI
+
+DB에 직접 연결하여 게시글과 Redis의 최신 조회수/좋아요 수를 NDJSON 또는 CSV로 내보냅니다.
+(HTTP로 받으려면 GET /api/admin/export/posts 사용)
+
+사용법:
+    python export_posts.py --format csv --columns id,title,views,hearts --output posts.csv
+    python export_posts.py --after-id 120000 --output posts.ndjson --append   # 중단된 곳부터 이어받기
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from database.core import async_engine
+from libs.export import EXPORT_CHUNK_SIZE, EXPORT_COLUMNS, EXPORT_FORMATS, parse_columns, export_posts
+from libs.redis import close_redis_connection
+
+
+async def run(args) -> int:
+    columns = parse_columns(args.columns)
+    output = open(args.output, "a" if args.append else "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    # 이어받기로 기존 CSV 파일에 덧붙일 때는 헤더를 다시 쓰지 않음
+    header = not args.no_header and not args.append
+
+    written = 0
+    started_at = time.perf_counter()
+    try:
+        async for text in export_posts(args.format, columns, args.after_id, args.limit, header, args.chunk_size):
+            output.write(text)
+            written += text.count("\n")
+            if args.output:
+                print(f"\r{written}줄 작성 ({written / (time.perf_counter() - started_at):.0f}줄/초)", end="", file=sys.stderr)
+    finally:
+        if args.output:
+            output.close()
+            print(file=sys.stderr)
+        await close_redis_connection()
+        await async_engine.dispose()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게시글 + 최신 통계 내보내기")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--columns", help=f"쉼표로 구분한 컬럼 목록 (가능: {','.join(EXPORT_COLUMNS)})")
+    parser.add_argument("--after-id", type=int, default=0, help="이 ID 다음부터 내보내기 (이어받기용)")
+    parser.add_argument("--limit", type=int, help="최대 게시글 수")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    parser.add_argument("--output", help="출력 파일 (없으면 표준 출력)")
+    parser.add_argument("--append", action="store_true", help="출력 파일에 덧붙이기 (이어받기용)")
+    parser.add_argument("--no-header", action="store_true", help="CSV 헤더 생략")
+    args = parser.parse_args()
+
+    try:
+        parse_columns(args.columns)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # 진행 상황 출력과 섞이지 않도록 INFO 로그는 끔
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+게시글 내보내기 모듈
+
+서버 측 커서(stream_results)로 게시글을 청크 단위로 읽고, 청크마다 Redis의 최신 조회수/좋아요 수를
+합쳐 NDJSON 또는 CSV로 직렬화합니다. 한 번에 한두 청크만 메모리에 있으므로
+테이블 크기와 관계없이 메모리 사용량이 일정합니다.
+샤드가 여러 개면 청크마다 모든 샤드를 id 순으로 합쳐 읽습니다. (database/sharding.py)
+
+청크 i의 Redis 조회는 청크 i+1을 DB에서 읽는 동안 함께 진행됩니다.
+"""
+import asyncio
+import csv
+import io
+import json
+import os
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+from sqlalchemy import select
+from database.core import async_engine
+from database.sharding import SHARD_COUNT, get_engine, merged_page
+from database.posts import Posts
+from libs.redis import get_cached_stats_for_posts
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+
+# 내보낼 수 있는 컬럼 (picture는 크기가 커서 제외)
+EXPORT_COLUMNS = ("id", "title", "content", "user_id", "last_modified", "is_modified", "views", "hearts", "unique_viewers")
+DEFAULT_EXPORT_COLUMNS = ("id", "title", "user_id", "last_modified", "views", "hearts")
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+def parse_columns(columns: Optional[str]) -> List[str]:
+    """
+    "id,title,views" 형식의 문자열을 검증하여 컬럼 목록으로 변환합니다.
+    id는 이어받기(after_id)에 필요하므로 항상 포함합니다.
+
+    Raises:
+        ValueError: 지원하지 않는 컬럼이 있을 때
+    """
+    if not columns:
+        return list(DEFAULT_EXPORT_COLUMNS)
+
+    selected = [column.strip() for column in columns.split(",") if column.strip()]
+    unknown = [column for column in selected if column not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 컬럼입니다: {', '.join(unknown)} (가능: {', '.join(EXPORT_COLUMNS)})")
+
+    if "id" not in selected:
+        selected.insert(0, "id")
+    return list(dict.fromkeys(selected))
+
+
+def _merge_stats(rows: Sequence, columns: List[str], stats: Dict[int, tuple]) -> List[dict]:
+    merge_views = "views" in columns
+    merge_hearts = "hearts" in columns
+    merged = []
+    for row in rows:
+        item = dict(zip(columns, row))
+        if merge_views or merge_hearts:
+            views, hearts = stats.get(item["id"], (None, None))
+            # Redis에 최신 값이 있으면 DB 값(배치 반영 전) 대신 사용
+            if merge_views and views is not None:
+                item["views"] = views
+            if merge_hearts and hearts is not None:
+                item["hearts"] = hearts
+        merged.append(item)
+    return merged
+
+
+async def _iter_partitions(columns: List[str], after_id: int, limit: Optional[int], chunk_size: int) -> AsyncIterator[Sequence]:
+    query = select(*[getattr(Posts, column) for column in columns])
+
+    if SHARD_COUNT == 1:
+        query = query.where(Posts.id > after_id).order_by(Posts.id)
+        if limit:
+            query = query.limit(limit)
+        async with async_engine.connect() as conn:
+            result = await conn.stream(query.execution_options(yield_per=chunk_size))
+            async for partition in result.partitions(chunk_size):
+                yield partition
+        return
+
+    # 샤드가 여러 개면 서버 측 커서 대신 청크마다 모든 샤드를 조회하여 id 순으로 합침
+    id_index = columns.index("id")
+
+    async def fetch(shard: int, cursor: int, size: int):
+        async with get_engine(shard).connect() as conn:
+            result = await conn.execute(query.where(Posts.id > cursor).order_by(Posts.id).limit(size))
+            return result.all()
+
+    sent = 0
+    while limit is None or sent < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - sent)
+        partition = await merged_page(fetch, after_id, size, id_of=lambda row: row[id_index])
+        if not partition:
+            break
+        yield partition
+        sent += len(partition)
+        after_id = partition[-1][id_index]
+        if len(partition) < size:
+            break
+
+
+async def iter_post_chunks(
+    columns: List[str],
+    after_id: int = 0,
+    limit: Optional[int] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[List[dict]]:
+    """
+    id > after_id인 게시글을 id 순으로 chunk_size개씩 반환합니다.
+    """
+    need_stats = "views" in columns or "hearts" in columns
+    # id를 직접 지정한 경우(views,id 등) 맨 앞이 아닐 수 있음
+    id_index = columns.index("id")
+    previous = None
+
+    try:
+        async for partition in _iter_partitions(columns, after_id, limit, chunk_size):
+            ids = [row[id_index] for row in partition]
+            stats_task = asyncio.ensure_future(get_cached_stats_for_posts(ids)) if need_stats else None
+
+            ready, previous = previous, (partition, stats_task)
+            if ready is not None:
+                rows, task = ready
+                yield _merge_stats(rows, columns, await task if task else {})
+
+        if previous is not None:
+            rows, task = previous
+            previous = None
+            yield _merge_stats(rows, columns, await task if task else {})
+    finally:
+        # 소비하는 쪽이 중간에 멈춘 경우(클라이언트 연결 종료 등) 남은 Redis 조회 취소
+        if previous is not None and previous[1] is not None:
+            previous[1].cancel()
+
+
+def _json_default(value):
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def format_ndjson(rows: List[dict]) -> str:
+    return "".join(json.dumps(row, ensure_ascii=False, default=_json_default) + "\n" for row in rows)
+
+
+def format_csv(rows: List[dict], columns: List[str], header: bool = False) -> str:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    if header:
+        writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_json_default(row[column]) if row[column] is not None else "" for column in columns])
+    return output.getvalue()
+
+
+async def export_posts(
+    fmt: str,
+    columns: List[str],
+    after_id: int = 0,
+    limit: Optional[int] = None,
+    header: bool = True,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[str]:
+    """
+    직렬화된 문자열을 청크 단위로 반환합니다. (HTTP 응답 / CLI 공용)
+    """
+    if fmt == "csv" and header:
+        yield format_csv([], columns, header=True)
+
+    async for rows in iter_post_chunks(columns, after_id, limit, chunk_size):
+        yield format_ndjson(rows) if fmt == "ndjson" else format_csv(rows, columns)
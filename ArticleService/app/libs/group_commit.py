@@ -0,0 +1,221 @@
+"""
+그룹 커밋 INSERT 모듈
+
+동시에 들어온 게시글/댓글 작성 요청을 최대 GROUP_COMMIT_MAX_WAIT_MS 동안 모아
+다중 행 INSERT 한 번과 커밋 한 번으로 처리합니다. (요청마다 커밋하면 트래픽이 몰릴 때 MySQL fsync가 병목)
+
+- 각 요청은 insert(row)를 await 하고, 자기 행의 생성된 id 또는 예외를 받습니다.
+- 배치는 GROUP_COMMIT_MAX_BATCH행을 넘지 않으며, 한 배치를 쓰는 동안 들어온 요청은 다음 배치로 모입니다.
+- 배치 INSERT가 실패하면(예: 댓글의 게시글이 없음) 행마다 다시 넣어 실패한 요청에만 예외를 전달합니다.
+- 응답 전에 연결이 끊긴(취소된) 요청의 행은 넣지 않습니다.
+
+생성된 id는 다중 행 INSERT의 자동 증가 값이 연속이라는 점을 이용해 계산합니다.
+(MySQL InnoDB는 행 수가 정해진 INSERT ... VALUES에 연속된 값을 할당하며 lastrowid는 첫 행의 id,
+SQLite는 마지막 행의 id) 샤딩을 쓰면 배치마다 allocate_ids로 행 수만큼 id를 한 번에 할당하여 넣고 그 값을 반환합니다.
+
+샤드마다 writer가 따로 있으며(ShardedGroupCommitWriter), 한 배치는 한 샤드에만 씁니다.
+GROUP_COMMIT_ENABLED=1일 때만 라우트에서 사용합니다.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from database.core import async_engine
+from database.sharding import allocate_ids, get_engine
+from database.posts import Posts
+from database.comments import Comments
+
+logger = logging.getLogger("group_commit")
+
+GROUP_COMMIT_ENABLED = os.getenv("GROUP_COMMIT_ENABLED", "0") == "1"
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", 100))
+# 첫 요청이 들어온 뒤 배치를 모으는 최대 시간 (밀리초)
+GROUP_COMMIT_MAX_WAIT_MS = float(os.getenv("GROUP_COMMIT_MAX_WAIT_MS", 5))
+
+
+class GroupCommitWriter:
+    def __init__(self, name: str, table: Table, max_batch: int = GROUP_COMMIT_MAX_BATCH,
+                 max_wait_ms: float = GROUP_COMMIT_MAX_WAIT_MS, engine: Optional[AsyncEngine] = None,
+                 sequence: Optional[str] = None, shard: int = 0):
+        self.name = name
+        self.table = table
+        self.engine = engine or async_engine
+        # sequence를 지정하면 샤딩을 쓸 때 shard로 인코딩된 id를 배치마다 할당 (database/sharding.py)
+        self.sequence = sequence
+        self.shard = shard
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000
+        # [(행, 결과를 받을 future, 들어온 시각)]
+        self._pending: List[Tuple[dict, asyncio.Future, float]] = []
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"rows": 0, "batches": 0, "fallback_batches": 0, "errors": 0, "cancelled": 0, "max_batch_seen": 0}
+
+    async def insert(self, row: dict) -> int:
+        """
+        행을 다음 배치에 넣고, 커밋된 뒤 생성된 id를 반환합니다.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future, time.monotonic()))
+
+        if self._full is None:
+            self._full = asyncio.Event()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+        return await future
+
+    async def _run(self):
+        while self._pending:
+            # 가장 오래 기다린 요청 기준으로 max_wait까지만 더 모음
+            remaining = self.max_wait - (time.monotonic() - self._pending[0][2])
+            if len(self._pending) < self.max_batch and remaining > 0:
+                try:
+                    await asyncio.wait_for(self._full.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            if len(self._pending) >= self.max_batch:
+                self._full.set()
+            await self._write(batch)
+
+    async def _insert_rows(self, rows: List[dict]) -> List[int]:
+        async with self.engine.begin() as conn:
+            result = await conn.execute(insert(self.table).values(rows))
+            if "id" in rows[0]:
+                return [row["id"] for row in rows]
+            if conn.dialect.name == "mysql":
+                first_id = result.lastrowid
+            else:
+                first_id = result.lastrowid - len(rows) + 1
+        return list(range(first_id, first_id + len(rows)))
+
+    async def _write(self, batch: List[Tuple[dict, asyncio.Future, float]]):
+        live = [(row, future) for row, future, _ in batch if not future.done()]
+        self.stats["cancelled"] += len(batch) - len(live)
+        if not live:
+            return
+
+        try:
+            # 샤딩을 쓰면 배치의 id를 한 번에 할당 (재시도하는 행도 같은 id 사용)
+            rows_without_id = [row for row, _ in live if "id" not in row] if self.sequence else []
+            new_ids = await allocate_ids(self.sequence, self.shard, len(rows_without_id)) if rows_without_id else None
+            if new_ids:
+                for row, row_id in zip(rows_without_id, new_ids):
+                    row["id"] = row_id
+        except Exception as e:
+            self.stats["errors"] += len(live)
+            for _, future in live:
+                _set_exception(future, e)
+            return
+
+        try:
+            ids = await self._insert_rows([row for row, _ in live])
+        except Exception as e:
+            if len(live) == 1:
+                self.stats["errors"] += 1
+                _set_exception(live[0][1], e)
+                return
+
+            # 어느 행 때문에 실패했는지 알 수 없으므로 행마다 따로 넣음
+            logger.warning(f"[{self.name}] 배치 INSERT 실패 ({len(live)}행), 행 단위로 재시도: {e!r}")
+            self.stats["fallback_batches"] += 1
+            for row, future in live:
+                try:
+                    row_id = (await self._insert_rows([row]))[0]
+                except Exception as row_error:
+                    self.stats["errors"] += 1
+                    _set_exception(future, row_error)
+                else:
+                    self.stats["rows"] += 1
+                    _set_result(future, row_id)
+            return
+
+        self.stats["rows"] += len(live)
+        self.stats["batches"] += 1
+        self.stats["max_batch_seen"] = max(self.stats["max_batch_seen"], len(live))
+        for (_, future), row_id in zip(live, ids):
+            _set_result(future, row_id)
+
+    async def close(self):
+        """
+        대기 중인 행을 모두 쓸 때까지 기다립니다. (종료 시)
+        """
+        if self._task is not None and not self._task.done():
+            self._full.set()
+            await self._task
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "pending": len(self._pending)}
+
+
+def _set_result(future: asyncio.Future, value):
+    if not future.done():
+        future.set_result(value)
+
+
+def _set_exception(future: asyncio.Future, error: Exception):
+    if not future.done():
+        future.set_exception(error)
+
+
+class ShardedGroupCommitWriter:
+    """
+    샤드별 GroupCommitWriter (처음 쓰는 샤드의 writer를 만들어 둠)
+    """
+    def __init__(self, name: str, table: Table):
+        self.name = name
+        self.table = table
+        self._writers: Dict[int, GroupCommitWriter] = {}
+
+    def _writer(self, shard: int) -> GroupCommitWriter:
+        writer = self._writers.get(shard)
+        if writer is None:
+            writer = GroupCommitWriter(f"{self.name}[{shard}]", self.table, engine=get_engine(shard),
+                                       sequence=self.name, shard=shard)
+            self._writers[shard] = writer
+        return writer
+
+    async def insert(self, row: dict, shard: int = 0) -> int:
+        return await self._writer(shard).insert(row)
+
+    async def close(self):
+        for writer in list(self._writers.values()):
+            await writer.close()
+
+    def get_stats(self) -> Dict[str, object]:
+        stats: Dict[str, object] = {"rows": 0, "batches": 0, "fallback_batches": 0, "errors": 0, "cancelled": 0, "pending": 0}
+        for writer in self._writers.values():
+            for key, value in writer.get_stats().items():
+                if key in stats:
+                    stats[key] += value
+        if len(self._writers) > 1:
+            stats["shards"] = {shard: writer.get_stats() for shard, writer in self._writers.items()}
+        return stats
+
+
+post_writer = ShardedGroupCommitWriter("posts", Posts.__table__)
+comment_writer = ShardedGroupCommitWriter("comments", Comments.__table__)
+
+
+async def close_group_commit_writers():
+    await post_writer.close()
+    await comment_writer.close()
+
+
+def get_group_commit_stats() -> Dict[str, object]:
+    return {
+        "enabled": GROUP_COMMIT_ENABLED,
+        "max_batch": GROUP_COMMIT_MAX_BATCH,
+        "max_wait_ms": GROUP_COMMIT_MAX_WAIT_MS,
+        "posts": post_writer.get_stats(),
+        "comments": comment_writer.get_stats(),
+    }
@@ -0,0 +1,93 @@
+"""
+핫 게시글 L1 캐시 모듈
+
+게시글 상세 조회 요청을 HotKeyDetector로 관찰하고, 핫 게시글로 판단된 게시글만
+워커 프로세스 메모리에 상세 정보(조회수 제외)를 짧게 캐시합니다.
+캐시는 워커마다 따로 존재하므로, 수정/삭제 시 다른 워커의 캐시는 TTL이 지나야 갱신됩니다.
+"""
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+from libs.hotkey import HotKeyDetector
+from libs.prepared_response import PreparedTailJSON
+from shared.ttl_cache import TTLCache
+
+HOTKEY_ENABLED = os.getenv("HOTKEY_ENABLED", "1") == "1"
+HOTKEY_TOP_K = int(os.getenv("HOTKEY_TOP_K", 32))
+# HOTKEY_WINDOW초마다 카운터가 절반이 되므로, 대략 "최근 2 * WINDOW초 동안의 요청 수" 기준
+HOTKEY_THRESHOLD = int(os.getenv("HOTKEY_THRESHOLD", 50))
+HOTKEY_WINDOW = float(os.getenv("HOTKEY_WINDOW", 10))
+HOTKEY_SKETCH_WIDTH = int(os.getenv("HOTKEY_SKETCH_WIDTH", 2048))
+HOTKEY_SKETCH_DEPTH = int(os.getenv("HOTKEY_SKETCH_DEPTH", 4))
+
+HOT_POST_CACHE_SIZE = int(os.getenv("HOT_POST_CACHE_SIZE", 256))
+HOT_POST_CACHE_TTL = float(os.getenv("HOT_POST_CACHE_TTL", 2))
+
+_detector = HotKeyDetector(
+    k=HOTKEY_TOP_K,
+    threshold=HOTKEY_THRESHOLD,
+    window=HOTKEY_WINDOW,
+    width=HOTKEY_SKETCH_WIDTH,
+    depth=HOTKEY_SKETCH_DEPTH,
+)
+
+
+class CachedDetail(NamedTuple):
+    # 상세 정보 dict (views는 캐시 시점의 DB 값)
+    detail: Dict[str, Any]
+    # views만 비워 둔 채 직렬화/압축해 둔 응답
+    response: PreparedTailJSON
+
+
+# {post_id: CachedDetail}
+_detail_cache = TTLCache(maxsize=HOT_POST_CACHE_SIZE, ttl=HOT_POST_CACHE_TTL)
+
+
+def observe_post(post_id: int) -> bool:
+    """
+    상세 조회 요청 한 건을 기록하고, 핫 게시글인지 반환합니다.
+    """
+    if not HOTKEY_ENABLED:
+        return False
+    return _detector.observe(post_id)
+
+
+def get_cached_detail(post_id: int) -> Optional[CachedDetail]:
+    return _detail_cache.get(post_id)
+
+
+def cache_detail(post_id: int, detail: Dict[str, Any]):
+    response = PreparedTailJSON({"ok": "True"}, detail, data_key="data", tail_field="views")
+    _detail_cache.set(post_id, CachedDetail(detail, response))
+
+
+def invalidate_post(post_id: int):
+    """
+    게시글/댓글이 바뀌었을 때 이 워커의 L1 캐시에서 제거합니다.
+    """
+    _detail_cache.delete(post_id)
+
+
+def get_hot_posts(n: Optional[int] = None) -> Dict[str, Any]:
+    """
+    운영 확인용: 이 워커가 보고 있는 상위 게시글과 L1 캐시 상태
+    """
+    top: List[Dict[str, Any]] = [
+        {
+            "post_id": post_id,
+            "estimated_requests": count,
+            "hot": count >= HOTKEY_THRESHOLD,
+            "cached": _detail_cache.peek(post_id) is not None,
+        }
+        for post_id, count in _detector.top(n)
+    ]
+    return {
+        "pid": os.getpid(),
+        "enabled": HOTKEY_ENABLED,
+        "window_sec": HOTKEY_WINDOW,
+        "threshold": HOTKEY_THRESHOLD,
+        "observed": _detector.observed,
+        "top": top,
+        "cache": {**_detail_cache.stats(), "ttl_sec": HOT_POST_CACHE_TTL},
+        "generated_at": time.time(),
+    }
@@ -0,0 +1,126 @@
+"""
+핫 키 탐지 모듈
+
+최근 요청을 Count-Min Sketch로 세고, 추정 빈도가 높은 상위 k개 키(heavy hitters)를 유지합니다.
+모든 키의 카운터를 따로 두지 않으므로 게시글이 수백만 개여도 메모리 사용량이 일정합니다.
+
+"최근" 요청만 반영하도록 window초마다 모든 카운터를 절반으로 줄입니다(지수 감쇠).
+asyncio 단일 스레드에서 사용하는 것을 전제로 하며 별도의 락을 사용하지 않습니다.
+"""
+import time
+from typing import Dict, Hashable, List, Tuple
+
+# 행마다 다른 해시를 만들기 위한 큰 홀수 (64비트 곱셈 해시)
+_HASH_MULTIPLIERS = (
+    0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93,
+    0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53, 0x94D049BB133111EB, 0xBF58476D1CE4E5B9,
+)
+_MASK64 = (1 << 64) - 1
+
+
+class CountMinSketch:
+    def __init__(self, width: int, depth: int):
+        """
+        Args:
+            width: 행당 카운터 수 (클수록 과대 추정 오차가 작아짐, 오차 ~ 전체 요청 수 * e / width)
+            depth: 행 수 (클수록 오차가 한도를 넘을 확률이 작아짐)
+        """
+        if depth > len(_HASH_MULTIPLIERS):
+            raise ValueError(f"depth는 {len(_HASH_MULTIPLIERS)} 이하여야 합니다.")
+
+        self.width = width
+        self.depth = depth
+        self._rows = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        # 곱셈 해시는 상위 비트가 잘 섞이므로 상위 비트로 칸을 고름 (% width는 하위 비트만 보게 되어
+        # width가 2의 거듭제곱이면 하위 비트가 같은 id들이 모든 행에서 같은 칸에 몰림)
+        h = hash(key) & _MASK64
+        return [(((h * multiplier) & _MASK64) * self.width) >> 64 for multiplier in _HASH_MULTIPLIERS[:self.depth]]
+
+    def add(self, key: Hashable, count: int = 1) -> int:
+        """
+        conservative update: 현재 최솟값보다 작은 카운터만 올려 과대 추정을 줄입니다.
+
+        Returns:
+            증가 후 추정 빈도
+        """
+        indexes = self._indexes(key)
+        estimate = min(row[index] for row, index in zip(self._rows, indexes)) + count
+        for row, index in zip(self._rows, indexes):
+            if row[index] < estimate:
+                row[index] = estimate
+        return estimate
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def decay(self):
+        for row in self._rows:
+            for index, value in enumerate(row):
+                if value:
+                    row[index] = value >> 1
+
+
+class HotKeyDetector:
+    def __init__(self, k: int, threshold: int, window: float, width: int = 2048, depth: int = 4):
+        """
+        Args:
+            k: 유지할 상위 키 수
+            threshold: 핫 키로 판단할 최소 추정 빈도 (감쇠 후 값 기준)
+            window: 카운터를 절반으로 줄이는 주기 (초)
+        """
+        self.k = k
+        self.threshold = threshold
+        self.window = window
+        self._sketch = CountMinSketch(width, depth)
+        self._top: Dict[Hashable, int] = {}
+        self._next_decay_at = time.monotonic() + window
+        self.observed = 0
+
+    def _maybe_decay(self):
+        now = time.monotonic()
+        if now < self._next_decay_at:
+            return
+
+        # 오래 쉬었다면 그 사이 지난 주기만큼 한 번에 줄임
+        periods = 1 + int((now - self._next_decay_at) // self.window)
+        for _ in range(min(periods, 64)):
+            self._sketch.decay()
+        self._top = {
+            key: count >> periods for key, count in self._top.items() if count >> periods > 0
+        }
+        self._next_decay_at = now + self.window
+
+    def observe(self, key: Hashable) -> bool:
+        """
+        요청 한 건을 기록합니다.
+
+        Returns:
+            이 키가 현재 핫 키인지 여부
+        """
+        self._maybe_decay()
+        self.observed += 1
+        estimate = self._sketch.add(key)
+
+        if key in self._top or len(self._top) < self.k:
+            self._top[key] = estimate
+        else:
+            # 상위 k개 중 가장 작은 값보다 크면 교체 (k가 작으므로 선형 탐색)
+            min_key = min(self._top, key=self._top.__getitem__)
+            if estimate > self._top[min_key]:
+                del self._top[min_key]
+                self._top[key] = estimate
+
+        return estimate >= self.threshold and key in self._top
+
+    def is_hot(self, key: Hashable) -> bool:
+        return self._top.get(key, 0) >= self.threshold
+
+    def top(self, n: int = None) -> List[Tuple[Hashable, int]]:
+        """
+        추정 빈도가 높은 순으로 상위 키를 반환합니다.
+        """
+        self._maybe_decay()
+        items = sorted(self._top.items(), key=lambda item: item[1], reverse=True)
+        return items[:n] if n else items
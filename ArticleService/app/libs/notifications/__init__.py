@@ -0,0 +1,12 @@
+from .queue import publish_event, EVENT_COMMENT, EVENT_HEART
+from .worker import start_notification_worker, stop_notification_worker, get_notification_stats, process_entries
+
+__all__ = [
+    'publish_event',
+    'EVENT_COMMENT',
+    'EVENT_HEART',
+    'start_notification_worker',
+    'stop_notification_worker',
+    'get_notification_stats',
+    'process_entries',
+]
@@ -0,0 +1,67 @@
+"""
+알림 이벤트 큐 (Redis Streams)
+
+요청 처리 중에는 이벤트를 스트림에 XADD 하기만 하고, 실제 알림 전송(SendPush RPC)은
+컨슈머 그룹 워커(worker.py)가 백그라운드에서 처리합니다.
+"""
+import logging
+import os
+import time
+from typing import Optional
+import redis.asyncio as redis
+from libs.redis import get_redis_client
+
+logger = logging.getLogger("notifications")
+
+# AuthService에 SendPush 구현이 생기기 전까지 기본은 사용 안 함 (켜면 모든 알림이 UNIMPLEMENTED로 dead-letter에 쌓임)
+NOTIFY_ENABLED = os.getenv("NOTIFY_ENABLED", "0") == "1"
+NOTIFY_STREAM = os.getenv("NOTIFY_STREAM", "notifications:events")
+NOTIFY_DEAD_STREAM = os.getenv("NOTIFY_DEAD_STREAM", "notifications:dead")
+NOTIFY_GROUP = os.getenv("NOTIFY_GROUP", "push")
+# 스트림 최대 길이 (근사치로 잘라냄, 워커가 오래 멈추면 오래된 이벤트부터 버려짐)
+NOTIFY_STREAM_MAXLEN = int(os.getenv("NOTIFY_STREAM_MAXLEN", 100000))
+
+EVENT_COMMENT = "comment"
+EVENT_HEART = "heart"
+EVENT_TYPES = (EVENT_COMMENT, EVENT_HEART)
+
+_publish_stats = {"published": 0, "publish_errors": 0}
+
+
+async def publish_event(event_type: str, post_id: int, actor_id: int) -> Optional[str]:
+    """
+    알림 이벤트를 스트림에 추가합니다. 실패해도 요청 처리에는 영향을 주지 않습니다.
+
+    Args:
+        event_type: EVENT_COMMENT 또는 EVENT_HEART
+        post_id: 대상 게시글 ID (알림 받을 작성자는 워커가 조회)
+        actor_id: 댓글/좋아요를 한 사용자 ID
+
+    Returns:
+        스트림 엔트리 ID, 추가하지 못했으면 None
+    """
+    if not NOTIFY_ENABLED:
+        return None
+
+    try:
+        redis_client = await get_redis_client()
+        if redis_client is None:
+            raise ConnectionError("Redis 연결 실패")
+
+        entry_id = await redis_client.xadd(
+            NOTIFY_STREAM,
+            {"type": event_type, "post_id": post_id, "actor_id": actor_id, "ts": int(time.time() * 1000)},
+            maxlen=NOTIFY_STREAM_MAXLEN,
+            approximate=True,
+        )
+        _publish_stats["published"] += 1
+        return entry_id
+
+    except (redis.RedisError, ConnectionError) as e:
+        _publish_stats["publish_errors"] += 1
+        logger.warning(f"알림 이벤트 추가 실패 (무시): {event_type} post_id={post_id}: {e!r}")
+        return None
+
+
+def get_publish_stats() -> dict:
+    return dict(_publish_stats)
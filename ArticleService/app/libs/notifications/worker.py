@@ -0,0 +1,424 @@
+"""
+알림 전송 워커 (Redis Streams 컨슈머 그룹)
+
+스트림에서 이벤트를 묶음으로 읽어 (받는 사람, 게시글, 종류)별로 합친 뒤
+("홍길동님 외 11명이 회원님의 게시글을 좋아합니다") SendPush RPC를 동시에 여러 건 호출합니다.
+(proto에 여러 건을 한 번에 보내는 RPC가 없으므로 합친 알림마다 한 번씩, NOTIFY_SEND_CONCURRENCY건까지 동시에 호출)
+
+- 첫 이벤트를 받은 뒤 NOTIFY_COALESCE_WINDOW초 동안 더 모아서 합칩니다.
+- 일시적인 오류(UNAVAILABLE 등)는 지수 백오프로 재시도하고, 끝내 실패하거나 재시도해도 소용없는 오류는
+  dead-letter 스트림(NOTIFY_DEAD_STREAM)으로 옮긴 뒤 ACK 합니다.
+- 처리 도중 죽은 컨슈머의 미확인(pending) 이벤트는 NOTIFY_CLAIM_IDLE_MS가 지나면 다른 컨슈머가 가져갑니다.
+- 워커 프로세스마다 같은 그룹의 컨슈머 하나로 동작하므로 이벤트는 워커들에 나뉘어 처리됩니다.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import grpc
+from grpc.aio import AioRpcError
+import redis.asyncio as redis
+from sqlalchemy import select
+from database.sharding import group_by_shard, shard_session
+from database.posts import Posts
+from libs.redis import get_redis_client
+from rpc.auth.services import send_push, batch_get_users
+from .queue import (
+    NOTIFY_STREAM, NOTIFY_DEAD_STREAM, NOTIFY_GROUP, NOTIFY_STREAM_MAXLEN,
+    EVENT_COMMENT, EVENT_HEART, EVENT_TYPES, get_publish_stats,
+)
+
+logger = logging.getLogger("notifications")
+
+# NOTIFY_ENABLED와 함께 켬 (AuthService의 SendPush 구현 필요)
+NOTIFY_WORKER_ENABLED = os.getenv("NOTIFY_WORKER_ENABLED", "0") == "1"
+# 한 번에 처리할 최대 이벤트 수
+NOTIFY_BATCH_SIZE = int(os.getenv("NOTIFY_BATCH_SIZE", 500))
+# 첫 이벤트 이후 추가 이벤트를 모으는 시간 (초, 0이면 바로 처리)
+NOTIFY_COALESCE_WINDOW = float(os.getenv("NOTIFY_COALESCE_WINDOW", 1))
+NOTIFY_BLOCK_MS = int(os.getenv("NOTIFY_BLOCK_MS", 5000))
+# 동시에 진행하는 SendPush 호출 수
+NOTIFY_SEND_CONCURRENCY = int(os.getenv("NOTIFY_SEND_CONCURRENCY", 20))
+NOTIFY_RPC_TIMEOUT = float(os.getenv("NOTIFY_RPC_TIMEOUT", 3))
+NOTIFY_MAX_RETRIES = int(os.getenv("NOTIFY_MAX_RETRIES", 3))
+NOTIFY_RETRY_BACKOFF = float(os.getenv("NOTIFY_RETRY_BACKOFF", 0.5))
+# 이 시간(ms) 넘게 ACK되지 않은 이벤트는 다른 컨슈머가 가져감
+NOTIFY_CLAIM_IDLE_MS = int(os.getenv("NOTIFY_CLAIM_IDLE_MS", 60000))
+NOTIFY_CLAIM_INTERVAL = float(os.getenv("NOTIFY_CLAIM_INTERVAL", 30))
+NOTIFY_LINK_FORMAT = os.getenv("NOTIFY_LINK_FORMAT", "/posts/{post_id}")
+
+CONSUMER_NAME = f"{socket.gethostname()}-{os.getpid()}"
+
+_RETRYABLE_CODES = (
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.ABORTED,
+)
+
+_TITLE_MAX_LENGTH = 50
+
+_running = False
+_worker_task: Optional[asyncio.Task] = None
+_group_ready = False
+_last_claim_time = 0.0
+
+_stats = {
+    "events_read": 0,
+    "events_claimed": 0,
+    "events_invalid": 0,
+    "events_skipped": 0,
+    "notifications_sent": 0,
+    "notifications_rejected": 0,
+    "notifications_dead": 0,
+    "coalesced_events": 0,
+    "retries": 0,
+    "batches": 0,
+    "last_batch_ms": None,
+    "last_batch_at": None,
+}
+
+
+class _Notification:
+    __slots__ = ("recipient_id", "post_id", "event_type", "actor_ids", "events", "entry_ids")
+
+    def __init__(self, recipient_id: int, post_id: int, event_type: str):
+        self.recipient_id = recipient_id
+        self.post_id = post_id
+        self.event_type = event_type
+        self.actor_ids: Dict[int, None] = {}
+        self.events = 0
+        self.entry_ids: List[str] = []
+
+
+async def _ensure_group(redis_client):
+    global _group_ready
+
+    if _group_ready:
+        return
+    try:
+        # $: 그룹을 처음 만들 때는 이후 이벤트부터 처리
+        await redis_client.xgroup_create(NOTIFY_STREAM, NOTIFY_GROUP, id="$", mkstream=True)
+        logger.info(f"알림 컨슈머 그룹 생성: {NOTIFY_STREAM} / {NOTIFY_GROUP}")
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+    _group_ready = True
+
+
+async def _read_batch(redis_client) -> List[Tuple[str, dict]]:
+    """
+    새 이벤트를 기다렸다가, 첫 이벤트 이후 NOTIFY_COALESCE_WINDOW초 동안 NOTIFY_BATCH_SIZE개까지 더 모읍니다.
+    """
+    entries: List[Tuple[str, dict]] = []
+    deadline = None
+    block_ms = NOTIFY_BLOCK_MS
+
+    while len(entries) < NOTIFY_BATCH_SIZE:
+        response = await redis_client.xreadgroup(
+            NOTIFY_GROUP, CONSUMER_NAME, {NOTIFY_STREAM: ">"},
+            count=NOTIFY_BATCH_SIZE - len(entries), block=block_ms,
+        )
+        for _, stream_entries in response or []:
+            entries.extend(stream_entries)
+
+        if not entries:
+            return entries
+        if deadline is None:
+            deadline = time.monotonic() + NOTIFY_COALESCE_WINDOW
+
+        # block=0은 무한 대기이므로 남은 시간이 1ms 미만이면 종료
+        block_ms = int((deadline - time.monotonic()) * 1000)
+        if block_ms < 1:
+            break
+
+    return entries
+
+
+async def _claim_stale(redis_client) -> List[Tuple[str, dict]]:
+    """
+    죽은 컨슈머가 가져간 뒤 오래 ACK하지 않은 이벤트를 이 컨슈머로 가져옵니다.
+    """
+    global _last_claim_time
+
+    if time.monotonic() - _last_claim_time < NOTIFY_CLAIM_INTERVAL:
+        return []
+    _last_claim_time = time.monotonic()
+
+    response = await redis_client.xautoclaim(
+        NOTIFY_STREAM, NOTIFY_GROUP, CONSUMER_NAME,
+        min_idle_time=NOTIFY_CLAIM_IDLE_MS, start_id="0-0", count=NOTIFY_BATCH_SIZE,
+    )
+    # Redis 7은 [다음 커서, 엔트리, 삭제된 ID], 6.2는 [다음 커서, 엔트리]
+    claimed = [entry for entry in response[1] if entry[1] is not None]
+    if claimed:
+        _stats["events_claimed"] += len(claimed)
+        logger.info(f"다른 컨슈머의 미처리 알림 이벤트 {len(claimed)}건을 가져왔습니다.")
+    return claimed
+
+
+async def _load_posts(post_ids) -> Dict[int, Tuple[int, str]]:
+    async def _load(shard: int, ids: List[int]) -> Dict[int, Tuple[int, str]]:
+        async with shard_session(shard) as session:
+            result = await session.execute(
+                select(Posts.id, Posts.user_id, Posts.title).where(Posts.id.in_(ids))
+            )
+            return {row.id: (row.user_id, row.title) for row in result}
+
+    posts: Dict[int, Tuple[int, str]] = {}
+    for loaded in await asyncio.gather(*(_load(shard, ids) for shard, ids in group_by_shard(post_ids).items())):
+        posts.update(loaded)
+    return posts
+
+
+async def _load_actor_names(actor_ids) -> Dict[int, str]:
+    # 이름은 있으면 좋은 정보이므로 조회에 실패해도 인원수만으로 알림을 보냄
+    try:
+        users = await batch_get_users(actor_ids)
+    except (AioRpcError, asyncio.TimeoutError) as e:
+        logger.warning(f"알림 대상 사용자 이름 조회 실패: {e!r}")
+        return {}
+    return {user_id: user["handle_name"] or user["username"] for user_id, user in users.items() if user}
+
+
+def _compose(notification: _Notification, post_title: str, names: Dict[int, str]) -> Tuple[str, str]:
+    """
+    합쳐진 알림의 (제목, 본문)을 만듭니다.
+    """
+    actors = list(notification.actor_ids)
+    # 가장 최근에 반응한 사용자의 이름을 대표로 표시
+    name = names.get(actors[-1])
+    if name:
+        who = f"{name}님" if len(actors) == 1 else f"{name}님 외 {len(actors) - 1}명"
+    else:
+        who = f"{len(actors)}명"
+
+    if notification.event_type == EVENT_HEART:
+        body = f"{who}이 회원님의 게시글을 좋아합니다."
+    else:
+        body = f"{who}이 회원님의 게시글에 댓글 {notification.events}개를 남겼습니다."
+
+    title = post_title if len(post_title) <= _TITLE_MAX_LENGTH else post_title[:_TITLE_MAX_LENGTH - 1] + "…"
+    return title, body
+
+
+async def _deliver(notification: _Notification, title: str, body: str, semaphore: asyncio.Semaphore) -> Tuple[str, str]:
+    """
+    SendPush를 호출하고 결과를 반환합니다. ("sent" | "rejected" | "dead", 오류 설명)
+    """
+    link = NOTIFY_LINK_FORMAT.format(post_id=notification.post_id)
+    error = ""
+
+    async with semaphore:
+        for attempt in range(NOTIFY_MAX_RETRIES + 1):
+            if attempt:
+                _stats["retries"] += 1
+                await asyncio.sleep(NOTIFY_RETRY_BACKOFF * 2 ** (attempt - 1))
+            try:
+                accepted = await send_push(notification.recipient_id, title, body, link, timeout=NOTIFY_RPC_TIMEOUT)
+                return ("sent" if accepted else "rejected"), ""
+            except AioRpcError as e:
+                error = f"{e.code().name}: {e.details()}"
+                if e.code() not in _RETRYABLE_CODES:
+                    break
+            except asyncio.TimeoutError:
+                error = "timeout"
+
+    return "dead", error
+
+
+async def _dead_letter(redis_client, notification: _Notification, entries: Dict[str, dict], error: str):
+    pipeline = redis_client.pipeline()
+    for entry_id in notification.entry_ids:
+        pipeline.xadd(
+            NOTIFY_DEAD_STREAM,
+            {**entries[entry_id], "entry_id": entry_id, "error": error[:200]},
+            maxlen=NOTIFY_STREAM_MAXLEN,
+            approximate=True,
+        )
+    await pipeline.execute()
+
+
+async def process_entries(redis_client, entries: List[Tuple[str, dict]]):
+    """
+    이벤트 묶음을 받는 사람별로 합쳐 전송하고, 처리가 끝난 이벤트를 ACK 합니다.
+    """
+    started_at = time.perf_counter()
+    fields_by_id = dict(entries)
+    done_ids: List[str] = []
+    parsed = []
+
+    for entry_id, fields in entries:
+        try:
+            event_type = fields["type"]
+            if event_type not in EVENT_TYPES:
+                raise ValueError(event_type)
+            parsed.append((entry_id, event_type, int(fields["post_id"]), int(fields["actor_id"])))
+        except (KeyError, ValueError, TypeError):
+            logger.warning(f"잘못된 알림 이벤트 무시: {entry_id} {fields}")
+            _stats["events_invalid"] += 1
+            done_ids.append(entry_id)
+
+    posts = await _load_posts({post_id for _, _, post_id, _ in parsed}) if parsed else {}
+
+    notifications: Dict[Tuple[int, int, str], _Notification] = {}
+    for entry_id, event_type, post_id, actor_id in parsed:
+        post = posts.get(post_id)
+        # 삭제된 게시글이나 자기 게시글에 대한 반응은 알리지 않음
+        if post is None or post[0] == actor_id:
+            _stats["events_skipped"] += 1
+            done_ids.append(entry_id)
+            continue
+
+        key = (post[0], post_id, event_type)
+        notification = notifications.get(key)
+        if notification is None:
+            notification = notifications[key] = _Notification(post[0], post_id, event_type)
+        else:
+            _stats["coalesced_events"] += 1
+        # 같은 사용자가 여러 번 반응하면 마지막 순서로 옮김
+        notification.actor_ids.pop(actor_id, None)
+        notification.actor_ids[actor_id] = None
+        notification.events += 1
+        notification.entry_ids.append(entry_id)
+
+    if notifications:
+        names = await _load_actor_names({actor_id for n in notifications.values() for actor_id in n.actor_ids})
+        semaphore = asyncio.Semaphore(NOTIFY_SEND_CONCURRENCY)
+        items = list(notifications.values())
+        results = await asyncio.gather(*[
+            _deliver(notification, *_compose(notification, posts[notification.post_id][1], names), semaphore)
+            for notification in items
+        ])
+
+        for notification, (outcome, error) in zip(items, results):
+            if outcome == "dead":
+                logger.error(f"알림 전송 실패, dead-letter로 이동: user_id={notification.recipient_id} ({error})")
+                await _dead_letter(redis_client, notification, fields_by_id, error)
+            _stats[f"notifications_{outcome}"] += 1
+            done_ids.extend(notification.entry_ids)
+
+    if done_ids:
+        await redis_client.xack(NOTIFY_STREAM, NOTIFY_GROUP, *done_ids)
+
+    _stats["batches"] += 1
+    _stats["last_batch_ms"] = round((time.perf_counter() - started_at) * 1000, 2)
+    _stats["last_batch_at"] = time.time()
+    logger.info(
+        f"알림 배치 처리: 이벤트 {len(entries)}건 -> 알림 {len(notifications)}건 ({_stats['last_batch_ms']}ms)"
+    )
+
+
+async def run_notification_worker():
+    """
+    이벤트를 읽어 처리하는 루프 (stop_notification_worker()로 종료)
+    """
+    global _running, _group_ready
+
+    _running = True
+    logger.info(f"알림 워커 시작: consumer={CONSUMER_NAME}")
+    try:
+        while _running:
+            try:
+                redis_client = await get_redis_client()
+                if redis_client is None:
+                    await asyncio.sleep(NOTIFY_BLOCK_MS / 1000)
+                    continue
+
+                await _ensure_group(redis_client)
+                entries = await _claim_stale(redis_client)
+                entries += await _read_batch(redis_client)
+                _stats["events_read"] += len(entries)
+                if entries:
+                    await process_entries(redis_client, entries)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, redis.ResponseError) and "NOGROUP" in str(e):
+                    # 스트림이 지워진 경우 그룹을 다시 생성
+                    _group_ready = False
+                logger.error(f"알림 워커 오류: {e!r}")
+                await asyncio.sleep(1)
+    except asyncio.CancelledError:
+        logger.info("알림 워커가 취소되었습니다.")
+    finally:
+        _running = False
+
+
+def start_notification_worker() -> Optional[asyncio.Task]:
+    global _worker_task
+
+    if not NOTIFY_WORKER_ENABLED:
+        logger.info("NOTIFY_WORKER_ENABLED=0: 알림 워커를 시작하지 않습니다.")
+        return None
+
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.get_event_loop().create_task(run_notification_worker())
+    return _worker_task
+
+
+async def stop_notification_worker():
+    """
+    워커를 멈춥니다. 읽었지만 ACK하지 못한 이벤트는 NOTIFY_CLAIM_IDLE_MS 후 다른 컨슈머가 처리합니다.
+    """
+    global _running
+
+    _running = False
+    if _worker_task is not None and not _worker_task.done():
+        _worker_task.cancel()
+        try:
+            await _worker_task
+        except asyncio.CancelledError:
+            pass
+
+
+def _entry_age_ms(entry_id: Optional[str]) -> Optional[int]:
+    if not entry_id:
+        return None
+    return max(0, int(time.time() * 1000) - int(entry_id.split("-")[0]))
+
+
+async def get_notification_stats() -> dict:
+    """
+    알림 큐 지표: 워커 통계(이 워커 기준)와 스트림/그룹 상태(전체 기준)
+
+    - pending: 컨슈머가 읽었지만 아직 ACK하지 않은 이벤트 수
+    - lag: 아직 어느 컨슈머도 읽지 않은 이벤트 수 (Redis 7 이상)
+    - oldest_pending_age_ms / oldest_unread_age_ms: 가장 오래 기다린 이벤트의 대기 시간
+    """
+    queue = {"stream": NOTIFY_STREAM, "group": NOTIFY_GROUP}
+    try:
+        redis_client = await get_redis_client()
+        if redis_client is None:
+            raise ConnectionError("Redis 연결 실패")
+
+        queue["length"] = await redis_client.xlen(NOTIFY_STREAM)
+        queue["dead_letter_length"] = await redis_client.xlen(NOTIFY_DEAD_STREAM)
+
+        groups = {group["name"]: group for group in await redis_client.xinfo_groups(NOTIFY_STREAM)}
+        group = groups.get(NOTIFY_GROUP)
+        if group is not None:
+            queue["consumers"] = group.get("consumers")
+            queue["pending"] = group.get("pending")
+            queue["lag"] = group.get("lag")
+
+            pending = await redis_client.xpending(NOTIFY_STREAM, NOTIFY_GROUP)
+            queue["oldest_pending_age_ms"] = _entry_age_ms(pending.get("min"))
+
+            unread = await redis_client.xrange(NOTIFY_STREAM, min=f"({group['last-delivered-id']}", count=1)
+            queue["oldest_unread_age_ms"] = _entry_age_ms(unread[0][0]) if unread else 0
+
+    except (redis.RedisError, ConnectionError) as e:
+        queue["error"] = repr(e)
+
+    return {
+        "consumer": CONSUMER_NAME,
+        "running": _running,
+        **get_publish_stats(),
+        **_stats,
+        "queue": queue,
+    }
@@ -0,0 +1,485 @@
+"""
+게시글 사진 업로드 / 크기별 변형 생성
+
+JSON 본문의 picture(bytes)는 base64로 부풀려진 채 전체가 메모리에 올라와 pydantic이 검증하므로,
+사진은 별도 엔드포인트(POST /api/posts/{post_id}/picture)로 받습니다.
+
+- 요청 본문(multipart/form-data의 picture 파일 또는 image/* 본문 그대로)을 청크 단위로 임시 파일에 씀
+  (PICTURE_MAX_BYTES를 넘는 순간 중단하고 413, 메모리에는 PICTURE_SPOOL_CHUNK만큼만 보관)
+- 헤더만 읽어 형식/크기를 확인한 뒤 바로 202로 응답
+- 디코딩과 크기별 변형(PICTURE_VARIANTS) 생성은 프로세스 풀(PICTURE_WORKERS)에서 실행하여 이벤트 루프와 GIL을 막지 않음
+- 변형은 게시글과 같은 샤드의 post_pictures에 저장하고 posts.picture_version을 올림
+  (응답에는 /api/posts/{post_id}/picture/{variant}?v={version} URL만 담으며, 버전이 URL에 있으므로 오래 캐시 가능)
+
+처리는 요청을 받은 워커에서 백그라운드로 진행하므로, 변형이 저장되기 전까지는 이전 사진(또는 사진 없음)이 보입니다.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import insert
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from database.sharding import SHARD_MOVE_RETRY_AFTER, ShardRangeMoving, engine_for_post, get_engine, writable_shard_for_post
+from database.statements import (
+    BUMP_PICTURE_VERSION,
+    DELETE_POST_PICTURES,
+    POST_PICTURE,
+    POST_PICTURE_VERSION,
+    post_pictures,
+)
+from libs.hot_posts import invalidate_post
+from libs.singleflight import SingleFlight
+from libs.thumbnails import Image, InvalidPicture, probe, render_variants
+from shared.ttl_cache import TTLCache
+
+logger = logging.getLogger("pictures")
+
+# 원본 사진 최대 크기 (바이트)
+PICTURE_MAX_BYTES = int(os.getenv("PICTURE_MAX_BYTES", 10 * 1024 * 1024))
+# 원본 사진 최대 픽셀 수 (압축 해제 폭탄 방지)
+PICTURE_MAX_PIXELS = int(os.getenv("PICTURE_MAX_PIXELS", 40_000_000))
+# 임시 파일 디렉터리 (비우면 시스템 임시 디렉터리)
+PICTURE_SPOOL_DIR = os.getenv("PICTURE_SPOOL_DIR") or None
+# 이만큼 모일 때마다 임시 파일에 씀 (바이트)
+PICTURE_SPOOL_CHUNK = int(os.getenv("PICTURE_SPOOL_CHUNK", 256 * 1024))
+# multipart 경계/다른 필드에 허용하는 추가 크기 (바이트)
+PICTURE_FORM_OVERHEAD = int(os.getenv("PICTURE_FORM_OVERHEAD", 64 * 1024))
+# 변형을 만드는 프로세스 수
+PICTURE_WORKERS = int(os.getenv("PICTURE_WORKERS", 2))
+# 워커당 처리 대기 중인 업로드 최대 수 (넘으면 503)
+PICTURE_MAX_PENDING = int(os.getenv("PICTURE_MAX_PENDING", 16))
+PICTURE_JPEG_QUALITY = int(os.getenv("PICTURE_JPEG_QUALITY", 85))
+# "이름:가로/세로 최대 픽셀" 목록
+PICTURE_VARIANTS: List[Tuple[str, int]] = [
+    (name.strip(), int(size))
+    for name, size in (item.split(":") for item in os.getenv("PICTURE_VARIANTS", "thumb:320,medium:1024,large:2048").split(","))
+]
+# 피드/상세 응답이 대표로 가리키는 변형
+PICTURE_FEED_VARIANT = os.getenv("PICTURE_FEED_VARIANT", "thumb")
+PICTURE_DETAIL_VARIANT = os.getenv("PICTURE_DETAIL_VARIANT", "medium")
+# 사진 URL 앞에 붙일 주소 (CDN 등, 비우면 상대 경로)
+PICTURE_URL_BASE = os.getenv("PICTURE_URL_BASE", "").rstrip("/")
+# 워커 메모리에 캐시할 변형 (이 크기 이하만, 0이면 사용 안 함)
+PICTURE_CACHE_SIZE = int(os.getenv("PICTURE_CACHE_SIZE", 512))
+PICTURE_CACHE_TTL = float(os.getenv("PICTURE_CACHE_TTL", 60))
+PICTURE_CACHE_MAX_BYTES = int(os.getenv("PICTURE_CACHE_MAX_BYTES", 64 * 1024))
+# 샤드 이동 중이라 저장하지 못했을 때 다시 시도하는 횟수
+PICTURE_STORE_RETRIES = int(os.getenv("PICTURE_STORE_RETRIES", 3))
+
+VARIANT_NAMES = frozenset(name for name, _ in PICTURE_VARIANTS)
+
+# multipart에서 사진으로 읽는 필드 이름 (없으면 첫 번째 파일 필드)
+PICTURE_FIELD = "picture"
+
+
+class PictureTooLarge(Exception):
+    pass
+
+
+class PictureBusy(Exception):
+    pass
+
+
+class SpooledPicture(NamedTuple):
+    path: str
+    size: int
+    format: str
+    width: int
+    height: int
+
+
+class CachedPicture(NamedTuple):
+    version: int
+    content_type: str
+    data: bytes
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_tasks = set()
+# 본문을 받는 중이거나 변형을 만드는 중인 업로드 수
+_pending = 0
+_picture_flight = SingleFlight("post_picture")
+# {(post_id, variant): CachedPicture}
+_picture_cache = TTLCache(maxsize=max(PICTURE_CACHE_SIZE, 1), ttl=PICTURE_CACHE_TTL)
+
+_stats = {
+    "uploads": 0,
+    "upload_bytes": 0,
+    "too_large": 0,
+    "invalid": 0,
+    "busy": 0,
+    "processed": 0,
+    "failed": 0,
+    "render_ms": 0.0,
+}
+
+
+def pictures_available() -> bool:
+    return Image is not None
+
+
+def picture_url(post_id: int, version: int, variant: str) -> str:
+    return f"{PICTURE_URL_BASE}/api/posts/{post_id}/picture/{variant}?v={version}"
+
+
+def picture_urls(post_id: int, version: Optional[int]) -> Optional[Dict[str, str]]:
+    """
+    크기별 변형 URL (사진이 없으면 None)
+    """
+    if version is None:
+        return None
+    return {name: picture_url(post_id, version, name) for name, _ in PICTURE_VARIANTS}
+
+
+def feed_picture_url(post_id: int, version: Optional[int]) -> Optional[str]:
+    return picture_url(post_id, version, PICTURE_FEED_VARIANT) if version is not None else None
+
+
+def detail_picture_url(post_id: int, version: Optional[int]) -> Optional[str]:
+    return picture_url(post_id, version, PICTURE_DETAIL_VARIANT) if version is not None else None
+
+
+# ---------------------------------------------------------------------------
+# 업로드 본문을 임시 파일로
+# ---------------------------------------------------------------------------
+
+class _Spool:
+    def __init__(self):
+        fd, self.path = tempfile.mkstemp(prefix="picture-", suffix=".upload", dir=PICTURE_SPOOL_DIR)
+        self.file = os.fdopen(fd, "wb")
+        self.size = 0
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes):
+        self.size += len(data)
+        if self.size > PICTURE_MAX_BYTES:
+            raise PictureTooLarge()
+        self._buffer += data
+
+    async def flush(self, force: bool = False):
+        if self._buffer and (force or len(self._buffer) >= PICTURE_SPOOL_CHUNK):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            await run_in_threadpool(self.file.write, data)
+
+    async def close(self):
+        await self.flush(force=True)
+        await run_in_threadpool(self.file.close)
+
+    async def discard(self):
+        self._buffer.clear()
+        await run_in_threadpool(_close_and_remove, self.file, self.path)
+
+
+def _close_and_remove(file, path: str):
+    file.close()
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class _MultipartTarget:
+    """
+    python-multipart 콜백: 사진 파트의 데이터만 스풀로 넘기고 나머지 필드는 버림
+    """
+    def __init__(self, spool: _Spool):
+        self.spool = spool
+        self.found = False
+        self._headers: Dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+        self._writing = False
+
+    def on_part_begin(self):
+        self._headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._field.lower()] = self._value
+        self._field = b""
+        self._value = b""
+
+    def on_headers_finished(self):
+        from multipart.multipart import parse_options_header
+
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        is_file = b"filename" in options
+        self._writing = not self.found and (name == PICTURE_FIELD or is_file)
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if self._writing:
+            self.spool.feed(data[start:end])
+
+    def on_part_end(self):
+        if self._writing:
+            self.found = True
+            self._writing = False
+
+
+async def _spool_multipart(request: Request, spool: _Spool):
+    from multipart.multipart import MultipartParser, parse_options_header
+
+    _, params = parse_options_header(request.headers["content-type"])
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise InvalidPicture("multipart 경계(boundary)가 없습니다.")
+
+    target = _MultipartTarget(spool)
+    parser = MultipartParser(boundary, {
+        name: getattr(target, name) for name in (
+            "on_part_begin", "on_part_data", "on_part_end",
+            "on_header_field", "on_header_value", "on_header_end", "on_headers_finished",
+        )
+    })
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > PICTURE_MAX_BYTES + PICTURE_FORM_OVERHEAD:
+            raise PictureTooLarge()
+        parser.write(chunk)
+        await spool.flush()
+    parser.finalize()
+
+    if not target.found:
+        raise InvalidPicture(f"'{PICTURE_FIELD}' 파일 필드가 없습니다.")
+
+
+async def _spool_raw(request: Request, spool: _Spool):
+    async for chunk in request.stream():
+        spool.feed(chunk)
+        await spool.flush()
+
+
+async def spool_upload(request: Request) -> SpooledPicture:
+    """
+    요청 본문의 사진을 임시 파일에 쓰고 헤더로 형식/크기를 확인합니다.
+
+    Raises:
+        PictureTooLarge: PICTURE_MAX_BYTES 초과
+        InvalidPicture: 사진이 없거나, 사진이 아니거나, 지원하지 않는 형식이거나, PICTURE_MAX_PIXELS 초과
+    """
+    content_type = request.headers.get("content-type", "")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > PICTURE_MAX_BYTES + PICTURE_FORM_OVERHEAD:
+        _stats["too_large"] += 1
+        raise PictureTooLarge()
+
+    spool = _Spool()
+    try:
+        if content_type.startswith("multipart/form-data"):
+            await _spool_multipart(request, spool)
+        elif content_type.startswith("image/") or content_type == "application/octet-stream":
+            await _spool_raw(request, spool)
+        else:
+            raise InvalidPicture("multipart/form-data 또는 image/* 본문이어야 합니다.")
+        await spool.close()
+        if spool.size == 0:
+            raise InvalidPicture("빈 파일입니다.")
+        image_format, width, height = await run_in_threadpool(probe, spool.path, PICTURE_MAX_PIXELS)
+    except PictureTooLarge:
+        _stats["too_large"] += 1
+        await spool.discard()
+        raise
+    except InvalidPicture:
+        _stats["invalid"] += 1
+        await spool.discard()
+        raise
+    except BaseException:
+        await spool.discard()
+        raise
+
+    _stats["uploads"] += 1
+    _stats["upload_bytes"] += spool.size
+    return SpooledPicture(spool.path, spool.size, image_format, width, height)
+
+
+# ---------------------------------------------------------------------------
+# 변형 생성 (프로세스 풀) / 저장
+# ---------------------------------------------------------------------------
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # fork는 이벤트 루프/DB 커넥션/스레드를 가진 프로세스를 복제하므로 spawn으로 새로 시작
+        _executor = ProcessPoolExecutor(max_workers=PICTURE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def reserve_upload():
+    """
+    업로드 하나를 받을 자리를 잡습니다. 본문을 읽기 전에 호출하고, 끝나면 schedule_picture 또는 release_upload를 호출해야 합니다.
+
+    Raises:
+        PictureBusy: 이 워커에서 처리 대기 중인 업로드가 PICTURE_MAX_PENDING개
+    """
+    global _pending
+    if _pending >= PICTURE_MAX_PENDING:
+        _stats["busy"] += 1
+        raise PictureBusy()
+    _pending += 1
+
+
+def release_upload():
+    global _pending
+    _pending -= 1
+
+
+async def store_variants(post_id: int, variants: list) -> Optional[int]:
+    """
+    변형을 게시글과 같은 샤드에 저장하고 사진 버전을 올립니다.
+
+    Returns:
+        새 버전, 그 사이 게시글이 지워졌으면 None
+
+    Raises:
+        ShardRangeMoving: 게시글을 다른 샤드로 옮기는 중
+    """
+    shard = writable_shard_for_post(post_id)
+    now = datetime.now(timezone.utc)
+
+    async with get_engine(shard).begin() as conn:
+        # 게시글 행을 먼저 갱신하여 같은 게시글의 동시 업로드는 이 행의 잠금으로 직렬화
+        result = await conn.execute(BUMP_PICTURE_VERSION, {"post_id": post_id, "last_modified": now})
+        if result.rowcount == 0:
+            return None
+        version = (await conn.execute(POST_PICTURE_VERSION, {"post_id": post_id})).scalar()
+
+        await conn.execute(DELETE_POST_PICTURES, {"post_id": post_id})
+        await conn.execute(insert(post_pictures), [
+            {
+                "post_id": post_id,
+                "variant": name,
+                "version": version,
+                "content_type": content_type,
+                "width": width,
+                "height": height,
+                "data": data,
+                "created_at": now,
+            }
+            for name, content_type, width, height, data in variants
+        ])
+
+    forget_pictures(post_id)
+    invalidate_post(post_id)
+    return version
+
+
+def forget_pictures(post_id: int):
+    """
+    워커 메모리에 캐시한 변형을 지웁니다. (사진을 바꾸거나 게시글을 지울 때)
+    """
+    for name in VARIANT_NAMES:
+        _picture_cache.delete((post_id, name))
+
+
+async def _process(post_id: int, upload: SpooledPicture):
+    try:
+        started = time.monotonic()
+        variants = await asyncio.get_running_loop().run_in_executor(
+            _get_executor(), render_variants, upload.path, PICTURE_VARIANTS, PICTURE_MAX_PIXELS, PICTURE_JPEG_QUALITY,
+        )
+        render_ms = (time.monotonic() - started) * 1000
+        _stats["render_ms"] = round(render_ms if not _stats["processed"] else _stats["render_ms"] * 0.9 + render_ms * 0.1, 3)
+
+        for attempt in range(PICTURE_STORE_RETRIES + 1):
+            try:
+                version = await store_variants(post_id, variants)
+                break
+            except ShardRangeMoving:
+                if attempt == PICTURE_STORE_RETRIES:
+                    raise
+                await asyncio.sleep(SHARD_MOVE_RETRY_AFTER)
+
+        if version is None:
+            logger.info(f"사진 처리 중 게시글이 삭제됨: post_id={post_id}")
+        else:
+            _stats["processed"] += 1
+            logger.info(f"사진 변형 저장: post_id={post_id}, version={version}, {upload.width}x{upload.height} {upload.format}")
+
+    except Exception as e:
+        _stats["failed"] += 1
+        logger.error(f"사진 처리 실패: post_id={post_id}: {e!r}")
+
+    finally:
+        release_upload()
+        await run_in_threadpool(_remove, upload.path)
+
+
+def _remove(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def schedule_picture(post_id: int, upload: SpooledPicture):
+    """
+    백그라운드에서 변형을 만들어 저장합니다. (reserve_upload로 잡은 자리는 처리가 끝나면 반환)
+    """
+    task = asyncio.get_running_loop().create_task(_process(post_id, upload))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def close_pictures(timeout: float = 30):
+    """
+    처리 중인 사진을 timeout초까지 기다린 뒤 프로세스 풀을 종료합니다.
+    """
+    global _executor
+    if _tasks:
+        logger.info(f"처리 중인 사진 {len(_tasks)}개를 기다리는 중...")
+        await asyncio.wait(list(_tasks), timeout=timeout)
+    if _executor is not None:
+        await run_in_threadpool(_executor.shutdown)
+        _executor = None
+
+
+# ---------------------------------------------------------------------------
+# 조회
+# ---------------------------------------------------------------------------
+
+async def _read_picture(post_id: int, variant: str) -> Optional[CachedPicture]:
+    async with engine_for_post(post_id).connect() as conn:
+        row = (await conn.execute(POST_PICTURE, {"post_id": post_id, "variant": variant})).first()
+    if row is None:
+        return None
+    return CachedPicture(row.version, row.content_type, bytes(row.data))
+
+
+async def load_picture(post_id: int, variant: str, version: Optional[int] = None) -> Optional[CachedPicture]:
+    """
+    변형 하나를 읽습니다. 작은 변형(썸네일 등)은 워커 메모리에 잠시 캐시하며,
+    version을 넘겼는데 캐시된 것이 다른 버전이면 DB에서 다시 읽습니다.
+    """
+    if PICTURE_CACHE_SIZE > 0:
+        cached = _picture_cache.get((post_id, variant))
+        if cached is not None and (version is None or cached.version == version):
+            return cached
+
+    picture = await _picture_flight.do((post_id, variant), lambda: _read_picture(post_id, variant))
+    if picture is not None and PICTURE_CACHE_SIZE > 0 and len(picture.data) <= PICTURE_CACHE_MAX_BYTES:
+        _picture_cache.set((post_id, variant), picture)
+    return picture
+
+
+def get_picture_stats() -> Dict[str, object]:
+    return {
+        "available": pictures_available(),
+        "workers": PICTURE_WORKERS,
+        **_stats,
+        "pending": _pending,
+        "cached": len(_picture_cache),
+    }
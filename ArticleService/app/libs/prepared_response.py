@@ -0,0 +1,99 @@
+"""
+미리 직렬화/압축해 둔 JSON 응답
+
+캐시된 상세/목록 응답을 요청마다 다시 직렬화하고 gzip 하지 않도록, 캐시에 넣을 때 한 번만 만들어 둡니다.
+클라이언트가 Accept-Encoding: gzip을 보내면 압축된 본문을 그대로 보내고, 아니면 직렬화된 본문을 보냅니다.
+
+상세 응답처럼 마지막 값(조회수)만 요청마다 바뀌는 경우에는 앞부분만 압축해 두고
+(Z_SYNC_FLUSH 후 압축기 상태를 보관) 요청마다 상태를 복사해 짧은 뒷부분만 이어서 압축합니다.
+"""
+import json
+import os
+import zlib
+from typing import Any, Optional
+from starlette.requests import Request
+from starlette.responses import Response
+
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", 6))
+# 캐시하지 않는 응답은 GZipMiddleware가 이 크기 이상일 때만 압축
+RESPONSE_GZIP_MIN_SIZE = int(os.getenv("RESPONSE_GZIP_MIN_SIZE", 1024))
+# 압축기 상태를 보관하는 응답마다 약 (128KB + 2^(MEMLEVEL+9)) 메모리 사용
+RESPONSE_GZIP_MEMLEVEL = int(os.getenv("RESPONSE_GZIP_MEMLEVEL", 4))
+
+# gzip 헤더/트레일러를 포함한 스트림
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def _default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode()
+    raise TypeError(f"JSON으로 직렬화할 수 없는 값입니다: {type(value)!r}")
+
+
+def dumps(value: Any) -> bytes:
+    # FastAPI 기본 JSONResponse와 같은 형식
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def accepts_gzip(request: Request) -> bool:
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _response(body: bytes, gzipped: bool) -> Response:
+    headers = {"Vary": "Accept-Encoding"}
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, media_type="application/json", headers=headers)
+
+
+class PreparedJSON:
+    """
+    본문 전체가 고정된 응답 (목록 등)
+    """
+    __slots__ = ("body", "_gzipped")
+
+    def __init__(self, value: Any):
+        self.body = dumps(value)
+        self._gzipped: Optional[bytes] = None
+
+    def render(self, gzip: bool) -> Response:
+        if not gzip:
+            return _response(self.body, False)
+        if self._gzipped is None:
+            compressor = zlib.compressobj(RESPONSE_GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS, RESPONSE_GZIP_MEMLEVEL)
+            self._gzipped = compressor.compress(self.body) + compressor.flush()
+        return _response(self._gzipped, True)
+
+
+class PreparedTailJSON:
+    """
+    {"ok": ..., "data": {..., <tail_field>: 값}} 형태에서 마지막 필드 값만 요청마다 바뀌는 응답
+    """
+    __slots__ = ("_head", "_gzip_head", "_gzip_state")
+
+    def __init__(self, envelope: dict, data: dict, data_key: str, tail_field: str):
+        data = {key: value for key, value in data.items() if key != tail_field}
+        envelope_json = dumps({**envelope, data_key: data})
+        # '..."data":{...}}' -> '..."data":{...,"views":' (data는 마지막 키, 비어 있지 않아야 함)
+        self._head = envelope_json[:-2] + b"," + dumps(tail_field) + b":"
+        self._gzip_head: Optional[bytes] = None
+        self._gzip_state = None
+
+    def render(self, tail_value: Any, gzip: bool) -> Response:
+        tail = dumps(tail_value) + b"}}"
+        if not gzip:
+            return _response(self._head + tail, False)
+
+        if self._gzip_state is None:
+            compressor = zlib.compressobj(RESPONSE_GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS, RESPONSE_GZIP_MEMLEVEL)
+            self._gzip_head = compressor.compress(self._head) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._gzip_state = compressor
+
+        compressor = self._gzip_state.copy()
+        return _response(self._gzip_head + compressor.compress(tail) + compressor.flush(), True)
@@ -0,0 +1,266 @@
+"""
+운영 중인 워커의 프로파일링 / 이벤트 루프 지연 감시
+
+- 샘플링 프로파일러: 별도 스레드가 interval마다 sys._current_frames()로 이벤트 루프 스레드의 스택을 읽어
+  "바깥;...;안쪽 횟수" 형식(collapsed stack, flamegraph.pl / speedscope 입력)으로 집계합니다.
+  대상 코드를 바꾸거나 추적 훅(sys.setprofile)을 걸지 않으므로 측정 중에도 요청 처리 속도에 영향이 거의 없고,
+  시간(PROFILE_MAX_SECONDS)과 동시 실행(워커당 하나)을 제한합니다.
+- 이벤트 루프 지연: 루프 안의 태스크가 LOOP_MONITOR_INTERVAL마다 깨어나며 예정보다 늦은 시간을 잽니다.
+- 블로킹 호출 감지: 감시 스레드가 위 태스크의 마지막 깨어난 시각을 확인하여 LOOP_BLOCK_THRESHOLD_MS 넘게 멈춰 있으면
+  그 순간 루프 스레드의 스택을 기록합니다. (루프를 막고 있는 동기 호출이 스택 맨 안쪽에 보임)
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("profiler")
+
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", 60))
+# 샘플링 간격 하한 (밀리초)
+PROFILE_MIN_INTERVAL_MS = float(os.getenv("PROFILE_MIN_INTERVAL_MS", 1))
+# 한 스택에서 기록할 최대 프레임 수 (깊은 재귀 방지)
+PROFILE_MAX_DEPTH = int(os.getenv("PROFILE_MAX_DEPTH", 128))
+
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "1") == "1"
+# 루프 지연 측정 간격 (초)
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", 0.1))
+# 루프가 이 시간 넘게 멈추면 블로킹으로 보고 스택을 기록 (밀리초)
+LOOP_BLOCK_THRESHOLD_MS = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", 100))
+LOOP_BLOCK_LOG_SIZE = int(os.getenv("LOOP_BLOCK_LOG_SIZE", 50))
+
+# 루프가 할 일 없이 I/O를 기다리는 프레임 (CPU 프로파일에서 제외)
+_IDLE_FRAMES = {("selectors.py", "select"), ("base_events.py", "_run_once")}
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    # site-packages/ 이후 또는 앱 디렉터리 기준의 짧은 경로
+    for marker in ("site-packages/", "/app/"):
+        index = filename.rfind(marker)
+        if index >= 0:
+            filename = filename[index + len(marker):]
+            break
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _stack_labels(frame) -> List[str]:
+    """
+    프레임부터 바깥으로 올라가며 읽은 스택 (바깥 -> 안쪽 순서)
+    """
+    labels = []
+    while frame is not None and len(labels) < PROFILE_MAX_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _collapse(frame) -> Optional[str]:
+    """
+    프레임을 "바깥;...;안쪽" 문자열로 만듭니다. 루프가 대기 중인 스택이면 None
+    """
+    leaf = frame.f_code
+    if (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_FRAMES:
+        return None
+    return ";".join(_stack_labels(frame))
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, thread_id: int, seconds: float, interval: float, include_idle: bool):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.seconds = seconds
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        deadline = time.monotonic() + self.seconds
+        while not self._stop_event.is_set() and time.monotonic() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples += 1
+                stack = _collapse(frame)
+                if stack is None:
+                    self.idle_samples += 1
+                    if self.include_idle:
+                        self.stacks["(idle)"] += 1
+                else:
+                    self.stacks[stack] += 1
+            del frame
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_active_sampler: Optional[_Sampler] = None
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+async def profile(seconds: float, interval_ms: float = 10, include_idle: bool = False) -> Dict[str, object]:
+    """
+    이 워커의 이벤트 루프 스레드를 seconds초 동안 샘플링합니다. (워커당 동시에 하나)
+
+    Returns:
+        {"stacks": {collapsed stack: 횟수}, "samples": 전체 샘플 수, "idle_samples": 대기 중이던 샘플 수, ...}
+
+    Raises:
+        ProfilerBusy: 이미 프로파일링 중
+    """
+    global _active_sampler
+
+    if _active_sampler is not None and _active_sampler.is_alive():
+        raise ProfilerBusy("이미 프로파일링 중입니다.")
+
+    seconds = min(max(seconds, 0.1), PROFILE_MAX_SECONDS)
+    interval = max(interval_ms, PROFILE_MIN_INTERVAL_MS) / 1000
+    sampler = _Sampler(threading.get_ident(), seconds, interval, include_idle)
+    _active_sampler = sampler
+
+    started_at = time.monotonic()
+    sampler.start()
+    try:
+        # 루프를 막지 않고 샘플러 스레드가 끝나기를 기다림
+        while sampler.is_alive():
+            await asyncio.sleep(min(0.2, seconds))
+    finally:
+        # 요청이 취소되어도 샘플러를 멈춤
+        sampler.stop()
+
+    return {
+        "pid": os.getpid(),
+        "seconds": round(time.monotonic() - started_at, 3),
+        "interval_ms": interval * 1000,
+        "samples": sampler.samples,
+        "idle_samples": sampler.idle_samples,
+        "stacks": dict(sampler.stacks.most_common()),
+    }
+
+
+def to_collapsed(stacks: Dict[str, int]) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.items())
+
+
+# ---------------------------------------------------------------------------
+# 이벤트 루프 지연 / 블로킹 감지
+# ---------------------------------------------------------------------------
+
+class LoopMonitor:
+    def __init__(self, interval: float = LOOP_MONITOR_INTERVAL, threshold_ms: float = LOOP_BLOCK_THRESHOLD_MS):
+        self.interval = interval
+        self.threshold = threshold_ms / 1000
+        self.loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        # 현재 진행 중인 블로킹 (감시 스레드가 기록, 루프가 다시 깨어나면 소요 시간을 채움)
+        self._blocking: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.lag_samples: deque = deque(maxlen=600)
+        self.blocking_events: deque = deque(maxlen=LOOP_BLOCK_LOG_SIZE)
+        self.stats = {"ticks": 0, "max_lag_ms": 0.0, "blocking_events": 0}
+
+    def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self.loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop_event.clear()
+        self._task = asyncio.get_event_loop().create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop_event.set()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+
+            lag_ms = max(0.0, (now - expected) * 1000)
+            self.lag_samples.append(lag_ms)
+            self.stats["ticks"] += 1
+            if lag_ms > self.stats["max_lag_ms"]:
+                self.stats["max_lag_ms"] = round(lag_ms, 3)
+
+            blocking = self._blocking
+            if blocking is not None:
+                self._blocking = None
+                blocking["blocked_ms"] = round(lag_ms, 3)
+
+    def _watch(self):
+        check = min(self.interval, self.threshold) / 2
+        while not self._stop_event.wait(check):
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            if stalled < self.threshold or self._blocking is not None:
+                continue
+
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            event = {
+                "at": time.time(),
+                "blocked_ms": None,
+                "stack": _stack_labels(frame),
+            }
+            del frame
+            self._blocking = event
+            self.blocking_events.append(event)
+            self.stats["blocking_events"] += 1
+            logger.warning(f"이벤트 루프가 {stalled * 1000:.0f}ms 넘게 멈춤: {event['stack'][-1] if event['stack'] else '?'}")
+
+    def get_stats(self) -> Dict[str, object]:
+        lags = sorted(self.lag_samples)
+        return {
+            "enabled": self._task is not None and not self._task.done(),
+            "interval_ms": self.interval * 1000,
+            "block_threshold_ms": self.threshold * 1000,
+            **self.stats,
+            "lag_ms": {
+                "avg": round(sum(lags) / len(lags), 3) if lags else 0.0,
+                "p99": round(lags[int(len(lags) * 0.99)], 3) if lags else 0.0,
+                "last": round(self.lag_samples[-1], 3) if lags else 0.0,
+            },
+        }
+
+    def get_blocking_events(self) -> List[dict]:
+        return list(self.blocking_events)
+
+
+loop_monitor = LoopMonitor()
+
+
+def start_loop_monitor():
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+
+
+async def stop_loop_monitor():
+    await loop_monitor.stop()
+
+
+def get_loop_stats() -> Dict[str, object]:
+    return loop_monitor.get_stats()
@@ -0,0 +1,305 @@
+"""
+요청 속도 제한 모듈 (토큰 버킷)
+
+사용자(토큰의 user id, 없거나 잘못된 토큰이면 IP)와 라우트 정책별로 Redis에 토큰 버킷을 두고,
+Lua 스크립트 하나로 리필/차감을 원자적으로 처리합니다. 모든 워커가 같은 버킷을 공유합니다.
+
+Redis 왕복을 줄이기 위해 워커마다 로컬 상태를 둡니다.
+- 리스(lease): Redis에서 토큰을 최대 RATE_LIMIT_LEASE개 한 번에 받아 두고, 이후 요청은 로컬에서 차감
+  (받아 둔 토큰은 RATE_LIMIT_LEASE_TTL초 후 버려지므로 전체 허용량이 버킷 크기를 넘지 않음)
+- 차단: 거부된 키는 Retry-After가 지날 때까지 Redis를 거치지 않고 바로 거부
+
+미들웨어는 인증 RPC/DB보다 먼저 실행되므로, 사용자 식별은 토큰을 로컬에서 검증(SECRET)하여 처리합니다.
+Redis에 연결할 수 없으면 요청을 막지 않고 통과시킵니다. (fail-open)
+"""
+import json
+import logging
+import math
+import os
+import re
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import jwt
+import redis.asyncio as redis
+from starlette.responses import JSONResponse
+from libs.redis import get_redis_client
+from shared.ttl_cache import TTLCache
+from tools import SECRET
+
+logger = logging.getLogger("ratelimit")
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+# Redis에서 한 번에 받아 두는 토큰 수 (1이면 요청마다 Redis 확인)
+RATE_LIMIT_LEASE = int(os.getenv("RATE_LIMIT_LEASE", 4))
+RATE_LIMIT_LEASE_TTL = float(os.getenv("RATE_LIMIT_LEASE_TTL", 1))
+RATE_LIMIT_LOCAL_SIZE = int(os.getenv("RATE_LIMIT_LOCAL_SIZE", 50000))
+# 프록시 뒤에서 실행할 때만 X-Forwarded-For의 첫 번째 주소를 클라이언트 IP로 사용
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "0") == "1"
+RATE_LIMIT_PREFIX = "ratelimit:"
+
+# 요청 경로에 적용하지 않음
+RATE_LIMIT_EXEMPT_PATHS = ("/api/health", "/api/ready")
+
+# KEYS[1]: 버킷 키
+# ARGV[1]: 초당 리필 토큰 수, ARGV[2]: 버킷 크기, ARGV[3]: 현재 시각(ms), ARGV[4]: 받고 싶은 토큰 수
+# 반환: {받은 토큰 수, 받지 못했으면 다음 토큰까지 대기 시간(ms)}
+_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local want = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = burst
+    ts = now
+end
+if now > ts then
+    tokens = math.min(burst, tokens + (now - ts) * rate / 1000)
+    ts = now
+end
+
+local granted = math.min(want, math.floor(tokens))
+local retry_after = 0
+if granted >= 1 then
+    tokens = tokens - granted
+else
+    granted = 0
+    retry_after = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(ts))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return {granted, retry_after}
+"""
+
+
+class RatePolicy(NamedTuple):
+    name: str
+    methods: Tuple[str, ...]
+    pattern: "re.Pattern"
+    # 초당 토큰 수, 버킷 크기(순간적으로 허용하는 요청 수)
+    rate: float
+    burst: int
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    # 거부된 경우 다시 시도할 수 있을 때까지의 시간 (초)
+    retry_after: float
+    # local | redis | fail_open
+    source: str
+
+
+# (이름, 메서드, 경로 정규식, 초당 토큰 수, 버킷 크기) - 위에서부터 처음 일치하는 정책 적용
+_DEFAULT_POLICIES = [
+    ("hearts", ("POST", "DELETE"), r"^/api/posts/hearts$", 2, 10),
+    ("import", ("POST",), r"^/api/posts/import$", 0.1, 2),
+    ("detail", ("GET",), r"^/api/posts/\d+$", 10, 30),
+    ("write", ("POST",), r"^/api/(create|update/|delete/|comment/)", 1, 10),
+    ("default", (), r"^/api/", 20, 60),
+]
+
+
+def load_policies() -> List[RatePolicy]:
+    """
+    기본 정책에 RATE_LIMIT_POLICIES(JSON) 값을 덮어씁니다.
+    예: RATE_LIMIT_POLICIES='{"hearts": {"rate": 5, "burst": 20}}'
+    """
+    overrides = json.loads(os.getenv("RATE_LIMIT_POLICIES") or "{}")
+    policies = []
+    for name, methods, pattern, rate, burst in _DEFAULT_POLICIES:
+        override = overrides.get(name, {})
+        policies.append(RatePolicy(
+            name=name,
+            methods=methods,
+            pattern=re.compile(pattern),
+            rate=float(override.get("rate", rate)),
+            burst=int(override.get("burst", burst)),
+        ))
+    return policies
+
+
+class _LocalState:
+    __slots__ = ("tokens", "lease_expires_at", "blocked_until")
+
+    def __init__(self):
+        self.tokens = 0
+        self.lease_expires_at = 0.0
+        self.blocked_until = 0.0
+
+
+class RateLimiter:
+    def __init__(self, policies: List[RatePolicy], lease: int = RATE_LIMIT_LEASE, lease_ttl: float = RATE_LIMIT_LEASE_TTL):
+        self.policies = policies
+        self.lease = max(1, lease)
+        self.lease_ttl = lease_ttl
+        self._local = TTLCache(maxsize=RATE_LIMIT_LOCAL_SIZE, ttl=lease_ttl)
+        self._script = None
+        self._script_client = None
+        self.stats = {
+            "allowed_local": 0,
+            "allowed_redis": 0,
+            "rejected_local": 0,
+            "rejected_redis": 0,
+            "fail_open": 0,
+        }
+        self.rejected_by_policy: Dict[str, int] = {}
+
+    def match(self, method: str, path: str) -> Optional[RatePolicy]:
+        for policy in self.policies:
+            if (not policy.methods or method in policy.methods) and policy.pattern.match(path):
+                return policy
+        return None
+
+    def _reject(self, policy: RatePolicy, retry_after: float, source: str) -> Decision:
+        self.stats[f"rejected_{source}"] += 1
+        self.rejected_by_policy[policy.name] = self.rejected_by_policy.get(policy.name, 0) + 1
+        return Decision(False, retry_after, source)
+
+    async def acquire(self, policy: RatePolicy, identity: str) -> Decision:
+        """
+        요청 하나에 필요한 토큰을 얻습니다.
+        """
+        key = f"{RATE_LIMIT_PREFIX}{policy.name}:{identity}"
+        now = time.monotonic()
+
+        state = self._local.get(key)
+        if state is not None:
+            if state.blocked_until > now:
+                return self._reject(policy, state.blocked_until - now, "local")
+            if state.tokens > 0 and state.lease_expires_at > now:
+                state.tokens -= 1
+                self.stats["allowed_local"] += 1
+                return Decision(True, 0, "local")
+
+        try:
+            redis_client = await get_redis_client()
+            if redis_client is None:
+                raise ConnectionError("Redis 연결 실패")
+            if self._script_client is not redis_client:
+                self._script = redis_client.register_script(_TOKEN_BUCKET)
+                self._script_client = redis_client
+
+            granted, retry_after_ms = await self._script(
+                keys=[key],
+                args=[policy.rate, policy.burst, int(time.time() * 1000), min(self.lease, policy.burst)],
+            )
+        except (redis.RedisError, ConnectionError) as e:
+            self.stats["fail_open"] += 1
+            logger.warning(f"속도 제한 확인 실패, 요청 허용: {e!r}")
+            return Decision(True, 0, "fail_open")
+
+        if state is None:
+            state = _LocalState()
+        now = time.monotonic()
+
+        if granted < 1:
+            retry_after = int(retry_after_ms) / 1000
+            state.tokens = 0
+            state.blocked_until = now + retry_after
+            self._local.set(key, state, ttl=retry_after)
+            return self._reject(policy, retry_after, "redis")
+
+        state.tokens = int(granted) - 1
+        state.lease_expires_at = now + self.lease_ttl
+        state.blocked_until = 0.0
+        self._local.set(key, state)
+        self.stats["allowed_redis"] += 1
+        return Decision(True, 0, "redis")
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": RATE_LIMIT_ENABLED,
+            "lease": self.lease,
+            **self.stats,
+            "rejected_by_policy": dict(self.rejected_by_policy),
+            "local_keys": len(self._local),
+            "policies": {policy.name: {"rate": policy.rate, "burst": policy.burst} for policy in self.policies},
+        }
+
+
+limiter = RateLimiter(load_policies())
+
+# {토큰: user id 또는 None} (요청마다 서명 검증을 반복하지 않도록)
+_token_cache = TTLCache(maxsize=RATE_LIMIT_LOCAL_SIZE, ttl=60)
+
+
+def _user_id_from_token(token: str) -> Optional[int]:
+    cached = _token_cache.get(token, False)
+    if cached is not False:
+        return cached
+
+    user_id = None
+    if SECRET:
+        try:
+            info = jwt.decode(token, SECRET, algorithms="HS256")
+            if info.get("end", 0) > time.time():
+                user_id = info.get("id")
+        except jwt.PyJWTError:
+            pass
+    _token_cache.set(token, user_id)
+    return user_id
+
+
+def _client_ip(scope) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def get_identity(scope) -> str:
+    """
+    검증된 토큰이면 user id, 아니면 클라이언트 IP로 식별합니다.
+    (토큰을 위조해 다른 사용자의 버킷을 소진시키지 못하도록 서명을 검증)
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            parts = value.decode("latin-1").split(" ")
+            if len(parts) == 2 and parts[0] == "Bearer":
+                user_id = _user_id_from_token(parts[1])
+                if user_id is not None:
+                    return f"u:{user_id}"
+            break
+    return f"ip:{_client_ip(scope)}"
+
+
+class RateLimitMiddleware:
+    """
+    정책에 걸린 요청은 429와 Retry-After 헤더로 바로 응답하는 ASGI 미들웨어
+    """
+    def __init__(self, app, rate_limiter: RateLimiter = limiter):
+        self.app = app
+        self.limiter = rate_limiter
+
+    async def __call__(self, scope, receive, send):
+        if not RATE_LIMIT_ENABLED or scope["type"] != "http" or scope["path"] in RATE_LIMIT_EXEMPT_PATHS:
+            return await self.app(scope, receive, send)
+
+        policy = self.limiter.match(scope["method"], scope["path"])
+        if policy is None:
+            return await self.app(scope, receive, send)
+
+        decision = await self.limiter.acquire(policy, get_identity(scope))
+        if decision.allowed:
+            return await self.app(scope, receive, send)
+
+        retry_after = max(1, math.ceil(decision.retry_after))
+        response = JSONResponse(
+            {"detail": "요청이 너무 많습니다. 잠시 후 다시 시도해주세요."},
+            status_code=429,
+            headers={
+                "Retry-After": str(retry_after),
+                "X-RateLimit-Policy": f"{policy.name};rate={policy.rate:g};burst={policy.burst}",
+            },
+        )
+        await response(scope, receive, send)
+
+
+def get_rate_limit_stats() -> dict:
+    return limiter.get_stats()
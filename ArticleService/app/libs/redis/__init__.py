@@ -1,19 +1,39 @@
 from .client import redis_client, UPDATE_INTERVAL, get_redis_client, close_redis_connection
-from .views import increment_views, get_views, force_flush_backlog as force_flush_views_backlog
+from .views import increment_views, increment_views_coalesced, get_views, peek_views, get_coalescing_stats, force_flush_backlog as force_flush_views_backlog
 from .hearts import increment_hearts, decrement_hearts, get_hearts, force_flush_backlog as force_flush_hearts_backlog
-from .common import get_all_cached_stats, clear_cache_for_post, sync_post_stats
+from .counters import get_seed_stats, pop_dirty_counters, restore_dirty_counters, get_dirty_counter_stats
+from .viewers import record_view, pop_dirty_unique_viewers, restore_dirty_unique_viewers, get_viewer_stats
+from .common import get_all_cached_stats, get_cached_stats_for_posts, clear_cache_for_post, sync_post_stats
+from .nodes import get_post_client, get_node_stats
+from .client import get_node_client, get_all_node_clients
 
 __all__ = [
     'redis_client',
     'get_redis_client',
     'close_redis_connection',
+    'get_node_client',
+    'get_all_node_clients',
+    'get_post_client',
+    'get_node_stats',
     'UPDATE_INTERVAL',
     'increment_views',
+    'increment_views_coalesced',
+    'get_coalescing_stats',
+    'get_seed_stats',
+    'pop_dirty_counters',
+    'restore_dirty_counters',
+    'get_dirty_counter_stats',
     'get_views',
+    'peek_views',
+    'record_view',
+    'pop_dirty_unique_viewers',
+    'restore_dirty_unique_viewers',
+    'get_viewer_stats',
     'increment_hearts',
     'decrement_hearts',
     'get_hearts',
     'get_all_cached_stats',
+    'get_cached_stats_for_posts',
     'clear_cache_for_post',
     'sync_post_stats',
     'force_flush_backlogs',
@@ -3,13 +3,18 @@ Redis 클라이언트 모듈
 
 비동기 Redis 연결 및 기본 설정을 관리합니다.
 연결 풀 관리 및 실패 처리 로직이 포함되어 있습니다.
+
+REDIS_NODES에 여러 노드를 지정하면 노드마다 별도의 연결 풀을 두며, 0번 노드가 기본 노드입니다.
+(게시글 키를 어느 노드에 둘지는 nodes.py에서 결정)
 """
 import asyncio
 import logging
 import redis.asyncio as redis 
 import os
-from typing import Optional
+import time
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
+from shared.tracing import instrument_redis
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("redis_client")
@@ -24,8 +29,25 @@ REDIS_CONNECTION_RETRY = int(os.getenv("REDIS_CONNECTION_RETRY", 5))
 REDIS_CONNECTION_TIMEOUT = int(os.getenv("REDIS_CONNECTION_TIMEOUT", 30))
 REDIS_KEY_TTL = int(os.getenv("REDIS_KEY_TTL", 86400))  # 기본 TTL: 1일
 
+# REDIS_URL을 지정하면 HOST/PORT/DB 대신 사용
+# fakeredis:// 는 인메모리 가짜 Redis (벤치마크/로컬 실행용, fakeredis 패키지 필요)
+REDIS_URL = os.getenv("REDIS_URL") or f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
+
+# 게시글 키를 나눠 담을 Redis 노드 URL (쉼표로 구분, 예: redis://10.0.0.1:6379/0,redis://10.0.0.2:6379/0)
+# 지정하면 첫 번째 노드가 REDIS_URL을 대신하며, 게시글과 무관한 키(알림 스트림, 처리율 제한 등)는 그 노드에만 둠
+REDIS_NODES = [url.strip() for url in os.getenv("REDIS_NODES", "").split(",") if url.strip()]
+if REDIS_NODES:
+    REDIS_URL = REDIS_NODES[0]
+else:
+    REDIS_NODES = [REDIS_URL]
+REDIS_NODE_COUNT = len(REDIS_NODES)
+# 연결에 실패한 노드를 다시 시도하기까지 기다리는 시간 (초, 그동안 그 노드의 키는 Redis 오류와 같이 처리)
+REDIS_NODE_RETRY_INTERVAL = float(os.getenv("REDIS_NODE_RETRY_INTERVAL", 5))
+
 VIEWS_PREFIX = "views:"
 HEARTS_PREFIX = "hearts:"
+# DB에 아직 반영하지 않은 카운터가 있는 게시글 {post_id: 처음 바뀐 시각(unix time)}
+DIRTY_COUNTERS_KEY = "counters:dirty"
 
 UPDATE_INTERVAL = int(os.getenv("REDIS_UPDATE_INTERVAL", 60))
 
@@ -34,6 +56,36 @@ pool: Optional[redis.ConnectionPool] = None
 # Redis 연결 상태
 _is_connected = False
 
+# 1번 이후 노드의 클라이언트/연결 풀 (0번 노드는 위의 redis_client/pool)
+_node_clients: Dict[int, redis.Redis] = {}
+_node_pools: Dict[int, redis.ConnectionPool] = {}
+_node_locks: Dict[int, asyncio.Lock] = {}
+# {node: 다시 연결을 시도할 시각(monotonic)}
+_node_retry_at: Dict[int, float] = {}
+
+def _create_client(node: int = 0) -> redis.Redis:
+    global pool
+
+    url = REDIS_NODES[node]
+    if url.startswith("fakeredis://"):
+        # 인스턴스마다 별도의 인메모리 서버이므로 노드마다 따로 만들면 여러 노드를 흉내낼 수 있음
+        from fakeredis import aioredis as fake_aioredis
+        return instrument_redis(fake_aioredis.FakeRedis(decode_responses=True))
+
+    node_pool = pool if node == 0 else _node_pools.get(node)
+    if node_pool is None:
+        node_pool = redis.ConnectionPool.from_url(
+            url,
+            max_connections=REDIS_POOL_SIZE,
+            decode_responses=True
+        )
+        if node == 0:
+            pool = node_pool
+        else:
+            _node_pools[node] = node_pool
+    # TRACING_ENABLED=1이면 명령/파이프라인마다 span 기록
+    return instrument_redis(redis.Redis(connection_pool=node_pool))
+
 async def get_redis_client() -> redis.Redis:
     """
     Redis 클라이언트 인스턴스를 반환합니다.
@@ -50,18 +102,12 @@ async def get_redis_client() -> redis.Redis:
     retry_count = 0
     while retry_count < REDIS_CONNECTION_RETRY:
         try:
-            if pool is None:
-                pool = redis.ConnectionPool.from_url(
-                    f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}",
-                    max_connections=REDIS_POOL_SIZE,
-                    decode_responses=True
-                )
-            
-            redis_client = redis.Redis(connection_pool=pool)
+            if redis_client is None:
+                redis_client = _create_client()
 
             await redis_client.ping()
             _is_connected = True
-            logger.info(f"Redis 서버({REDIS_HOST}:{REDIS_PORT})에 연결되었습니다.")
+            logger.info(f"Redis 서버({REDIS_URL})에 연결되었습니다.")
             return redis_client
         
         except (redis.RedisError, ConnectionError, asyncio.TimeoutError) as e:
@@ -74,6 +120,47 @@ async def get_redis_client() -> redis.Redis:
     _is_connected = False
     return None
 
+async def get_node_client(node: int) -> Optional[redis.Redis]:
+    """
+    node번 Redis 노드의 클라이언트를 반환합니다. (0번은 get_redis_client와 같음)
+    다른 노드는 요청이 재시도를 기다리지 않도록 한 번만 연결을 확인하고, 실패하면 None을 반환합니다.
+    (실패한 노드는 REDIS_NODE_RETRY_INTERVAL 동안 연결을 시도하지 않음)
+    """
+    if node == 0:
+        return await get_redis_client()
+
+    client = _node_clients.get(node)
+    if client is not None:
+        return client
+    if time.monotonic() < _node_retry_at.get(node, 0.0):
+        return None
+
+    lock = _node_locks.setdefault(node, asyncio.Lock())
+    async with lock:
+        client = _node_clients.get(node)
+        if client is not None:
+            return client
+        client = _create_client(node)
+        try:
+            await client.ping()
+        except (redis.RedisError, ConnectionError, OSError, asyncio.TimeoutError) as e:
+            logger.warning(f"Redis 노드 {node}({REDIS_NODES[node]}) 연결 실패: {str(e)}")
+            await client.close()
+            _node_retry_at[node] = time.monotonic() + REDIS_NODE_RETRY_INTERVAL
+            return None
+        _node_clients[node] = client
+        logger.info(f"Redis 노드 {node}({REDIS_NODES[node]})에 연결되었습니다.")
+        return client
+
+async def get_all_node_clients() -> List[Optional[redis.Redis]]:
+    """
+    모든 노드의 클라이언트 (노드 번호 순서, 연결하지 못한 노드는 None)
+    """
+    return list(await asyncio.gather(*(get_node_client(node) for node in range(REDIS_NODE_COUNT))))
+
+def get_connected_nodes() -> List[bool]:
+    return [_is_connected if node == 0 else node in _node_clients for node in range(REDIS_NODE_COUNT)]
+
 async def close_redis_connection():
     """
     Redis 연결을 정리합니다.
@@ -88,6 +175,13 @@ async def close_redis_connection():
     if pool is not None:
         await pool.disconnect()
         pool = None
+
+    for node, client in list(_node_clients.items()):
+        await client.close()
+    _node_clients.clear()
+    for node_pool in list(_node_pools.values()):
+        await node_pool.disconnect()
+    _node_pools.clear()
     
     _is_connected = False
     logger.info("Redis 연결이 종료되었습니다.") 
\ No newline at end of file
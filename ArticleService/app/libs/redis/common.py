@@ -3,17 +3,43 @@ Redis 공통 유틸리티 함수
 
 여러 통계 데이터를 일괄 처리하거나 캐시를 관리하는 함수들을 제공합니다.
 """
+import asyncio
 import logging
 import redis.asyncio as redis  
-from typing import Dict, Tuple, Any, List
-from .client import get_redis_client, VIEWS_PREFIX, HEARTS_PREFIX, REDIS_KEY_TTL
+from typing import Dict, Tuple, Any, List, Optional
+from .client import VIEWS_PREFIX, HEARTS_PREFIX, REDIS_KEY_TTL
+from .nodes import get_post_client, group_by_node, run_on_all_nodes, run_on_nodes
 
 # 로깅 설정
 logger = logging.getLogger("redis_common")
 
+async def _scan_values(redis_client, pattern: str) -> Dict[str, int]:
+    """
+    한 노드에서 pattern에 맞는 키를 SCAN 하여 {post_id: 값}으로 읽습니다.
+    """
+    result = {}
+    # 청크 단위로 키 조회 (SCAN 사용)
+    cursor = "0"
+    while cursor != 0:
+        cursor, keys = await redis_client.scan(cursor=cursor, match=pattern, count=100)
+        if keys:
+            # 파이프라인으로 일괄 조회
+            pipeline = redis_client.pipeline()
+            for key in keys:
+                pipeline.get(key)
+            values = await pipeline.execute()
+
+            # 결과 처리
+            for i, key in enumerate(keys):
+                if values[i]:
+                    post_id = key.split(":")[-1]
+                    result[post_id] = int(values[i])
+    return result
+
 async def get_all_cached_stats() -> Tuple[Dict[str, int], Dict[str, int]]:
     """
     캐시된 모든 조회수와 좋아요 수를 조회
+    Redis 노드가 여럿이면 모든 노드를 동시에 SCAN 하여 합칩니다. (연결하지 못한 노드는 빠짐)
     
     Returns:
         (views_dict, hearts_dict): 조회수와 좋아요 수 딕셔너리
@@ -22,58 +48,71 @@ async def get_all_cached_stats() -> Tuple[Dict[str, int], Dict[str, int]]:
     hearts_dict = {}
     
     try:
-        # Redis 클라이언트 가져오기
-        redis_client = await get_redis_client()
-        if redis_client is None:
-            logger.error("Redis 연결 실패: 캐시된 통계를 조회할 수 없습니다.")
+        async def _scan_node(redis_client):
+            return await asyncio.gather(
+                _scan_values(redis_client, f"{VIEWS_PREFIX}*"),
+                _scan_values(redis_client, f"{HEARTS_PREFIX}*"),
+            )
+
+        outcomes = await run_on_all_nodes(_scan_node)
+        for node, outcome in outcomes.items():
+            if isinstance(outcome, BaseException):
+                logger.error(f"Redis 노드 {node} 오류: 캐시된 통계를 조회할 수 없습니다. ({str(outcome)})")
+                continue
+            node_views, node_hearts = outcome
+            views_dict.update(node_views)
+            hearts_dict.update(node_hearts)
+
+        if outcomes and all(isinstance(outcome, BaseException) for outcome in outcomes.values()):
             return {}, {}
-        
-        # 청크 단위로 views 키 조회 (SCAN 사용)
-        cursor = "0"
-        views_pattern = f"{VIEWS_PREFIX}*"
-        while cursor != 0:
-            cursor, keys = await redis_client.scan(cursor=cursor, match=views_pattern, count=100)
-            if keys:
-                # 파이프라인으로 일괄 조회
-                pipeline = redis_client.pipeline()
-                for key in keys:
-                    pipeline.get(key)
-                values = await pipeline.execute()
-                
-                # 결과 처리
-                for i, key in enumerate(keys):
-                    if values[i]:
-                        post_id = key.split(":")[-1]
-                        views_dict[post_id] = int(values[i])
-        
-        # 청크 단위로 hearts 키 조회 (SCAN 사용)
-        cursor = "0"
-        hearts_pattern = f"{HEARTS_PREFIX}*"
-        while cursor != 0:
-            cursor, keys = await redis_client.scan(cursor=cursor, match=hearts_pattern, count=100)
-            if keys:
-                # 파이프라인으로 일괄 조회
-                pipeline = redis_client.pipeline()
-                for key in keys:
-                    pipeline.get(key)
-                values = await pipeline.execute()
-                
-                # 결과 처리
-                for i, key in enumerate(keys):
-                    if values[i]:
-                        post_id = key.split(":")[-1]
-                        hearts_dict[post_id] = int(values[i])
-                
+
         logger.info(f"캐시된 통계 조회 완료: {len(views_dict)}개 조회수, {len(hearts_dict)}개 좋아요 수")
         return views_dict, hearts_dict
         
-    except redis.RedisError as e:
-        logger.error(f"Redis 오류 (통계 조회): {str(e)}")
-        return {}, {}
     except Exception as e:
         logger.error(f"예상치 못한 오류 (통계 조회): {str(e)}")
         return {}, {}
 
+async def get_cached_stats_for_posts(post_ids: List[int]) -> Dict[int, Tuple[Optional[int], Optional[int]]]:
+    """
+    여러 게시글의 캐시된 조회수와 좋아요 수를 한 번에 조회
+    Redis 노드가 여럿이면 노드별 파이프라인을 동시에 실행합니다.
+
+    Args:
+        post_ids: 게시글 ID 목록
+
+    Returns:
+        {post_id: (views, hearts)}: 캐시에 없는 값은 None, 연결하지 못한 노드의 게시글은 결과에서 빠짐
+    """
+    if not post_ids:
+        return {}
+
+    async def _mget(redis_client, node_post_ids: List[int]):
+        # MGET 두 번을 하나의 파이프라인으로 처리
+        pipeline = redis_client.pipeline()
+        pipeline.mget([f"{VIEWS_PREFIX}{post_id}" for post_id in node_post_ids])
+        pipeline.mget([f"{HEARTS_PREFIX}{post_id}" for post_id in node_post_ids])
+        return await pipeline.execute()
+
+    try:
+        groups = group_by_node(post_ids)
+        stats = {}
+        for node, outcome in (await run_on_nodes(groups, _mget)).items():
+            if isinstance(outcome, BaseException):
+                logger.error(f"Redis 오류 (통계 일괄 조회, 노드 {node}): {str(outcome)}")
+                continue
+            views_values, hearts_values = outcome
+            for post_id, views, hearts in zip(groups[node], views_values, hearts_values):
+                stats[post_id] = (
+                    int(views) if views is not None else None,
+                    int(hearts) if hearts is not None else None,
+                )
+        return stats
+
+    except Exception as e:
+        logger.error(f"예상치 못한 오류 (통계 일괄 조회): {str(e)}")
+        return {}
+
 async def clear_cache_for_post(post_id: int) -> bool:
     """
     특정 게시글의 캐시 삭제
@@ -88,8 +127,8 @@ async def clear_cache_for_post(post_id: int) -> bool:
     hearts_key = f"{HEARTS_PREFIX}{post_id}"
     
     try:
-        # Redis 클라이언트 가져오기
-        redis_client = await get_redis_client()
+        # 게시글 키가 있는 노드의 Redis 클라이언트 가져오기
+        redis_client = await get_post_client(post_id)
         if redis_client is None:
             logger.error(f"Redis 연결 실패: post_id={post_id}의 캐시를 삭제할 수 없습니다.")
             return False
@@ -123,8 +162,8 @@ async def sync_post_stats(post_id: int, views: int, hearts: int) -> bool:
     hearts_key = f"{HEARTS_PREFIX}{post_id}"
     
     try:
-        # Redis 클라이언트 가져오기
-        redis_client = await get_redis_client()
+        # 게시글 키가 있는 노드의 Redis 클라이언트 가져오기
+        redis_client = await get_post_client(post_id)
         if redis_client is None:
             logger.error(f"Redis 연결 실패: post_id={post_id}의 통계를 동기화할 수 없습니다.")
             return False
@@ -0,0 +1,294 @@
+"""
+Redis 카운터 증감 + 캐시 미스 시 DB 값으로 초기화 (seed-on-miss)
+
+카운터 키는 REDIS_KEY_TTL이 지나면 사라지므로, 그대로 INCR 하면 1부터 다시 세게 되고
+배치 업데이트가 그 작은 값으로 DB의 실제 값을 덮어씁니다.
+이를 막기 위해 키가 없을 때는 증가시키지 않고, DB 값으로 한 번 초기화한 뒤 증가시킵니다.
+
+- 증감은 Lua 스크립트 하나로 처리: 키가 있으면 증감 + TTL 갱신, 없으면 nil 반환 (왕복 1회)
+- 키가 없으면 게시글별 single-flight로 DB를 한 번만 조회하고 SET NX로 조회수/좋아요 수를 함께 초기화
+  (다른 워커가 먼저 초기화했다면 그 값을 유지)
+- 초기화 후 다시 증감 (그 사이 키가 또 사라졌다면 스크립트가 전달받은 DB 값으로 초기화)
+- DB에 없는 게시글은 키를 만들지 않고 0을 반환
+
+증감한 게시글은 같은 스크립트 안에서 dirty 정렬 집합(DIRTY_COUNTERS_KEY)에 처음 바뀐 시각으로 추가되며,
+배치 업데이트는 이 집합에서 오래된 것부터 꺼내 DB에 반영합니다. (반영 지연 = 가장 오래된 시각부터 지금까지)
+Redis 노드가 여럿이면 dirty 집합도 노드마다 있으며 (게시글 키와 같은 노드), 꺼내기/복원/통계는 모든 노드에 나눠 실행합니다.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from libs.singleflight import SingleFlight
+from .client import VIEWS_PREFIX, HEARTS_PREFIX, REDIS_KEY_TTL, DIRTY_COUNTERS_KEY, REDIS_NODE_COUNT
+from .nodes import group_by_node, run_on_all_nodes, run_on_nodes
+
+logger = logging.getLogger("redis_counters")
+
+# KEYS[1]: 카운터 키, KEYS[2]: dirty 정렬 집합
+# ARGV[1]: 증감량, ARGV[2]: TTL, ARGV[3]: 키가 없을 때 사용할 초기값("" 이면 초기화하지 않고 nil 반환)
+# ARGV[4]: "1"이면 0 미만으로 내려가지 않음, ARGV[5]: 게시글 ID, ARGV[6]: 현재 시각
+_INCRBY_SEEDED = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    if ARGV[3] == '' then
+        return false
+    end
+    current = ARGV[3]
+end
+local value = tonumber(current) + tonumber(ARGV[1])
+if ARGV[4] == '1' and value < 0 then
+    value = 0
+end
+redis.call('SET', KEYS[1], value, 'EX', ARGV[2])
+redis.call('ZADD', KEYS[2], 'NX', ARGV[6], ARGV[5])
+return value
+"""
+
+_seed_flight = SingleFlight("counter_seed")
+
+# redis 클라이언트(노드)별로 등록한 스크립트 (재연결 시 다시 등록)
+_scripts = {}
+
+_seed_stats = {"misses": 0, "seeded_posts": 0, "missing_posts": 0}
+
+
+def _script(redis_client):
+    script = _scripts.get(id(redis_client))
+    if script is None:
+        if len(_scripts) >= REDIS_NODE_COUNT:
+            _scripts.clear()
+        script = _scripts[id(redis_client)] = redis_client.register_script(_INCRBY_SEEDED)
+    return script
+
+
+def _stat_index(prefix: str) -> int:
+    return 0 if prefix == VIEWS_PREFIX else 1
+
+
+async def _load_db_counters(post_ids: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+    """
+    DB에서 게시글별 (조회수, 좋아요 수)를 조회합니다. 없는 게시글은 결과에 포함되지 않습니다.
+    """
+    from database.posts import Posts
+    from database.sharding import group_by_shard, shard_session
+
+    async def _load(shard: int, ids: List[int]) -> Dict[int, Tuple[int, int]]:
+        async with shard_session(shard) as session:
+            result = await session.execute(
+                select(Posts.id, Posts.views, Posts.hearts).where(Posts.id.in_(ids))
+            )
+            return {row.id: (row.views, row.hearts) for row in result}
+
+    counters: Dict[int, Tuple[int, int]] = {}
+    for loaded in await asyncio.gather(*(_load(shard, ids) for shard, ids in group_by_shard(post_ids).items())):
+        counters.update(loaded)
+    return counters
+
+
+async def _seed_keys(redis_client, counters: Dict[int, Tuple[int, int]]):
+    """
+    조회수/좋아요 키를 SET NX로 초기화합니다. (이미 있는 키는 그대로 둠)
+    """
+    if not counters:
+        return
+
+    pipeline = redis_client.pipeline()
+    for post_id, (views, hearts) in counters.items():
+        pipeline.set(f"{VIEWS_PREFIX}{post_id}", views, nx=True, ex=REDIS_KEY_TTL)
+        pipeline.set(f"{HEARTS_PREFIX}{post_id}", hearts, nx=True, ex=REDIS_KEY_TTL)
+    await pipeline.execute()
+    _seed_stats["seeded_posts"] += len(counters)
+
+
+async def seed_post_counters(redis_client, post_id: int) -> Optional[Tuple[int, int]]:
+    """
+    게시글 하나의 카운터를 DB 값으로 초기화합니다. 동시에 여러 요청이 와도 DB 조회는 한 번입니다.
+
+    Returns:
+        DB의 (조회수, 좋아요 수), 게시글이 없으면 None
+    """
+    async def _seed():
+        counters = await _load_db_counters([post_id])
+        if post_id not in counters:
+            _seed_stats["missing_posts"] += 1
+            return None
+        await _seed_keys(redis_client, counters)
+        return counters[post_id]
+
+    return await _seed_flight.do(post_id, _seed)
+
+
+async def incr_counter(redis_client, prefix: str, post_id: int, delta: int, floor_zero: bool = False) -> int:
+    """
+    카운터를 delta만큼 증감하고 결과 값을 반환합니다. 키가 없으면 DB 값으로 초기화한 뒤 증감합니다.
+    """
+    script = _script(redis_client)
+    key = f"{prefix}{post_id}"
+    floor = "1" if floor_zero else "0"
+
+    value = await script(keys=[key, DIRTY_COUNTERS_KEY], args=[delta, REDIS_KEY_TTL, "", floor, post_id, time.time()])
+    if value is not None:
+        return int(value)
+
+    _seed_stats["misses"] += 1
+    seeded = await seed_post_counters(redis_client, post_id)
+    if seeded is None:
+        return 0
+
+    value = await script(
+        keys=[key, DIRTY_COUNTERS_KEY],
+        args=[delta, REDIS_KEY_TTL, seeded[_stat_index(prefix)], floor, post_id, time.time()],
+    )
+    return int(value)
+
+
+async def incr_counters(redis_client, prefix: str, deltas: Dict[int, int], floor_zero: bool = False) -> Dict[int, int]:
+    """
+    여러 게시글의 카운터를 한 번에 증감합니다. (백로그 반영용)
+    키가 없는 게시글은 DB를 한 번에 조회하여 초기화하며, DB에도 없는 게시글은 결과에서 빠집니다.
+
+    Returns:
+        {post_id: 증감 후 값}
+    """
+    if not deltas:
+        return {}
+
+    script = _script(redis_client)
+    floor = "1" if floor_zero else "0"
+    now = time.time()
+
+    pipeline = redis_client.pipeline()
+    for post_id, delta in deltas.items():
+        # 파이프라인에서는 await 시 명령이 큐에 쌓이기만 함
+        await script(
+            keys=[f"{prefix}{post_id}", DIRTY_COUNTERS_KEY],
+            args=[delta, REDIS_KEY_TTL, "", floor, post_id, now],
+            client=pipeline,
+        )
+    values = await pipeline.execute()
+
+    results = {}
+    missing = []
+    for post_id, value in zip(deltas, values):
+        if value is None:
+            missing.append(post_id)
+        else:
+            results[post_id] = int(value)
+
+    if missing:
+        _seed_stats["misses"] += len(missing)
+        counters = await _load_db_counters(missing)
+        _seed_stats["missing_posts"] += len(missing) - len(counters)
+        await _seed_keys(redis_client, counters)
+
+        pipeline = redis_client.pipeline()
+        for post_id, seeds in counters.items():
+            await script(
+                keys=[f"{prefix}{post_id}", DIRTY_COUNTERS_KEY],
+                args=[deltas[post_id], REDIS_KEY_TTL, seeds[_stat_index(prefix)], floor, post_id, now],
+                client=pipeline,
+            )
+        for post_id, value in zip(counters, await pipeline.execute()):
+            results[post_id] = int(value)
+
+    return results
+
+
+async def incr_counters_by_node(
+    prefix: str, deltas: Dict[int, int], floor_zero: bool = False
+) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """
+    게시글을 노드별로 나눠 incr_counters를 동시에 실행합니다.
+    한 노드가 실패해도 다른 노드의 증감은 반영되므로, 실패한 노드의 몫만 돌려받아 다시 시도해야 합니다.
+
+    Returns:
+        ({post_id: 증감 후 값}, {post_id: 반영하지 못한 증감량})
+    """
+    if not deltas:
+        return {}, {}
+
+    groups = {
+        node: {post_id: deltas[post_id] for post_id in post_ids}
+        for node, post_ids in group_by_node(deltas).items()
+    }
+    results: Dict[int, int] = {}
+    failed: Dict[int, int] = {}
+    outcomes = await run_on_nodes(
+        groups, lambda redis_client, part: incr_counters(redis_client, prefix, part, floor_zero)
+    )
+    for node, outcome in outcomes.items():
+        if isinstance(outcome, BaseException):
+            logger.error(f"Redis 노드 {node}의 카운터 {len(groups[node])}개 반영 실패: {str(outcome)}")
+            failed.update(groups[node])
+        else:
+            results.update(outcome)
+    return results, failed
+
+
+async def pop_dirty_counters(count: int) -> List[Tuple[int, float]]:
+    """
+    DB에 반영할 게시글을 오래된 것부터 꺼냅니다. (노드마다 최대 count개, 노드가 하나면 최대 count개)
+    꺼낸 뒤 다시 증감된 게시글은 새 시각으로 다시 추가되므로 변경이 누락되지 않으며,
+    DB 반영에 실패하면 restore_dirty_counters로 되돌려야 합니다.
+
+    Returns:
+        [(post_id, 처음 바뀐 시각)]
+    """
+    async def _pop(redis_client):
+        return await redis_client.zpopmin(DIRTY_COUNTERS_KEY, count)
+
+    items = []
+    for node, popped in (await run_on_all_nodes(_pop)).items():
+        if isinstance(popped, BaseException):
+            logger.error(f"Redis 노드 {node} 연결 실패: 반영할 게시글 목록을 조회할 수 없습니다. ({str(popped)})")
+            continue
+        items.extend((int(member), float(score)) for member, score in popped)
+    if REDIS_NODE_COUNT > 1:
+        items.sort(key=lambda item: item[1])
+    return items
+
+
+async def restore_dirty_counters(items: List[Tuple[int, float]]):
+    """
+    DB 반영에 실패한 게시글을 원래 시각으로 되돌립니다. (그 사이 다시 추가되었다면 더 오래된 시각 유지)
+    """
+    if not items:
+        return
+
+    scores = dict(items)
+
+    async def _restore(redis_client, post_ids: List[int]):
+        await redis_client.zadd(DIRTY_COUNTERS_KEY, {post_id: scores[post_id] for post_id in post_ids}, lt=True)
+
+    for node, outcome in (await run_on_nodes(group_by_node(scores), _restore)).items():
+        if isinstance(outcome, BaseException):
+            logger.error(f"카운터 dirty 목록 복원 실패 (노드 {node}): {str(outcome)}")
+
+
+async def get_dirty_counter_stats() -> Tuple[int, Optional[float]]:
+    """
+    Returns:
+        (DB에 반영되지 않은 게시글 수, 그중 가장 오래된 변경 시각 또는 None) - 연결하지 못한 노드는 제외
+    """
+    async def _stats(redis_client):
+        pipeline = redis_client.pipeline(transaction=False)
+        pipeline.zcard(DIRTY_COUNTERS_KEY)
+        pipeline.zrange(DIRTY_COUNTERS_KEY, 0, 0, withscores=True)
+        return await pipeline.execute()
+
+    total = 0
+    oldest_at: Optional[float] = None
+    for outcome in (await run_on_all_nodes(_stats)).values():
+        if isinstance(outcome, BaseException):
+            continue
+        count, oldest = outcome
+        total += int(count)
+        if oldest and (oldest_at is None or float(oldest[0][1]) < oldest_at):
+            oldest_at = float(oldest[0][1])
+    return total, oldest_at
+
+
+def get_seed_stats() -> Dict[str, int]:
+    return dict(_seed_stats)
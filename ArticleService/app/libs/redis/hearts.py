@@ -10,7 +10,9 @@ from collections import defaultdict
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis  
-from .client import get_redis_client, HEARTS_PREFIX, REDIS_KEY_TTL
+from .client import HEARTS_PREFIX
+from .counters import incr_counter, incr_counters_by_node
+from .nodes import get_post_client
 
 logger = logging.getLogger("redis_hearts")
 
@@ -31,22 +33,16 @@ async def increment_hearts(post_id: int) -> int:
     Returns:
         현재 좋아요 수
     """
-    key = f"{HEARTS_PREFIX}{post_id}"
-    
     try:
-        # Redis 클라이언트 가져오기
-        redis_client = await get_redis_client()
+        # 게시글 키가 있는 노드의 Redis 클라이언트 가져오기
+        redis_client = await get_post_client(post_id)
         if redis_client is None:
             # Redis 연결 실패 시 로컬 메모리에 백로그 추가
             logger.warning(f"Redis 연결 실패: post_id={post_id} 좋아요 증가 요청을 백로그에 추가합니다.")
             return await _add_to_backlog(post_id, 1)
         
-        # 좋아요 수 증가 및 조회
-        current_hearts = await redis_client.incr(key)
-        
-        # TTL 설정 (키가 존재하지 않았을 때만)
-        if current_hearts == 1:
-            await redis_client.expire(key, REDIS_KEY_TTL)
+        # 좋아요 수 증가 및 조회 (키가 만료되었으면 DB 값으로 초기화 후 증가)
+        current_hearts = await incr_counter(redis_client, HEARTS_PREFIX, post_id, 1)
         
         # 백로그 처리 시도 (주기적으로)
         if time.time() - _last_flush_time > _FLUSH_INTERVAL:
@@ -73,32 +69,22 @@ async def decrement_hearts(post_id: int) -> int:
     Returns:
         현재 좋아요 수 (0 미만으로 내려가지 않음)
     """
-    key = f"{HEARTS_PREFIX}{post_id}"
-    
     try:
-        # Redis 클라이언트 가져오기
-        redis_client = await get_redis_client()
+        # 게시글 키가 있는 노드의 Redis 클라이언트 가져오기
+        redis_client = await get_post_client(post_id)
         if redis_client is None:
             # Redis 연결 실패 시 로컬 메모리에 백로그 추가
             logger.warning(f"Redis 연결 실패: post_id={post_id} 좋아요 감소 요청을 백로그에 추가합니다.")
             return await _add_to_backlog(post_id, -1)
         
-        # 현재 좋아요 수 조회
-        current_hearts = await redis_client.get(key)
+        # 좋아요 수 감소 및 조회 (0 미만으로 내려가지 않도록 한 번에 처리)
+        new_hearts = await incr_counter(redis_client, HEARTS_PREFIX, post_id, -1, floor_zero=True)
         
-        if current_hearts and int(current_hearts) > 0:
-            # 좋아요 수 감소 및 조회
-            new_hearts = await redis_client.decr(key)
+        # 백로그 처리 시도 (주기적으로)
+        if time.time() - _last_flush_time > _FLUSH_INTERVAL:
+            asyncio.create_task(_flush_backlog())
             
-            # 백로그 처리 시도 (주기적으로)
-            if time.time() - _last_flush_time > _FLUSH_INTERVAL:
-                asyncio.create_task(_flush_backlog())
-                
-            return new_hearts
-        else:
-            # 좋아요가 없거나 0인 경우 0으로 설정
-            await redis_client.set(key, 0, ex=REDIS_KEY_TTL)
-            return 0
+        return new_hearts
             
     except redis.RedisError as e:
         logger.error(f"Redis 오류 (좋아요 감소): {str(e)}, post_id={post_id}")
@@ -140,34 +126,20 @@ async def _flush_backlog():
         return
     
     try:
-        redis_client = await get_redis_client()
-        if redis_client is None:
-            logger.warning("백로그 처리 시도 중 Redis 연결 실패")
-            return
-            
         # 백로그 데이터 복사 및 초기화 (처리 중 새 요청과 경쟁 조건 방지)
         async with _backlog_lock:
             backlog_copy = dict(_hearts_backlog)
             _hearts_backlog.clear()
         
-        # Redis 파이프라인으로 일괄 처리
-        for post_id, delta in backlog_copy.items():
-            key = f"{HEARTS_PREFIX}{post_id}"
-            try:
-                # 현재 값 조회
-                current = await redis_client.get(key)
-                current_val = int(current) if current else 0
-                
-                # 새 값 계산 (음수 안됨)
-                new_val = max(0, current_val + delta)
-                
-                # 값 설정 및 TTL 설정
-                await redis_client.set(key, new_val, ex=REDIS_KEY_TTL)
-            except Exception as e:
-                logger.error(f"개별 좋아요 백로그 처리 실패: {post_id}, {delta}, {str(e)}")
-                # 실패 시 해당 항목만 백로그에 복원
-                async with _backlog_lock:
+        # 현재 값에 변경량을 더함 (음수 안됨, 만료된 키는 DB 값으로 초기화 후 반영)
+        _, failed = await incr_counters_by_node(HEARTS_PREFIX, backlog_copy, floor_zero=True)
+        if failed:
+            # 연결하지 못한 노드의 몫만 백로그로 되돌림 (다른 노드에는 이미 반영됨)
+            logger.warning(f"백로그 처리 중 Redis 연결 실패: {len(failed)}개 게시글은 다음에 다시 시도")
+            async with _backlog_lock:
+                for post_id, delta in failed.items():
                     _hearts_backlog[post_id] += delta
+            return
                     
         logger.info(f"좋아요 백로그 처리 성공: {len(backlog_copy)}개 게시글 좋아요 수 업데이트")
         _last_flush_time = time.time()
@@ -192,8 +164,8 @@ async def get_hearts(post_id: int) -> int:
     key = f"{HEARTS_PREFIX}{post_id}"
     
     try:
-        # Redis 클라이언트 가져오기
-        redis_client = await get_redis_client()
+        # 게시글 키가 있는 노드의 Redis 클라이언트 가져오기
+        redis_client = await get_post_client(post_id)
         if redis_client is None:
             logger.error(f"Redis 연결 실패: post_id={post_id} 좋아요 조회 요청을 처리할 수 없습니다.")
             # 백로그에 있는 값 확인
@@ -0,0 +1,123 @@
+"""
+여러 Redis 노드에 게시글 키 나눠 담기 (REDIS_NODES)
+
+게시글 ID를 일관된 해싱(consistent hashing) 링에 올려 노드를 고릅니다.
+노드마다 REDIS_NODE_VNODES개의 가상 노드를 노드 URL로 해싱해 두므로, 노드를 추가/제거해도
+대부분의 게시글은 원래 노드에 남고 (약 1/N만 이동) 키가 노드 사이에 고르게 퍼집니다.
+
+- 한 게시글의 키(views:, hearts:, uv:, viewdedup:)는 모두 같은 노드에 있으므로
+  카운터 Lua 스크립트나 게시글 하나에 대한 파이프라인은 그대로 한 노드에서 실행됩니다.
+- DB 반영 대상 목록(counters:dirty, uv:dirty)은 노드마다 따로 두어, 스크립트가 다른 노드의 키를 건드리지 않습니다.
+- 여러 게시글에 대한 명령은 group_by_node로 나눠 노드별 파이프라인을 동시에 실행합니다.
+
+노드가 하나이면 (기본) 모든 게시글이 0번 노드에 있으며 링을 만들지 않습니다.
+"""
+import asyncio
+import bisect
+import hashlib
+import os
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+import redis.asyncio as redis
+from .client import REDIS_NODES, REDIS_NODE_COUNT, get_node_client, get_connected_nodes
+
+T = TypeVar("T")
+
+REDIS_NODE_VNODES = int(os.getenv("REDIS_NODE_VNODES", 160))
+
+
+def _ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    def __init__(self, nodes: List[str], vnodes: int):
+        # 노드 번호가 아니라 URL로 해싱하여, 목록 순서가 바뀌어도 같은 노드는 같은 구간을 맡음
+        points = sorted(
+            (_ring_hash(f"{url}#{replica}"), node)
+            for node, url in enumerate(nodes)
+            for replica in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key: str) -> int:
+        index = bisect.bisect(self._hashes, _ring_hash(key))
+        return self._nodes[index % len(self._nodes)]
+
+
+_ring = HashRing(REDIS_NODES, REDIS_NODE_VNODES) if REDIS_NODE_COUNT > 1 else None
+
+
+@lru_cache(maxsize=65536)
+def _ring_node(post_id: int) -> int:
+    return _ring.node_for(str(post_id))
+
+
+def node_for_post(post_id: int) -> int:
+    """
+    게시글 키가 있는 노드 번호
+    """
+    if _ring is None:
+        return 0
+    return _ring_node(int(post_id))
+
+
+def group_by_node(post_ids: Iterable[int]) -> Dict[int, List[int]]:
+    """
+    게시글 ID를 노드별로 나눕니다. (각 노드 안에서는 입력 순서 유지)
+    """
+    if _ring is None:
+        return {0: list(post_ids)}
+
+    groups: Dict[int, List[int]] = {}
+    for post_id in post_ids:
+        groups.setdefault(node_for_post(post_id), []).append(post_id)
+    return groups
+
+
+async def get_post_client(post_id: int) -> Optional[redis.Redis]:
+    """
+    게시글 키가 있는 노드의 클라이언트 (연결 실패 시 None)
+    """
+    return await get_node_client(node_for_post(post_id))
+
+
+async def run_on_nodes(groups: Dict[int, T], fn: Callable[[redis.Redis, T], Awaitable]) -> Dict[int, object]:
+    """
+    노드별로 fn(클라이언트, 그 노드의 몫)을 동시에 실행합니다.
+
+    Returns:
+        {node: 결과 또는 예외} - 연결하지 못한 노드는 ConnectionError
+    """
+    async def _run(node: int, part: T):
+        redis_client = await get_node_client(node)
+        if redis_client is None:
+            raise ConnectionError(f"Redis 노드 {node} 연결 실패")
+        return await fn(redis_client, part)
+
+    if len(groups) == 1:
+        # 노드가 하나면 태스크를 만들지 않음
+        (node, part), = groups.items()
+        try:
+            return {node: await _run(node, part)}
+        except Exception as e:
+            return {node: e}
+
+    results = await asyncio.gather(*(_run(node, part) for node, part in groups.items()), return_exceptions=True)
+    return dict(zip(groups, results))
+
+
+async def run_on_all_nodes(fn: Callable[[redis.Redis], Awaitable]) -> Dict[int, object]:
+    """
+    모든 노드에서 fn(클라이언트)을 동시에 실행합니다. (SCAN, dirty 목록 조회 등)
+    """
+    return await run_on_nodes({node: None for node in range(REDIS_NODE_COUNT)}, lambda client, _: fn(client))
+
+
+def get_node_stats() -> Dict[str, object]:
+    return {
+        "nodes": REDIS_NODE_COUNT,
+        "virtual_nodes": REDIS_NODE_VNODES if _ring is not None else 0,
+        "connected": get_connected_nodes(),
+    }
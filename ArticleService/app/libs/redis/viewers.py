@@ -0,0 +1,166 @@
+"""
+게시글 순 방문자(unique viewers) 집계 + 사용자별 조회수 중복 제거
+
+- 순 방문자: 게시글마다 HyperLogLog(PFADD/PFCOUNT)에 user id를 넣어 추정 (방문자 수와 관계없이 최대 약 12KB)
+  조회된 게시글을 dirty 집합에 넣어 두고, 배치 업데이트가 그 게시글만 PFCOUNT 하여 DB에 반영
+- 중복 제거(VIEW_DEDUP_WINDOW분, 0이면 사용 안 함): 같은 사용자는 창(window)마다 한 번만 조회수를 올림
+  창마다 게시글별 Redis SET에 user id를 넣고, 창이 끝나면 만료
+  (멤버가 set-max-intset-entries(기본 512) 이하인 동안은 intset이라 사용자당 수 바이트,
+  넘으면 hashtable로 바뀌어 사용자당 수십 바이트)
+
+같은 워커에서 반복된 조회는 로컬 캐시에서 걸러 Redis를 거치지 않으며,
+그 외 조회도 Redis 왕복은 한 번 (SADD + PFADD 파이프라인)입니다.
+Redis 노드가 여럿이면 게시글의 키와 dirty 집합이 같은 노드에 있으므로 이 파이프라인도 그 노드 하나로 갑니다.
+"""
+import logging
+import os
+import time
+from typing import Dict, List
+import redis.asyncio as redis
+from shared.ttl_cache import TTLCache
+from .nodes import get_post_client, group_by_node, run_on_all_nodes, run_on_nodes
+
+logger = logging.getLogger("redis_viewers")
+
+# 켜면 로컬 캐시에 없는 상세 조회마다 Redis 왕복(PFADD 파이프라인)이 한 번 더해지므로 기본은 끔
+UNIQUE_VIEWERS_ENABLED = os.getenv("UNIQUE_VIEWERS_ENABLED", "0") == "1"
+# 순 방문자 HLL 키 유지 기간 (조회될 때마다 갱신, 만료되어도 DB 값은 줄어들지 않음)
+UNIQUE_VIEWERS_TTL = int(os.getenv("UNIQUE_VIEWERS_TTL", 30 * 86400))
+# 같은 사용자의 조회를 한 번만 세는 기간 (분)
+VIEW_DEDUP_WINDOW = int(os.getenv("VIEW_DEDUP_WINDOW", 0))
+VIEW_DEDUP_LOCAL_SIZE = int(os.getenv("VIEW_DEDUP_LOCAL_SIZE", 100000))
+# 중복 제거를 쓰지 않을 때 이미 HLL에 넣은 (게시글, 사용자)를 기억하는 시간 (초)
+UNIQUE_VIEWERS_LOCAL_TTL = int(os.getenv("UNIQUE_VIEWERS_LOCAL_TTL", 600))
+
+UNIQUE_VIEWERS_PREFIX = "uv:"
+UNIQUE_VIEWERS_DIRTY_KEY = "uv:dirty"
+VIEW_DEDUP_PREFIX = "viewdedup:"
+
+# 한 번에 DB에 반영할 게시글 수
+_FLUSH_BATCH_SIZE = 500
+
+# {(post_id, user_id, 창 번호): True} - 이 워커에서 이미 Redis에 기록한 조회 (중복 제거를 쓰지 않으면 창 번호는 0)
+_local_seen = TTLCache(
+    maxsize=VIEW_DEDUP_LOCAL_SIZE,
+    ttl=VIEW_DEDUP_WINDOW * 60 if VIEW_DEDUP_WINDOW else UNIQUE_VIEWERS_LOCAL_TTL,
+)
+
+_viewer_stats = {"counted": 0, "deduped_local": 0, "deduped_redis": 0, "errors": 0}
+
+
+def _window() -> int:
+    return int(time.time() // (VIEW_DEDUP_WINDOW * 60))
+
+
+async def record_view(post_id: int, user_id: int) -> bool:
+    """
+    조회를 기록하고, 조회수를 올려야 하는지 반환합니다.
+
+    순 방문자 집계나 중복 제거가 켜져 있으면, 이 워커에서 처음 보는 (게시글, 사용자)마다
+    상세 조회 요청에 Redis 파이프라인 왕복이 한 번 더해집니다. (둘 다 꺼져 있으면 바로 True)
+
+    Returns:
+        중복 제거 창 안에서 이미 센 사용자면 False, 그 외(중복 제거를 쓰지 않거나 Redis 오류 포함)는 True
+    """
+    if not UNIQUE_VIEWERS_ENABLED and not VIEW_DEDUP_WINDOW:
+        return True
+
+    window = _window() if VIEW_DEDUP_WINDOW else 0
+    local_key = (post_id, user_id, window)
+    if local_key in _local_seen:
+        # 이미 HLL/중복 제거 집합에 들어 있으므로 Redis를 거치지 않음
+        if VIEW_DEDUP_WINDOW:
+            _viewer_stats["deduped_local"] += 1
+            return False
+        _viewer_stats["counted"] += 1
+        return True
+
+    try:
+        redis_client = await get_post_client(post_id)
+        if redis_client is None:
+            raise ConnectionError("Redis 연결 실패")
+
+        pipeline = redis_client.pipeline(transaction=False)
+        if VIEW_DEDUP_WINDOW:
+            dedup_key = f"{VIEW_DEDUP_PREFIX}{post_id}:{window}"
+            pipeline.sadd(dedup_key, user_id)
+            # 창이 끝나면 바로 사라지도록 만료 시각 지정
+            pipeline.expireat(dedup_key, (window + 1) * VIEW_DEDUP_WINDOW * 60 + 60)
+        if UNIQUE_VIEWERS_ENABLED:
+            hll_key = f"{UNIQUE_VIEWERS_PREFIX}{post_id}"
+            pipeline.pfadd(hll_key, user_id)
+            pipeline.expire(hll_key, UNIQUE_VIEWERS_TTL)
+            # 배치 업데이트는 이 집합에 있는 게시글만 PFCOUNT 하여 반영
+            pipeline.sadd(UNIQUE_VIEWERS_DIRTY_KEY, post_id)
+        results = await pipeline.execute()
+
+    except (redis.RedisError, ConnectionError) as e:
+        # 집계보다 조회수 증가가 우선이므로 오류 시에는 그대로 셈
+        _viewer_stats["errors"] += 1
+        logger.warning(f"순 방문자 기록 실패: {e!r}, post_id={post_id}")
+        return True
+
+    _local_seen.set(local_key, True)
+    if VIEW_DEDUP_WINDOW and not results[0]:
+        _viewer_stats["deduped_redis"] += 1
+        return False
+
+    _viewer_stats["counted"] += 1
+    return True
+
+
+async def pop_dirty_unique_viewers() -> Dict[int, int]:
+    """
+    마지막 반영 이후 조회된 게시글을 dirty 집합에서 꺼내 PFCOUNT 합니다. (노드별로 동시에)
+    DB 반영에 실패하면 restore_dirty_unique_viewers로 되돌려야 합니다.
+
+    Returns:
+        {post_id: 순 방문자 수}
+    """
+    async def _pop(redis_client) -> Dict[int, int]:
+        counts = {}
+        while True:
+            members = await redis_client.spop(UNIQUE_VIEWERS_DIRTY_KEY, _FLUSH_BATCH_SIZE)
+            if not members:
+                break
+
+            post_ids = [int(member) for member in members]
+            pipeline = redis_client.pipeline(transaction=False)
+            for post_id in post_ids:
+                pipeline.pfcount(f"{UNIQUE_VIEWERS_PREFIX}{post_id}")
+            for post_id, count in zip(post_ids, await pipeline.execute()):
+                if count:
+                    counts[post_id] = int(count)
+
+            if len(members) < _FLUSH_BATCH_SIZE:
+                break
+        return counts
+
+    counts = {}
+    for node, outcome in (await run_on_all_nodes(_pop)).items():
+        if isinstance(outcome, BaseException):
+            logger.error(f"Redis 노드 {node} 연결 실패: 순 방문자 수를 조회할 수 없습니다. ({str(outcome)})")
+            continue
+        counts.update(outcome)
+    return counts
+
+
+async def restore_dirty_unique_viewers(post_ids: List[int]):
+    if not post_ids:
+        return
+
+    async def _restore(redis_client, node_post_ids: List[int]):
+        await redis_client.sadd(UNIQUE_VIEWERS_DIRTY_KEY, *node_post_ids)
+
+    for node, outcome in (await run_on_nodes(group_by_node(post_ids), _restore)).items():
+        if isinstance(outcome, BaseException):
+            logger.error(f"순 방문자 dirty 목록 복원 실패 (노드 {node}): {str(outcome)}")
+
+
+def get_viewer_stats() -> Dict[str, int]:
+    return {
+        "unique_viewers_enabled": UNIQUE_VIEWERS_ENABLED,
+        "dedup_window_minutes": VIEW_DEDUP_WINDOW,
+        **_viewer_stats,
+        "local_seen": len(_local_seen),
+    }
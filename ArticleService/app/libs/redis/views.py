@@ -5,12 +5,17 @@
 """
 import logging
 import asyncio
+import os
 import time
 from collections import defaultdict
+from typing import Dict, Optional
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis  # aioredis 대신 redis-py 사용
-from .client import get_redis_client, VIEWS_PREFIX, REDIS_KEY_TTL
+from .client import VIEWS_PREFIX
+from .counters import incr_counter, incr_counters_by_node
+from .nodes import get_post_client
+from shared.ttl_cache import TTLCache
 
 logger = logging.getLogger("redis_views")
 
@@ -21,6 +26,15 @@ _backlog_lock = asyncio.Lock()
 _last_flush_time = time.time()
 _FLUSH_INTERVAL = 30  
 
+# 핫 게시글 조회수 로컬 합산 (요청마다 INCR 대신 주기적으로 INCRBY 한 번)
+# {post_id: Redis에 아직 반영하지 않은 증가분}
+HOT_VIEWS_FLUSH_INTERVAL = float(os.getenv("HOT_VIEWS_FLUSH_INTERVAL", 0.5))
+_pending_views = defaultdict(int)
+# 마지막으로 Redis에서 확인한 조회수 (응답에 표시할 값 = 이 값 + 미반영 증가분)
+_known_views = TTLCache(maxsize=int(os.getenv("HOT_VIEWS_KNOWN_SIZE", 1024)), ttl=60)
+_pending_flush_task: Optional[asyncio.Task] = None
+_coalesce_stats = {"coalesced": 0, "flushes": 0, "flushed_posts": 0}
+
 async def increment_views(post_id: int) -> int:
     """
     게시글 조회수 증가 (Redis 캐싱)
@@ -31,22 +45,16 @@ async def increment_views(post_id: int) -> int:
     Returns:
         현재 조회수
     """
-    key = f"{VIEWS_PREFIX}{post_id}"
-    
     try:
-        # Redis 클라이언트 가져오기
-        redis_client = await get_redis_client()
+        # 게시글 키가 있는 노드의 Redis 클라이언트 가져오기
+        redis_client = await get_post_client(post_id)
         if redis_client is None:
             # Redis 연결 실패 시 로컬 메모리에 백로그 추가
             logger.warning(f"Redis 연결 실패: post_id={post_id} 조회수 증가 요청을 백로그에 추가합니다.")
             return await _add_to_backlog(post_id)
         
-        # 조회수 증가 및 조회
-        current_views = await redis_client.incr(key)
-        
-        # TTL 설정 (키가 존재하지 않았을 때만)
-        if current_views == 1:
-            await redis_client.expire(key, REDIS_KEY_TTL)
+        # 조회수 증가 및 조회 (키가 만료되었으면 DB 값으로 초기화 후 증가)
+        current_views = await incr_counter(redis_client, VIEWS_PREFIX, post_id, 1)
         
         # 백로그 처리 시도 (주기적으로)
         if time.time() - _last_flush_time > _FLUSH_INTERVAL:
@@ -90,26 +98,20 @@ async def _flush_backlog():
         return
     
     try:
-        redis_client = await get_redis_client()
-        if redis_client is None:
-            logger.warning("백로그 처리 시도 중 Redis 연결 실패")
-            return
-            
         # 백로그 데이터 복사 및 초기화 (처리 중 새 요청과 경쟁 조건 방지)
         async with _backlog_lock:
             backlog_copy = dict(_views_backlog)
             _views_backlog.clear()
         
-        # Redis 파이프라인으로 일괄 처리
-        pipeline = redis_client.pipeline()
-        for post_id, increment in backlog_copy.items():
-            key = f"{VIEWS_PREFIX}{post_id}"
-            # 현재 값에 백로그 값을 더함
-            pipeline.incrby(key, increment)
-            pipeline.expire(key, REDIS_KEY_TTL)
-            
-        # 일괄 실행
-        await pipeline.execute()
+        # 현재 값에 백로그 값을 더함 (만료된 키는 DB 값으로 초기화 후 반영)
+        _, failed = await incr_counters_by_node(VIEWS_PREFIX, backlog_copy)
+        if failed:
+            # 연결하지 못한 노드의 몫만 백로그로 되돌림 (다른 노드에는 이미 반영됨)
+            logger.warning(f"백로그 처리 중 Redis 연결 실패: {len(failed)}개 게시글은 다음에 다시 시도")
+            async with _backlog_lock:
+                for post_id, increment in failed.items():
+                    _views_backlog[post_id] += increment
+            return
         logger.info(f"백로그 처리 성공: {len(backlog_copy)}개 게시글 조회수 업데이트")
         
         _last_flush_time = time.time()
@@ -121,6 +123,80 @@ async def _flush_backlog():
             for post_id, increment in backlog_copy.items():
                 _views_backlog[post_id] += increment
 
+async def increment_views_coalesced(post_id: int) -> int:
+    """
+    핫 게시글 조회수 증가 (로컬 합산 후 HOT_VIEWS_FLUSH_INTERVAL마다 Redis에 반영)
+
+    처음 보는 게시글은 기존처럼 INCR 하여 현재 조회수를 알아두고,
+    이후 요청은 메모리에서만 더한 뒤 추정 조회수를 반환합니다.
+
+    Args:
+        post_id: 게시글 ID
+
+    Returns:
+        현재 추정 조회수
+    """
+    global _pending_flush_task
+
+    known = _known_views.get(post_id)
+    if known is None:
+        current_views = await increment_views(post_id)
+        if current_views:
+            _known_views.set(post_id, current_views)
+        return current_views
+
+    _pending_views[post_id] += 1
+    _coalesce_stats["coalesced"] += 1
+
+    if _pending_flush_task is None or _pending_flush_task.done():
+        _pending_flush_task = asyncio.create_task(_flush_pending_views_later())
+
+    return known + _pending_views[post_id]
+
+async def _flush_pending_views_later():
+    await asyncio.sleep(HOT_VIEWS_FLUSH_INTERVAL)
+    await _flush_pending_views()
+
+async def _flush_pending_views():
+    """
+    로컬에서 합산한 조회수를 INCRBY로 한 번에 반영합니다.
+    반영이 끝날 때까지 증가분을 지우지 않아 응답 조회수가 잠시 줄어드는 일이 없도록 합니다.
+    """
+    if not _pending_views:
+        return
+
+    snapshot = dict(_pending_views)
+    try:
+        results, failed = await incr_counters_by_node(VIEWS_PREFIX, snapshot)
+
+        for post_id, views in results.items():
+            _known_views.set(post_id, views)
+        _coalesce_stats["flushes"] += 1
+        _coalesce_stats["flushed_posts"] += len(snapshot) - len(failed)
+
+        if failed:
+            logger.error(f"핫 게시글 조회수 {len(failed)}개 반영 실패, 백로그로 이동")
+            async with _backlog_lock:
+                for post_id, increment in failed.items():
+                    _views_backlog[post_id] += increment
+
+    except Exception as e:
+        logger.error(f"핫 게시글 조회수 반영 실패, 백로그로 이동: {str(e)}")
+        async with _backlog_lock:
+            for post_id, increment in snapshot.items():
+                _views_backlog[post_id] += increment
+
+    finally:
+        for post_id, increment in snapshot.items():
+            remaining = _pending_views[post_id] - increment
+            if remaining > 0:
+                _pending_views[post_id] = remaining
+            else:
+                del _pending_views[post_id]
+
+def get_coalescing_stats() -> Dict[str, int]:
+    return {**_coalesce_stats, "pending_posts": len(_pending_views), "pending_views": sum(_pending_views.values())}
+
 async def get_views(post_id: int) -> int:
     """
     게시글 조회수 조회
@@ -134,8 +210,8 @@ async def get_views(post_id: int) -> int:
     key = f"{VIEWS_PREFIX}{post_id}"
     
     try:
-        # Redis 클라이언트 가져오기
-        redis_client = await get_redis_client()
+        # 게시글 키가 있는 노드의 Redis 클라이언트 가져오기
+        redis_client = await get_post_client(post_id)
         if redis_client is None:
             logger.error(f"Redis 연결 실패: post_id={post_id} 조회수 조회 요청을 처리할 수 없습니다.")
             # 백로그에 있는 값 확인
@@ -149,6 +225,8 @@ async def get_views(post_id: int) -> int:
         
         # Redis 값 + 백로그 값 (있는 경우)
         result = int(views) if views else 0
+        # 아직 Redis에 반영하지 않은 핫 게시글 증가분
+        result += _pending_views.get(post_id, 0)
         async with _backlog_lock:
             if post_id in _views_backlog:
                 result += _views_backlog[post_id]
@@ -166,6 +244,29 @@ async def get_views(post_id: int) -> int:
         logger.error(f"예상치 못한 오류 (조회수 조회): {str(e)}, post_id={post_id}")
         return 0
 
+async def peek_views(post_id: int) -> Optional[int]:
+    """
+    조회수를 증가시키지 않고 현재 조회수를 반환합니다. (중복 조회로 판단된 요청의 응답용)
+
+    Returns:
+        현재 조회수, 캐시에 없으면 None (호출하는 쪽에서 DB 값 사용)
+    """
+    pending = _pending_views.get(post_id, 0) + _views_backlog.get(post_id, 0)
+    known = _known_views.get(post_id)
+    if known is not None:
+        return known + pending
+
+    try:
+        redis_client = await get_post_client(post_id)
+        if redis_client is None:
+            return None
+        views = await redis_client.get(f"{VIEWS_PREFIX}{post_id}")
+    except redis.RedisError as e:
+        logger.error(f"Redis 오류 (조회수 확인): {str(e)}, post_id={post_id}")
+        return None
+
+    return int(views) + pending if views is not None else None
+
 async def update_views_directly_to_db(post_id: int, views: int, session: AsyncSession):
     """
     조회수를 직접 DB에 업데이트 (Redis 실패 시 폴백)
@@ -194,4 +295,5 @@ async def force_flush_backlog():
     애플리케이션 종료 전 호출해야 합니다.
     """
     logger.info("백로그 강제 처리 시작")
-    await _flush_backlog() 
\ No newline at end of file
+    await _flush_pending_views()
+    await _flush_backlog()
\ No newline at end of file
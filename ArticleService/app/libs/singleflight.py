@@ -0,0 +1,107 @@
+"""
+Single-flight 요청 병합 모듈
+
+같은 키에 대한 로드가 동시에 여러 번 요청되면 한 번만 실행하고
+나머지 요청은 그 결과(또는 예외)를 함께 받습니다.
+
+- 로드는 별도 태스크에서 실행되므로, 처음 요청한 쪽이 취소되어도 기다리는 다른 요청에는 영향이 없습니다.
+- 기다리는 요청이 모두 취소/타임아웃되면 로드 태스크도 취소합니다.
+- 요청마다 timeout초까지만 기다리며, 넘으면 asyncio.TimeoutError를 받습니다.
+  (로드 자체는 다른 대기자를 위해 계속 실행됩니다.)
+
+결과 객체는 여러 요청이 공유하므로 호출하는 쪽에서 수정하면 안 됩니다.
+"""
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_TIMEOUT = float(os.getenv("SINGLEFLIGHT_TIMEOUT", 5))
+
+# 이름 -> SingleFlight (통계 조회용)
+_groups: Dict[str, "SingleFlight"] = {}
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str, timeout: Optional[float] = SINGLEFLIGHT_TIMEOUT):
+        """
+        Args:
+            name: 통계에 표시할 이름 (예: "post_detail")
+            timeout: 요청별 기본 대기 시간 (초, None이면 무제한)
+        """
+        self.name = name
+        self.timeout = timeout
+        self._calls: Dict[Hashable, _Call] = {}
+        self.stats = {"calls": 0, "executions": 0, "coalesced": 0, "timeouts": 0, "errors": 0}
+        _groups[name] = self
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _finished(self, key: Hashable, call: _Call):
+        self._forget(key, call)
+        # 기다리던 요청이 모두 취소된 뒤 로드가 실패하면 아무도 예외를 꺼내지 않으므로 여기서 꺼냄
+        # (asyncio가 "Task exception was never retrieved"를 기록하지 않도록)
+        if not call.task.cancelled():
+            call.task.exception()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """
+        key에 대한 로드가 진행 중이면 그 결과를 기다리고, 없으면 func()를 실행합니다.
+        """
+        self.stats["calls"] += 1
+
+        call = self._calls.get(key)
+        if call is None:
+            self.stats["executions"] += 1
+            call = _Call(asyncio.ensure_future(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._finished(key, call))
+        else:
+            self.stats["coalesced"] += 1
+
+        call.waiters += 1
+        try:
+            # shield: 이 요청이 취소/타임아웃되어도 공유 태스크는 취소되지 않음
+            return await asyncio.wait_for(
+                asyncio.shield(call.task),
+                timeout if timeout is not None else self.timeout,
+            )
+        except asyncio.TimeoutError:
+            if not call.task.done():
+                self.stats["timeouts"] += 1
+            raise
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # 결과를 기다리는 요청이 없으면 로드도 중단
+                call.task.cancel()
+                self._forget(key, call)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+def get_singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    그룹별 호출 수, 실제 실행 수, 병합된 요청 수 등을 반환합니다.
+    """
+    return {
+        name: {**group.stats, "in_flight": group.in_flight()}
+        for name, group in _groups.items()
+    }
@@ -0,0 +1,94 @@
+"""
+사진 디코딩/크기 변환 (Pillow)
+
+libs/pictures.py가 프로세스 풀에서 실행하므로 이벤트 루프나 DB/Redis 상태에 의존하지 않아야 합니다.
+(인자와 반환값은 pickle 가능한 기본 타입만 사용)
+"""
+import io
+from typing import List, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow가 없으면 사진 업로드를 받지 않음
+    Image = None
+    ImageOps = None
+
+# 받는 원본 형식 (Pillow 형식 이름)
+ALLOWED_FORMATS = ("JPEG", "PNG", "GIF", "WEBP")
+
+# (이름, content type, 가로, 세로, 인코딩된 바이트)
+Variant = Tuple[str, str, int, int, bytes]
+
+
+class InvalidPicture(ValueError):
+    pass
+
+
+def _open(path: str, max_pixels: int):
+    if Image is None:
+        raise RuntimeError("사진을 처리하려면 Pillow 패키지가 필요합니다.")
+    # 압축 해제 폭탄 방지 (이 크기를 넘으면 DecompressionBombError)
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    try:
+        image = Image.open(path)
+    except Image.DecompressionBombError:
+        raise InvalidPicture("사진이 너무 큽니다.")
+    except OSError:
+        # 메시지에 임시 파일 경로가 들어 있으므로 그대로 돌려주지 않음
+        raise InvalidPicture("사진을 읽을 수 없습니다.")
+    if image.format not in ALLOWED_FORMATS:
+        image.close()
+        raise InvalidPicture(f"지원하지 않는 형식입니다: {image.format}")
+    if image.width * image.height > max_pixels:
+        image.close()
+        raise InvalidPicture(f"사진이 너무 큽니다: {image.width}x{image.height}")
+    return image
+
+
+def probe(path: str, max_pixels: int) -> Tuple[str, int, int]:
+    """
+    헤더만 읽어 형식과 크기를 확인합니다. (디코딩하지 않으므로 빠름)
+
+    Returns:
+        (형식, 가로, 세로)
+
+    Raises:
+        InvalidPicture: 사진이 아니거나, 지원하지 않는 형식이거나, max_pixels를 넘음
+    """
+    image = _open(path, max_pixels)
+    with image:
+        return image.format, image.width, image.height
+
+
+def render_variants(path: str, sizes: List[Tuple[str, int]], max_pixels: int, quality: int) -> List[Variant]:
+    """
+    원본을 한 번 디코딩하여 sizes의 크기별 변형을 큰 것부터 차례로 줄여 만듭니다.
+    원본보다 큰 변형은 늘리지 않고 원본 크기로 저장하며, EXIF 방향은 적용한 뒤 메타데이터는 버립니다.
+    투명도가 있으면 PNG, 없으면 JPEG로 저장합니다. (움직이는 GIF는 첫 프레임)
+    """
+    image = _open(path, max_pixels)
+    with image:
+        largest = max(size for _, size in sizes)
+        # JPEG는 DCT 단계에서 1/2~1/8로 줄여 디코딩 (큰 사진의 썸네일이 훨씬 빠름)
+        image.draft("RGB", (largest, largest))
+        try:
+            image.load()
+        except (OSError, Image.DecompressionBombError):
+            raise InvalidPicture("사진을 읽을 수 없습니다. (손상된 파일)")
+
+        frame = ImageOps.exif_transpose(image)
+        has_alpha = frame.mode in ("RGBA", "LA", "PA") or (frame.mode == "P" and "transparency" in frame.info)
+        frame = frame.convert("RGBA" if has_alpha else "RGB")
+
+        variants = []
+        for name, size in sorted(sizes, key=lambda item: -item[1]):
+            frame.thumbnail((size, size), Image.LANCZOS)
+            buffer = io.BytesIO()
+            if has_alpha:
+                frame.save(buffer, "PNG", optimize=True)
+                content_type = "image/png"
+            else:
+                frame.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+                content_type = "image/jpeg"
+            variants.append((name, content_type, frame.width, frame.height, buffer.getvalue()))
+        return variants
@@ -1,6 +1,10 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from database.core import async_engine, Base  
+from fastapi.middleware.gzip import GZipMiddleware
+from database.core import async_engine
+from database.migrations import run_migrations
+from database.sharding import SHARD_MOVE_RETRY_AFTER, ShardRangeMoving, shard_engines, start_sharding, stop_sharding
 from routes import include_router 
 import asyncio
 import signal
@@ -8,8 +12,16 @@ import sys
 import logging
 from batch_update import start_batch_update, stop_batch_update
 from libs.redis import close_redis_connection, force_flush_backlogs
+from libs.notifications import start_notification_worker, stop_notification_worker
+from libs.group_commit import close_group_commit_writers
 import os
 from rpc.main import gRPCServer
+from startup import DB_SCHEMA_MODE, start_warmup, stop_warmup, FirstRequestTimerMiddleware
+from libs.ratelimit import RateLimitMiddleware
+from libs.prepared_response import RESPONSE_GZIP_LEVEL, RESPONSE_GZIP_MIN_SIZE
+from shared.tracing import TRACING_ENABLED, TracingMiddleware
+from libs.profiler import start_loop_monitor, stop_loop_monitor
+from libs.pictures import close_pictures
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -17,6 +29,9 @@ logger = logging.getLogger("main")
 
 app = FastAPI()
 
+# 사용자/IP별 속도 제한 (CORS 안쪽에 두어 429 응답에도 CORS 헤더가 붙도록 먼저 등록)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -26,9 +41,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-async def create_tables():
-    async with async_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+# 응답 압축 (이미 Content-Encoding이 붙은 캐시 응답은 그대로 전달)
+app.add_middleware(GZipMiddleware, minimum_size=RESPONSE_GZIP_MIN_SIZE, compresslevel=RESPONSE_GZIP_LEVEL)
+
+# 첫 요청 지연 시간 측정
+app.add_middleware(FirstRequestTimerMiddleware)
+
+# 요청마다 루트 span (가장 바깥에 두어 속도 제한/압축 시간까지 포함)
+if TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
+# 다른 샤드로 옮기는 중인 게시글에 쓰기 요청 (잠시 후 재시도)
+@app.exception_handler(ShardRangeMoving)
+async def shard_range_moving_handler(request: Request, exc: ShardRangeMoving):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "게시글을 다른 저장소로 옮기는 중입니다. 잠시 후 다시 시도해주세요."},
+        headers={"Retry-After": str(SHARD_MOVE_RETRY_AFTER)},
+    )
 
 async def start_grpc_server():
     await gRPCServer.run()
@@ -37,10 +67,23 @@ async def start_grpc_server():
 @app.on_event("startup")
 async def startup_event():
     logger.info("애플리케이션 시작 중...")
-    # 테이블 생성
-    await create_tables()
+    # 스키마 마이그레이션 (DB_SCHEMA_MODE=skip이면 스키마는 별도로 관리)
+    if DB_SCHEMA_MODE == "migrate":
+        # 샤드마다 같은 스키마
+        for engine in shard_engines:
+            await run_migrations(engine)
+    else:
+        logger.info(f"DB_SCHEMA_MODE={DB_SCHEMA_MODE}: 시작 시 DDL을 실행하지 않습니다.")
+    # 샤드 구간 맵 로드 (DB_SHARD_URLS를 지정한 경우)
+    await start_sharding()
+    # DB/Redis/Auth 채널 warm-up (완료 전까지 /api/ready는 503)
+    start_warmup()
     # 배치 업데이트 서비스 시작
     start_batch_update()
+    # 알림 큐 컨슈머 시작
+    start_notification_worker()
+    # 이벤트 루프 지연/블로킹 감시
+    start_loop_monitor()
     logger.info("애플리케이션 시작 완료")
 
 # 애플리케이션 종료 시 실행
@@ -48,7 +91,14 @@ async def startup_event():
 async def shutdown_event():
     logger.info("애플리케이션 종료 중...")
 
+    await stop_warmup()
+    await stop_loop_monitor()
+    # 모으고 있던 게시글/댓글 INSERT 마저 반영
+    await close_group_commit_writers()
     await stop_batch_update()
+    await stop_notification_worker()
+    # 처리 중인 사진 업로드를 마저 저장하고 프로세스 풀 종료
+    await close_pictures()
 
     try:
         logger.info("메모리 백로그 처리 중...")
@@ -58,6 +108,7 @@ async def shutdown_event():
         logger.error(f"백로그 처리 실패: {str(e)}")
         
     await close_redis_connection()
+    await stop_sharding()
     await async_engine.dispose()
     logger.info("애플리케이션 종료 완료")
 
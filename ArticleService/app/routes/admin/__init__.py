@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from .hot_posts import router as hotposts_router
+from .metrics import router as metrics_router
+from .export import router as export_router
+from .flush import router as flush_router
+from .profile import router as profile_router
+
+router = APIRouter(prefix="/api/admin")
+
+router.include_router(hotposts_router)
+router.include_router(metrics_router)
+router.include_router(export_router)
+router.include_router(flush_router)
+router.include_router(profile_router)
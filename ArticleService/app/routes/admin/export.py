@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from depends import RequireAdmin
+from libs.export import EXPORT_FORMATS, parse_columns, export_posts
+
+router = APIRouter()
+
+@router.get("/export/posts", tags=["admin"])
+async def export_posts_route(
+    format: str = Query("ndjson"),
+    columns: Optional[str] = Query(None, description="쉼표로 구분한 컬럼 목록 (id는 항상 포함)"),
+    after_id: int = Query(0, ge=0, description="이 ID 다음부터 내보내기 (이어받기용)"),
+    limit: Optional[int] = Query(None, ge=1),
+    header: bool = Query(True, description="CSV 헤더 포함 여부"),
+    adminid=Depends(RequireAdmin),
+):
+    """
+    게시글과 최신 조회수/좋아요 수를 NDJSON 또는 CSV로 스트리밍합니다.
+    중간에 끊기면 마지막으로 받은 id를 after_id로 넘겨 이어받을 수 있습니다.
+
+    Returns:
+        StreamingResponse (application/x-ndjson 또는 text/csv)
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format은 {', '.join(EXPORT_FORMATS)} 중 하나여야 합니다.")
+
+    try:
+        selected = parse_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        export_posts(format, selected, after_id=after_id, limit=limit, header=header),
+        media_type="application/x-ndjson" if format == "ndjson" else "text/csv",
+        headers={"X-Export-Columns": ",".join(selected)},
+    )
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from depends import RequireAdmin
+from batch_update import flush_now
+
+router = APIRouter()
+
+@router.post("/flush", tags=["admin"])
+async def flush(adminid=Depends(RequireAdmin)):
+    """
+    Redis의 조회수/좋아요 수를 즉시 DB에 반영하고, 끝날 때까지 기다린 뒤 결과를 반환합니다.
+    dirty 집합은 워커가 공유하므로 Redis에 들어간 변경은 모든 워커 것이 반영되지만, 메모리에만 있는
+    증가분(핫 게시글 조회수 합산, 백로그)은 요청을 받은 이 워커 것만 먼저 Redis로 보냅니다.
+    다른 워커의 증가분은 각 워커의 다음 반영 주기(HOT_VIEWS_FLUSH_INTERVAL 등)에 Redis로, 그 다음 배치 반영에 DB로 들어갑니다.
+
+    Returns:
+        rows: 반영한 게시글 수, chunks/failed_chunks: 처리/실패한 청크 수,
+        duration_sec: 소요 시간, staleness_sec: 반영 전 가장 오래 반영되지 않은 변경의 경과 시간
+    """
+    return {
+        "ok": True,
+        **await flush_now(),
+    }
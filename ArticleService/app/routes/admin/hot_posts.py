@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Query
+from depends import RequireAdmin
+from libs.hot_posts import get_hot_posts
+from libs.redis import get_coalescing_stats
+
+router = APIRouter()
+
+@router.get("/hot_posts", tags=["admin"])
+async def hot_posts(limit: int = Query(20, ge=1, le=100), adminid=Depends(RequireAdmin)):
+    """
+    현재 핫 게시글 상위 목록 (운영 확인용)
+    탐지기와 L1 캐시는 워커마다 따로 있으므로 응답한 워커(pid)의 값입니다.
+
+    Returns:
+        추정 요청 수 상위 게시글, L1 캐시 적중률, 조회수 로컬 합산 현황
+    """
+    return {
+        "ok": True,
+        **get_hot_posts(limit),
+        "view_coalescing": get_coalescing_stats(),
+    }
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends
+from depends import RequireAdmin
+from libs.singleflight import get_singleflight_stats
+from libs.redis import get_seed_stats, get_viewer_stats, get_node_stats
+from libs.notifications import get_notification_stats
+from libs.ratelimit import get_rate_limit_stats
+from libs.group_commit import get_group_commit_stats
+from batch_update import get_batch_update_stats
+from shared.tracing import get_tracing_stats
+from libs.profiler import get_loop_stats
+from database.slow_queries import get_slow_query_stats
+from database.sharding import get_sharding_stats
+from libs.pictures import get_picture_stats
+
+router = APIRouter()
+
+@router.get("/metrics", tags=["admin"])
+async def metrics(adminid=Depends(RequireAdmin)):
+    """
+    운영 지표 (응답한 워커 기준)
+
+    Returns:
+        singleflight: 그룹별 호출 수(calls), 실제 실행 수(executions), 병합된 요청 수(coalesced), 타임아웃/에러 수
+        counter_seed: 카운터 키 미스 수, DB 값으로 초기화한 게시글 수, DB에 없는 게시글 수
+        viewers: 조회수를 올린 조회 수, 중복 제거 창에 걸려 로컬/Redis에서 걸러진 조회 수
+        notifications: 알림 전송 통계와 큐 상태 (길이, pending, lag, 가장 오래 대기한 이벤트의 대기 시간)
+        rate_limit: 로컬/Redis에서 허용·거부한 요청 수, 정책별 거부 수
+        group_commit: 그룹 커밋으로 넣은 행/배치 수, 행 단위 재시도 배치 수, 대기 중인 행 수
+        batch_update: DB 반영 대기 게시글 수, db_staleness_sec(가장 오래된 미반영 변경의 경과 시간), 직전 반영 결과, 다음 간격
+        tracing: 시작/샘플링된 트레이스 수, 기록/내보낸/버린 span 수
+        event_loop: 이벤트 루프 지연(ms)과 블로킹 횟수 (스택은 /api/admin/loop)
+        slow_queries: 실행한 SQL 문 수와 임계값 이상 걸린 문 수 (목록은 /api/admin/slow_queries)
+        sharding: 샤드 수, 구간 맵(레거시/옮긴 구간과 상태)과 맵 나이, id 블록 예약 수, 옮기는 중이라 거부한 쓰기 수
+        redis_nodes: 게시글 키를 나눠 담는 Redis 노드 수, 노드당 가상 노드 수, 노드별 연결 여부
+        pictures: 받은/거부한(크기 초과, 잘못된 형식, 대기열 가득) 업로드 수, 변형 생성/저장 성공·실패 수, 평균 변형 생성 시간(ms), 처리 대기 수
+    """
+    return {
+        "ok": True,
+        "singleflight": get_singleflight_stats(),
+        "counter_seed": get_seed_stats(),
+        "viewers": get_viewer_stats(),
+        "notifications": await get_notification_stats(),
+        "rate_limit": get_rate_limit_stats(),
+        "group_commit": get_group_commit_stats(),
+        "batch_update": await get_batch_update_stats(),
+        "tracing": get_tracing_stats(),
+        "event_loop": get_loop_stats(),
+        "slow_queries": get_slow_query_stats(),
+        "sharding": get_sharding_stats(),
+        "redis_nodes": get_node_stats(),
+        "pictures": get_picture_stats(),
+    }
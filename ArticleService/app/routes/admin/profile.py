@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from depends import RequireAdmin
+from libs.profiler import PROFILE_MAX_SECONDS, ProfilerBusy, profile, to_collapsed, loop_monitor
+from database.slow_queries import (
+    get_slow_queries,
+    get_slow_query_stats,
+    set_slow_query_threshold,
+    clear_slow_queries,
+)
+
+router = APIRouter()
+
+@router.post("/profile", tags=["admin"])
+async def profile_route(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(10, gt=0, description="샘플링 간격 (PROFILE_MIN_INTERVAL_MS 미만이면 올림)"),
+    include_idle: bool = Query(False, description="루프가 I/O를 기다린 샘플을 (idle)로 포함"),
+    format: str = Query("collapsed", description="collapsed (flamegraph.pl/speedscope 입력) 또는 json"),
+    adminid=Depends(RequireAdmin),
+):
+    """
+    요청을 받은 워커의 이벤트 루프 스레드를 seconds초 동안 샘플링합니다. (워커당 동시에 하나)
+    측정하는 동안 이 요청만 기다리며 다른 요청 처리는 계속됩니다.
+
+    Returns:
+        collapsed: "바깥;...;안쪽 횟수" 텍스트 (X-Profile-Samples/X-Profile-Idle-Samples 헤더에 샘플 수)
+        json: pid, 샘플 수, stacks
+    """
+    if format not in ("collapsed", "json"):
+        raise HTTPException(status_code=400, detail="format은 collapsed, json 중 하나여야 합니다.")
+
+    try:
+        result = await profile(seconds, interval_ms, include_idle)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if format == "json":
+        return {"ok": True, **result}
+
+    return PlainTextResponse(
+        to_collapsed(result["stacks"]),
+        headers={
+            "X-Profile-Pid": str(result["pid"]),
+            "X-Profile-Samples": str(result["samples"]),
+            "X-Profile-Idle-Samples": str(result["idle_samples"]),
+        },
+    )
+
+@router.get("/loop", tags=["admin"])
+async def loop_route(adminid=Depends(RequireAdmin)):
+    """
+    이벤트 루프 지연과 최근 블로킹 기록 (응답한 워커 기준)
+
+    Returns:
+        stats: 측정 간격, 최대/평균/p99 지연(ms), 블로킹 횟수
+        blocking: 루프가 LOOP_BLOCK_THRESHOLD_MS 넘게 멈췄을 때의 시각, 멈춘 시간, 루프 스레드 스택 (바깥 -> 안쪽)
+    """
+    return {
+        "ok": True,
+        "stats": loop_monitor.get_stats(),
+        "blocking": loop_monitor.get_blocking_events(),
+    }
+
+@router.get("/slow_queries", tags=["admin"])
+async def slow_queries_route(limit: int = Query(50, ge=1, le=1000), adminid=Depends(RequireAdmin)):
+    """
+    임계값 이상 걸린 최근 SQL 문 (최신 순, 응답한 워커 기준)
+    """
+    return {
+        "ok": True,
+        **get_slow_query_stats(),
+        "queries": get_slow_queries(limit),
+    }
+
+@router.put("/slow_queries/threshold", tags=["admin"])
+async def slow_query_threshold_route(
+    threshold_ms: float = Query(..., description="이 시간(ms) 이상 걸린 문을 기록, 0이면 기록 중지"),
+    adminid=Depends(RequireAdmin),
+):
+    set_slow_query_threshold(threshold_ms)
+    return {"ok": True, **get_slow_query_stats()}
+
+@router.delete("/slow_queries", tags=["admin"])
+async def clear_slow_queries_route(adminid=Depends(RequireAdmin)):
+    clear_slow_queries()
+    return {"ok": True}
@@ -2,8 +2,11 @@ from fastapi import FastAPI, HTTPException, APIRouter, Depends
 from pydantic import BaseModel
 from datetime import datetime, timezone     
 from depends import RequireAuth
-from database.core import AsyncSessionLocal
+from libs.hot_posts import invalidate_post
+from libs.notifications import publish_event, EVENT_COMMENT
+from database.sharding import allocate_id, shard_session, writable_shard_for_post
 from database.comments import Comments 
+from libs.group_commit import GROUP_COMMIT_ENABLED, comment_writer
 from typing import Optional
 
 router = APIRouter()
@@ -19,16 +22,37 @@ async def submit_apply(data: ApplicationExample,
     if not userid:
         raise HTTPException(status_code=401, detail="로그인 후 이용 가능합니다.")
     
-    async with AsyncSessionLocal() as session:
-    
-        db_value = Comments(
-            content=data.content,
-            user_id=userid,
-            last_modified=datetime.now(timezone.utc),
-            post_id=post_id
-        )
-    
-        session.add(db_value)
-        await session.commit()
+    # 댓글은 게시글과 같은 샤드에 저장 (옮기는 중인 게시글이면 ShardRangeMoving, 503)
+    shard = writable_shard_for_post(post_id)
+
+    if GROUP_COMMIT_ENABLED:
+        row = {
+            "content": data.content,
+            "user_id": userid,
+            "last_modified": datetime.now(timezone.utc),
+            "is_modified": False,
+            "post_id": post_id,
+        }
+        # 동시에 들어온 댓글과 함께 한 번에 id 할당/INSERT/커밋
+        await comment_writer.insert(row, shard)
+        invalidate_post(post_id)
+    else:
+        comment_id = await allocate_id("comments", shard)
+        async with shard_session(shard) as session:
+        
+            db_value = Comments(
+                id=comment_id,
+                content=data.content,
+                user_id=userid,
+                last_modified=datetime.now(timezone.utc),
+                post_id=post_id
+            )
+        
+            session.add(db_value)
+            await session.commit()
+            invalidate_post(post_id)
+
+    # 작성자 알림은 큐에만 넣고 워커가 모아서 전송
+    await publish_event(EVENT_COMMENT, post_id, userid)
 
     return {"ok": True}
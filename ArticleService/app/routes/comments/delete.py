@@ -2,9 +2,10 @@ from fastapi import FastAPI, HTTPException, APIRouter, Depends
 from pydantic import BaseModel
 from datetime import datetime, timezone     
 from depends import RequireAuth
-from database.core import AsyncSessionLocal
+from libs.hot_posts import invalidate_post
+from database.sharding import SHARDING_ENABLED, fan_out, home_shard, shard_for_post, shard_session, writable_shard_for_post
 from database.comments import Comments 
-from typing import Optional
+from typing import Optional, Tuple
 from sqlalchemy import select, delete
 
 router = APIRouter()
@@ -12,6 +13,33 @@ router = APIRouter()
 class ApplicationExample(BaseModel):
     content: str
 
+async def _comment_post_id(shard: int, comment_id: int) -> Optional[int]:
+    async with shard_session(shard) as session:
+        return (await session.execute(select(Comments.post_id).where(Comments.id == comment_id))).scalar()
+
+async def _locate_comment(comment_id: int) -> Optional[Tuple[int, int]]:
+    """
+    댓글이 있는 (샤드, 게시글 id)를 찾습니다. id에 인코딩된 샤드를 먼저 보고,
+    없으면(샤딩 이전 댓글, 다른 샤드로 옮긴 게시글의 댓글) 모든 샤드에서 찾습니다.
+    """
+    if not SHARDING_ENABLED:
+        post_id = await _comment_post_id(0, comment_id)
+        return (0, post_id) if post_id is not None else None
+
+    shard = home_shard(comment_id)
+    post_id = await _comment_post_id(shard, comment_id)
+    if post_id is None or shard_for_post(post_id) != shard:
+        found = await fan_out(lambda candidate: _comment_post_id(candidate, comment_id))
+        # 옮긴 뒤 아직 정리되지 않은 이전 샤드의 행은 건너뜀
+        owned = [(candidate, post_id) for candidate, post_id in enumerate(found)
+                 if post_id is not None and shard_for_post(post_id) == candidate]
+        if not owned:
+            return None
+        shard, post_id = owned[0]
+    # 옮기는 중인 게시글의 댓글이면 ShardRangeMoving (503)
+    writable_shard_for_post(post_id)
+    return shard, post_id
+
 @router.post("/api/comment/delete/{post_id}", tags=["delete comments"])
 async def submit_apply(data: ApplicationExample, 
                         userid=Depends(RequireAuth),
@@ -20,10 +48,20 @@ async def submit_apply(data: ApplicationExample,
     if not userid:
         raise HTTPException(status_code=401, detail="로그인 후 이용 가능합니다.")
     
-    async with AsyncSessionLocal() as session:
-        query = select(Comments).where(Comments.id == post_id, Comments.user_id == userid).delete()
+    located = await _locate_comment(post_id)
+    if located is None:
+        return {"ok": True}
+    shard, comment_post_id = located
+
+    async with shard_session(shard) as session:
+        # 본인 댓글만 삭제 (id는 기본 키, user_id는 ix_comments_user_id_id)
+        query = delete(Comments).where(Comments.id == post_id, Comments.user_id == userid)
         
-        await session.execute(query)
+        result = await session.execute(query)
         await session.commit()
 
+    # 핫 게시글 L1 캐시/상세 캐시에서 지운 댓글이 보이지 않도록
+    if result.rowcount:
+        invalidate_post(comment_post_id)
+
     return {"ok": True}
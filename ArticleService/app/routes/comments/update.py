@@ -2,7 +2,8 @@ from fastapi import FastAPI, HTTPException, APIRouter, Depends
 from pydantic import BaseModel
 from datetime import datetime, timezone     
 from depends import RequireAuth
-from database.core import AsyncSessionLocal
+from libs.hot_posts import invalidate_post
+from database.sharding import shard_session, writable_shard_for_post
 from database.comments import Comments 
 from typing import Optional
 from sqlalchemy import select
@@ -21,7 +22,7 @@ async def submit_apply(data: ApplicationExample,
     if not userid:
         raise HTTPException(status_code=401, detail="로그인 후 이용 가능합니다.")
     
-    async with AsyncSessionLocal() as session:
+    async with shard_session(writable_shard_for_post(post_id)) as session:
         post = await session.execute(select(Comments.id == comment_id, Comments.post_id == post_id).where())
         post_info = post.scalars().first()
         
@@ -34,5 +35,6 @@ async def submit_apply(data: ApplicationExample,
             
         session.add(post_info)
         await session.commit()
+        invalidate_post(post_id)
 
     return {"ok": True}
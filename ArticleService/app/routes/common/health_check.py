@@ -1,13 +1,43 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from startup import is_ready, check_dependencies, get_startup_report
 
 router = APIRouter()
 
 @router.get("/health", tags=["health"])
 async def health_check():
     """
-    서비스 상태 확인 엔드포인트
+    서비스 상태 확인 엔드포인트 (liveness)
     
     Returns:
         dict: 서비스 상태 정보
     """
-    return {"status": "healthy", "service": "article"} 
\ No newline at end of file
+    return {"status": "healthy", "service": "article"}
+
+@router.get("/ready", tags=["health"])
+async def readiness_check():
+    """
+    서비스 준비 상태 확인 엔드포인트 (readiness)
+    warm-up이 끝나고 모든 의존성이 응답할 때만 200을 반환합니다.
+
+    Returns:
+        dict: 준비 상태, 의존성별 지연 시간, 시작 시간 측정값
+    """
+    if not is_ready():
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warming_up", "service": "article", "startup": get_startup_report()},
+        )
+
+    dependencies = await check_dependencies()
+    ready = all(result["ok"] for result in dependencies.values())
+
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "degraded",
+            "service": "article",
+            "dependencies": dependencies,
+            "startup": get_startup_report(),
+        },
+    )
@@ -5,6 +5,8 @@ from .update import router as update_router
 from .delete import router as delete_router
 from .detail_get import router as detailget_router
 from .hearts import router as hearts_router
+from .bulk_import import router as bulkimport_router
+from .picture import router as picture_router
 
 router = APIRouter()
 
@@ -13,4 +15,6 @@ router.include_router(create_router)
 router.include_router(update_router)
 router.include_router(delete_router)   
 router.include_router(detailget_router) 
-router.include_router(hearts_router) 
\ No newline at end of file
+router.include_router(hearts_router)
+router.include_router(bulkimport_router)
+router.include_router(picture_router) 
\ No newline at end of file
@@ -0,0 +1,192 @@
+from fastapi import HTTPException, APIRouter, Depends, Header, Request
+from pydantic import BaseModel, Base64Bytes, ValidationError, constr
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import insert
+import asyncio
+import logging
+import os
+import time
+from depends import RequireAuth
+from tools import admin_check_auth
+from database.sharding import allocate_ids, choose_shard_for_new_post, get_engine
+from database.posts import Posts, POST_TITLE_MAX_LENGTH
+from routes.posts.get import invalidate_feed_cache
+
+logger = logging.getLogger("posts_import")
+
+router = APIRouter()
+
+# 한 번에 executemany로 넣을 행 수 (청크마다 커밋)
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 1000))
+# 한 줄(게시글 하나)의 최대 크기
+BULK_IMPORT_MAX_LINE_BYTES = int(os.getenv("BULK_IMPORT_MAX_LINE_BYTES", 1024 * 1024))
+# 응답에 포함할 행 오류 최대 개수 (나머지는 개수만 집계)
+BULK_IMPORT_MAX_ERRORS = int(os.getenv("BULK_IMPORT_MAX_ERRORS", 1000))
+
+class ImportRow(BaseModel):
+    title: constr(min_length=1, max_length=POST_TITLE_MAX_LENGTH)
+    content: str
+    picture: Optional[Base64Bytes] = None
+    # 관리자 토큰일 때만 지정 가능 (기존 작성자 유지용), 없으면 요청한 사용자
+    user_id: Optional[int] = None
+
+class _ImportState:
+    def __init__(self):
+        self.lines = 0
+        self.inserted = 0
+        self.failed = 0
+        self.chunks = 0
+        self.errors: List[dict] = []
+
+    def add_error(self, line: int, error: str):
+        self.failed += 1
+        if len(self.errors) < BULK_IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+async def _iter_lines(request: Request):
+    """
+    요청 본문을 받는 대로 줄 단위로 나눠 (줄 번호, bytes)를 반환합니다.
+    최대 한 줄 + 수신 청크 하나만 메모리에 유지하며, 너무 긴 줄은 None으로 반환하고 건너뜁니다.
+    """
+    buffer = b""
+    line_no = 0
+    skipping = False
+    async for chunk in request.stream():
+        if skipping:
+            # 너무 긴 줄의 나머지는 다음 줄바꿈까지 버림
+            newline = chunk.find(b"\n")
+            if newline < 0:
+                continue
+            chunk = chunk[newline + 1:]
+            skipping = False
+
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, (line if len(line) <= BULK_IMPORT_MAX_LINE_BYTES else None)
+
+        if len(buffer) > BULK_IMPORT_MAX_LINE_BYTES:
+            line_no += 1
+            yield line_no, None
+            buffer = b""
+            skipping = True
+
+    if buffer and not skipping:
+        yield line_no + 1, buffer
+
+async def _insert_chunk(rows: List[dict], line_numbers: List[int], state: _ImportState):
+    started_at = time.perf_counter()
+    try:
+        # 청크 하나는 한 샤드에 넣음 (샤딩을 쓰지 않으면 0번, 자동 증가 id)
+        shard = choose_shard_for_new_post()
+        ids = await allocate_ids("posts", shard, len(rows))
+        if ids:
+            for row, row_id in zip(rows, ids):
+                row["id"] = row_id
+        async with get_engine(shard).begin() as conn:
+            await conn.execute(insert(Posts), rows)
+        state.inserted += len(rows)
+    except Exception as e:
+        # 청크 전체가 롤백되므로 해당 청크의 모든 행을 실패로 보고
+        logger.error(f"대량 등록 청크 실패 ({len(rows)}행): {e!r}")
+        for line in line_numbers:
+            state.add_error(line, f"DB 오류: {type(e).__name__}")
+    state.chunks += 1
+    logger.info(
+        f"대량 등록 진행: {state.lines}줄 처리, {state.inserted}건 등록, {state.failed}건 실패 "
+        f"(청크 {len(rows)}행 {(time.perf_counter() - started_at) * 1000:.1f}ms)"
+    )
+
+@router.post("/api/posts/import", tags=["posts"])
+async def import_posts(request: Request, userid=Depends(RequireAuth), authorization: str = Header(...)):
+    """
+    NDJSON 본문(한 줄에 게시글 하나)을 스트리밍으로 읽어 대량 등록합니다.
+
+    각 줄은 {"title", "content", "picture"(base64, 선택), "user_id"(관리자만, 선택)} 형식이며,
+    BULK_IMPORT_CHUNK_SIZE행씩 executemany로 넣고 청크마다 커밋합니다.
+    형식이 잘못된 줄은 건너뛰고 줄 번호와 함께 오류로 보고합니다.
+    다음 청크를 파싱하는 동안 이전 청크의 INSERT가 진행됩니다. (동시에 최대 1개)
+
+    Returns:
+        처리한 줄 수, 등록/실패 건수, 줄별 오류 목록
+    """
+    if not userid:
+        raise HTTPException(status_code=401, detail="로그인 후 이용 가능합니다.")
+
+    is_admin = bool(await admin_check_auth(authorization.split(" ")[-1]))
+
+    state = _ImportState()
+    started_at = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    rows: List[dict] = []
+    line_numbers: List[int] = []
+    pending: Optional[asyncio.Task] = None
+
+    async def flush():
+        nonlocal pending, rows, line_numbers
+        if pending is not None:
+            await pending
+        pending = asyncio.create_task(_insert_chunk(rows, line_numbers, state))
+        rows, line_numbers = [], []
+
+    try:
+        async for line_no, line in _iter_lines(request):
+            state.lines = line_no
+            if line is None:
+                state.add_error(line_no, f"줄이 너무 깁니다. (최대 {BULK_IMPORT_MAX_LINE_BYTES}바이트)")
+                continue
+            if not line.strip():
+                continue
+
+            try:
+                row = ImportRow.model_validate_json(line)
+            except ValidationError as e:
+                first = e.errors()[0]
+                state.add_error(line_no, f"{'.'.join(str(loc) for loc in first['loc']) or 'row'}: {first['msg']}")
+                continue
+
+            if row.user_id is not None and not is_admin:
+                state.add_error(line_no, "user_id는 관리자만 지정할 수 있습니다.")
+                continue
+
+            rows.append({
+                "title": row.title,
+                "content": row.content,
+                "picture": row.picture,
+                "user_id": row.user_id if row.user_id is not None else userid,
+                "last_modified": now,
+                "is_modified": False,
+                "views": 0,
+                "hearts": 0,
+            })
+            line_numbers.append(line_no)
+
+            if len(rows) >= BULK_IMPORT_CHUNK_SIZE:
+                await flush()
+
+        if rows:
+            await flush()
+    finally:
+        # 클라이언트 연결이 끊겨도 이미 시작한 청크는 끝까지 반영
+        if pending is not None:
+            await pending
+        # 단건 작성과 같이 등록한 게시글이 목록에 바로 보이도록
+        if state.inserted:
+            invalidate_feed_cache()
+
+    elapsed = time.perf_counter() - started_at
+    logger.info(f"대량 등록 완료: {state.inserted}건 등록, {state.failed}건 실패, {elapsed:.2f}초")
+
+    return {
+        "ok": state.failed == 0,
+        "lines": state.lines,
+        "inserted": state.inserted,
+        "failed": state.failed,
+        "chunks": state.chunks,
+        "elapsed_sec": round(elapsed, 3),
+        "rows_per_sec": round(state.inserted / elapsed) if elapsed > 0 else None,
+        "errors": state.errors,
+        "errors_truncated": state.failed > len(state.errors),
+    }
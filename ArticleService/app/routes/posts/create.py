@@ -1,19 +1,21 @@
 from fastapi import FastAPI, HTTPException, Header, Response, APIRouter, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, constr
 from datetime import datetime, timezone     
 from depends import RequireAuth
 from sqlalchemy.future import select 
 from sqlalchemy.sql.expression import desc
-from database.core import AsyncSessionLocal
+from database.sharding import allocate_id, choose_shard_for_new_post, shard_session
 # from database.user import User
-from database.posts import Posts
+from database.posts import Posts, POST_TITLE_MAX_LENGTH
+from libs.group_commit import GROUP_COMMIT_ENABLED, post_writer
+from routes.posts.get import invalidate_feed_cache
 from typing import Optional
 
 router = APIRouter()
 
 class ApplicationExample(BaseModel):
     content: str
-    title: str
+    title: constr(max_length=POST_TITLE_MAX_LENGTH)
     picture: Optional[bytes] = None
 
 @router.post("/api/create", tags=["create posts"])
@@ -22,9 +24,32 @@ async def submit_apply(data: ApplicationExample, userid=Depends(RequireAuth)):
     if not userid:
         raise HTTPException(status_code=401, detail="로그인 후 이용 가능합니다.")
     
-    async with AsyncSessionLocal() as session:
+    # 샤딩을 쓰면 샤드를 정하고 그 샤드로 인코딩된 id를 할당 (아니면 자동 증가)
+    shard = choose_shard_for_new_post()
+
+    if GROUP_COMMIT_ENABLED:
+        row = {
+            "title": data.title,
+            "content": data.content,
+            "picture": data.picture,
+            "user_id": userid,
+            "last_modified": datetime.now(timezone.utc),
+            "is_modified": False,
+            "views": 0,
+            "hearts": 0,
+            "unique_viewers": 0,
+        }
+        # 동시에 들어온 작성 요청과 함께 한 번에 id 할당/INSERT/커밋
+        post_id = await post_writer.insert(row, shard)
+        invalidate_feed_cache()
+        # 사진은 post_id로 /api/posts/{post_id}/picture에 따로 업로드
+        return {"ok": True, "post_id": post_id}
+
+    post_id = await allocate_id("posts", shard)
+    async with shard_session(shard) as session:
     
         db_value = Posts(
+            id=post_id,
             title=data.title,
             content=data.content,
             picture=data.picture,
@@ -34,5 +59,6 @@ async def submit_apply(data: ApplicationExample, userid=Depends(RequireAuth)):
     
         session.add(db_value)
         await session.commit()
+    invalidate_feed_cache()
 
-    return {"ok": True}
+    return {"ok": True, "post_id": db_value.id}
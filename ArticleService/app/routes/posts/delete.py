@@ -2,11 +2,13 @@ from fastapi import FastAPI, HTTPException, Header, Response, APIRouter, Depends
 from pydantic import BaseModel
 from datetime import datetime, timezone     
 from depends import RequireAuth
+from libs.hot_posts import invalidate_post
+from libs.pictures import forget_pictures
 from sqlalchemy.future import select 
 from sqlalchemy.sql.expression import desc
-from database.core import AsyncSessionLocal
+from database.sharding import get_engine, writable_shard_for_post
 # from database.user import User
-from database.posts import Posts
+from database.statements import DELETE_POST, DELETE_POST_COMMENTS, DELETE_POST_PICTURES
 from typing import Optional
 
 router = APIRouter()
@@ -17,15 +19,19 @@ async def submit_apply(userid=Depends(RequireAuth), post_id: int = 0):
     if not userid:
         raise HTTPException(status_code=401, detail="로그인 후 이용 가능합니다.")
     
-    async with AsyncSessionLocal() as session:
-        post_query = select(Posts).where(Posts.id == post_id)
-        post = await session.execute(post_query)
-        post_to_delete = post.scalars().first()
-        
-        if not post_to_delete:
+    # 다른 샤드로 옮기는 중인 게시글이면 ShardRangeMoving (503)
+    shard = writable_shard_for_post(post_id)
+
+    async with get_engine(shard).begin() as conn:
+        await conn.execute(DELETE_POST_COMMENTS, {"post_id": post_id})
+        await conn.execute(DELETE_POST_PICTURES, {"post_id": post_id})
+        result = await conn.execute(DELETE_POST, {"post_id": post_id})
+
+        # 없는 게시글이면 예외로 트랜잭션이 롤백됨
+        if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="해당 게시글이 없습니다.")
-        
-        await session.delete(post_to_delete)
-        await session.commit()
+
+    invalidate_post(post_id)
+    forget_pictures(post_id)
 
     return {"ok": True}
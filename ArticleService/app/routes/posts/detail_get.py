@@ -1,25 +1,56 @@
-from fastapi import FastAPI, HTTPException, Header, Response, APIRouter, Depends
+from fastapi import FastAPI, HTTPException, Header, Request, Response, APIRouter, Depends
 from pydantic import BaseModel, constr
 from sqlalchemy import select, update
 from datetime import datetime 
+from typing import Optional
+import asyncio
 from depends import RequireAuth
-from libs.redis import increment_views, get_views
+from libs.redis import increment_views, increment_views_coalesced, get_views, peek_views, record_view
+from libs.hot_posts import observe_post, get_cached_detail, cache_detail
+from libs.singleflight import SingleFlight
+from libs.prepared_response import accepts_gzip
+from libs.pictures import detail_picture_url, picture_urls
 
 router = APIRouter()
 
 from database.core import *
 # from database.user import * 
 from database.posts import *
+from database.statements import POST_DETAIL, COMMENTS_FOR_POST
+from database.sharding import engine_for_post
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.future import select
 from sqlalchemy import desc
-from sqlalchemy.orm import joinedload
 
 router = APIRouter()
 
+_detail_flight = SingleFlight("post_detail")
+
+async def _load_post_detail(post_id: int) -> Optional[dict]:
+    """
+    게시글과 댓글을 조회하여 응답용 dict로 만듭니다. (여러 요청이 공유하므로 수정 금지)
+    """
+    # 댓글은 게시글과 같은 샤드에 있음
+    async with engine_for_post(post_id).connect() as conn:
+        post_info = (await conn.execute(POST_DETAIL, {"post_id": post_id})).first()
+
+        if not post_info:
+            return None
+
+        comments = await conn.execute(COMMENTS_FOR_POST, {"post_id": post_id})
+        post = dict(post_info._mapping)
+        # 업로드한 사진은 본문 대신 상세용 변형 URL과 크기별 URL로 응답
+        picture_version = post.pop("picture_version")
+        return {
+            **post,
+            "picture_url": detail_picture_url(post_id, picture_version),
+            "picture_urls": picture_urls(post_id, picture_version),
+            "comments": [{"id": comment.id, "content": comment.content} for comment in comments]
+        }
+
 @router.get("/api/posts/{post_id}", tags=["posts"])  # 게시글 불러오기
-async def get_posts(post_id: int = 0, userid=Depends(RequireAuth)):
+async def get_posts(request: Request, post_id: int = 0, userid=Depends(RequireAuth)):
     """
     게시글 상세 조회
     
@@ -32,35 +63,39 @@ async def get_posts(post_id: int = 0, userid=Depends(RequireAuth)):
     if not userid:
         raise HTTPException(status_code=400, detail="토큰이 올바르지 않습니다.")
     
-    current_views = await increment_views(post_id)
+    # 순 방문자 기록, 중복 제거 창 안에서 다시 조회한 사용자는 조회수를 올리지 않음
+    counted = await record_view(post_id, userid)
+
+    # 핫 게시글은 조회수를 로컬에서 합산하고, 상세 정보는 워커 L1 캐시에서 응답
+    hot = observe_post(post_id)
+    if not counted:
+        current_views = await peek_views(post_id)
+    elif hot:
+        current_views = await increment_views_coalesced(post_id)
+    else:
+        # 카운터 키가 만료된 경우 DB 값으로 초기화한 뒤 증가하므로 그대로 사용
+        current_views = await increment_views(post_id)
+
+    if hot:
+        cached = get_cached_detail(post_id)
+        if cached is not None:
+            # 미리 직렬화/압축해 둔 응답에 조회수만 붙여 전송
+            views = current_views if current_views is not None else cached.detail["views"]
+            return cached.response.render(views, gzip=accepts_gzip(request))
     
-    async with AsyncSessionLocal() as session:
-        posts = await session.execute(select(Posts).options(joinedload(Posts.comments)).where(Posts.id == post_id))
-        post_info = posts.scalars().first()
-        
-        if not post_info:
-            raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
-            
-        # Redis 연결 실패 등으로 조회수를 가져오지 못한 경우
-        # DB의 원래 값에 1을 더한 값 사용
-        if current_views == 0 and post_info.views > 0:
-            current_views = post_info.views + 1
-            
-        post_info_dict = {
-            "id": post_info.id,
-            "title": post_info.title,
-            "content": post_info.content,
-            "picture": post_info.picture,
-            "last_modified": post_info.last_modified,
-            "is_modified": post_info.is_modified,
-            "views": current_views, 
-            "hearts": post_info.hearts,
-            "user_id": post_info.user_id,
-            "comments": [{"id": comment.id, "content": comment.content} for comment in post_info.comments]
-        }
-        
-        return {
-            "ok": "True",
-            "data": post_info_dict, 
-        }
+    # 같은 게시글을 동시에 여러 요청이 조회하면 DB 조회는 한 번만 실행
+    try:
+        post_info = await _detail_flight.do(post_id, lambda: _load_post_detail(post_id))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="게시글 조회 시간이 초과되었습니다.")
+
+    if not post_info:
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+
+    if hot:
+        cache_detail(post_id, post_info)
 
+    return {
+        "ok": "True",
+        "data": {**post_info, "views": current_views if current_views is not None else post_info["views"]},
+    }
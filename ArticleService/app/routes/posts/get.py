@@ -1,44 +1,110 @@
-from fastapi import FastAPI, HTTPException, Header, Response, APIRouter, Depends
+from fastapi import FastAPI, HTTPException, Header, Request, Response, APIRouter, Depends, Query
 from pydantic import BaseModel, constr
 from sqlalchemy import func, select, desc
 from datetime import datetime 
 import sys
 import asyncio
+import logging
+import os
 from depends import RequireAuth
+from rpc.auth.services import batch_get_users
+from grpc.experimental.aio import AioRpcError
+from libs.singleflight import SingleFlight
+from libs.prepared_response import PreparedJSON, accepts_gzip
+from shared.ttl_cache import TTLCache
+from libs.pictures import feed_picture_url
 
 router = APIRouter()
 
 from database.core import *
 # from database.user import * 
 from database.posts import *
+from database.statements import FEED_PAGE
+from database.sharding import get_engine, merged_page
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.future import select
 from sqlalchemy import desc
 
+logger = logging.getLogger("posts_get")
+
 router = APIRouter()
 
+_page_flight = SingleFlight("post_page")
+
+# 완성된 목록 응답을 직렬화/압축된 상태로 잠시 보관 (워커별, 0이면 사용 안 함)
+FEED_RESPONSE_CACHE_TTL = float(os.getenv("FEED_RESPONSE_CACHE_TTL", 2))
+FEED_RESPONSE_CACHE_SIZE = int(os.getenv("FEED_RESPONSE_CACHE_SIZE", 256))
+
+# {(cursor_id, limit): PreparedJSON}
+_response_cache = TTLCache(maxsize=FEED_RESPONSE_CACHE_SIZE, ttl=FEED_RESPONSE_CACHE_TTL)
+
+def invalidate_feed_cache():
+    """
+    게시글을 새로 등록한 뒤 이 워커의 목록 응답 캐시를 비웁니다. (다른 워커는 FEED_RESPONSE_CACHE_TTL 안에 만료)
+    """
+    _response_cache.clear()
+
+def _feed_item(row) -> dict:
+    item = dict(row)
+    # 목록에는 사진 대신 썸네일 변형 URL만 담음
+    item["thumbnail_url"] = feed_picture_url(item["id"], item.pop("picture_version"))
+    return item
+
+async def _load_page(cursor_id: int, limit: int) -> list:
+    """
+    cursor_id 다음 게시글 limit개를 조회합니다. (여러 요청이 공유하므로 수정 금지)
+    샤딩을 쓰면 모든 샤드를 동시에 조회하여 id 순으로 합칩니다.
+    """
+    async def fetch(shard: int, cursor: int, size: int) -> list:
+        async with get_engine(shard).connect() as conn:
+            res = await conn.execute(FEED_PAGE, {"cursor_id": cursor, "limit": size})
+            return [_feed_item(row._mapping) for row in res]
+
+    return await merged_page(fetch, cursor_id, limit)
+
 @router.get("/api/get_posts/{cursor_id}", tags=["posts"])  # 게시글 불러오기
-async def get_posts(cursor_id: int = 0, userid=Depends(RequireAuth)):
+async def get_posts(request: Request, cursor_id: int = 0, limit: int = Query(10, ge=1, le=50), userid=Depends(RequireAuth)):
     if not userid:
         raise HTTPException(status_code=400, detail="토큰이 올바르지 않습니다.")
+
+    if FEED_RESPONSE_CACHE_TTL > 0:
+        cached = _response_cache.get((cursor_id, limit))
+        if cached is not None:
+            return cached.render(gzip=accepts_gzip(request))
     
-    async with AsyncSessionLocal() as session:
-        query = select(Posts).where(Posts.id > cursor_id).order_by(Posts.id).limit(10)  
-        res = await session.execute(query)
-        posts = res.scalars().all()
+    # 같은 페이지를 동시에 여러 요청이 조회하면 DB 조회는 한 번만 실행
+    try:
+        posts = await _page_flight.do((cursor_id, limit), lambda: _load_page(cursor_id, limit))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="게시글 목록 조회 시간이 초과되었습니다.")
+
+    next_cursor_id = posts[-1]["id"] if posts else None
+
+    # 작성자 정보는 페이지 단위로 한 번에 조회 (캐시 미스가 있을 때만 RPC 1회)
+    authors_ok = True
+    try:
+        authors = await batch_get_users(post["user_id"] for post in posts)
+    except (AioRpcError, asyncio.TimeoutError) as e:
+        logger.error(f"작성자 정보 조회 실패: {e!r}")
+        authors = {}
+        authors_ok = False
 
-        next_cursor_id = posts[-1].id if posts else None
+    posts_data = [{
+        **post,
+        "author": (authors.get(post["user_id"]) or {}).get("handle_name"),
+    } for post in posts]
 
-        posts_data = [{
-            "title": post.title,
-            "author": post.author,
-            "created_at": post.created_at
-        } for post in posts]
+    result = {
+        "ok": "True",
+        "posts": posts_data,  
+        "next_cursor_id": next_cursor_id
+    }
 
-        return {
-            "ok": "True",
-            "posts": posts_data,  
-            "next_cursor_id": next_cursor_id
-        }
+    # 작성자 정보가 빠진 응답은 캐시하지 않음
+    if FEED_RESPONSE_CACHE_TTL > 0 and authors_ok:
+        prepared = PreparedJSON(result)
+        _response_cache.set((cursor_id, limit), prepared)
+        return prepared.render(gzip=accepts_gzip(request))
 
+    return result
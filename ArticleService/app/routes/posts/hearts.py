@@ -3,11 +3,14 @@ from pydantic import BaseModel
 from sqlalchemy import select, update
 from depends import RequireAuth
 from libs.redis import increment_hearts, decrement_hearts, get_hearts
+from libs.notifications import publish_event, EVENT_HEART
 
 router = APIRouter()
 
 from database.core import *
 from database.posts import *
+from database.statements import POST_HEARTS
+from database.sharding import engine_for_post
 
 class HeartRequest(BaseModel):
     post_id: int
@@ -28,12 +31,10 @@ async def add_heart(request: HeartRequest, userid=Depends(RequireAuth)):
     
     post_id = request.post_id
     
-    async with AsyncSessionLocal() as session:
+    async with engine_for_post(post_id).connect() as conn:
         # 게시글 존재 확인
-        result = await session.execute(
-            select(Posts).where(Posts.id == post_id)
-        )
-        post = result.scalars().first()
+        result = await conn.execute(POST_HEARTS, {"post_id": post_id})
+        post = result.first()
         
         if not post:
             raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
@@ -45,6 +46,8 @@ async def add_heart(request: HeartRequest, userid=Depends(RequireAuth)):
         if current_hearts == 0:
             new_hearts = post.hearts + 1
                
+    # 작성자 알림은 큐에만 넣고 워커가 모아서 전송
+    await publish_event(EVENT_HEART, post_id, userid)
     
     return {
         "ok": "True",
@@ -68,12 +71,10 @@ async def remove_heart(request: HeartRequest, userid=Depends(RequireAuth)):
     
     post_id = request.post_id
     
-    async with AsyncSessionLocal() as session:
+    async with engine_for_post(post_id).connect() as conn:
         
-        result = await session.execute(
-            select(Posts).where(Posts.id == post_id)
-        )
-        post = result.scalars().first()
+        result = await conn.execute(POST_HEARTS, {"post_id": post_id})
+        post = result.first()
         
         if not post:
             raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
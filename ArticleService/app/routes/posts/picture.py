@@ -0,0 +1,91 @@
+from fastapi import HTTPException, Request, Response, APIRouter, Depends, Query
+from depends import RequireAuth
+from database.sharding import get_engine, writable_shard_for_post
+from database.statements import POST_PICTURE_VERSION
+from libs.pictures import (
+    PICTURE_MAX_BYTES,
+    VARIANT_NAMES,
+    PictureBusy,
+    PictureTooLarge,
+    load_picture,
+    pictures_available,
+    release_upload,
+    reserve_upload,
+    schedule_picture,
+    spool_upload,
+)
+from libs.thumbnails import InvalidPicture
+from typing import Optional
+
+router = APIRouter()
+
+# URL의 버전(v)이 현재 버전과 같으면 내용이 바뀌지 않으므로 오래 캐시
+PICTURE_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PICTURE_CACHE_CONTROL = "public, max-age=60"
+
+@router.post("/api/posts/{post_id}/picture", tags=["update posts"], status_code=202)
+async def upload_picture(request: Request, post_id: int, userid=Depends(RequireAuth)):
+    """
+    게시글 사진 업로드
+
+    multipart/form-data의 picture 파일 필드 또는 image/* 본문을 그대로 받습니다. (JPEG/PNG/GIF/WEBP)
+    크기별 변형은 백그라운드에서 만들어지며, 저장되면 상세/목록 응답의 picture_url/thumbnail_url이 바뀝니다.
+    """
+    if not userid:
+        raise HTTPException(status_code=401, detail="로그인 후 이용 가능합니다.")
+
+    if not pictures_available():
+        raise HTTPException(status_code=501, detail="사진 업로드를 사용할 수 없습니다.")
+
+    # 본문을 받기 전에 확인 (옮기는 중인 게시글이면 ShardRangeMoving -> 503)
+    shard = writable_shard_for_post(post_id)
+    async with get_engine(shard).connect() as conn:
+        if (await conn.execute(POST_PICTURE_VERSION, {"post_id": post_id})).first() is None:
+            raise HTTPException(status_code=404, detail="해당 게시글이 없습니다.")
+
+    try:
+        reserve_upload()
+    except PictureBusy:
+        raise HTTPException(status_code=503, detail="사진 처리 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.", headers={"Retry-After": "5"})
+
+    try:
+        upload = await spool_upload(request)
+    except PictureTooLarge:
+        release_upload()
+        raise HTTPException(status_code=413, detail=f"사진은 {PICTURE_MAX_BYTES // (1024 * 1024)}MB 이하만 올릴 수 있습니다.")
+    except InvalidPicture as e:
+        release_upload()
+        raise HTTPException(status_code=415, detail=str(e))
+    except BaseException:
+        release_upload()
+        raise
+
+    schedule_picture(post_id, upload)
+
+    return {"ok": True, "status": "processing"}
+
+@router.get("/api/posts/{post_id}/picture/{variant}", tags=["posts"])
+async def get_picture(request: Request, post_id: int, variant: str, v: Optional[int] = Query(None)):
+    """
+    게시글 사진 변형 (thumb, medium, large 등)
+
+    <img>에서 바로 쓰도록 인증 없이 응답합니다. 상세/목록 응답의 URL에 버전(v)이 붙어 있습니다.
+    """
+    if variant not in VARIANT_NAMES:
+        raise HTTPException(status_code=404, detail="없는 사진 크기입니다.")
+
+    picture = await load_picture(post_id, variant, v)
+    if picture is None:
+        raise HTTPException(status_code=404, detail="사진이 없습니다.")
+
+    etag = f'"{post_id}-{picture.version}-{variant}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": PICTURE_IMMUTABLE_CACHE_CONTROL if v == picture.version else PICTURE_CACHE_CONTROL,
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    # 이미 압축된 이미지이므로 GZipMiddleware가 다시 압축하지 않도록 표시
+    headers["Content-Encoding"] = "identity"
+    return Response(content=picture.data, media_type=picture.content_type, headers=headers)
@@ -1,19 +1,22 @@
 from fastapi import FastAPI, HTTPException, Header, Response, APIRouter, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, constr
 from datetime import datetime, timezone     
 from depends import RequireAuth
+from libs.hot_posts import invalidate_post
+from libs.pictures import forget_pictures
 from sqlalchemy.future import select 
 from sqlalchemy.sql.expression import desc
-from database.core import AsyncSessionLocal
+from database.sharding import get_engine, writable_shard_for_post
 # from database.user import User
-from database.posts import Posts
+from database.posts import POST_TITLE_MAX_LENGTH
+from database.statements import UPDATE_POST, DELETE_POST_PICTURES
 from typing import Optional
 
 router = APIRouter()
 
 class PostsExample(BaseModel):
     content: Optional[str] = None
-    title: Optional[str] = None
+    title: Optional[constr(max_length=POST_TITLE_MAX_LENGTH)] = None
     picture: Optional[bytes] = None
 
 @router.post("/api/update/{post_id}", tags=["update posts"])
@@ -22,20 +25,33 @@ async def submit_apply(data: PostsExample, userid=Depends(RequireAuth), post_id:
     if not userid:
         raise HTTPException(status_code=401, detail="로그인 후 이용 가능합니다.")
     
-    async with AsyncSessionLocal() as session:
-
-        post = await session.execute(select(Posts).where(Posts.id == post_id))
-        post = post.scalars().first()
-
-        if not post:
+    # 다른 샤드로 옮기는 중인 게시글이면 ShardRangeMoving (503)
+    shard = writable_shard_for_post(post_id)
+
+    async with get_engine(shard).begin() as conn:
+        # 보내지 않은 제목/본문은 그대로 둠 (NOT NULL 컬럼)
+        values = {
+            "post_id": post_id,
+            "picture": data.picture,
+            "last_modified": datetime.now(timezone.utc),
+        }
+        if data.title is not None:
+            values["title"] = data.title
+        if data.content is not None:
+            values["content"] = data.content
+        if data.picture is not None:
+            # 본문으로 보낸 사진이 업로드한 사진(/api/posts/{post_id}/picture)을 대신함
+            values["picture_version"] = None
+
+        result = await conn.execute(UPDATE_POST, values)
+
+        if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="해당 게시글이 없습니다.")
 
-        post.title = data.title
-        post.content = data.content
-        post.picture = data.picture
-        post.last_modified = datetime.now(timezone.utc)
+        if data.picture is not None:
+            await conn.execute(DELETE_POST_PICTURES, {"post_id": post_id})
 
-        session.add(post)
-        await session.commit()
+    invalidate_post(post_id)
+    forget_pictures(post_id)
 
-        return {"ok": True}
+    return {"ok": True}
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: article.proto
+# Protobuf Python Version: 4.25.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rarticle.proto\x12\x07\x61rticle\"c\n\x07\x43omment\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\t\x12\x0f\n\x07user_id\x18\x03 \x01(\x03\x12\x15\n\rlast_modified\x18\x04 \x01(\t\x12\x13\n\x0bis_modified\x18\x05 \x01(\x08\"\xd4\x01\n\x04Post\x12\n\n\x02id\x18\x01 \x01(\x03\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\x12\x14\n\x07picture\x18\x04 \x01(\x0cH\x00\x88\x01\x01\x12\x15\n\rlast_modified\x18\x05 \x01(\t\x12\x13\n\x0bis_modified\x18\x06 \x01(\x08\x12\r\n\x05views\x18\x07 \x01(\x03\x12\x0e\n\x06hearts\x18\x08 \x01(\x03\x12\x0f\n\x07user_id\x18\t \x01(\x03\x12\"\n\x08\x63omments\x18\n \x03(\x0b\x32\x10.article.CommentB\n\n\x08_picture\";\n\tPostStats\x12\x0f\n\x07post_id\x18\x01 \x01(\x03\x12\r\n\x05views\x18\x02 \x01(\x03\x12\x0e\n\x06hearts\x18\x03 \x01(\x03\";\n\x0eGetPostRequest\x12\x0f\n\x07post_id\x18\x01 \x01(\x03\x12\x18\n\x10include_comments\x18\x02 \x01(\x08\"K\n\rGetPostResult\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12 \n\x04post\x18\x02 \x01(\x0b\x32\r.article.PostH\x00\x88\x01\x01\x42\x07\n\x05_post\"A\n\x14\x42\x61tchGetPostsRequest\x12\x10\n\x08post_ids\x18\x01 \x03(\x03\x12\x17\n\x0finclude_content\x18\x02 \x01(\x08\"H\n\x13\x42\x61tchGetPostsResult\x12\x1c\n\x05posts\x18\x01 \x03(\x0b\x32\r.article.Post\x12\x13\n\x0bmissing_ids\x18\x02 \x03(\x03\"o\n\x10ListPostsRequest\x12\x11\n\tcursor_id\x18\x01 \x01(\x03\x12\r\n\x05limit\x18\x02 \x01(\x05\x12\x14\n\x07user_id\x18\x03 \x01(\x03H\x00\x88\x01\x01\x12\x17\n\x0finclude_content\x18\x04 \x01(\x08\x42\n\n\x08_user_id\"#\n\x0fGetStatsRequest\x12\x10\n\x08post_ids\x18\x01 \x03(\x03\"3\n\x0eGetStatsResult\x12!\n\x05stats\x18\x01 \x03(\x0b\x32\x12.article.PostStats2\x9a\x02\n\x0e\x41rticleService\x12<\n\x07GetPost\x12\x17.article.GetPostRequest\x1a\x16.article.GetPostResult\"\x00\x12N\n\rBatchGetPosts\x12\x1d.article.BatchGetPostsRequest\x1a\x1c.article.BatchGetPostsResult\"\x00\x12\x39\n\tListPosts\x12\x19.article.ListPostsRequest\x1a\r.article.Post\"\x00\x30\x01\x12?\n\x08GetStats\x12\x18.article.GetStatsRequest\x1a\x17.article.GetStatsResult\"\x00\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'article_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_COMMENT']._serialized_start=26
+  _globals['_COMMENT']._serialized_end=125
+  _globals['_POST']._serialized_start=128
+  _globals['_POST']._serialized_end=340
+  _globals['_POSTSTATS']._serialized_start=342
+  _globals['_POSTSTATS']._serialized_end=401
+  _globals['_GETPOSTREQUEST']._serialized_start=403
+  _globals['_GETPOSTREQUEST']._serialized_end=462
+  _globals['_GETPOSTRESULT']._serialized_start=464
+  _globals['_GETPOSTRESULT']._serialized_end=539
+  _globals['_BATCHGETPOSTSREQUEST']._serialized_start=541
+  _globals['_BATCHGETPOSTSREQUEST']._serialized_end=606
+  _globals['_BATCHGETPOSTSRESULT']._serialized_start=608
+  _globals['_BATCHGETPOSTSRESULT']._serialized_end=680
+  _globals['_LISTPOSTSREQUEST']._serialized_start=682
+  _globals['_LISTPOSTSREQUEST']._serialized_end=793
+  _globals['_GETSTATSREQUEST']._serialized_start=795
+  _globals['_GETSTATSREQUEST']._serialized_end=830
+  _globals['_GETSTATSRESULT']._serialized_start=832
+  _globals['_GETSTATSRESULT']._serialized_end=883
+  _globals['_ARTICLESERVICE']._serialized_start=886
+  _globals['_ARTICLESERVICE']._serialized_end=1168
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,165 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from . import article_pb2 as article__pb2
+
+
+class ArticleServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GetPost = channel.unary_unary(
+                '/article.ArticleService/GetPost',
+                request_serializer=article__pb2.GetPostRequest.SerializeToString,
+                response_deserializer=article__pb2.GetPostResult.FromString,
+                )
+        self.BatchGetPosts = channel.unary_unary(
+                '/article.ArticleService/BatchGetPosts',
+                request_serializer=article__pb2.BatchGetPostsRequest.SerializeToString,
+                response_deserializer=article__pb2.BatchGetPostsResult.FromString,
+                )
+        self.ListPosts = channel.unary_stream(
+                '/article.ArticleService/ListPosts',
+                request_serializer=article__pb2.ListPostsRequest.SerializeToString,
+                response_deserializer=article__pb2.Post.FromString,
+                )
+        self.GetStats = channel.unary_unary(
+                '/article.ArticleService/GetStats',
+                request_serializer=article__pb2.GetStatsRequest.SerializeToString,
+                response_deserializer=article__pb2.GetStatsResult.FromString,
+                )
+
+
+class ArticleServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def GetPost(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchGetPosts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListPosts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetStats(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_ArticleServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'GetPost': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetPost,
+                    request_deserializer=article__pb2.GetPostRequest.FromString,
+                    response_serializer=article__pb2.GetPostResult.SerializeToString,
+            ),
+            'BatchGetPosts': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetPosts,
+                    request_deserializer=article__pb2.BatchGetPostsRequest.FromString,
+                    response_serializer=article__pb2.BatchGetPostsResult.SerializeToString,
+            ),
+            'ListPosts': grpc.unary_stream_rpc_method_handler(
+                    servicer.ListPosts,
+                    request_deserializer=article__pb2.ListPostsRequest.FromString,
+                    response_serializer=article__pb2.Post.SerializeToString,
+            ),
+            'GetStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetStats,
+                    request_deserializer=article__pb2.GetStatsRequest.FromString,
+                    response_serializer=article__pb2.GetStatsResult.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'article.ArticleService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class ArticleService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def GetPost(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/article.ArticleService/GetPost',
+            article__pb2.GetPostRequest.SerializeToString,
+            article__pb2.GetPostResult.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def BatchGetPosts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/article.ArticleService/BatchGetPosts',
+            article__pb2.BatchGetPostsRequest.SerializeToString,
+            article__pb2.BatchGetPostsResult.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ListPosts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/article.ArticleService/ListPosts',
+            article__pb2.ListPostsRequest.SerializeToString,
+            article__pb2.Post.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/article.ArticleService/GetStats',
+            article__pb2.GetStatsRequest.SerializeToString,
+            article__pb2.GetStatsResult.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,20 @@
+from rpc.article.declaration import article_pb2_grpc
+from .getpost import GetPostInterface
+from .batchgetposts import BatchGetPostsInterface
+from .listposts import ListPostsInterface
+from .getstats import GetStatsInterface
+
+
+class ArticleServicer(article_pb2_grpc.ArticleServiceServicer):
+    async def GetPost(self, request, context):
+        return await GetPostInterface(self, request, context)
+
+    async def BatchGetPosts(self, request, context):
+        return await BatchGetPostsInterface(self, request, context)
+
+    async def ListPosts(self, request, context):
+        async for post in ListPostsInterface(self, request, context):
+            yield post
+
+    async def GetStats(self, request, context):
+        return await GetStatsInterface(self, request, context)
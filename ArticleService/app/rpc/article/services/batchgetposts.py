@@ -0,0 +1,49 @@
+import asyncio
+import os
+import grpc
+from sqlalchemy import select
+from database.sharding import group_by_shard, shard_session
+from database.posts import Posts
+from libs.redis import get_cached_stats_for_posts
+from rpc.article.declaration.article_pb2 import BatchGetPostsResult
+from .converter import merge_stats, post_to_message
+
+BATCH_GET_MAX_IDS = int(os.getenv("GRPC_BATCH_GET_MAX_IDS", 500))
+
+
+async def BatchGetPostsInterface(self, request, context):
+    # 중복 제거 (요청 순서 유지)
+    post_ids = list(dict.fromkeys(request.post_ids))
+
+    if len(post_ids) > BATCH_GET_MAX_IDS:
+        await context.abort(
+            grpc.StatusCode.INVALID_ARGUMENT,
+            f"post_ids는 최대 {BATCH_GET_MAX_IDS}개까지 요청할 수 있습니다.",
+        )
+
+    if not post_ids:
+        return BatchGetPostsResult()
+
+    async def _load(shard, ids):
+        async with shard_session(shard) as session:
+            result = await session.execute(select(Posts).where(Posts.id.in_(ids)))
+            return result.scalars().all()
+
+    # 샤드별로 동시에 조회
+    posts = {}
+    for loaded in await asyncio.gather(*(_load(shard, ids) for shard, ids in group_by_shard(post_ids).items())):
+        posts.update((post.id, post) for post in loaded)
+
+    cached = await get_cached_stats_for_posts(list(posts.keys()))
+
+    response = BatchGetPostsResult()
+    for post_id in post_ids:
+        post = posts.get(post_id)
+        if post is None:
+            response.missing_ids.append(post_id)
+            continue
+        views, hearts = merge_stats(post.id, post.views, post.hearts, cached)
+        response.posts.append(
+            post_to_message(post, views, hearts, include_content=request.include_content)
+        )
+    return response
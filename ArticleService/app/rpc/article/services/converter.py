@@ -0,0 +1,50 @@
+from typing import Dict, Optional, Tuple
+from rpc.article.declaration.article_pb2 import Post, Comment, PostStats
+
+
+def merge_stats(post_id: int, db_views: int, db_hearts: int,
+                cached: Dict[int, Tuple[Optional[int], Optional[int]]]) -> Tuple[int, int]:
+    """
+    Redis에 캐시된 통계가 있으면 우선 사용하고, 없으면 DB 값을 사용합니다.
+    """
+    views, hearts = cached.get(post_id, (None, None))
+    return (
+        views if views is not None else (db_views or 0),
+        hearts if hearts is not None else (db_hearts or 0),
+    )
+
+
+def post_to_message(post, views: int, hearts: int,
+                    include_content: bool = True,
+                    include_picture: bool = False,
+                    comments=None) -> Post:
+    message = Post(
+        id=post.id,
+        title=post.title,
+        last_modified=post.last_modified.isoformat() if post.last_modified else "",
+        is_modified=bool(post.is_modified),
+        views=views,
+        hearts=hearts,
+        user_id=post.user_id,
+    )
+
+    if include_content:
+        message.content = post.content
+    if include_picture and post.picture is not None:
+        message.picture = post.picture
+    if comments:
+        message.comments.extend(
+            Comment(
+                id=comment.id,
+                content=comment.content,
+                user_id=comment.user_id,
+                last_modified=comment.last_modified.isoformat() if comment.last_modified else "",
+                is_modified=bool(comment.is_modified),
+            )
+            for comment in comments
+        )
+    return message
+
+
+def stats_to_message(post_id: int, views: int, hearts: int) -> PostStats:
+    return PostStats(post_id=post_id, views=views, hearts=hearts)
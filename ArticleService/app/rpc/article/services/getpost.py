@@ -0,0 +1,32 @@
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from database.sharding import shard_for_post, shard_session
+from database.posts import Posts
+from libs.redis import get_cached_stats_for_posts
+from rpc.article.declaration.article_pb2 import GetPostResult
+from .converter import merge_stats, post_to_message
+
+
+async def GetPostInterface(self, request, context):
+    query = select(Posts).where(Posts.id == request.post_id)
+    if request.include_comments:
+        query = query.options(joinedload(Posts.comments))
+
+    async with shard_session(shard_for_post(request.post_id)) as session:
+        result = await session.execute(query)
+        post = result.unique().scalars().first()
+
+    if not post:
+        return GetPostResult(success=False)
+
+    cached = await get_cached_stats_for_posts([post.id])
+    views, hearts = merge_stats(post.id, post.views, post.hearts, cached)
+
+    return GetPostResult(
+        success=True,
+        post=post_to_message(
+            post, views, hearts,
+            include_picture=True,
+            comments=post.comments if request.include_comments else None,
+        ),
+    )
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import grpc
+from sqlalchemy import select
+from database.sharding import group_by_shard, shard_session
+from database.posts import Posts
+from libs.redis import get_cached_stats_for_posts
+from rpc.article.declaration.article_pb2 import GetStatsResult
+from .converter import stats_to_message
+
+GET_STATS_MAX_IDS = int(os.getenv("GRPC_GET_STATS_MAX_IDS", 1000))
+
+
+async def GetStatsInterface(self, request, context):
+    post_ids = list(dict.fromkeys(request.post_ids))
+
+    if len(post_ids) > GET_STATS_MAX_IDS:
+        await context.abort(
+            grpc.StatusCode.INVALID_ARGUMENT,
+            f"post_ids는 최대 {GET_STATS_MAX_IDS}개까지 요청할 수 있습니다.",
+        )
+
+    if not post_ids:
+        return GetStatsResult()
+
+    cached = await get_cached_stats_for_posts(post_ids)
+
+    # Redis에 없는 값만 DB에서 조회
+    missing_ids = [
+        post_id for post_id in post_ids
+        if None in cached.get(post_id, (None, None))
+    ]
+    db_stats = {}
+    if missing_ids:
+        async def _load(shard, ids):
+            async with shard_session(shard) as session:
+                result = await session.execute(
+                    select(Posts.id, Posts.views, Posts.hearts).where(Posts.id.in_(ids))
+                )
+                return {row.id: (row.views, row.hearts) for row in result}
+
+        for loaded in await asyncio.gather(*(_load(shard, ids) for shard, ids in group_by_shard(missing_ids).items())):
+            db_stats.update(loaded)
+
+    response = GetStatsResult()
+    for post_id in post_ids:
+        views, hearts = cached.get(post_id, (None, None))
+        db_views, db_hearts = db_stats.get(post_id, (None, None))
+
+        if views is None and hearts is None and db_views is None:
+            # 존재하지 않는 게시글
+            continue
+
+        response.stats.append(stats_to_message(
+            post_id,
+            views if views is not None else (db_views or 0),
+            hearts if hearts is not None else (db_hearts or 0),
+        ))
+    return response
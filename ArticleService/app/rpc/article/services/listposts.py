@@ -0,0 +1,52 @@
+import os
+from sqlalchemy import select
+from database.sharding import merged_page, shard_session
+from database.posts import Posts
+from libs.redis import get_cached_stats_for_posts
+from .converter import merge_stats, post_to_message
+
+LIST_POSTS_DEFAULT_LIMIT = int(os.getenv("GRPC_LIST_POSTS_DEFAULT_LIMIT", 100))
+LIST_POSTS_MAX_LIMIT = int(os.getenv("GRPC_LIST_POSTS_MAX_LIMIT", 100000))
+LIST_POSTS_CHUNK_SIZE = int(os.getenv("GRPC_LIST_POSTS_CHUNK_SIZE", 500))
+
+
+async def _load_chunk(request, shard: int, cursor_id: int, size: int):
+    query = select(Posts).where(Posts.id > cursor_id)
+    if request.HasField("user_id"):
+        query = query.where(Posts.user_id == request.user_id)
+    query = query.order_by(Posts.id).limit(size)
+
+    async with shard_session(shard) as session:
+        result = await session.execute(query)
+        return result.scalars().all()
+
+
+async def ListPostsInterface(self, request, context):
+    """
+    cursor_id 이후의 게시글을 청크 단위로 조회하여 스트리밍합니다.
+    청크마다 세션을 새로 열어 긴 스트림이 커넥션을 오래 점유하지 않도록 합니다.
+    샤딩을 쓰면 청크마다 모든 샤드를 조회하여 id 순으로 합칩니다.
+    """
+    limit = request.limit or LIST_POSTS_DEFAULT_LIMIT
+    limit = min(limit, LIST_POSTS_MAX_LIMIT)
+    cursor_id = request.cursor_id
+    sent = 0
+
+    while sent < limit:
+        chunk_size = min(LIST_POSTS_CHUNK_SIZE, limit - sent)
+        posts = await merged_page(lambda shard, cursor, size: _load_chunk(request, shard, cursor, size),
+                                  cursor_id, chunk_size, id_of=lambda post: post.id)
+
+        if not posts:
+            break
+
+        cached = await get_cached_stats_for_posts([post.id for post in posts])
+        for post in posts:
+            views, hearts = merge_stats(post.id, post.views, post.hearts, cached)
+            yield post_to_message(post, views, hearts, include_content=request.include_content)
+
+        sent += len(posts)
+        cursor_id = posts[-1].id
+
+        if len(posts) < chunk_size:
+            break
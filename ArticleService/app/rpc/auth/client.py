@@ -1,5 +1,8 @@
+import asyncio
 import grpc
 from rpc.auth.declaration.auth_pb2_grpc import AuthServiceStub
+from shared.rpc.tracing import TracingClientInterceptor
+from shared.tracing import TRACING_ENABLED
 from dotenv import load_dotenv
 import os
 
@@ -7,18 +10,44 @@ import os
 load_dotenv()
 
 STORED_CLIENT = None
+STORED_CHANNEL = None
 
 AUTH_HOST = os.getenv("AUTH_HOST", "auth_service")
 AUTH_PORT = os.getenv("AUTH_PORT", "50001")
 
 async def generate_client():
-    global STORED_CLIENT
+    global STORED_CLIENT, STORED_CHANNEL
 
     if STORED_CLIENT:
         return STORED_CLIENT
 
-    channel = grpc.aio.insecure_channel(f"{AUTH_HOST}:{AUTH_PORT}")
+    # 트레이싱을 켜면 호출마다 traceparent를 메타데이터로 전달
+    interceptors = [TracingClientInterceptor()] if TRACING_ENABLED else None
+    channel = grpc.aio.insecure_channel(f"{AUTH_HOST}:{AUTH_PORT}", interceptors=interceptors)
     client = AuthServiceStub(channel)
 
+    STORED_CHANNEL = channel
     STORED_CLIENT = client
-    return client
\ No newline at end of file
+    return client
+
+async def warmup_channel(timeout: float) -> bool:
+    """
+    채널을 미리 연결하여 첫 요청이 연결 수립 비용을 내지 않도록 합니다.
+
+    Returns:
+        bool: 제한 시간 안에 READY 상태가 되었는지 여부
+    """
+    await generate_client()
+    try:
+        await asyncio.wait_for(STORED_CHANNEL.channel_ready(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+def get_channel_state():
+    """
+    현재 채널 연결 상태를 반환합니다. 채널이 없으면 None
+    """
+    if STORED_CHANNEL is None:
+        return None
+    return STORED_CHANNEL.get_state(try_to_connect=True)
@@ -1,10 +1,3 @@
-from .authorize import authorize 
-# from .getuser import GetUserInterface
-
-
-# class AuthorizeServicerV2(auth_pb2_grpc.AuthServiceServicer):
-#     async def Authorize(self, request, context):
-#         return await authorize(self, request, context)
-
-#     async def GetUser(self, request, context):
-#         return await GetUserInterface(self, request, context)
\ No newline at end of file
+from .authorize import authorize
+from .getuser import get_user, batch_get_users
+from .sendpush import send_push
@@ -0,0 +1,65 @@
+import logging
+import os
+from typing import Dict, Iterable, List, Optional
+from ..client import generate_client
+from shared.ttl_cache import TTLCache
+from libs.singleflight import SingleFlight
+from rpc.auth.declaration.auth_pb2 import BatchGetUsersRequest
+
+logger = logging.getLogger("auth_getuser")
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 300))
+USER_CACHE_NEGATIVE_TTL = float(os.getenv("USER_CACHE_NEGATIVE_TTL", 30))
+USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", 50000))
+
+# {user_id: {"id", "username", "handle_name"} 또는 None(존재하지 않는 사용자)}
+_user_cache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL)
+
+# 같은 사용자 목록을 동시에 조회하면(예: 같은 피드 페이지) RPC는 한 번만 호출
+_users_flight = SingleFlight("batch_get_users")
+
+
+async def batch_get_users(user_ids: Iterable[int]) -> Dict[int, Optional[dict]]:
+    """
+    여러 사용자 정보를 조회합니다.
+    캐시에 없는 사용자만 모아 BatchGetUsers RPC를 최대 한 번 호출합니다.
+
+    Args:
+        user_ids: 사용자 ID 목록
+
+    Returns:
+        {user_id: 사용자 정보 dict 또는 None}
+    """
+    found, missing = _user_cache.get_many(dict.fromkeys(user_ids))
+
+    if not missing:
+        return found
+
+    missing = sorted(missing)
+    loaded = await _users_flight.do(tuple(missing), lambda: _load_users(missing))
+    found.update(loaded)
+    return found
+
+
+async def _load_users(user_ids: List[int]) -> Dict[int, Optional[dict]]:
+    client = await generate_client()
+    response = await client.BatchGetUsers(BatchGetUsersRequest(userids=user_ids))
+
+    loaded = {
+        user.id: {"id": user.id, "username": user.username, "handle_name": user.handle_name}
+        for user in response.users
+    }
+    _user_cache.set_many(loaded)
+
+    # 존재하지 않는 사용자도 짧게 캐시하여 같은 ID로 반복 호출하지 않도록 함
+    for user_id in user_ids:
+        if user_id not in loaded:
+            _user_cache.set(user_id, None, ttl=USER_CACHE_NEGATIVE_TTL)
+            loaded[user_id] = None
+
+    return loaded
+
+
+async def get_user(user_id: int) -> Optional[dict]:
+    users = await batch_get_users([user_id])
+    return users.get(user_id)
@@ -0,0 +1,17 @@
+from ..client import generate_client
+from rpc.auth.declaration.auth_pb2 import SendPushRequest
+
+
+async def send_push(user_id: int, title: str, body: str, link: str = "", timeout: float = None) -> bool:
+    """
+    사용자 한 명에게 푸시 알림을 보냅니다.
+
+    Returns:
+        bool: Auth 서비스가 전송을 수락했는지 여부
+    """
+    client = await generate_client()
+    response = await client.SendPush(
+        SendPushRequest(userid=user_id, title=title, body=body, link=link),
+        timeout=timeout,
+    )
+    return response.success
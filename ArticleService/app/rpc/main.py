@@ -1,18 +1,85 @@
+import asyncio
+import logging
+import signal
 from grpc import aio
-from rpc.auth.declaration import auth_pb2_grpc
-from rpc.auth.services import AuthorizeServicer
+from rpc.article.declaration import article_pb2_grpc
+from rpc.article.services import ArticleServicer
+from shared.rpc.config import (
+    get_server_options,
+    get_max_concurrent_rpcs,
+    get_compression,
+    GRPC_SHUTDOWN_GRACE,
+    GRPC_METRICS_LOG_INTERVAL,
+)
+from shared.rpc.metrics import InFlightInterceptor, get_total_inflight, log_inflight_snapshot
+from shared.rpc.tracing import TracingServerInterceptor
+from shared.tracing import TRACING_ENABLED
 import os
 
+logger = logging.getLogger("grpc_server")
+
 
 class gRPCServer:
+    @staticmethod
+    def create_server() -> aio.Server:
+        interceptors = [InFlightInterceptor()]
+        if TRACING_ENABLED:
+            interceptors.append(TracingServerInterceptor())
+        return aio.server(
+            interceptors=interceptors,
+            options=get_server_options(),
+            maximum_concurrent_rpcs=get_max_concurrent_rpcs(),
+            compression=get_compression(),
+        )
+
     @staticmethod
     async def run():
-        server = aio.server()
+        server = gRPCServer.create_server()
 
-        auth_pb2_grpc.add_AuthServiceServicer_to_server(AuthorizeServicer(), server)
+        article_pb2_grpc.add_ArticleServiceServicer_to_server(ArticleServicer(), server)
 
-        article_port = os.getenv("ARTICLE_PORT", "50002")
-        server.add_insecure_port(f"[::]:{article_port}")
+        # HTTP(ARTICLE_PORT)와 포트가 겹치지 않도록 별도의 gRPC 포트를 사용
+        grpc_port = os.getenv("GRPC_PORT", "50102")
+        server.add_insecure_port(f"[::]:{grpc_port}")
         await server.start()
-        print("[GRPC] Server is running on port", article_port)
-        await server.wait_for_termination()
\ No newline at end of file
+        print("[GRPC] Server is running on port", grpc_port)
+
+        gRPCServer.install_shutdown_handlers(server)
+        metrics_task = gRPCServer.start_metrics_logger()
+        try:
+            await server.wait_for_termination()
+        finally:
+            if metrics_task:
+                metrics_task.cancel()
+
+    @staticmethod
+    def install_shutdown_handlers(server: aio.Server):
+        """
+        SIGTERM/SIGINT 수신 시 새 요청을 거절하고
+        진행 중인 RPC가 GRPC_SHUTDOWN_GRACE초 안에 끝나도록 기다린 뒤 종료합니다.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def drain(sig):
+            logger.info(f"[GRPC] 종료 시그널 수신: {sig.name}, 진행 중 RPC {get_total_inflight()}개 drain 시작")
+            await server.stop(GRPC_SHUTDOWN_GRACE)
+            logger.info("[GRPC] drain 완료, 서버 종료")
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, lambda s=sig: asyncio.create_task(drain(s)))
+            except (NotImplementedError, RuntimeError):
+                # 메인 스레드가 아니거나 지원하지 않는 플랫폼
+                pass
+
+    @staticmethod
+    def start_metrics_logger():
+        if GRPC_METRICS_LOG_INTERVAL <= 0:
+            return None
+
+        async def _loop():
+            while True:
+                await asyncio.sleep(GRPC_METRICS_LOG_INTERVAL)
+                log_inflight_snapshot()
+
+        return asyncio.create_task(_loop())
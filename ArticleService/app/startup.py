@@ -0,0 +1,232 @@
+"""
+시작/준비 상태 관리 모듈
+
+DB, Redis 커넥션과 Auth gRPC 채널을 병렬로 미리 열어두고(warm-up),
+준비가 끝난 뒤에만 readiness 체크가 성공하도록 합니다.
+시작 시간과 첫 요청 지연 시간도 함께 기록합니다.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Optional
+from sqlalchemy import text
+from database.core import DB_POOL_SIZE
+from database.sharding import fan_out, get_engine
+from libs.redis import get_all_node_clients
+from libs.redis.client import REDIS_POOL_SIZE
+from rpc.auth.client import warmup_channel, get_channel_state
+
+logger = logging.getLogger("startup")
+
+# 스키마 관리 방식: migrate(기본, 시작 시 미적용 마이그레이션 실행) / skip(DDL 실행 안 함, 별도 관리)
+DB_SCHEMA_MODE = os.getenv("DB_SCHEMA_MODE", "migrate")
+
+# 미리 열어둘 커넥션 수 (풀 크기를 넘지 않음)
+WARMUP_DB_CONNECTIONS = min(int(os.getenv("WARMUP_DB_CONNECTIONS", 5)), DB_POOL_SIZE)
+WARMUP_REDIS_CONNECTIONS = min(int(os.getenv("WARMUP_REDIS_CONNECTIONS", 5)), REDIS_POOL_SIZE)
+WARMUP_AUTH_CHANNEL = os.getenv("WARMUP_AUTH_CHANNEL", "1") == "1"
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", 10))
+WARMUP_RETRY_INTERVAL = float(os.getenv("WARMUP_RETRY_INTERVAL", 2))
+
+# readiness 체크 시 의존성별 제한 시간 (초)
+READINESS_CHECK_TIMEOUT = float(os.getenv("READINESS_CHECK_TIMEOUT", 1))
+
+# 모듈 import 시각을 프로세스 시작 시각으로 간주
+_process_started_at = time.perf_counter()
+
+_ready = False
+_warmup_task: Optional[asyncio.Task] = None
+_startup_report: Dict[str, Optional[float]] = {
+    "startup_ms": None,
+    "warmup_ms": None,
+    "db_warmup_ms": None,
+    "redis_warmup_ms": None,
+    "auth_warmup_ms": None,
+    "first_request_ms": None,
+}
+
+
+def _elapsed_ms(started_at: float) -> float:
+    return round((time.perf_counter() - started_at) * 1000, 2)
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+def get_startup_report() -> Dict[str, Optional[float]]:
+    return dict(_startup_report)
+
+
+def record_first_request(latency_ms: float):
+    """
+    첫 요청의 지연 시간을 한 번만 기록합니다.
+    """
+    if _startup_report["first_request_ms"] is None:
+        _startup_report["first_request_ms"] = round(latency_ms, 2)
+        logger.info(f"첫 요청 처리 시간: {latency_ms:.2f}ms")
+
+
+class FirstRequestTimerMiddleware:
+    """
+    첫 요청(health/ready 제외)의 처리 시간을 기록하는 ASGI 미들웨어
+    기록 후에는 플래그 확인만 하고 바로 통과시킵니다.
+    """
+    _SKIP_PATHS = ("/api/health", "/api/ready")
+
+    def __init__(self, app):
+        self.app = app
+        self.recorded = False
+
+    async def __call__(self, scope, receive, send):
+        if self.recorded or scope["type"] != "http" or scope["path"] in self._SKIP_PATHS:
+            return await self.app(scope, receive, send)
+
+        self.recorded = True
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            record_first_request((time.perf_counter() - started_at) * 1000)
+
+
+async def _warm_db(count: int):
+    if count <= 0:
+        return
+
+    started_at = time.perf_counter()
+    connections = []
+    try:
+        # 커넥션을 동시에 잡고 있어야 서로 다른 커넥션 N개가 열림 (샤드마다)
+        async def _open(shard: int):
+            conn = await get_engine(shard).connect()
+            connections.append(conn)
+            await conn.execute(text("SELECT 1"))
+
+        await fan_out(lambda shard: asyncio.gather(*[_open(shard) for _ in range(count)]))
+    finally:
+        # 닫으면 풀로 반환되어 이후 요청에서 재사용됨
+        await asyncio.gather(*[conn.close() for conn in connections], return_exceptions=True)
+
+    _startup_report["db_warmup_ms"] = _elapsed_ms(started_at)
+
+
+async def _warm_redis(count: int):
+    if count <= 0:
+        return
+
+    started_at = time.perf_counter()
+    clients = await get_all_node_clients()
+    if any(redis_client is None for redis_client in clients):
+        raise ConnectionError("Redis 연결 실패")
+
+    # 동시에 실행되는 명령마다 풀에서 별도 커넥션을 사용 (노드가 여럿이면 노드마다)
+    await asyncio.gather(*[redis_client.ping() for redis_client in clients for _ in range(count)])
+    _startup_report["redis_warmup_ms"] = _elapsed_ms(started_at)
+
+
+async def _warm_auth_channel():
+    if not WARMUP_AUTH_CHANNEL:
+        return
+
+    started_at = time.perf_counter()
+    if not await warmup_channel(WARMUP_TIMEOUT):
+        raise ConnectionError("Auth gRPC 채널이 준비되지 않았습니다.")
+    _startup_report["auth_warmup_ms"] = _elapsed_ms(started_at)
+
+
+async def warmup():
+    """
+    DB, Redis, Auth 채널을 병렬로 warm-up 합니다.
+    실패한 경우 WARMUP_RETRY_INTERVAL 간격으로 재시도하며, 성공하면 준비 상태가 됩니다.
+    """
+    global _ready
+
+    started_at = time.perf_counter()
+    while True:
+        results = await asyncio.gather(
+            asyncio.wait_for(_warm_db(WARMUP_DB_CONNECTIONS), WARMUP_TIMEOUT),
+            asyncio.wait_for(_warm_redis(WARMUP_REDIS_CONNECTIONS), WARMUP_TIMEOUT),
+            _warm_auth_channel(),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if not errors:
+            break
+
+        for error in errors:
+            logger.warning(f"warm-up 실패: {error!r}. {WARMUP_RETRY_INTERVAL}초 후 재시도...")
+        await asyncio.sleep(WARMUP_RETRY_INTERVAL)
+
+    _startup_report["warmup_ms"] = _elapsed_ms(started_at)
+    _startup_report["startup_ms"] = _elapsed_ms(_process_started_at)
+    _ready = True
+    logger.info(f"warm-up 완료: {_startup_report}")
+
+
+def start_warmup() -> asyncio.Task:
+    """
+    warm-up을 백그라운드 태스크로 시작합니다.
+    liveness(/api/health)는 바로 응답하고, readiness(/api/ready)는 완료 후 성공합니다.
+    """
+    global _warmup_task
+
+    if _warmup_task is None or _warmup_task.done():
+        _warmup_task = asyncio.get_event_loop().create_task(warmup())
+    return _warmup_task
+
+
+async def stop_warmup():
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except asyncio.CancelledError:
+            pass
+
+
+async def _timed(check) -> Dict[str, object]:
+    started_at = time.perf_counter()
+    try:
+        await asyncio.wait_for(check(), READINESS_CHECK_TIMEOUT)
+        return {"ok": True, "latency_ms": _elapsed_ms(started_at)}
+    except Exception as e:
+        return {"ok": False, "latency_ms": _elapsed_ms(started_at), "error": repr(e)}
+
+
+async def _check_db():
+    # 샤드 하나라도 응답하지 않으면 준비되지 않은 것으로 봄
+    async def _check(shard: int):
+        async with get_engine(shard).connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await fan_out(_check)
+
+
+async def _check_redis():
+    clients = await get_all_node_clients()
+    down = [node for node, redis_client in enumerate(clients) if redis_client is None]
+    if down:
+        raise ConnectionError(f"Redis 연결 실패 (노드 {down})")
+    await asyncio.gather(*[redis_client.ping() for redis_client in clients])
+
+
+async def _check_auth():
+    state = get_channel_state()
+    if state is None:
+        raise ConnectionError("Auth gRPC 채널이 없습니다.")
+    if state.name not in ("READY", "IDLE"):
+        raise ConnectionError(f"Auth gRPC 채널 상태: {state.name}")
+
+
+async def check_dependencies() -> Dict[str, Dict[str, object]]:
+    """
+    의존성별 상태와 응답 지연 시간을 병렬로 측정합니다.
+    """
+    checks = {"db": _check_db, "redis": _check_redis}
+    if WARMUP_AUTH_CHANNEL:
+        checks["auth"] = _check_auth
+
+    results = await asyncio.gather(*[_timed(check) for check in checks.values()])
+    return dict(zip(checks.keys(), results))
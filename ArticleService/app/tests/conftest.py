@@ -0,0 +1,22 @@
+"""
+ArticleService 테스트 공통 설정
+
+앱 모듈을 import 하기 전에 DB/Redis 백엔드를 정해야 하므로 여기서 환경변수를 지정합니다.
+샤드 2개(SQLite 임시 파일)와 인메모리 fakeredis를 사용합니다.
+
+사용법:
+    cd ArticleService/app && python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+
+_TEMP_DIR = tempfile.mkdtemp(prefix="article-test-")
+os.environ.setdefault("DB_SHARD_URLS", f"sqlite+aiosqlite:///{_TEMP_DIR}/shard0.db,sqlite+aiosqlite:///{_TEMP_DIR}/shard1.db")
+os.environ.setdefault("REDIS_URL", "fakeredis://")
+os.environ.setdefault("SECRET", "test-secret")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+os.environ.setdefault("FEED_RESPONSE_CACHE_TTL", "0")
+os.environ.setdefault("NOTIFY_ENABLED", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
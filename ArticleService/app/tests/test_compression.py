@@ -0,0 +1,80 @@
+import gzip
+import json
+import zlib
+from datetime import datetime
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select, text
+from database.compression import ENCODING_PLAIN, ENCODING_ZLIB, CompressedText, compress_content, decompress_content
+from libs.prepared_response import PreparedJSON, PreparedTailJSON
+
+LONG_CONTENT = "캐시 조회수 latency throughput " * 200
+
+
+def test_short_content_is_stored_plain():
+    stored = compress_content("짧은 본문")
+    assert stored[0] == ENCODING_PLAIN
+    assert decompress_content(stored) == "짧은 본문"
+
+
+def test_long_content_round_trips_compressed():
+    stored = compress_content(LONG_CONTENT)
+    assert stored[0] != ENCODING_PLAIN
+    assert len(stored) < len(LONG_CONTENT.encode("utf-8"))
+    assert decompress_content(stored) == LONG_CONTENT
+
+
+def test_zlib_rows_stay_readable():
+    # 설정을 zstd로 바꾸기 전에 저장한 zlib 행
+    stored = bytes((ENCODING_ZLIB,)) + zlib.compress(LONG_CONTENT.encode("utf-8"))
+    assert decompress_content(stored) == LONG_CONTENT
+
+
+def test_legacy_rows_without_marker_are_plain_utf8():
+    assert decompress_content("예전 TEXT 행") == "예전 TEXT 행"
+    assert decompress_content("예전 BLOB 행".encode("utf-8")) == "예전 BLOB 행"
+    assert decompress_content(b"") == ""
+
+
+def test_column_type_compresses_on_write_and_reads_legacy_rows():
+    metadata = MetaData()
+    table = Table("compressed", metadata, Column("id", Integer, primary_key=True), Column("content", CompressedText()))
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(table), [{"id": 1, "content": LONG_CONTENT}, {"id": 2, "content": None}])
+        # BLOB으로 바꾸기 전에 TEXT로 저장된 행
+        conn.execute(text("INSERT INTO compressed (id, content) VALUES (3, '예전 본문')"))
+
+        raw = conn.execute(text("SELECT content FROM compressed WHERE id = 1")).scalar()
+        rows = dict(conn.execute(select(table.c.id, table.c.content)).all())
+
+    assert len(raw) < len(LONG_CONTENT.encode("utf-8"))
+    assert rows == {1: LONG_CONTENT, 2: None, 3: "예전 본문"}
+
+
+def test_prepared_json_plain_and_gzip_match():
+    value = {"ok": "True", "posts": [{"id": 1, "title": "제목", "last_modified": datetime(2024, 1, 2, 3, 4, 5)}]}
+    prepared = PreparedJSON(value)
+
+    plain = prepared.render(gzip=False)
+    gzipped = prepared.render(gzip=True)
+
+    expected = {"ok": "True", "posts": [{"id": 1, "title": "제목", "last_modified": "2024-01-02T03:04:05"}]}
+    assert json.loads(plain.body) == expected
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(gzipped.body)) == expected
+
+
+def test_prepared_tail_json_renders_each_tail_value():
+    data = {"id": 7, "title": "제목", "views": 1, "comments": [{"id": 1, "content": "댓글"}]}
+    prepared = PreparedTailJSON({"ok": True}, data, "data", "views")
+
+    for views in (1, 42, 1000000):
+        expected = {"ok": True, "data": {**{k: v for k, v in data.items() if k != "views"}, "views": views}}
+        plain = prepared.render(views, gzip=False)
+        gzipped = prepared.render(views, gzip=True)
+
+        assert json.loads(plain.body) == expected
+        assert list(json.loads(plain.body)["data"])[-1] == "views"
+        assert json.loads(gzip.decompress(gzipped.body)) == expected
+        assert plain.headers["vary"] == "Accept-Encoding"
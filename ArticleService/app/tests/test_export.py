@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+from libs import export
+from libs.export import DEFAULT_EXPORT_COLUMNS, iter_post_chunks, parse_columns
+
+
+def test_parse_columns_defaults_and_validation():
+    assert parse_columns(None) == list(DEFAULT_EXPORT_COLUMNS)
+    assert parse_columns("title, views") == ["id", "title", "views"]
+    # 직접 지정한 id는 그 자리에 두고, 중복은 한 번만
+    assert parse_columns("views,id,views") == ["views", "id"]
+    with pytest.raises(ValueError):
+        parse_columns("id,picture")
+
+
+@pytest.mark.parametrize("columns", ["views,id", "title,views,id", "id,hearts,views"])
+def test_chunks_merge_live_counters_by_id_column(monkeypatch, columns):
+    columns = parse_columns(columns)
+    db_rows = [
+        {"id": 7, "title": "a", "views": 0, "hearts": 1},
+        {"id": 8, "title": "b", "views": 3, "hearts": 2},
+    ]
+    looked_up = []
+
+    async def fake_partitions(columns, after_id, limit, chunk_size):
+        rows = [tuple(row[column] for column in columns) for row in db_rows]
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+    async def fake_stats(post_ids):
+        looked_up.extend(post_ids)
+        return {7: (999, None), 8: (None, 50)}
+
+    monkeypatch.setattr(export, "_iter_partitions", fake_partitions)
+    monkeypatch.setattr(export, "get_cached_stats_for_posts", fake_stats)
+
+    async def collect():
+        return [row async for chunk in iter_post_chunks(columns, chunk_size=1) for row in chunk]
+
+    rows = asyncio.run(collect())
+
+    assert looked_up == [7, 8]
+    assert [row["id"] for row in rows] == [7, 8]
+    if "views" in columns:
+        assert [row["views"] for row in rows] == [999, 3]
+    if "hearts" in columns:
+        assert [row["hearts"] for row in rows] == [1, 50]
@@ -0,0 +1,85 @@
+import asyncio
+from sqlalchemy import Column, Integer, MetaData, String, Table, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+from libs.group_commit import GroupCommitWriter
+
+_metadata = MetaData()
+_items = Table(
+    "group_commit_items",
+    _metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(32), nullable=False, unique=True),
+)
+
+
+def _run_with_writer(test, **options):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(_metadata.create_all)
+        writer = GroupCommitWriter("test", _items, engine=engine, **options)
+        try:
+            result = await test(writer)
+            await writer.close()
+            async with engine.connect() as conn:
+                rows = dict((await conn.execute(select(_items.c.id, _items.c.name))).all())
+            return result, rows, writer.get_stats()
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_each_request_gets_its_own_generated_id():
+    async def test(writer):
+        # 첫 배치 이후에도 자동 증가 값이 이어지는지 확인하기 위해 두 번 나눠 넣음
+        first = await asyncio.gather(*(writer.insert({"name": f"a{i}"}) for i in range(5)))
+        second = await asyncio.gather(*(writer.insert({"name": f"b{i}"}) for i in range(3)))
+        return first + second
+
+    ids, rows, stats = _run_with_writer(test, max_wait_ms=20)
+
+    assert [rows[row_id] for row_id in ids] == [f"a{i}" for i in range(5)] + [f"b{i}" for i in range(3)]
+    assert stats["batches"] == 2 and stats["rows"] == 8 and stats["max_batch_seen"] == 5
+
+
+def test_batches_are_capped_at_max_batch():
+    async def test(writer):
+        return await asyncio.gather(*(writer.insert({"name": f"n{i}"}) for i in range(7)))
+
+    ids, rows, stats = _run_with_writer(test, max_batch=3, max_wait_ms=20)
+
+    assert len(set(ids)) == 7 and sorted(rows) == sorted(ids)
+    assert stats["batches"] == 3 and stats["max_batch_seen"] == 3
+
+
+def test_failed_batch_falls_back_to_single_rows():
+    async def test(writer):
+        # 같은 name이 두 번 들어가 배치 INSERT가 실패하면, 행마다 다시 넣어 중복된 요청만 실패
+        return await asyncio.gather(
+            writer.insert({"name": "dup"}),
+            writer.insert({"name": "ok"}),
+            writer.insert({"name": "dup"}),
+            return_exceptions=True,
+        )
+
+    results, rows, stats = _run_with_writer(test, max_wait_ms=20)
+
+    assert isinstance(results[2], IntegrityError)
+    assert rows == {results[0]: "dup", results[1]: "ok"}
+    assert stats["fallback_batches"] == 1 and stats["errors"] == 1 and stats["rows"] == 2
+
+
+def test_cancelled_request_is_not_written():
+    async def test(writer):
+        cancelled = asyncio.ensure_future(writer.insert({"name": "gone"}))
+        kept = asyncio.ensure_future(writer.insert({"name": "kept"}))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return await kept
+
+    kept_id, rows, stats = _run_with_writer(test, max_wait_ms=20)
+
+    assert rows == {kept_id: "kept"}
+    assert stats["cancelled"] == 1
@@ -0,0 +1,68 @@
+import pytest
+from libs.hotkey import CountMinSketch, HotKeyDetector
+
+
+def test_sketch_rows_separate_ids_with_same_low_bits():
+    sketch = CountMinSketch(width=2048, depth=4)
+    # 2048로 나눈 나머지가 같은 id들 (하위 11비트가 같음)
+    ids = [5 + 2048 * i for i in range(1, 50)]
+
+    assert all(sketch._indexes(5) != sketch._indexes(post_id) for post_id in ids)
+
+    for _ in range(100):
+        sketch.add(5)
+    assert sketch.estimate(5) == 100
+    assert all(sketch.estimate(post_id) == 0 for post_id in ids)
+
+
+def test_sketch_never_underestimates():
+    sketch = CountMinSketch(width=64, depth=4)
+    counts = {key: key % 7 + 1 for key in range(500)}
+    for key, count in counts.items():
+        sketch.add(key, count)
+
+    assert all(sketch.estimate(key) >= count for key, count in counts.items())
+
+
+def test_sketch_decay_halves_counters():
+    sketch = CountMinSketch(width=256, depth=2)
+    sketch.add("a", 10)
+    sketch.decay()
+    assert sketch.estimate("a") == 5
+
+
+def test_sketch_rejects_too_many_rows():
+    with pytest.raises(ValueError):
+        CountMinSketch(width=16, depth=9)
+
+
+def test_detector_reports_only_frequent_keys():
+    detector = HotKeyDetector(k=4, threshold=10, window=3600)
+
+    hot = [detector.observe(5) for _ in range(12)]
+    assert hot[:9] == [False] * 9 and all(hot[9:])
+    # 하위 비트가 같은 다른 게시글은 첫 조회에 핫으로 보고되지 않음
+    assert not detector.observe(5 + 2048)
+    assert detector.is_hot(5) and not detector.is_hot(5 + 2048)
+    assert detector.top(1) == [(5, 12)]
+
+
+def test_detector_replaces_smallest_top_key():
+    detector = HotKeyDetector(k=2, threshold=1, window=3600)
+    for key, count in (("a", 3), ("b", 1), ("c", 2)):
+        for _ in range(count):
+            detector.observe(key)
+
+    assert [key for key, _ in detector.top()] == ["a", "c"]
+
+
+def test_detector_decays_after_window():
+    detector = HotKeyDetector(k=4, threshold=4, window=60)
+    for _ in range(8):
+        detector.observe("a")
+    assert detector.is_hot("a")
+
+    # 두 주기가 지난 것처럼 만들면 8 -> 2로 줄어 더 이상 핫 키가 아님
+    detector._next_decay_at -= 120
+    assert detector.top() == [("a", 2)]
+    assert not detector.is_hot("a")
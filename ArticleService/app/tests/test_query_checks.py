@@ -0,0 +1,20 @@
+import asyncio
+from database.core import async_engine
+from database.migrations import run_migrations
+from database.query_checks import PRIMARY, _sqlite_index, run_query_checks
+
+
+def test_sqlite_autoindex_counts_as_primary_key():
+    detail = "SEARCH post_pictures USING INDEX sqlite_autoindex_post_pictures_1 (post_id=? AND variant=?)"
+    assert _sqlite_index(detail) == PRIMARY
+    assert _sqlite_index("SEARCH comments USING INDEX ix_comments_post_id_id (post_id=?)") == "ix_comments_post_id_id"
+
+
+def test_query_checks_pass_on_migrated_sqlite():
+    async def run():
+        await run_migrations(async_engine)
+        return await run_query_checks(async_engine)
+
+    results = asyncio.run(run())
+
+    assert [result["name"] for result in results if not result["ok"]] == []
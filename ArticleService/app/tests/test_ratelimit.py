@@ -0,0 +1,103 @@
+import asyncio
+import re
+from libs import ratelimit
+from libs.ratelimit import RateLimiter, RatePolicy, load_policies
+from libs.redis import close_redis_connection
+
+
+def _run(test):
+    # Redis 클라이언트는 이벤트 루프에 묶이므로 테스트마다 닫음
+    async def run():
+        try:
+            return await test()
+        finally:
+            await close_redis_connection()
+
+    return asyncio.run(run())
+
+
+def _policy(name: str, rate: float, burst: int) -> RatePolicy:
+    return RatePolicy(name=name, methods=(), pattern=re.compile("^/"), rate=rate, burst=burst)
+
+
+def test_policies_match_first_rule_in_order():
+    limiter = RateLimiter(load_policies())
+
+    assert limiter.match("POST", "/api/posts/hearts").name == "hearts"
+    assert limiter.match("GET", "/api/posts/12").name == "detail"
+    assert limiter.match("POST", "/api/comment/create/3").name == "write"
+    assert limiter.match("GET", "/api/get_posts/0").name == "default"
+    assert limiter.match("GET", "/docs") is None
+
+
+def test_bucket_allows_burst_then_blocks_locally():
+    limiter = RateLimiter([], lease=1)
+    policy = _policy("test_burst", rate=1, burst=3)
+
+    async def run():
+        return [await limiter.acquire(policy, "u:1") for _ in range(5)]
+
+    decisions = _run(run)
+
+    assert [d.allowed for d in decisions] == [True, True, True, False, False]
+    assert [d.source for d in decisions] == ["redis", "redis", "redis", "redis", "local"]
+    # 초당 1개 리필이므로 다음 토큰까지 1초 이내
+    assert 0 < decisions[3].retry_after <= 1
+    assert limiter.stats["rejected_redis"] == 1 and limiter.stats["rejected_local"] == 1
+
+
+def test_bucket_refills_over_time():
+    limiter = RateLimiter([], lease=1)
+    policy = _policy("test_refill", rate=100, burst=1)
+
+    async def run():
+        first = await limiter.acquire(policy, "u:1")
+        second = await limiter.acquire(policy, "u:1")
+        await asyncio.sleep(second.retry_after + 0.02)
+        third = await limiter.acquire(policy, "u:1")
+        return first, second, third
+
+    first, second, third = _run(run)
+
+    assert first.allowed and not second.allowed and third.allowed
+
+
+def test_lease_serves_requests_locally_until_used_up():
+    limiter = RateLimiter([], lease=4, lease_ttl=60)
+    policy = _policy("test_lease", rate=1, burst=10)
+
+    async def run():
+        return [await limiter.acquire(policy, "u:1") for _ in range(12)]
+
+    decisions = _run(run)
+
+    # Redis에서 4개씩 받아 1개는 바로 쓰고 3개는 로컬에서 차감, 버킷(10개)을 넘겨 허용하지 않음
+    assert [d.source for d in decisions[:8]] == ["redis", "local", "local", "local"] * 2
+    assert [d.allowed for d in decisions] == [True] * 10 + [False] * 2
+    assert limiter.stats["allowed_redis"] == 3 and limiter.stats["allowed_local"] == 7
+
+
+def test_expired_lease_goes_back_to_redis():
+    limiter = RateLimiter([], lease=4, lease_ttl=0.02)
+    policy = _policy("test_lease_ttl", rate=1, burst=10)
+
+    async def run():
+        first = await limiter.acquire(policy, "u:1")
+        await asyncio.sleep(0.05)
+        return first, await limiter.acquire(policy, "u:1")
+
+    first, second = _run(run)
+
+    assert (first.source, second.source) == ("redis", "redis")
+
+
+def test_fails_open_without_redis(monkeypatch):
+    async def no_redis():
+        return None
+
+    monkeypatch.setattr(ratelimit, "get_redis_client", no_redis)
+    limiter = RateLimiter([], lease=1)
+
+    decision = asyncio.run(limiter.acquire(_policy("test_fail_open", rate=1, burst=1), "u:1"))
+
+    assert decision.allowed and decision.source == "fail_open"
@@ -0,0 +1,129 @@
+import asyncio
+from sqlalchemy import insert
+from database.migrations import run_migrations
+from database.posts import Posts
+from database.sharding import (
+    SHARD_COUNT, allocate_id, allocate_ids, choose_shard_for_new_post, get_engine, get_sharding_stats, home_shard,
+    start_sharding, stop_sharding,
+)
+from libs.group_commit import ShardedGroupCommitWriter
+from routes.posts.get import _load_page
+
+
+def _run_with_shards(test):
+    async def run():
+        for shard in range(SHARD_COUNT):
+            await run_migrations(get_engine(shard))
+        await start_sharding()
+        try:
+            return await test()
+        finally:
+            await stop_sharding()
+
+    return asyncio.run(run())
+
+
+async def _create_posts(count: int) -> list:
+    ids = []
+    for i in range(count):
+        # 작성 라우트와 같은 순서: 샤드를 번갈아 고른 뒤 id 할당
+        shard = choose_shard_for_new_post()
+        post_id = await allocate_id("posts", shard)
+        async with get_engine(shard).begin() as conn:
+            await conn.execute(insert(Posts.__table__).values(
+                id=post_id, title=f"post {i}", content="content", user_id=1,
+            ))
+        ids.append(post_id)
+    return ids
+
+
+async def _walk_feed(limit: int) -> list:
+    seen, cursor_id = [], 0
+    while True:
+        page = await _load_page(cursor_id, limit)
+        if not page:
+            return seen
+        seen.extend(post["id"] for post in page)
+        cursor_id = page[-1]["id"]
+
+
+def test_ids_follow_creation_order_across_shards():
+    async def run():
+        created = await _create_posts(12)
+        # 대량 등록처럼 한 번에 여러 개를 받아도 그 뒤에 이어짐
+        bulk = await allocate_ids("posts", 1, 3)
+        walked = await _walk_feed(limit=5)
+        return created, bulk, walked
+
+    created, bulk, walked = _run_with_shards(run)
+
+    assert SHARD_COUNT == 2
+    assert {home_shard(post_id) for post_id in created} == {0, 1}
+    assert created == sorted(created)
+    assert bulk == sorted(bulk) and bulk[0] > created[-1]
+    # 커서로 끝까지 넘기면 모든 게시글을 만든 순서대로 한 번씩 받음
+    assert walked == created
+
+
+def test_concurrent_allocations_share_one_reservation():
+    async def run():
+        before = get_sharding_stats()["reservations"]
+        ids = await asyncio.gather(*(allocate_id("comments", i % SHARD_COUNT) for i in range(20)))
+        return ids, get_sharding_stats()["reservations"] - before
+
+    ids, reservations = _run_with_shards(run)
+
+    assert reservations == 1
+    # 요청 순서대로 연속된 시퀀스를 나눠 받음
+    assert ids == sorted(ids) and len(set(ids)) == 20
+    assert [home_shard(comment_id) for comment_id in ids] == [i % SHARD_COUNT for i in range(20)]
+
+
+def test_group_commit_batch_allocates_ids_once():
+    writer = ShardedGroupCommitWriter("posts", Posts.__table__)
+
+    async def run():
+        before = get_sharding_stats()["reservations"]
+        ids = await asyncio.gather(*(
+            writer.insert({"title": f"batch {i}", "content": "content", "user_id": 1}, 1) for i in range(10)
+        ))
+        await writer.close()
+        return ids, get_sharding_stats()["reservations"] - before
+
+    ids, reservations = _run_with_shards(run)
+
+    assert reservations == 1
+    assert ids == sorted(ids) and {home_shard(post_id) for post_id in ids} == {1}
+    assert writer.get_stats()["batches"] == 1
+
+
+def test_seed_reserves_ids_and_maps_them_to_their_shards():
+    from argparse import Namespace
+    from sqlalchemy import func, select
+    from benchmarks.seed import seed
+    from database.sharding import load_shard_map, shard_for_post
+
+    args = Namespace(posts=40, comments=1, users=5, content_bytes=20, chunk_size=10, concurrency=2, seed=1, create_tables=True)
+    result = asyncio.run(seed(args))
+
+    async def check():
+        await load_shard_map()
+        owners = {}
+        for post_id in range(result["post_id_min"], result["post_id_max"] + 1):
+            owners.setdefault(shard_for_post(post_id), []).append(post_id)
+        counts = {}
+        for shard, post_ids in owners.items():
+            async with get_engine(shard).connect() as conn:
+                counts[shard] = (await conn.execute(
+                    select(func.count()).select_from(Posts.__table__).where(Posts.__table__.c.id.in_(post_ids))
+                )).scalar()
+        # 이후 할당되는 id는 시드한 구간과 겹치지 않음
+        later = await allocate_ids("posts", 0, 2) + await allocate_ids("posts", 1, 2)
+        return owners, counts, later
+
+    owners, counts, later = _run_with_shards(check)
+
+    assert result["posts"] == 40 and len(result["shard_ranges"]) == SHARD_COUNT
+    assert sorted(owners) == list(range(SHARD_COUNT))
+    assert counts == {shard: len(post_ids) for shard, post_ids in owners.items()}
+    assert all(post_id > result["post_id_max"] for post_id in later)
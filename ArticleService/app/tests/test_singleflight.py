@@ -0,0 +1,124 @@
+import asyncio
+import gc
+import pytest
+from libs.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight("test_share", timeout=None)
+    executions = []
+
+    async def load():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    async def run():
+        return await asyncio.gather(*(group.do(1, load) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert len(executions) == 1
+    assert all(result is results[0] for result in results)
+    assert group.stats["executions"] == 1 and group.stats["coalesced"] == 4
+    assert group.in_flight() == 0
+
+
+def test_errors_reach_every_waiter():
+    group = SingleFlight("test_errors", timeout=None)
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def run():
+        return await asyncio.gather(*(group.do(1, load) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert [type(result) for result in results] == [RuntimeError] * 3
+    assert group.stats["errors"] == 3 and group.stats["executions"] == 1
+
+
+def test_cancelled_waiter_does_not_cancel_shared_load():
+    group = SingleFlight("test_cancel_one", timeout=None)
+
+    async def load():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(group.do(1, load))
+        second = asyncio.ensure_future(group.do(1, load))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(run()) == ("done", True)
+
+
+def test_load_is_cancelled_when_every_waiter_leaves():
+    group = SingleFlight("test_cancel_all", timeout=None)
+    cancelled = []
+
+    async def load():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        waiters = [asyncio.ensure_future(group.do(1, load)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert cancelled == [1]
+    assert group.in_flight() == 0
+
+
+def test_timeout_leaves_load_running_for_other_waiters():
+    group = SingleFlight("test_timeout", timeout=None)
+
+    async def load():
+        await asyncio.sleep(0.05)
+        return "late"
+
+    async def run():
+        patient = asyncio.ensure_future(group.do(1, load))
+        with pytest.raises(asyncio.TimeoutError):
+            await group.do(1, load, timeout=0.01)
+        return await patient
+
+    assert asyncio.run(run()) == "late"
+    assert group.stats["timeouts"] == 1
+
+
+def test_failure_after_every_waiter_left_is_retrieved():
+    group = SingleFlight("test_unretrieved", timeout=None)
+    unhandled = []
+
+    async def load():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            # 정리 중 다른 예외로 실패 (예: DB 드라이버 오류)
+            raise RuntimeError("cleanup failed")
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context["message"]))
+        waiter = asyncio.ensure_future(group.do(1, load))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        gc.collect()
+
+    asyncio.run(run())
+
+    assert unhandled == []
@@ -2,14 +2,12 @@ import os
 import jwt
 import time
 from datetime import datetime, timedelta
-import hashlib
 from dotenv import load_dotenv
 load_dotenv()
 
 DAY = 86400
 
 SECRET = os.environ.get("SECRET")
-salt = os.environ.get("SALT")
 
 async def encToken(user_id):
   end = int(time.time()) + DAY
@@ -54,6 +52,3 @@ async def admin_check_auth(token):
       return False
   except:
     return False
-
-async def hashing_pw(plain_pw):
-  return hashlib.sha256((plain_pw + salt).encode('utf-8')).hexdigest()
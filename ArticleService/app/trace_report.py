@@ -0,0 +1,73 @@
+"""
+트레이스 요약 CLI
+
+TRACE_EXPORT_PATH로 내보낸 span 파일을 읽어 느린 요청 순으로 구간별 소요 시간을 트리로 출력합니다.
+ArticleService와 AuthService 파일을 함께 넘기면 trace id로 합쳐 gRPC 호출 안쪽까지 보여줍니다.
+
+사용법:
+    python trace_report.py traces.jsonl ../../AuthService/app/traces.jsonl --top 10
+    python trace_report.py traces.jsonl --name "GET /api/posts/{post_id}"   # 특정 라우트만
+"""
+import argparse
+import json
+from typing import Dict, List, Optional
+
+
+def load_traces(paths: List[str]) -> Dict[str, List[dict]]:
+    traces: Dict[str, List[dict]] = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    span = json.loads(line)
+                    traces.setdefault(span["trace_id"], []).append(span)
+    return traces
+
+
+def _roots(spans: List[dict]) -> List[dict]:
+    ids = {span["span_id"] for span in spans}
+    return [span for span in spans if span["parent_id"] not in ids]
+
+
+def print_trace(trace_id: str, spans: List[dict]):
+    ids = {span["span_id"] for span in spans}
+    children: Dict[Optional[str], List[dict]] = {}
+    for span in spans:
+        # 부모가 넘기지 않은 파일(다른 서비스)에만 있으면 루트로 표시
+        parent = span["parent_id"] if span["parent_id"] in ids else None
+        children.setdefault(parent, []).append(span)
+
+    print(f"trace {trace_id} ({len(spans)} spans)")
+
+    def visit(parent_id: Optional[str], depth: int):
+        for span in sorted(children.get(parent_id, []), key=lambda s: s["start_us"]):
+            mark = " !" if span["status"] == "error" else ""
+            print(f"{'  ' * depth}{span['duration_us'] / 1000:9.2f}ms  [{span['service']}] {span['name']}{mark}")
+            visit(span["span_id"], depth + 1)
+
+    visit(None, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="내보낸 트레이스 중 느린 요청의 구간별 소요 시간 출력")
+    parser.add_argument("paths", nargs="+", help="TRACE_EXPORT_PATH 파일 (여러 서비스 파일을 함께 넘기면 합쳐서 표시)")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--name", help="루트 span 이름이 같은 트레이스만 (예: 'GET /api/posts/{post_id}')")
+    args = parser.parse_args()
+
+    traces = load_traces(args.paths)
+    if args.name:
+        traces = {
+            trace_id: spans for trace_id, spans in traces.items()
+            if any(span["name"] == args.name for span in _roots(spans))
+        }
+
+    def root_duration(trace_id: str) -> int:
+        return max(span["duration_us"] for span in _roots(traces[trace_id]))
+
+    for trace_id in sorted(traces, key=root_duration, reverse=True)[:args.top]:
+        print_trace(trace_id, traces[trace_id])
+
+
+if __name__ == "__main__":
+    main()
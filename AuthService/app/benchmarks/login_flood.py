@@ -0,0 +1,101 @@
+"""
+로그인 폭주 벤치마크
+
+동시에 많은 로그인(비밀번호 검증)이 들어올 때의 처리량과
+그동안 이벤트 루프가 얼마나 지연되는지(heartbeat lag)를 측정합니다.
+
+    inline: 이벤트 루프에서 직접 KDF 계산 (기존 방식)
+    pool:   ProcessPoolExecutor에서 계산 (libs.password)
+
+사용법:
+    python -m benchmarks.login_flood --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from libs import password
+
+
+async def _heartbeat(samples: list, stop: asyncio.Event, interval: float):
+    """
+    interval마다 깨어나 예정 시각보다 얼마나 늦었는지 기록합니다.
+    이벤트 루프가 막혀 있으면 이 값이 커집니다.
+    """
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def _login_inline(plain: str, stored: str) -> bool:
+    return password.verify_password_sync(plain, stored)
+
+
+async def _login_pool(plain: str, stored: str) -> bool:
+    return await password.verify_password(plain, stored)
+
+
+async def run(mode: str, logins: int, concurrency: int, interval: float) -> dict:
+    plain = "password123"
+    stored = password.hash_password_sync(plain)
+    login = _login_inline if mode == "inline" else _login_pool
+
+    if mode == "pool":
+        await password.warmup_executor()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    lag_samples = []
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(lag_samples, stop, interval))
+
+    async def one():
+        async with semaphore:
+            assert await login(plain, stored)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(logins)])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await heartbeat
+
+    lag_samples.sort()
+    return {
+        "mode": mode,
+        "scheme": password.PASSWORD_HASH_SCHEME,
+        "logins": logins,
+        "concurrency": concurrency,
+        "workers": password.PASSWORD_HASH_WORKERS,
+        "elapsed_sec": round(elapsed, 3),
+        "logins_per_sec": round(logins / elapsed, 1),
+        "loop_lag_ms": {
+            "p50": round(statistics.median(lag_samples), 2) if lag_samples else None,
+            "p99": round(lag_samples[int(len(lag_samples) * 0.99) - 1], 2) if lag_samples else None,
+            "max": round(lag_samples[-1], 2) if lag_samples else None,
+            "samples": len(lag_samples),
+        },
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="로그인 폭주 시 처리량과 이벤트 루프 지연 측정")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.01, help="heartbeat 간격 (초)")
+    parser.add_argument("--mode", choices=["inline", "pool", "both"], default="both")
+    args = parser.parse_args()
+
+    modes = ["inline", "pool"] if args.mode == "both" else [args.mode]
+    results = []
+    for mode in modes:
+        results.append(await run(mode, args.logins, args.concurrency, args.interval))
+
+    password.shutdown_executor()
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+부하 테스트용 사용자 대량 시더
+
+<prefix><번호> 형식의 사용자를 청크 단위 executemany로 생성합니다.
+모든 사용자가 같은 비밀번호를 쓰므로 해시는 한 번만 계산하며,
+현재 설정(PASSWORD_HASH_SCHEME 등)으로 만들어 로그인 시 재해시가 일어나지 않습니다.
+
+k6 시나리오(loadtests/zipf_hot_posts_test.js)는 USER_PREFIX / USER_PASSWORD로
+여기서 만든 사용자 중 일부로 로그인합니다.
+
+사용법:
+    python -m benchmarks.seed_users --users 10000
+"""
+import argparse
+import asyncio
+import json
+import time
+from sqlalchemy import func, insert, select
+from database import Base
+from database.core import async_engine
+from database.user import User
+from libs import password
+
+
+def _user_rows(start: int, count: int, prefix: str, hashed: str) -> list:
+    return [
+        {
+            "username": f"{prefix}{index}",
+            "password": hashed,
+            "handle_name": f"load{index}"[:20],
+            "role": "user",
+        }
+        for index in range(start, start + count)
+    ]
+
+
+async def seed(args) -> dict:
+    if args.create_tables:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async with async_engine.connect() as conn:
+        first_id = ((await conn.execute(select(func.max(User.id)))).scalar() or 0) + 1
+
+    hashed = password.hash_password_sync(args.password)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def insert_chunk(start: int) -> int:
+        async with semaphore:
+            rows = _user_rows(start, min(args.chunk_size, args.start + args.users - start), args.prefix, hashed)
+            async with async_engine.begin() as conn:
+                await conn.execute(insert(User), rows)
+            return len(rows)
+
+    started_at = time.perf_counter()
+    inserted = sum(await asyncio.gather(*[
+        insert_chunk(start) for start in range(args.start, args.start + args.users, args.chunk_size)
+    ]))
+    elapsed = time.perf_counter() - started_at
+
+    await async_engine.dispose()
+
+    return {
+        "users": inserted,
+        "username_first": f"{args.prefix}{args.start}",
+        "username_last": f"{args.prefix}{args.start + args.users - 1}",
+        "user_id_min": first_id,
+        "elapsed_sec": round(elapsed, 1),
+        "rows_per_sec": round(inserted / elapsed) if elapsed > 0 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부하 테스트용 사용자 대량 시드")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--start", type=int, default=1, help="사용자 번호 시작값 (username 중복 방지용)")
+    parser.add_argument("--prefix", default="loaduser_")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="executemany 한 번에 넣을 행 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 사용할 커넥션 수")
+    parser.add_argument("--create-tables", action="store_true", help="시드 전에 create_all 실행")
+    args = parser.parse_args()
+
+    result = asyncio.run(seed(args))
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,34 @@
 import os
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from dotenv import load_dotenv
+# 모델들이 등록되는 Base와 같은 객체를 사용해야 create_all이 테이블을 생성함
+from database import Base
+from shared.tracing import instrument_sqlalchemy
 
 load_dotenv()
 
-MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD')
+# DATABASE_URL을 지정하면 해당 DB를 사용 (예: 시드/벤치마크용 sqlite+aiosqlite:///seed.db)
+DATABASE_URL = os.environ.get('DATABASE_URL')
 
-if not MYSQL_PASSWORD:
-    raise ValueError("mysql password 환경변수를 찾을 수 없습니다.")
+if DATABASE_URL:
+    SQLALCHEMY_DATABASE_URL = DATABASE_URL
+else:
+    MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD')
 
-SQLALCHEMY_DATABASE_URL = f"mysql+aiomysql://root:123456@db:3306/rpcarticle-db-1"
+    if not MYSQL_PASSWORD:
+        raise ValueError("mysql password 환경변수를 찾을 수 없습니다.")
+
+    SQLALCHEMY_DATABASE_URL = f"mysql+aiomysql://root:123456@db:3306/rpcarticle-db-1"
 
 async_engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
 
+# TRACING_ENABLED=1이면 SQL 문마다 span 기록
+instrument_sqlalchemy(async_engine)
+
 AsyncSessionLocal = sessionmaker(
     bind=async_engine,
     expire_on_commit=False,
     class_=AsyncSession
 )  
-
-Base = declarative_base()
@@ -8,6 +8,7 @@ class User(Base):
     __tablename__ = "user"
     id = Column(Integer, primary_key=True, autoincrement=True)
     username = Column(String(50), nullable=False, unique=True)
-    password = Column(String(64), nullable=False)
+    # 해시 형식 접두어와 솔트를 포함하므로 sha256 hex(64자)보다 길게 저장
+    password = Column(String(255), nullable=False)
     handle_name = Column(String(20), nullable=False)
     role = Column(String(10), nullable=False, default="user")
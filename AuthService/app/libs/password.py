@@ -0,0 +1,205 @@
+"""
+비밀번호 해시 모듈
+
+scrypt / PBKDF2 같은 느린 KDF 계산을 ProcessPoolExecutor에서 실행하여
+로그인/회원가입이 몰려도 이벤트 루프(gRPC Authorize 포함)가 멈추지 않도록 합니다.
+
+저장 형식 (버전 관리):
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+    64자리 hex: 이전 버전 sha256(password + SALT) 해시 (로그인 시 자동 재해시)
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import multiprocessing
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger("password")
+
+SCHEME_SCRYPT = "scrypt"
+SCHEME_PBKDF2 = "pbkdf2_sha256"
+
+# 새로 저장할 해시 방식과 비용
+PASSWORD_HASH_SCHEME = os.getenv("PASSWORD_HASH_SCHEME", SCHEME_SCRYPT)
+PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", 2 ** 14))
+PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", 8))
+PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", 1))
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", 600000))
+PASSWORD_SALT_BYTES = 16
+PASSWORD_HASH_BYTES = 32
+
+# 해시 계산 전용 프로세스 수
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+
+# 이전 버전 해시에 사용하던 고정 솔트
+LEGACY_SALT = os.environ.get("SALT") or ""
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# 없는 아이디로 로그인할 때 비교할 해시 (현재 방식/비용으로 한 번만 만듦)
+_dummy_hash: Optional[str] = None
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # n * r * 128 바이트의 메모리가 필요하므로 여유 있게 한도를 지정
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=n * r * 256, dklen=PASSWORD_HASH_BYTES,
+    )
+
+
+def _pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac(
+        "sha256", password.encode("utf-8"), salt, iterations, dklen=PASSWORD_HASH_BYTES
+    )
+
+
+def _legacy_hash(password: str) -> str:
+    return hashlib.sha256((password + LEGACY_SALT).encode("utf-8")).hexdigest()
+
+
+def _is_legacy(stored: str) -> bool:
+    return len(stored) == 64 and "$" not in stored
+
+
+def hash_password_sync(password: str, scheme: str = PASSWORD_HASH_SCHEME) -> str:
+    """
+    비밀번호를 현재 설정된 방식과 비용으로 해시합니다. (CPU 작업, 워커 프로세스에서 실행)
+    """
+    salt = secrets.token_bytes(PASSWORD_SALT_BYTES)
+
+    if scheme == SCHEME_SCRYPT:
+        digest = _scrypt(password, salt, PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+        return (
+            f"{SCHEME_SCRYPT}${PASSWORD_SCRYPT_N}${PASSWORD_SCRYPT_R}${PASSWORD_SCRYPT_P}"
+            f"${_b64encode(salt)}${_b64encode(digest)}"
+        )
+    if scheme == SCHEME_PBKDF2:
+        digest = _pbkdf2(password, salt, PASSWORD_PBKDF2_ITERATIONS)
+        return f"{SCHEME_PBKDF2}${PASSWORD_PBKDF2_ITERATIONS}${_b64encode(salt)}${_b64encode(digest)}"
+
+    raise ValueError(f"지원하지 않는 비밀번호 해시 방식입니다: {scheme}")
+
+
+def verify_password_sync(password: str, stored: str) -> bool:
+    """
+    저장된 해시와 비밀번호를 비교합니다. (CPU 작업, 워커 프로세스에서 실행)
+    """
+    try:
+        if _is_legacy(stored):
+            return hmac.compare_digest(_legacy_hash(password), stored)
+
+        parts = stored.split("$")
+        if parts[0] == SCHEME_SCRYPT and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            digest = _scrypt(password, _b64decode(parts[4]), n, r, p)
+            return hmac.compare_digest(digest, _b64decode(parts[5]))
+        if parts[0] == SCHEME_PBKDF2 and len(parts) == 4:
+            digest = _pbkdf2(password, _b64decode(parts[2]), int(parts[1]))
+            return hmac.compare_digest(digest, _b64decode(parts[3]))
+    except (ValueError, TypeError) as e:
+        logger.error(f"비밀번호 해시 형식 오류: {str(e)}")
+        return False
+
+    logger.error("알 수 없는 비밀번호 해시 형식입니다.")
+    return False
+
+
+def needs_rehash(stored: str) -> bool:
+    """
+    저장된 해시가 현재 설정(방식, 비용)과 다르면 True를 반환합니다.
+    """
+    if _is_legacy(stored):
+        return True
+
+    parts = stored.split("$")
+    if parts[0] != PASSWORD_HASH_SCHEME:
+        return True
+    if parts[0] == SCHEME_SCRYPT:
+        return parts[1:4] != [str(PASSWORD_SCRYPT_N), str(PASSWORD_SCRYPT_R), str(PASSWORD_SCRYPT_P)]
+    if parts[0] == SCHEME_PBKDF2:
+        return parts[1] != str(PASSWORD_PBKDF2_ITERATIONS)
+    return True
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    해시 계산용 프로세스 풀을 반환합니다. 처음 호출 시 생성합니다.
+    gRPC 스레드가 있는 프로세스에서 fork하지 않도록 spawn 방식을 사용합니다.
+    """
+    global _executor
+
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"비밀번호 해시 프로세스 풀 생성 (workers={PASSWORD_HASH_WORKERS})")
+    return _executor
+
+
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), hash_password_sync, password, PASSWORD_HASH_SCHEME)
+
+
+async def verify_password(password: str, stored: str) -> bool:
+    # 이전 버전 sha256 해시는 충분히 가벼우므로 이벤트 루프에서 바로 비교
+    if _is_legacy(stored):
+        return verify_password_sync(password, stored)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), verify_password_sync, password, stored)
+
+
+async def verify_dummy_password(password: str) -> bool:
+    """
+    없는 아이디일 때도 실제 계정과 같은 비용의 해시 비교를 하여,
+    응답 시간으로 아이디 존재 여부를 알 수 없도록 합니다. 항상 False를 반환합니다.
+    """
+    global _dummy_hash
+
+    if _dummy_hash is None:
+        _dummy_hash = await hash_password(secrets.token_urlsafe(PASSWORD_SALT_BYTES))
+    await verify_password(password, _dummy_hash)
+    return False
+
+
+async def warmup_executor():
+    """
+    워커 프로세스를 미리 띄워 첫 로그인 요청이 프로세스 생성 비용을 내지 않도록 합니다.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    await asyncio.gather(*[
+        loop.run_in_executor(executor, needs_rehash, "")
+        for _ in range(PASSWORD_HASH_WORKERS)
+    ])
+    # 없는 아이디 로그인에 쓰는 해시도 미리 만들어 둠
+    await verify_dummy_password("")
+
+
+def shutdown_executor():
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+        logger.info("비밀번호 해시 프로세스 풀이 종료되었습니다.")
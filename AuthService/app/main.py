@@ -4,10 +4,15 @@ from database.core import async_engine, Base
 from routes import include_router
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession  
 from rpc import gRPCServer
+from libs.password import warmup_executor, shutdown_executor
+from shared.tracing import TRACING_ENABLED, TracingMiddleware
 import asyncio
 
 app = FastAPI()
 
+if TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
 from tools import check_auth  
 
 
@@ -16,6 +21,17 @@ async def create_tables():
         await conn.run_sync(Base.metadata.create_all)
 
 
+@app.on_event("startup")
+async def startup_event():
+    # 비밀번호 해시 워커 프로세스를 미리 생성
+    await warmup_executor()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_executor()
+
+
 @app.post("/api/authcheck", tags=["authcheck test"])
 async def authcheck(token : str = Header(...)):
     user = check_auth(token)
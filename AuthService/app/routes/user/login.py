@@ -9,7 +9,8 @@ router = APIRouter()
 from database.core import *
 from database.user import * 
 
-from tools import encToken, hashing_pw
+from tools import encToken
+from libs.password import verify_password, verify_dummy_password, hash_password, needs_rehash
 
 class Login_example(BaseModel):
     username: str
@@ -18,14 +19,23 @@ class Login_example(BaseModel):
 
 @router.post("/api/login", tags=["login"])
 async def login(data: Login_example):
-    hashed_pw = hashing_pw(data.password)
-    
     async with AsyncSessionLocal() as session:
-        user = await session.execute(select(User).filter(User.username == data.username, User.password == hashed_pw))
+        user = await session.execute(select(User).filter(User.username == data.username))
         user_info = user.scalars().first()
 
+        # 없는 아이디도 같은 비용의 해시 비교를 거쳐 응답 시간으로 구분되지 않도록 함
         if not user_info:
+            await verify_dummy_password(data.password)
+            raise HTTPException(status_code=400, detail="아이디 혹은 비밀번호가 다릅니다.")
+
+        # 해시 비교는 프로세스 풀에서 실행되어 이벤트 루프를 막지 않음
+        if not await verify_password(data.password, user_info.password):
             raise HTTPException(status_code=400, detail="아이디 혹은 비밀번호가 다릅니다.")
+
+        # 이전 형식이거나 비용 설정이 바뀐 해시는 로그인 시 새 형식으로 재해시
+        if needs_rehash(user_info.password):
+            user_info.password = await hash_password(data.password)
+            await session.commit()
         
         token = encToken(user_info.id)
     return {"ok": True, "token": token}
@@ -8,7 +8,7 @@ router = APIRouter()
 
 from database.core import *
 from database.user import * 
-from tools import hashing_pw
+from libs.password import hash_password
 
 class Register_example(BaseModel):
     username: str
@@ -21,7 +21,7 @@ async def register(data: Register_example):
     if data.password != data.re_pw:
         raise HTTPException(status_code=400, detail="비밀번호가 일치하지 않습니다.")
     
-    hashed_pw = hashing_pw(data.password)
+    hashed_pw = await hash_password(data.password)
 
     async with AsyncSessionLocal() as session:  
         user = await session.execute(select(User).filter(User.username == data.username))
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: auth.proto
-# Protobuf Python Version: 4.25.3
+# Protobuf Python Version: 4.25.1
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nauth.proto\x12\x04\x61uth\"!\n\x10\x41uthorizeRequest\x12\r\n\x05token\x18\x01 \x01(\t\"B\n\x0f\x41uthorizeResult\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x13\n\x06userid\x18\x02 \x01(\x03H\x00\x88\x01\x01\x42\t\n\x07_userid\"\x8d\x01\n\x0cVerification\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x12\n\ndepartment\x18\x02 \x01(\t\x12\r\n\x05grade\x18\x03 \x01(\x05\x12\x11\n\tclassroom\x18\x04 \x01(\x05\x12\x0e\n\x06number\x18\x05 \x01(\x05\x12\x13\n\x0bvalid_until\x18\x06 \x01(\t\x12\x14\n\x0cgraduated_at\x18\x07 \x01(\t\"\xaa\x01\n\x04User\x12\n\n\x02id\x18\x01 \x01(\x03\x12\r\n\x05phone\x18\x02 \x01(\t\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\x0f\n\x07profile\x18\x05 \x01(\t\x12\x12\n\ncreated_at\x18\x06 \x01(\t\x12\x14\n\x0cis_suspended\x18\x07 \x01(\x08\x12-\n\x0cverification\x18\x08 \x01(\x0b\x32\x12.auth.VerificationH\x00\x88\x01\x01\x42\x0f\n\r_verification\"\x89\x01\n\x0fSendPushRequest\x12\x13\n\x06userid\x18\x01 \x01(\x03H\x00\x88\x01\x01\x12\x12\n\x05topic\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\r\n\x05title\x18\x03 \x01(\t\x12\x0c\n\x04\x62ody\x18\x04 \x01(\t\x12\r\n\x05image\x18\x05 \x01(\t\x12\x0c\n\x04link\x18\x06 \x01(\tB\t\n\x07_useridB\x08\n\x06_topic\"!\n\x0eSendPushResult\x12\x0f\n\x07success\x18\x01 \x01(\x08\x32\x86\x01\n\x0b\x41uthService\x12<\n\tAuthorize\x12\x16.auth.AuthorizeRequest\x1a\x15.auth.AuthorizeResult\"\x00\x12\x39\n\x08SendPush\x12\x15.auth.SendPushRequest\x1a\x14.auth.SendPushResult\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nauth.proto\x12\x04\x61uth\"!\n\x10\x41uthorizeRequest\x12\r\n\x05token\x18\x01 \x01(\t\"B\n\x0f\x41uthorizeResult\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x13\n\x06userid\x18\x02 \x01(\x03H\x00\x88\x01\x01\x42\t\n\x07_userid\" \n\x0eGetUserRequest\x12\x0e\n\x06userid\x18\x01 \x01(\x03\"\x8e\x01\n\rGetUserResult\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x13\n\x06userid\x18\x02 \x01(\x03H\x00\x88\x01\x01\x12\x15\n\x08username\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x18\n\x0bhandle_name\x18\x04 \x01(\tH\x02\x88\x01\x01\x42\t\n\x07_useridB\x0b\n\t_usernameB\x0e\n\x0c_handle_name\"@\n\x0bUserSummary\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x10\n\x08username\x18\x02 \x01(\t\x12\x13\n\x0bhandle_name\x18\x03 \x01(\t\"\'\n\x14\x42\x61tchGetUsersRequest\x12\x0f\n\x07userids\x18\x01 \x03(\x03\"H\n\x13\x42\x61tchGetUsersResult\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12 \n\x05users\x18\x02 \x03(\x0b\x32\x11.auth.UserSummary\"\x8d\x01\n\x0cVerification\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x12\n\ndepartment\x18\x02 \x01(\t\x12\r\n\x05grade\x18\x03 \x01(\x05\x12\x11\n\tclassroom\x18\x04 \x01(\x05\x12\x0e\n\x06number\x18\x05 \x01(\x05\x12\x13\n\x0bvalid_until\x18\x06 \x01(\t\x12\x14\n\x0cgraduated_at\x18\x07 \x01(\t\"\xaa\x01\n\x04User\x12\n\n\x02id\x18\x01 \x01(\x03\x12\r\n\x05phone\x18\x02 \x01(\t\x12\x0c\n\x04name\x18\x03 \x01(\t\x12\x0f\n\x07profile\x18\x05 \x01(\t\x12\x12\n\ncreated_at\x18\x06 \x01(\t\x12\x14\n\x0cis_suspended\x18\x07 \x01(\x08\x12-\n\x0cverification\x18\x08 \x01(\x0b\x32\x12.auth.VerificationH\x00\x88\x01\x01\x42\x0f\n\r_verification\"\x89\x01\n\x0fSendPushRequest\x12\x13\n\x06userid\x18\x01 \x01(\x03H\x00\x88\x01\x01\x12\x12\n\x05topic\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\r\n\x05title\x18\x03 \x01(\t\x12\x0c\n\x04\x62ody\x18\x04 \x01(\t\x12\r\n\x05image\x18\x05 \x01(\t\x12\x0c\n\x04link\x18\x06 \x01(\tB\t\n\x07_useridB\x08\n\x06_topic\"!\n\x0eSendPushResult\x12\x0f\n\x07success\x18\x01 \x01(\x08\x32\x88\x02\n\x0b\x41uthService\x12<\n\tAuthorize\x12\x16.auth.AuthorizeRequest\x1a\x15.auth.AuthorizeResult\"\x00\x12\x36\n\x07GetUser\x12\x14.auth.GetUserRequest\x1a\x13.auth.GetUserResult\"\x00\x12H\n\rBatchGetUsers\x12\x1a.auth.BatchGetUsersRequest\x1a\x19.auth.BatchGetUsersResult\"\x00\x12\x39\n\x08SendPush\x12\x15.auth.SendPushRequest\x1a\x14.auth.SendPushResult\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -25,14 +25,24 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_AUTHORIZEREQUEST']._serialized_end=53
   _globals['_AUTHORIZERESULT']._serialized_start=55
   _globals['_AUTHORIZERESULT']._serialized_end=121
-  _globals['_VERIFICATION']._serialized_start=124
-  _globals['_VERIFICATION']._serialized_end=265
-  _globals['_USER']._serialized_start=268
-  _globals['_USER']._serialized_end=438
-  _globals['_SENDPUSHREQUEST']._serialized_start=441
-  _globals['_SENDPUSHREQUEST']._serialized_end=578
-  _globals['_SENDPUSHRESULT']._serialized_start=580
-  _globals['_SENDPUSHRESULT']._serialized_end=613
-  _globals['_AUTHSERVICE']._serialized_start=616
-  _globals['_AUTHSERVICE']._serialized_end=750
+  _globals['_GETUSERREQUEST']._serialized_start=123
+  _globals['_GETUSERREQUEST']._serialized_end=155
+  _globals['_GETUSERRESULT']._serialized_start=158
+  _globals['_GETUSERRESULT']._serialized_end=300
+  _globals['_USERSUMMARY']._serialized_start=302
+  _globals['_USERSUMMARY']._serialized_end=366
+  _globals['_BATCHGETUSERSREQUEST']._serialized_start=368
+  _globals['_BATCHGETUSERSREQUEST']._serialized_end=407
+  _globals['_BATCHGETUSERSRESULT']._serialized_start=409
+  _globals['_BATCHGETUSERSRESULT']._serialized_end=481
+  _globals['_VERIFICATION']._serialized_start=484
+  _globals['_VERIFICATION']._serialized_end=625
+  _globals['_USER']._serialized_start=628
+  _globals['_USER']._serialized_end=798
+  _globals['_SENDPUSHREQUEST']._serialized_start=801
+  _globals['_SENDPUSHREQUEST']._serialized_end=938
+  _globals['_SENDPUSHRESULT']._serialized_start=940
+  _globals['_SENDPUSHRESULT']._serialized_end=973
+  _globals['_AUTHSERVICE']._serialized_start=976
+  _globals['_AUTHSERVICE']._serialized_end=1240
 # @@protoc_insertion_point(module_scope)
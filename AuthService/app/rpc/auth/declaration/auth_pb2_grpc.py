@@ -24,6 +24,11 @@ class AuthServiceStub(object):
                 request_serializer=auth__pb2.GetUserRequest.SerializeToString,
                 response_deserializer=auth__pb2.GetUserResult.FromString,
                 )
+        self.BatchGetUsers = channel.unary_unary(
+                '/auth.AuthService/BatchGetUsers',
+                request_serializer=auth__pb2.BatchGetUsersRequest.SerializeToString,
+                response_deserializer=auth__pb2.BatchGetUsersResult.FromString,
+                )
         self.SendPush = channel.unary_unary(
                 '/auth.AuthService/SendPush',
                 request_serializer=auth__pb2.SendPushRequest.SerializeToString,
@@ -46,6 +51,12 @@ class AuthServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchGetUsers(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SendPush(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -65,6 +76,11 @@ def add_AuthServiceServicer_to_server(servicer, server):
                     request_deserializer=auth__pb2.GetUserRequest.FromString,
                     response_serializer=auth__pb2.GetUserResult.SerializeToString,
             ),
+            'BatchGetUsers': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetUsers,
+                    request_deserializer=auth__pb2.BatchGetUsersRequest.FromString,
+                    response_serializer=auth__pb2.BatchGetUsersResult.SerializeToString,
+            ),
             'SendPush': grpc.unary_unary_rpc_method_handler(
                     servicer.SendPush,
                     request_deserializer=auth__pb2.SendPushRequest.FromString,
@@ -114,6 +130,23 @@ class AuthService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def BatchGetUsers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/auth.AuthService/BatchGetUsers',
+            auth__pb2.BatchGetUsersRequest.SerializeToString,
+            auth__pb2.BatchGetUsersResult.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def SendPush(request,
             target,
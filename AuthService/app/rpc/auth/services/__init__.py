@@ -1,2 +1,14 @@
-from .authorize import authorize
-from .getuser import get_user
\ No newline at end of file
+from rpc.auth.declaration import auth_pb2_grpc
+from .authorize import AuthorizeInterface
+from .getuser import GetUserInterface, BatchGetUsersInterface
+
+
+class AuthorizeServicer(auth_pb2_grpc.AuthServiceServicer):
+    async def Authorize(self, request, context):
+        return await AuthorizeInterface(self, request, context)
+
+    async def GetUser(self, request, context):
+        return await GetUserInterface(self, request, context)
+
+    async def BatchGetUsers(self, request, context):
+        return await BatchGetUsersInterface(self, request, context)
@@ -0,0 +1,69 @@
+import os
+import grpc
+from typing import Dict, List, Tuple
+from sqlalchemy import select
+from database.core import AsyncSessionLocal
+from database.user import User
+from shared.ttl_cache import TTLCache
+from rpc.auth.declaration.auth_pb2 import (
+    GetUserResult,
+    BatchGetUsersResult,
+    UserSummary,
+)
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 60))
+USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", 100000))
+BATCH_GET_USERS_MAX_IDS = int(os.getenv("BATCH_GET_USERS_MAX_IDS", 1000))
+
+# {user_id: (username, handle_name)}
+_user_cache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL)
+
+
+async def load_users(user_ids: List[int]) -> Dict[int, Tuple[str, str]]:
+    """
+    캐시에 없는 사용자만 IN (...) 쿼리 한 번으로 조회합니다.
+    """
+    found, missing = _user_cache.get_many(user_ids)
+
+    if missing:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(User.id, User.username, User.handle_name).where(User.id.in_(missing))
+            )
+            loaded = {row.id: (row.username, row.handle_name) for row in result}
+
+        _user_cache.set_many(loaded)
+        found.update(loaded)
+
+    return found
+
+
+async def GetUserInterface(self, request, context):
+    users = await load_users([request.userid])
+    user = users.get(request.userid)
+
+    if not user:
+        return GetUserResult(success=False)
+
+    username, handle_name = user
+    return GetUserResult(success=True, userid=request.userid, username=username, handle_name=handle_name)
+
+
+async def BatchGetUsersInterface(self, request, context):
+    user_ids = list(dict.fromkeys(request.userids))
+
+    if len(user_ids) > BATCH_GET_USERS_MAX_IDS:
+        await context.abort(
+            grpc.StatusCode.INVALID_ARGUMENT,
+            f"userids는 최대 {BATCH_GET_USERS_MAX_IDS}개까지 요청할 수 있습니다.",
+        )
+
+    users = await load_users(user_ids) if user_ids else {}
+
+    return BatchGetUsersResult(
+        success=True,
+        users=[
+            UserSummary(id=user_id, username=username, handle_name=handle_name)
+            for user_id, (username, handle_name) in users.items()
+        ],
+    )
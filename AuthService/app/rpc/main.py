@@ -1,6 +1,19 @@
+import asyncio
+import logging
+import signal
 from grpc import aio
 from rpc.auth.declaration import auth_pb2_grpc
 from rpc.auth.services import AuthorizeServicer
+from shared.rpc.config import (
+    get_server_options,
+    get_max_concurrent_rpcs,
+    get_compression,
+    GRPC_SHUTDOWN_GRACE,
+    GRPC_METRICS_LOG_INTERVAL,
+)
+from shared.rpc.metrics import InFlightInterceptor, get_total_inflight, log_inflight_snapshot
+from shared.rpc.tracing import TracingServerInterceptor
+from shared.tracing import TRACING_ENABLED
 import dotenv
 import os
 
@@ -8,14 +21,69 @@ dotenv.load_dotenv()
 
 AUTH_PORT = os.getenv("AUTH_PORT", "50001")
 
+logger = logging.getLogger("grpc_server")
+
+
 class gRPCServer:
     @staticmethod
-    async def run():                                                                                    
-        server = aio.server()
+    def create_server() -> aio.Server:
+        interceptors = [InFlightInterceptor()]
+        if TRACING_ENABLED:
+            # ArticleService가 메타데이터로 보낸 traceparent를 이어 받음
+            interceptors.append(TracingServerInterceptor())
+        return aio.server(
+            interceptors=interceptors,
+            options=get_server_options(),
+            maximum_concurrent_rpcs=get_max_concurrent_rpcs(),
+            compression=get_compression(),
+        )
+
+    @staticmethod
+    async def run():
+        server = gRPCServer.create_server()
 
         auth_pb2_grpc.add_AuthServiceServicer_to_server(AuthorizeServicer(), server)
 
         server.add_insecure_port(f"[::]:{AUTH_PORT}")
         await server.start()
         print("[GRPC] Server is running on port", AUTH_PORT)
-        await server.wait_for_termination()
\ No newline at end of file
+
+        gRPCServer.install_shutdown_handlers(server)
+        metrics_task = gRPCServer.start_metrics_logger()
+        try:
+            await server.wait_for_termination()
+        finally:
+            if metrics_task:
+                metrics_task.cancel()
+
+    @staticmethod
+    def install_shutdown_handlers(server: aio.Server):
+        """
+        SIGTERM/SIGINT 수신 시 새 요청을 거절하고
+        진행 중인 RPC가 GRPC_SHUTDOWN_GRACE초 안에 끝나도록 기다린 뒤 종료합니다.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def drain(sig):
+            logger.info(f"[GRPC] 종료 시그널 수신: {sig.name}, 진행 중 RPC {get_total_inflight()}개 drain 시작")
+            await server.stop(GRPC_SHUTDOWN_GRACE)
+            logger.info("[GRPC] drain 완료, 서버 종료")
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, lambda s=sig: asyncio.create_task(drain(s)))
+            except (NotImplementedError, RuntimeError):
+                # 메인 스레드가 아니거나 지원하지 않는 플랫폼
+                pass
+
+    @staticmethod
+    def start_metrics_logger():
+        if GRPC_METRICS_LOG_INTERVAL <= 0:
+            return None
+
+        async def _loop():
+            while True:
+                await asyncio.sleep(GRPC_METRICS_LOG_INTERVAL)
+                log_inflight_snapshot()
+
+        return asyncio.create_task(_loop())
@@ -2,7 +2,6 @@ import os
 import jwt
 import time
 from datetime import datetime, timedelta
-import hashlib
 from dotenv import load_dotenv
 import base64
 load_dotenv()
@@ -10,7 +9,6 @@ load_dotenv()
 DAY = 86400
 
 SECRET = os.environ.get("SECRET")
-SALT = os.environ.get("SALT")
 
 def encToken(user_id):
   end = int(time.time()) + DAY
@@ -52,6 +50,3 @@ def admin_check_auth(token):
       return False
   except:
     return False
-
-def hashing_pw(plain_pw):
-  return hashlib.sha256((plain_pw + SALT).encode('utf-8')).hexdigest()
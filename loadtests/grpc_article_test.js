@@ -1,4 +1,5 @@
 import grpc from "k6/net/grpc";
+import http from "k6/http";
 import { check, sleep } from "k6";
 import { randomString } from "https://jslib.k6.io/k6-utils/1.2.0/index.js";
 import { Trend, Rate, Counter } from "k6/metrics";
@@ -8,10 +9,35 @@ const authorizeLatency = new Trend("grpc_authorize_latency");
 const errorRate = new Rate("grpc_error_rate");
 const requestCount = new Counter("grpc_request_count");
 
+// gRPC / REST 대량 조회 비교 메트릭
+const grpcBatchGetLatency = new Trend("grpc_batch_get_posts_latency");
+const grpcListPostsLatency = new Trend("grpc_list_posts_latency");
+const restBulkReadLatency = new Trend("rest_bulk_read_latency");
+const grpcPostsFetched = new Counter("grpc_posts_fetched");
+const restPostsFetched = new Counter("rest_posts_fetched");
+
+// 포화(saturation) 시나리오 메트릭
+const saturationLatency = new Trend("grpc_saturation_latency");
+const shedRate = new Rate("grpc_shed_rate"); // RESOURCE_EXHAUSTED로 즉시 거절된 비율
+const timeoutRate = new Rate("grpc_timeout_rate"); // 거절되지 못하고 deadline을 넘긴 비율
+
+// 포화 시나리오 설정 (서버의 GRPC_MAX_CONCURRENT_RPCS를 넘는 부하)
+const SATURATION_RPS = parseInt(__ENV.SATURATION_RPS || "2000");
+const SATURATION_TIMEOUT = __ENV.SATURATION_TIMEOUT || "2s";
+
+// 대량 조회 비교 설정
+const ARTICLE_GRPC_ADDR = __ENV.ARTICLE_GRPC_ADDR || "localhost:50102";
+const ARTICLE_REST_URL = __ENV.ARTICLE_REST_URL || "http://localhost:50002";
+const BULK_SIZE = parseInt(__ENV.BULK_SIZE || "50"); // 한 번에 가져올 게시글 수
+const POST_ID_MAX = parseInt(__ENV.POST_ID_MAX || "1000");
+
 // gRPC 클라이언트 설정
 const client = new grpc.Client();
 client.load(["proto"], "auth.proto");
 
+const articleClient = new grpc.Client();
+articleClient.load(["proto"], "article.proto");
+
 // 테스트 설정
 export const options = {
   scenarios: {
@@ -38,27 +64,70 @@ export const options = {
       gracefulRampDown: "10s",
       startTime: "2m30s", // 기본 시나리오 이후 시작
     },
+    // 대량 조회 비교: 같은 부하를 gRPC와 REST로 각각 실행
+    bulk_read_grpc: {
+      executor: "constant-vus",
+      vus: 20,
+      duration: "1m",
+      exec: "bulkReadGrpc",
+      startTime: "4m30s",
+    },
+    bulk_read_rest: {
+      executor: "constant-vus",
+      vus: 20,
+      duration: "1m",
+      exec: "bulkReadRest",
+      startTime: "5m40s", // gRPC 비교 시나리오 이후 시작
+    },
+    // 포화 시나리오: 동시 처리 한도를 넘는 Authorize 폭주
+    // 서버가 요청을 쌓아두지 않고 RESOURCE_EXHAUSTED로 빠르게 거절하는지 확인
+    saturation: {
+      executor: "constant-arrival-rate",
+      rate: SATURATION_RPS,
+      timeUnit: "1s",
+      duration: "1m",
+      preAllocatedVUs: 200,
+      maxVUs: 1000,
+      exec: "saturation",
+      startTime: "6m50s", // REST 비교 시나리오 이후 시작
+    },
   },
   thresholds: {
     grpc_authorize_latency: ["p(95)<200"], // 95%의 요청이 200ms 이하
     grpc_error_rate: ["rate<0.1"], // 에러율 10% 이하
+    grpc_batch_get_posts_latency: ["p(95)<300"],
+    grpc_list_posts_latency: ["p(95)<500"],
+    grpc_saturation_latency: ["p(95)<500"], // 거절 응답도 빨라야 함
+    grpc_timeout_rate: ["rate<0.01"], // deadline 초과 1% 미만
   },
 };
 
-// gRPC 연결 설정
+// 테스트 준비 - REST API로 테스트 사용자 생성 및 토큰 발급
+// (gRPC 연결은 VU마다 맺어야 하므로 각 실행 함수에서 연결)
 export function setup() {
-  client.connect("localhost:50001", {
-    plaintext: true,
-  });
-
-  // REST API로 테스트 사용자 생성 및 토큰 발급
   const tokens = createTestTokens(3);
   return { tokens };
 }
 
+// VU별 최초 1회 gRPC 연결
+function ensureConnected() {
+  if (__ITER === 0) {
+    client.connect("localhost:50001", {
+      plaintext: true,
+    });
+  }
+}
+
+function ensureArticleConnected() {
+  if (__ITER === 0) {
+    articleClient.connect(ARTICLE_GRPC_ADDR, {
+      plaintext: true,
+    });
+  }
+}
+
 // REST API를 통해 사용자 생성 및 토큰 발급
 function createTestTokens(count) {
-  const http = require("k6/http");
   const tokens = [];
 
   for (let i = 0; i < count; i++) {
@@ -103,10 +172,6 @@ function createTestTokens(count) {
   return tokens;
 }
 
-// gRPC 연결 종료
-export function teardown() {
-  client.close();
-}
 
 // 토큰 유효성 검증
 function authorize(token) {
@@ -148,8 +213,126 @@ function randomIntBetween(min, max) {
   return Math.floor(Math.random() * (max - min + 1)) + min;
 }
 
+// 임의의 게시글 ID 목록 생성
+function randomPostIds(count) {
+  const ids = [];
+  for (let i = 0; i < count; i++) {
+    ids.push(randomIntBetween(1, POST_ID_MAX));
+  }
+  return ids;
+}
+
+// gRPC 대량 조회: BatchGetPosts(unary) + ListPosts(server-streaming)
+export function bulkReadGrpc() {
+  ensureArticleConnected();
+
+  // 1) 임의의 ID 묶음 조회
+  let startTime = new Date();
+  const response = articleClient.invoke("article.ArticleService/BatchGetPosts", {
+    post_ids: randomPostIds(BULK_SIZE),
+    include_content: true,
+  });
+  grpcBatchGetLatency.add(new Date() - startTime);
+  requestCount.add(1);
+
+  const ok = check(response, {
+    "batch get status is OK": (r) => r.status === grpc.StatusOK,
+  });
+  errorRate.add(!ok);
+  if (ok && response.message.posts) {
+    grpcPostsFetched.add(response.message.posts.length);
+  }
+
+  // 2) 커서 이후 게시글을 스트림으로 조회
+  const cursorId = randomIntBetween(0, Math.max(0, POST_ID_MAX - BULK_SIZE));
+  const stream = new grpc.Stream(articleClient, "article.ArticleService/ListPosts");
+  let received = 0;
+  startTime = new Date();
+
+  stream.on("data", () => {
+    received++;
+  });
+  stream.on("error", (err) => {
+    errorRate.add(1);
+    console.log(`ListPosts 스트림 오류: ${JSON.stringify(err)}`);
+  });
+  stream.on("end", () => {
+    grpcListPostsLatency.add(new Date() - startTime);
+    grpcPostsFetched.add(received);
+    errorRate.add(0);
+  });
+
+  stream.write({
+    cursor_id: cursorId,
+    limit: BULK_SIZE,
+    include_content: true,
+  });
+  stream.end();
+}
+
+// REST 대량 조회: 같은 양의 게시글을 상세 조회 API로 가져옴
+export function bulkReadRest(data) {
+  const tokens = data?.tokens?.length > 0 ? data.tokens : ["sample_token_1"];
+  const token = tokens[randomIntBetween(0, tokens.length - 1)];
+  const params = {
+    headers: {
+      Authorization: `Bearer ${token}`,
+    },
+  };
+
+  const requests = randomPostIds(BULK_SIZE).map((postId) => [
+    "GET",
+    `${ARTICLE_REST_URL}/api/posts/${postId}`,
+    null,
+    params,
+  ]);
+
+  const startTime = new Date();
+  const responses = http.batch(requests);
+  restBulkReadLatency.add(new Date() - startTime);
+  requestCount.add(responses.length);
+
+  let fetched = 0;
+  for (const r of responses) {
+    if (r.status === 200) {
+      fetched++;
+    }
+  }
+  restPostsFetched.add(fetched);
+  errorRate.add(fetched < responses.length);
+}
+
+// 포화 상태에서 Authorize 호출: 성공 또는 빠른 거절만 허용
+export function saturation(data) {
+  ensureConnected();
+
+  const tokens = data?.tokens?.length > 0 ? data.tokens : ["sample_token_1"];
+  const token = tokens[randomIntBetween(0, tokens.length - 1)];
+
+  const startTime = new Date();
+  const response = client.invoke(
+    "auth.AuthService/Authorize",
+    { token: token },
+    { timeout: SATURATION_TIMEOUT }
+  );
+  saturationLatency.add(new Date() - startTime);
+  requestCount.add(1);
+
+  const shed = response.status === grpc.StatusResourceExhausted;
+  const timedOut = response.status === grpc.StatusDeadlineExceeded;
+  shedRate.add(shed);
+  timeoutRate.add(timedOut);
+
+  check(response, {
+    "ok or shed": (r) =>
+      r.status === grpc.StatusOK || r.status === grpc.StatusResourceExhausted,
+  });
+}
+
 // 메인 함수
 export default function (data) {
+  ensureConnected();
+
   // 사용 가능한 토큰이 없으면 고정 테스트 토큰 사용
   const tokens =
     data?.tokens?.length > 0
@@ -0,0 +1,176 @@
+import { check } from "k6";
+import http from "k6/http";
+import { Trend, Rate, Counter } from "k6/metrics";
+
+// 소수의 인기 게시글에 조회/좋아요가 몰리는 운영 환경의 접근 패턴을 재현합니다.
+// 게시글 순위(rank)는 Zipf 분포로 뽑으며 ZIPF_S가 클수록 상위 게시글에 더 몰립니다.
+//   ZIPF_S=0   균등 분포
+//   ZIPF_S=1   일반적인 인기 분포 (게시글 100만 개 기준 상위 1%가 약 2/3, 상위 10개가 약 17%)
+//   ZIPF_S=1.2 소수 게시글에 극단적으로 집중 (상위 1%가 약 90%)
+//
+// 데이터 준비:
+//   (AuthService/app)    python -m benchmarks.seed_users --users 10000
+//   (ArticleService/app) python -m benchmarks.seed --posts 1000000
+//   -> seed 출력의 post_id_min / post_id_max를 POST_ID_MIN / POST_ID_MAX로 전달
+//
+// 실행 예:
+//   k6 run -e POST_ID_MAX=1000000 -e ZIPF_S=1.1 -e READ_RATIO=0.95 loadtests/zipf_hot_posts_test.js
+
+// 환경 변수
+const ARTICLE_URL = __ENV.ARTICLE_URL || "http://localhost:50002";
+const AUTH_URL = __ENV.AUTH_URL || "http://localhost:50001";
+const POST_ID_MIN = parseInt(__ENV.POST_ID_MIN || "1");
+const POST_ID_MAX = parseInt(__ENV.POST_ID_MAX || "1000000");
+const ZIPF_S = parseFloat(__ENV.ZIPF_S || "1.0");
+// 인기 게시글이 연속된 ID에 몰리지 않도록 순위를 ID 공간에 흩뿌림 (0이면 순위 = ID 순서)
+const ZIPF_SCATTER = (__ENV.ZIPF_SCATTER || "1") === "1";
+// 요청 비율: 상세 조회 READ_RATIO, 나머지는 좋아요 (그중 UNHEART_RATIO는 좋아요 취소)
+const READ_RATIO = parseFloat(__ENV.READ_RATIO || "0.9");
+const UNHEART_RATIO = parseFloat(__ENV.UNHEART_RATIO || "0.2");
+// 상세 조회 중 FEED_RATIO만큼은 피드(목록) 조회로 대체
+const FEED_RATIO = parseFloat(__ENV.FEED_RATIO || "0");
+const RATE = parseInt(__ENV.RATE || "500"); // 초당 요청 수
+const DURATION = __ENV.DURATION || "2m";
+const VUS = parseInt(__ENV.VUS || "100");
+const MAX_VUS = parseInt(__ENV.MAX_VUS || "500");
+const USER_PREFIX = __ENV.USER_PREFIX || "loaduser_";
+const USER_PASSWORD = __ENV.USER_PASSWORD || "password123";
+const LOGIN_USERS = parseInt(__ENV.LOGIN_USERS || "50"); // setup에서 로그인할 사용자 수
+const HOT_RANKS = parseInt(__ENV.HOT_RANKS || "10"); // 상위 몇 개 게시글을 "hot"으로 집계할지
+
+// 메트릭 정의
+const detailLatency = new Trend("zipf_detail_latency", true);
+const heartLatency = new Trend("zipf_heart_latency", true);
+const feedLatency = new Trend("zipf_feed_latency", true);
+const errorRate = new Rate("zipf_error_rate");
+const hotRequests = new Counter("zipf_hot_requests"); // 상위 HOT_RANKS개 게시글로 간 요청 수
+const totalRequests = new Counter("zipf_total_requests");
+
+export const options = {
+  scenarios: {
+    zipf_mix: {
+      executor: "constant-arrival-rate",
+      rate: RATE,
+      timeUnit: "1s",
+      duration: DURATION,
+      preAllocatedVUs: VUS,
+      maxVUs: MAX_VUS,
+    },
+  },
+  thresholds: {
+    zipf_detail_latency: ["p(95)<300"],
+    zipf_heart_latency: ["p(95)<300"],
+    zipf_error_rate: ["rate<0.01"],
+  },
+};
+
+const POST_COUNT = POST_ID_MAX - POST_ID_MIN + 1;
+
+// 순위 -> ID 매핑에 쓰는 곱셈 상수 (POST_COUNT와 서로소이면 1:1 대응)
+function gcd(a, b) {
+  return b === 0 ? a : gcd(b, a % b);
+}
+let SCATTER_MULTIPLIER = 2654435761 % POST_COUNT || 1;
+while (gcd(SCATTER_MULTIPLIER, POST_COUNT) !== 1) {
+  SCATTER_MULTIPLIER += 1;
+}
+
+// 연속 근사 역함수 샘플링: 메모리 O(1)로 수백만 개 게시글에도 사용 가능
+// P(rank <= k) ~ (k^(1-s) - 1) / (N^(1-s) - 1), s = 1이면 ln k / ln N
+function zipfRank() {
+  const u = Math.random();
+  let rank;
+  if (ZIPF_S === 0) {
+    rank = Math.floor(u * POST_COUNT) + 1;
+  } else if (Math.abs(ZIPF_S - 1) < 1e-9) {
+    rank = Math.floor(Math.exp(u * Math.log(POST_COUNT + 1)));
+  } else {
+    const exponent = 1 - ZIPF_S;
+    rank = Math.floor(
+      Math.pow(u * (Math.pow(POST_COUNT + 1, exponent) - 1) + 1, 1 / exponent)
+    );
+  }
+  return Math.min(Math.max(rank, 1), POST_COUNT);
+}
+
+function rankToPostId(rank) {
+  if (!ZIPF_SCATTER) {
+    return POST_ID_MIN + rank - 1;
+  }
+  // 곱이 2^53보다 작아야 정확하므로 게시글 수 9천만 개 이하에서 사용
+  return POST_ID_MIN + (((rank - 1) * SCATTER_MULTIPLIER) % POST_COUNT);
+}
+
+export function setup() {
+  const tokens = [];
+  for (let i = 1; i <= LOGIN_USERS; i++) {
+    const response = http.post(
+      `${AUTH_URL}/api/login`,
+      JSON.stringify({ username: `${USER_PREFIX}${i}`, password: USER_PASSWORD }),
+      { headers: { "Content-Type": "application/json" } }
+    );
+    if (response.status === 200) {
+      tokens.push(response.json("token"));
+    }
+  }
+
+  if (tokens.length === 0) {
+    throw new Error(
+      "로그인 가능한 사용자가 없습니다. AuthService에서 benchmarks.seed_users를 먼저 실행하세요."
+    );
+  }
+  console.log(
+    `로그인 ${tokens.length}/${LOGIN_USERS}, 게시글 ${POST_COUNT}개, ZIPF_S=${ZIPF_S}, READ_RATIO=${READ_RATIO}`
+  );
+  return { tokens };
+}
+
+function authHeaders(data) {
+  const token = data.tokens[Math.floor(Math.random() * data.tokens.length)];
+  return {
+    "Content-Type": "application/json",
+    Authorization: `Bearer ${token}`,
+  };
+}
+
+function recordResult(response, trend, name) {
+  trend.add(response.timings.duration);
+  totalRequests.add(1);
+  const ok = check(response, { [`${name} status is 200`]: (r) => r.status === 200 });
+  errorRate.add(!ok);
+}
+
+export default function (data) {
+  const headers = authHeaders(data);
+  const rank = zipfRank();
+  const postId = rankToPostId(rank);
+  if (rank <= HOT_RANKS) {
+    hotRequests.add(1);
+  }
+
+  if (Math.random() < READ_RATIO) {
+    if (FEED_RATIO > 0 && Math.random() < FEED_RATIO) {
+      // 피드 커서도 인기 게시글 근처에서 시작
+      const response = http.get(`${ARTICLE_URL}/api/get_posts/${postId - 1}`, {
+        headers,
+        tags: { name: "feed" },
+      });
+      recordResult(response, feedLatency, "feed");
+      return;
+    }
+
+    const response = http.get(`${ARTICLE_URL}/api/posts/${postId}`, {
+      headers,
+      tags: { name: "detail" },
+    });
+    recordResult(response, detailLatency, "detail");
+    return;
+  }
+
+  const payload = JSON.stringify({ post_id: postId });
+  const response =
+    Math.random() < UNHEART_RATIO
+      ? http.del(`${ARTICLE_URL}/api/posts/hearts`, payload, { headers, tags: { name: "unheart" } })
+      : http.post(`${ARTICLE_URL}/api/posts/hearts`, payload, { headers, tags: { name: "heart" } });
+  recordResult(response, heartLatency, "heart");
+}
@@ -0,0 +1,7 @@
+"""
+ArticleService와 AuthService가 함께 쓰는 모듈
+
+두 서비스에 같은 파일을 복사해 두지 않고 여기 한 곳에서 고칩니다.
+각 서비스 디렉터리의 shared는 이 디렉터리를 가리키는 심볼릭 링크이므로 로컬에서는 그대로 import 되고,
+Docker 이미지는 저장소 루트를 빌드 컨텍스트로 하여 /shared에 복사합니다. (링크가 /app/../../shared를 가리킴)
+"""
@@ -0,0 +1,78 @@
+"""
+gRPC 서버 설정 모듈
+
+동시 처리 한도, keepalive, 메시지 압축, 종료 시 drain 시간 등
+서버 동작을 환경변수로 조정할 수 있도록 모아둡니다.
+"""
+import os
+from typing import List, Optional, Tuple
+import grpc
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 동시 처리 RPC 한도 (초과 요청은 RESOURCE_EXHAUSTED로 즉시 거절, 0이면 무제한)
+GRPC_MAX_CONCURRENT_RPCS = int(os.getenv("GRPC_MAX_CONCURRENT_RPCS", 256))
+# HTTP/2 연결당 최대 동시 스트림 수
+GRPC_MAX_CONCURRENT_STREAMS = int(os.getenv("GRPC_MAX_CONCURRENT_STREAMS", 100))
+
+# keepalive 설정
+GRPC_KEEPALIVE_TIME_MS = int(os.getenv("GRPC_KEEPALIVE_TIME_MS", 30000))
+GRPC_KEEPALIVE_TIMEOUT_MS = int(os.getenv("GRPC_KEEPALIVE_TIMEOUT_MS", 10000))
+GRPC_KEEPALIVE_PERMIT_WITHOUT_CALLS = os.getenv("GRPC_KEEPALIVE_PERMIT_WITHOUT_CALLS", "1") == "1"
+GRPC_MIN_PING_INTERVAL_MS = int(os.getenv("GRPC_MIN_PING_INTERVAL_MS", 10000))
+GRPC_MAX_CONNECTION_IDLE_MS = int(os.getenv("GRPC_MAX_CONNECTION_IDLE_MS", 300000))
+GRPC_MAX_CONNECTION_AGE_MS = int(os.getenv("GRPC_MAX_CONNECTION_AGE_MS", 0))
+GRPC_MAX_CONNECTION_AGE_GRACE_MS = int(os.getenv("GRPC_MAX_CONNECTION_AGE_GRACE_MS", 5000))
+
+# 메시지 크기 한도 (바이트)
+GRPC_MAX_RECEIVE_MESSAGE_LENGTH = int(os.getenv("GRPC_MAX_RECEIVE_MESSAGE_LENGTH", 4 * 1024 * 1024))
+GRPC_MAX_SEND_MESSAGE_LENGTH = int(os.getenv("GRPC_MAX_SEND_MESSAGE_LENGTH", 16 * 1024 * 1024))
+
+# 응답 압축 (none, gzip, deflate)
+GRPC_COMPRESSION = os.getenv("GRPC_COMPRESSION", "none").lower()
+
+# 종료 시 진행 중인 RPC를 기다리는 최대 시간 (초)
+GRPC_SHUTDOWN_GRACE = float(os.getenv("GRPC_SHUTDOWN_GRACE", 10))
+
+# 메소드별 진행 중 RPC 수를 로그로 남기는 간격 (초, 0이면 비활성화)
+GRPC_METRICS_LOG_INTERVAL = int(os.getenv("GRPC_METRICS_LOG_INTERVAL", 60))
+
+_COMPRESSION_ALGORITHMS = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+
+def get_server_options() -> List[Tuple[str, int]]:
+    """
+    aio.server()에 전달할 채널 옵션 목록을 반환합니다.
+    """
+    options = [
+        ("grpc.max_concurrent_streams", GRPC_MAX_CONCURRENT_STREAMS),
+        ("grpc.keepalive_time_ms", GRPC_KEEPALIVE_TIME_MS),
+        ("grpc.keepalive_timeout_ms", GRPC_KEEPALIVE_TIMEOUT_MS),
+        ("grpc.keepalive_permit_without_calls", int(GRPC_KEEPALIVE_PERMIT_WITHOUT_CALLS)),
+        ("grpc.http2.min_ping_interval_without_data_ms", GRPC_MIN_PING_INTERVAL_MS),
+        ("grpc.http2.max_pings_without_data", 0),
+        ("grpc.max_connection_idle_ms", GRPC_MAX_CONNECTION_IDLE_MS),
+        ("grpc.max_receive_message_length", GRPC_MAX_RECEIVE_MESSAGE_LENGTH),
+        ("grpc.max_send_message_length", GRPC_MAX_SEND_MESSAGE_LENGTH),
+    ]
+
+    if GRPC_MAX_CONNECTION_AGE_MS > 0:
+        options.append(("grpc.max_connection_age_ms", GRPC_MAX_CONNECTION_AGE_MS))
+        options.append(("grpc.max_connection_age_grace_ms", GRPC_MAX_CONNECTION_AGE_GRACE_MS))
+
+    return options
+
+
+def get_max_concurrent_rpcs() -> Optional[int]:
+    return GRPC_MAX_CONCURRENT_RPCS if GRPC_MAX_CONCURRENT_RPCS > 0 else None
+
+
+def get_compression() -> grpc.Compression:
+    if GRPC_COMPRESSION not in _COMPRESSION_ALGORITHMS:
+        raise ValueError(f"지원하지 않는 GRPC_COMPRESSION 값입니다: {GRPC_COMPRESSION}")
+    return _COMPRESSION_ALGORITHMS[GRPC_COMPRESSION]
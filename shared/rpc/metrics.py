@@ -0,0 +1,110 @@
+"""
+gRPC 서버 메트릭 모듈
+
+메소드별 진행 중(in-flight) RPC 수를 집계하는 서버 인터셉터를 제공합니다.
+"""
+import inspect
+import logging
+from collections import defaultdict
+from typing import Dict
+from grpc import aio
+
+logger = logging.getLogger("grpc_metrics")
+
+# {method: 현재 진행 중인 RPC 수}
+_inflight: Dict[str, int] = defaultdict(int)
+# {method: 관측된 최대 동시 RPC 수}
+_inflight_peak: Dict[str, int] = defaultdict(int)
+# {method: 처리 완료된 RPC 수}
+_completed: Dict[str, int] = defaultdict(int)
+
+
+def _enter(method: str):
+    _inflight[method] += 1
+    if _inflight[method] > _inflight_peak[method]:
+        _inflight_peak[method] = _inflight[method]
+
+
+def _exit(method: str):
+    _inflight[method] -= 1
+    _completed[method] += 1
+
+
+def get_inflight_snapshot() -> Dict[str, Dict[str, int]]:
+    """
+    메소드별 in-flight 게이지 스냅샷을 반환합니다.
+
+    Returns:
+        {method: {"inflight": 현재 값, "peak": 최대 값, "completed": 완료 수}}
+    """
+    return {
+        method: {
+            "inflight": _inflight[method],
+            "peak": _inflight_peak[method],
+            "completed": _completed[method],
+        }
+        for method in set(_inflight) | set(_completed)
+    }
+
+
+def get_total_inflight() -> int:
+    return sum(_inflight.values())
+
+
+def _wrap_unary_response(method: str, behavior):
+    async def wrapper(request_or_iterator, context):
+        _enter(method)
+        try:
+            return await behavior(request_or_iterator, context)
+        finally:
+            _exit(method)
+    return wrapper
+
+
+def _wrap_stream_response(method: str, behavior):
+    # 응답 스트리밍 핸들러는 async generator 또는 context.write를 쓰는 코루틴일 수 있음
+    if not inspect.isasyncgenfunction(behavior):
+        return _wrap_unary_response(method, behavior)
+
+    async def wrapper(request_or_iterator, context):
+        _enter(method)
+        try:
+            async for response in behavior(request_or_iterator, context):
+                yield response
+        finally:
+            _exit(method)
+    return wrapper
+
+
+class InFlightInterceptor(aio.ServerInterceptor):
+    """
+    모든 RPC의 시작/종료 시점에 메소드별 in-flight 게이지를 갱신하는 인터셉터
+    """
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+
+        method = handler_call_details.method
+
+        if handler.unary_unary:
+            return handler._replace(unary_unary=_wrap_unary_response(method, handler.unary_unary))
+        if handler.stream_unary:
+            return handler._replace(stream_unary=_wrap_unary_response(method, handler.stream_unary))
+        if handler.unary_stream:
+            return handler._replace(unary_stream=_wrap_stream_response(method, handler.unary_stream))
+        if handler.stream_stream:
+            return handler._replace(stream_stream=_wrap_stream_response(method, handler.stream_stream))
+        return handler
+
+
+def log_inflight_snapshot():
+    snapshot = get_inflight_snapshot()
+    if not snapshot:
+        return
+    for method, values in sorted(snapshot.items()):
+        logger.info(
+            f"[GRPC] {method} inflight={values['inflight']} "
+            f"peak={values['peak']} completed={values['completed']}"
+        )
@@ -0,0 +1,88 @@
+"""
+gRPC 트레이싱 인터셉터
+
+- 서버: 요청 메타데이터의 traceparent를 읽어 RPC마다 루트 span을 만듭니다. (호출한 서비스의 트레이스에 이어 붙음)
+- 클라이언트: 호출마다 span을 만들고 traceparent를 메타데이터에 넣어 상대 서비스로 전달합니다.
+
+TRACING_ENABLED=1일 때만 서버/채널에 등록합니다.
+"""
+import inspect
+from grpc import aio
+from shared.tracing import TRACEPARENT, start_trace, start_span, current_traceparent
+
+
+def _metadata_value(metadata, key: str):
+    for item_key, value in metadata or ():
+        if item_key == key:
+            return value
+    return None
+
+
+def _wrap_unary_response(method: str, behavior):
+    async def wrapper(request_or_iterator, context):
+        traceparent = _metadata_value(context.invocation_metadata(), TRACEPARENT)
+        with start_trace(method, traceparent, kind="server", **{"rpc.system": "grpc"}):
+            return await behavior(request_or_iterator, context)
+    return wrapper
+
+
+def _wrap_stream_response(method: str, behavior):
+    if not inspect.isasyncgenfunction(behavior):
+        return _wrap_unary_response(method, behavior)
+
+    async def wrapper(request_or_iterator, context):
+        traceparent = _metadata_value(context.invocation_metadata(), TRACEPARENT)
+        with start_trace(method, traceparent, kind="server", **{"rpc.system": "grpc"}):
+            async for response in behavior(request_or_iterator, context):
+                yield response
+    return wrapper
+
+
+class TracingServerInterceptor(aio.ServerInterceptor):
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+
+        method = handler_call_details.method
+
+        if handler.unary_unary:
+            return handler._replace(unary_unary=_wrap_unary_response(method, handler.unary_unary))
+        if handler.stream_unary:
+            return handler._replace(stream_unary=_wrap_unary_response(method, handler.stream_unary))
+        if handler.unary_stream:
+            return handler._replace(unary_stream=_wrap_stream_response(method, handler.unary_stream))
+        if handler.stream_stream:
+            return handler._replace(stream_stream=_wrap_stream_response(method, handler.stream_stream))
+        return handler
+
+
+def _with_traceparent(client_call_details):
+    traceparent = current_traceparent()
+    if traceparent is None:
+        return client_call_details
+    metadata = aio.Metadata(*(client_call_details.metadata or ()))
+    metadata.add(TRACEPARENT, traceparent)
+    return client_call_details._replace(metadata=metadata)
+
+
+def _method_name(client_call_details) -> str:
+    method = client_call_details.method
+    return method.decode() if isinstance(method, bytes) else method
+
+
+class TracingClientInterceptor(aio.UnaryUnaryClientInterceptor, aio.UnaryStreamClientInterceptor):
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        with start_span(_method_name(client_call_details), kind="client", **{"rpc.system": "grpc"}) as span:
+            # span 안에서 메타데이터를 만들어야 상대 서비스의 span이 이 span의 자식이 됨
+            call = await continuation(_with_traceparent(client_call_details), request)
+            try:
+                # 응답까지 기다려 RPC 전체 시간을 기록 (call은 다시 await 해도 같은 결과를 반환)
+                await call
+            except aio.AioRpcError as e:
+                span.record_error(e)
+            return call
+
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        # 스트림은 소비하는 쪽에서 시간을 쓰므로 traceparent 전달만 함
+        return await continuation(_with_traceparent(client_call_details), request)
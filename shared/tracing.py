@@ -0,0 +1,433 @@
+"""
+경량 분산 트레이싱 모듈
+
+요청 하나가 HTTP 라우트 -> gRPC(AuthService) -> SQL -> Redis를 거치며 어디서 시간을 쓰는지 보기 위해
+구간(span)마다 시작 시각/소요 시간을 기록하고 trace id로 묶습니다.
+
+- 컨텍스트: 현재 span을 contextvars로 전달 (asyncio 태스크/SQLAlchemy greenlet에도 그대로 전달됨)
+- 전파: W3C traceparent 형식 (HTTP 헤더, gRPC 메타데이터)
+- 샘플링: 루트(트레이스가 시작되는 곳)에서만 TRACE_SAMPLE_RATE 확률로 결정하고 하위 span과 다음 서비스는 그 결정을 따름
+  (샘플링되지 않은 요청의 하위 span은 아무것도 기록하지 않는 공용 객체라 비용이 거의 없음)
+- 내보내기: 끝난 span을 큐에 넣고 별도 스레드가 모아서 TRACE_EXPORT_PATH 파일에 JSON Lines로 추가
+  (큐가 가득 차면 버리며 이벤트 루프는 파일 I/O를 기다리지 않음)
+
+TRACING_ENABLED=0(기본)이면 미들웨어/인터셉터를 등록하지 않고 계측 함수도 아무것도 하지 않습니다.
+
+사용 예:
+    with start_span("hot_posts.lookup", post_id=post_id):
+        ...
+
+기록된 트레이스는 trace_report.py로 확인합니다. (느린 요청 순으로 구간별 소요 시간 출력)
+"""
+import atexit
+import contextvars
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("tracing")
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0") == "1"
+# span에 기록하는 서비스 이름 (각 서비스의 Dockerfile에서 지정)
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "unknown")
+# 트레이스를 시작할 확률 (들어온 traceparent가 있으면 그 결정을 따름)
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", 0.01))
+# {pid}는 워커 프로세스 ID로 치환
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "traces.jsonl")
+TRACE_EXPORT_QUEUE_SIZE = int(os.getenv("TRACE_EXPORT_QUEUE_SIZE", 10000))
+# 내보낼 span이 없을 때 내보내기 스레드가 쉬는 시간 (초)
+TRACE_EXPORT_INTERVAL = float(os.getenv("TRACE_EXPORT_INTERVAL", 0.5))
+# SQL 문은 이 길이까지만 기록 (파라미터 값은 기록하지 않음)
+TRACE_SQL_MAX_LENGTH = int(os.getenv("TRACE_SQL_MAX_LENGTH", 300))
+
+TRACEPARENT = "traceparent"
+
+
+class SpanContext:
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("trace_span", default=None)
+
+# deque의 append/popleft는 스레드 안전하므로 이벤트 루프 쪽에서 락을 잡지 않음
+_export_queue: deque = deque()
+_export_thread: Optional[threading.Thread] = None
+_export_lock = threading.Lock()
+
+_trace_stats = {"traces": 0, "sampled_traces": 0, "spans": 0, "dropped": 0, "exported": 0, "export_errors": 0}
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """
+    "00-<trace id 32자>-<span id 16자>-<flags>" 를 읽습니다. 형식이 맞지 않으면 None
+    """
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return SpanContext(parts[1], parts[2], bool(flags & 1))
+
+
+def current_traceparent() -> Optional[str]:
+    """
+    다음 서비스로 전달할 traceparent (진행 중인 트레이스가 없으면 None)
+    """
+    context = _current.get()
+    return context.traceparent() if context is not None else None
+
+
+class Span:
+    """
+    기록되는 구간. with 블록을 벗어나면 끝나고 내보내기 큐에 들어갑니다.
+    """
+    __slots__ = ("context", "parent_id", "name", "kind", "attributes", "status", "_start", "_start_ns", "_token")
+
+    def __init__(self, context: SpanContext, parent_id: Optional[str], name: str, kind: str, attributes: dict):
+        self.context = context
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.status = "ok"
+        self._token = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def set_name(self, name: str):
+        self.name = name
+
+    def set_status(self, status: str):
+        self.status = status
+
+    def record_error(self, error: BaseException):
+        self.status = "error"
+        self.attributes["error"] = repr(error)[:200]
+
+    def start(self) -> "Span":
+        self._start_ns = time.time_ns()
+        self._start = time.perf_counter_ns()
+        return self
+
+    def end(self):
+        duration_ns = time.perf_counter_ns() - self._start
+        _export((
+            self.context.trace_id, self.context.span_id, self.parent_id, self.name, self.kind,
+            self._start_ns // 1000, duration_ns // 1000, self.status, self.attributes,
+        ))
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self.context)
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.record_error(exc)
+        self.end()
+        _current.reset(self._token)
+        return False
+
+
+class _NoopSpan:
+    """
+    샘플링되지 않았거나 트레이스 밖에서 만든 span (아무것도 기록하지 않음)
+    """
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value):
+        pass
+
+    def set_name(self, name: str):
+        pass
+
+    def set_status(self, status: str):
+        pass
+
+    def record_error(self, error: BaseException):
+        pass
+
+    def start(self) -> "_NoopSpan":
+        return self
+
+    def end(self):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _UnsampledScope(_NoopSpan):
+    """
+    샘플링되지 않은 트레이스의 루트. 하위 span이 새 트레이스를 시작하지 않고 다음 서비스에도 '샘플링 안 함'을 전달하도록
+    컨텍스트만 설정합니다.
+    """
+    __slots__ = ("context", "_token")
+
+    def __init__(self, context: SpanContext):
+        self.context = context
+
+    def __enter__(self) -> "_UnsampledScope":
+        self._token = _current.set(self.context)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        return False
+
+
+def start_trace(name: str, traceparent: Optional[str] = None, kind: str = "server", **attributes):
+    """
+    요청 처리의 루트 span을 만듭니다. (HTTP 미들웨어, gRPC 서버 인터셉터)
+    traceparent가 있으면 호출한 서비스의 트레이스에 이어 붙이고 샘플링 결정도 따릅니다.
+    """
+    if not TRACING_ENABLED:
+        return NOOP_SPAN
+
+    _trace_stats["traces"] += 1
+    parent = parse_traceparent(traceparent)
+    if parent is not None:
+        trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+    else:
+        trace_id, parent_id, sampled = _new_id(128), None, random.random() < TRACE_SAMPLE_RATE
+
+    if not sampled:
+        return _UnsampledScope(SpanContext(trace_id, _new_id(64), False))
+
+    _trace_stats["sampled_traces"] += 1
+    return Span(SpanContext(trace_id, _new_id(64), True), parent_id, name, kind, attributes)
+
+
+def start_span(name: str, kind: str = "internal", **attributes):
+    """
+    현재 트레이스 안에 하위 span을 만듭니다. 샘플링된 트레이스 안이 아니면 NOOP_SPAN을 반환합니다.
+    """
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        return NOOP_SPAN
+    return Span(SpanContext(parent.trace_id, _new_id(64), True), parent.span_id, name, kind, attributes)
+
+
+def _export(record: tuple):
+    _trace_stats["spans"] += 1
+    if _export_thread is None:
+        _start_exporter()
+    if len(_export_queue) >= TRACE_EXPORT_QUEUE_SIZE:
+        _trace_stats["dropped"] += 1
+        return
+    _export_queue.append(record)
+
+
+def _start_exporter():
+    global _export_thread
+    with _export_lock:
+        if _export_thread is None:
+            _export_thread = threading.Thread(target=_export_loop, name="trace-exporter", daemon=True)
+            _export_thread.start()
+            atexit.register(_flush_exporter)
+
+
+def _to_json(record: tuple) -> str:
+    trace_id, span_id, parent_id, name, kind, start_us, duration_us, status, attributes = record
+    return json.dumps({
+        "service": TRACE_SERVICE_NAME,
+        "trace_id": trace_id,
+        "span_id": span_id,
+        "parent_id": parent_id,
+        "name": name,
+        "kind": kind,
+        "start_us": start_us,
+        "duration_us": duration_us,
+        "status": status,
+        "attributes": attributes,
+    }, ensure_ascii=False, default=str)
+
+
+def _drain() -> List[tuple]:
+    records = []
+    try:
+        while len(records) < 1000:
+            records.append(_export_queue.popleft())
+    except IndexError:
+        pass
+    return records
+
+
+def _write(records: List[tuple]):
+    if not records:
+        return
+    try:
+        lines = "".join(_to_json(record) + "\n" for record in records)
+        # 여러 워커가 같은 파일에 써도 줄이 섞이지 않도록 배치마다 append 한 번
+        with open(TRACE_EXPORT_PATH.format(pid=os.getpid()), "a", encoding="utf-8") as f:
+            f.write(lines)
+        _trace_stats["exported"] += len(records)
+    except Exception as e:
+        _trace_stats["export_errors"] += 1
+        logger.warning(f"트레이스 내보내기 실패: {e!r}")
+
+
+def _export_loop():
+    while True:
+        records = _drain()
+        if records:
+            _write(records)
+        else:
+            time.sleep(TRACE_EXPORT_INTERVAL)
+
+
+def _flush_exporter():
+    while True:
+        records = _drain()
+        if not records:
+            return
+        _write(records)
+
+
+def get_tracing_stats() -> Dict[str, object]:
+    return {
+        "enabled": TRACING_ENABLED,
+        "sample_rate": TRACE_SAMPLE_RATE,
+        **_trace_stats,
+        "queued": len(_export_queue),
+    }
+
+
+# ---------------------------------------------------------------------------
+# 계측 (HTTP / SQLAlchemy / Redis)
+# ---------------------------------------------------------------------------
+
+class TracingMiddleware:
+    """
+    HTTP 요청마다 루트 span을 만드는 ASGI 미들웨어 (traceparent 헤더가 있으면 이어 붙임)
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        traceparent = None
+        for key, value in scope["headers"]:
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        method = scope["method"]
+        with start_trace(f"{method} {scope['path']}", traceparent, kind="server", **{"http.method": method}) as span:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status("error")
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # 라우팅이 끝난 뒤에는 경로 대신 라우트 템플릿으로 이름을 바꿔 같은 라우트끼리 묶이도록 함
+                route = scope.get("route")
+                if route is not None and getattr(route, "path", None):
+                    span.set_name(f"{method} {route.path}")
+
+
+def instrument_sqlalchemy(engine):
+    """
+    엔진에서 실행되는 SQL 문마다 span을 기록합니다. (AsyncEngine이면 sync_engine에 이벤트 등록)
+    """
+    if not TRACING_ENABLED:
+        return
+
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    system = sync_engine.dialect.name
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        span = start_span("db.query", kind="client")
+        if span is NOOP_SPAN:
+            return
+        span.set_attribute("db.system", system)
+        span.set_attribute("db.statement", statement[:TRACE_SQL_MAX_LENGTH])
+        if executemany:
+            span.set_attribute("db.executemany", len(parameters))
+        context._trace_span = span.start()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            context._trace_span = None
+            span.end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_trace_span", None) if context is not None else None
+        if span is not None:
+            context._trace_span = None
+            span.record_error(exception_context.original_exception)
+            span.end()
+
+
+def instrument_redis(client):
+    """
+    Redis 명령(파이프라인은 execute 한 번)마다 span을 기록하도록 클라이언트 인스턴스를 감쌉니다.
+    """
+    if not TRACING_ENABLED:
+        return client
+
+    execute_command = client.execute_command
+    pipeline = client.pipeline
+
+    async def traced_execute_command(*args, **options):
+        with start_span(f"redis.{args[0]}", kind="client", **{"db.system": "redis"}):
+            return await execute_command(*args, **options)
+
+    def traced_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def traced_execute(*execute_args, **execute_kwargs):
+            with start_span("redis.pipeline", kind="client", **{"db.system": "redis"}) as span:
+                span.set_attribute("redis.commands", len(pipe.command_stack))
+                return await execute(*execute_args, **execute_kwargs)
+
+        pipe.execute = traced_execute
+        return pipe
+
+    client.execute_command = traced_execute_command
+    client.pipeline = traced_pipeline
+    return client
@@ -0,0 +1,92 @@
+"""
+TTL 캐시 모듈
+
+프로세스 로컬 메모리에 값을 일정 시간 동안 보관하는 LRU + TTL 캐시입니다.
+asyncio 단일 스레드에서 사용하는 것을 전제로 하며 별도의 락을 사용하지 않습니다.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Args:
+            maxsize: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+            ttl: 항목 유효 시간 (초)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """
+        LRU 순서와 적중률 통계를 바꾸지 않고 조회합니다. (모니터링용)
+        """
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return default
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self._data[key] = (time.monotonic() + (ttl if ttl is not None else self.ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get_many(self, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, Any], List[Hashable]]:
+        """
+        여러 키를 한 번에 조회합니다.
+
+        Returns:
+            (found, missing): 캐시에 있는 값과 없는 키 목록
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        return found, missing
+
+    def set_many(self, items: Dict[Hashable, Any], ttl: Optional[float] = None):
+        for key, value in items.items():
+            self.set(key, value, ttl)
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}